@@ -2,17 +2,18 @@ import { initPitchRenderer } from './pitch_renderer_stub.js';
 
 const e = React.createElement;
 
-function usePitchRenderer() {
+function usePitchRenderer(subscribe) {
   const canvasRef = React.useRef(null);
   const disposerRef = React.useRef(null);
   const mount = React.useCallback(async () => {
     if (!canvasRef.current) return;
     disposerRef.current = await initPitchRenderer({
       canvas: canvasRef.current,
+      subscribe,
       onReady: () => {},
       onDispose: () => {},
     });
-  }, []);
+  }, [subscribe]);
   const unmount = React.useCallback(() => {
     disposerRef.current && disposerRef.current();
   }, []);
@@ -23,6 +24,8 @@ class WSClient {
   constructor(url){ 
     this.url=url; 
     this.listeners=new Set(); 
+    this.pitchListeners=new Set();   // Binary pitch frames
+    this.pitchRateHz = 0;
     this.connected = false;
     this.reconnectAttempts = 0;
     this.maxReconnectAttempts = 5;
@@ -30,11 +33,13 @@ class WSClient {
   
   connect(){ 
     this.ws=new WebSocket(this.url);
+    this.ws.binaryType = 'arraybuffer';
     
     this.ws.onopen = () => {
       console.log('🎧 WebSocket connected');
       this.connected = true;
       this.reconnectAttempts = 0;
+      if (this.pitchRateHz) this.send('subscribe_pitch', { rateHz: this.pitchRateHz });
     };
     
     this.ws.onclose = () => {
@@ -48,6 +53,10 @@ class WSClient {
     };
     
     this.ws.onmessage=(m)=>{ 
+      if (m.data instanceof ArrayBuffer) {
+        this.pitchListeners.forEach(l=>l(m.data));
+        return;
+      }
       try{
         const ev=JSON.parse(m.data); 
         this.listeners.forEach(l=>l(ev));
@@ -75,6 +84,20 @@ class WSClient {
   
   addListener(cb){ this.listeners.add(cb); }
   removeListener(cb){ this.listeners.delete(cb); }
+  
+  // The backend only sends pitch frames once asked, at no more than rateHz
+  subscribePitch(cb, rateHz){
+    this.pitchListeners.add(cb);
+    this.pitchRateHz = Math.max(this.pitchRateHz, rateHz);
+    if (this.connected) this.send('subscribe_pitch', { rateHz: this.pitchRateHz });
+    return () => {
+      this.pitchListeners.delete(cb);
+      if (!this.pitchListeners.size) {
+        this.pitchRateHz = 0;
+        if (this.connected) this.send('subscribe_pitch', { rateHz: 0 });
+      }
+    };
+  }
 }
 
 function App(){
@@ -96,9 +119,9 @@ function App(){
   const [selectedOutput, setSelectedOutput] = React.useState('');
   const [currentPreset, setCurrentPreset] = React.useState(null);
 
-  // Remove the mock pitch renderer - we'll use C++ instead
-  // const { canvasRef, mount, unmount } = usePitchRenderer();
-  // React.useEffect(()=>{ mount(); return ()=>unmount(); },[mount,unmount]);
+  // Live pitch lane, fed by the engine's pitch stream through the backend
+  const subscribePitch = React.useCallback((cb, rateHz) => wsRef.current ? wsRef.current.subscribePitch(cb, rateHz) : null, [useMock, wsUrl]);
+  const { canvasRef, mount, unmount } = usePitchRenderer(subscribePitch);
 
   React.useEffect(()=>{
     if (useMock) return;
@@ -155,6 +178,9 @@ function App(){
     
     return ()=>{ ws.removeListener(onEvent); };
   },[useMock, wsUrl]);
+  
+  // Mounted after the socket above so the renderer can subscribe to it
+  React.useEffect(()=>{ mount(); return ()=>unmount(); },[mount,unmount]);
 
   React.useEffect(()=>{
     const v = videoRef.current; if (!v) return;
@@ -681,28 +707,18 @@ function App(){
           )
         ),
         
-        // C++ Waveform Integration
-        /*
+        // Live pitch lane (engine pitch stream via the backend)
         e('div',{className:'mt-4'},
           e('div',{className:'shadow-sm border rounded-xl bg-white'},
             e('div',{className:'p-2 relative h-44 rounded-xl overflow-hidden'},
-              e('div',{className:'h-full flex items-center justify-center bg-gradient-to-r from-blue-50 to-purple-50'},
-                e('div',{className:'text-center text-neutral-600'},
-                  e('div',{className:'text-2xl mb-2'}, '🎤'),
-                  e('div',{className:'font-medium'}, 'C++ Autotune Visualization'),
-                  e('div',{className:'text-sm mt-1'}, 'Real-time pitch correction display'),
-                  e('div',{className:'text-xs mt-2 text-neutral-500'}, 'Opens in separate window when session starts')
-                )
-              ),
+              e('canvas',{ref: canvasRef, className:'w-full h-full rounded-lg'}),
               e('div',{className:'absolute top-2 right-3 text-xs bg-black/50 text-white px-2 py-1 rounded-full'},
                 e('span',{className:'mr-3'}, e('span',{className:'inline-block w-2 h-2 rounded-full bg-green-500 mr-1'}),'Your voice (green)'),
-                e('span',null, e('span',{className:'inline-block w-2 h-2 rounded-full bg-red-500 mr-1'}),'Your voice (green)'),
                 e('span',null, e('span',{className:'inline-block w-2 h-2 rounded-full bg-red-500 mr-1'}),'Target melody (red)')
               )
             )
           )
         )
-        */
       )
     )
   );
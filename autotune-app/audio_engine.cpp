@@ -0,0 +1,130 @@
+#include "audio_engine.h"
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include "dsp_kernels.h"
+
+int audioCallback(const void* inputBuffer, void* outputBuffer,
+                  unsigned long framesPerBuffer,
+                  const PaStreamCallbackTimeInfo* timeInfo,
+                  PaStreamCallbackFlags statusFlags,
+                  void* userData) {
+    
+    (void)timeInfo;        // Suppress unused parameter warning
+    
+    AudioData* data = (AudioData*)userData;
+    float* in = (float*)inputBuffer;
+    float* out = (float*)outputBuffer;
+    
+    // Safety check for null pointers
+    if (!in || !out || !data || framesPerBuffer > (unsigned long)MAX_FRAMES_PER_BUFFER) {
+        return paAbort;
+    }
+    
+    // Count glitches PortAudio reports; the main loop turns them into events
+    if (statusFlags & (paInputOverflow | paOutputUnderflow)) {
+        data->xruns.fetch_add(1, std::memory_order_relaxed);
+    }
+    const int frames = (int)framesPerBuffer;
+    
+    // Snapshot live parameters once per buffer (lock-free, updated by the control thread)
+    const float autotune_strength = data->params.autotune_strength.load(std::memory_order_relaxed);
+    const float pitch_shift_amount = data->params.pitch_shift.load(std::memory_order_relaxed);
+    const float voice_volume = data->params.voice_volume.load(std::memory_order_relaxed);
+    const float instrument_volume = data->params.instrument_volume.load(std::memory_order_relaxed);
+    
+    // Get instrumental chunk from the read-ahead stream (silence on underrun)
+    float instrumental_chunk[MAX_FRAMES_PER_BUFFER];
+    data->instrumental->read(instrumental_chunk, frames);
+    
+    // Debug: Check if instrumental has non-zero values
+    if (data->debug_counter++ % 100 == 0 && data->logger->getLevel() <= LogLevel::Debug) {  // Scan every 100th callback
+        float max_instrumental = 0.0f;
+        for (int i = 0; i < frames; i++) {
+            max_instrumental = std::max(max_instrumental, std::abs(instrumental_chunk[i]));
+        }
+        
+        data->logger->log(LogLevel::Debug, "🔍 Debug - Chunk max: %g, Position: %.0f, Underruns: %.0f",
+                          max_instrumental, (double)data->instrumental->getSamplesPlayed(),
+                          (double)data->instrumental->getUnderrunCount());
+    }
+    
+    // Split the interleaved input into one buffer per singer
+    const int num_singers = (int)data->singers.size();
+    if (num_singers == 1) {
+        std::memcpy(data->singers[0]->inputBuffer(), in, frames * sizeof(float));
+    } else {
+        for (int s = 0; s < num_singers; s++) {
+            extractChannel(data->singers[s]->inputBuffer(), in, frames, num_singers, s);
+        }
+    }
+    
+    // Pitch tracking, autotune and noise suppression for every singer
+    data->singer_pool->run(frames, data->current_time, autotune_strength, pitch_shift_amount);
+    
+    const SingerChain* lead = data->singers[0];
+    if (lead->wasShifted()) {
+        // Debug output for autotune and pitch shift
+        data->logger->logLimited(data->effect_log_limit, LogLevel::Info,
+                                 "🎵 Effects applied - Autotune: %g, Pitch shift: %g semitones",
+                                 autotune_strength, pitch_shift_amount);
+    } else {
+        // No confident pitch or target: the voice passed through unshifted
+        data->logger->logLimited(data->no_effect_log_limit, LogLevel::Info,
+                                 "🔇 No effects - Autotune: %g, Pitch shift: %g semitones",
+                                 autotune_strength, pitch_shift_amount);
+    }
+    
+    // Sum the singers onto one voice bus
+    float processed_audio[MAX_FRAMES_PER_BUFFER];
+    std::memcpy(processed_audio, lead->outputBuffer(), frames * sizeof(float));
+    for (int s = 1; s < num_singers; s++) {
+        addBuffer(processed_audio, data->singers[s]->outputBuffer(), frames);
+    }
+    
+    // Chorus and reverb on the voice only, so the instrumental stays dry
+    if (data->enable_chorus && data->chorus) {
+        data->chorus->process(processed_audio, frames);
+        data->logger->logLimited(data->chorus_log_limit, LogLevel::Info,
+                                 "🎭 Chorus enabled - Depth: %g", data->chorus_depth);
+    }
+    
+    if (data->enable_reverb && data->reverb) {
+        data->reverb->process(processed_audio, frames);
+    }
+    
+    // Dynamic mixing based on voice and instrument volume settings
+    data->logger->logLimited(data->volume_log_limit, LogLevel::Info,
+                             "🔊 Audio mixing - Instrument vol: %g, Voice vol: %g",
+                             instrument_volume, voice_volume);
+    
+    mixWithGains(out, instrumental_chunk, instrument_volume, processed_audio, voice_volume, frames);
+    
+    // Clamp to prevent clipping
+    clampBuffer(out, frames);
+    
+    data->current_time += (float)frames / SAMPLE_RATE;
+    
+    // Hand the mixed audio to the recorder (never blocks, drops if the consumer stalls)
+    if (data->recording_enabled && data->recording_queue) {
+        data->recording_queue->pushBlock(out, frames);
+    }
+    
+    // Publish pitch telemetry for the in-process plot and any external viewers
+    PitchFrame frame = {};
+    frame.time = data->current_time;
+    frame.pitch = lead->getLastPitch();
+    frame.confidence = lead->getLastConfidence();
+    frame.target = lead->getTargetPitch();
+    frame.vad = lead->getNoiseSuppressor().getVADProbability();
+    frame.noise_level = lead->getNoiseSuppressor().getNoiseLevel();
+    frame.voice_active = lead->getNoiseSuppressor().isVoiceActive() ? 1 : 0;
+    if (data->plot_queue) {
+        data->plot_queue->push(frame);
+    }
+    if (data->telemetry) {
+        data->telemetry->publish(frame);
+    }
+    
+    return paContinue;
+}
@@ -0,0 +1,63 @@
+#ifndef AUDIO_ENGINE_H
+#define AUDIO_ENGINE_H
+
+#include <portaudio.h>
+#include <atomic>
+#include <cstdint>
+#include <vector>
+#include "chorus.h"
+#include "control_channel.h"
+#include "reverb.h"
+#include "ring_buffer.h"
+#include "rt_log.h"
+#include "singer_chain.h"
+#include "singer_pool.h"
+#include "streaming_source.h"
+#include "telemetry_shm.h"
+
+#define SAMPLE_RATE 48000
+
+// Everything the audio callback reads or writes, set up by main() before the
+// stream starts. The callback owns none of it.
+struct AudioData {
+    float current_time;
+    StreamingInstrumental* instrumental;   // Read-ahead instrumental stream
+    std::vector<SingerChain*> singers;       // One voice chain per input channel (singer 0 drives the plot)
+    SingerPool* singer_pool;                 // Runs the chains, in parallel when there are enough of them
+    SpscRingBuffer<PitchFrame>* plot_queue;  // Pitch telemetry for the plot (audio thread -> main loop)
+    TelemetryWriter* telemetry;              // Same frames in shared memory for external viewers
+    SpscRingBuffer<float>* recording_queue;  // Mixed output for the recorder (audio thread -> WavRecorder)
+    bool recording_enabled;
+    RtLogger* logger;                        // Only way the callback may print
+    VoiceParams params;             // Live-adjustable: autotune strength, pitch shift, voice/instrument volume
+    bool enable_chorus;             // Enable chorus effect
+    float chorus_depth;             // Chorus intensity
+    Chorus* chorus;                 // Modulated delay line, preallocated for the profile's buffer size
+    bool enable_reverb;             // Enable reverb effect
+    Reverb* reverb;                 // Freeverb network, preallocated for the profile's buffer size
+    float reverb_wetness;
+    std::atomic<uint64_t> xruns{0}; // Buffers PortAudio flagged with input overflow or output underflow
+
+    // Callback-only log state, kept here so daemon sessions and replay runs each start fresh
+    uint32_t debug_counter{0};
+    RtRateLimiter effect_log_limit{LOG_INTERVAL_SECONDS};
+    RtRateLimiter no_effect_log_limit{LOG_INTERVAL_SECONDS};
+    RtRateLimiter chorus_log_limit{LOG_INTERVAL_SECONDS};
+    RtRateLimiter volume_log_limit{LOG_INTERVAL_SECONDS};
+
+    // Constants
+    static constexpr double LOG_INTERVAL_SECONDS = 5.0;   // Per repeating callback message
+};
+
+// The real-time path: split the input per singer, run the voice chains, add
+// chorus/reverb, mix with the instrumental, then publish the mix to the
+// recorder and pitch telemetry. PortAudio calls it once per buffer; offline
+// rendering and benchmarks/callback_replay call it directly with
+// userData = AudioData*, and timeInfo may be null there.
+int audioCallback(const void* inputBuffer, void* outputBuffer,
+                  unsigned long framesPerBuffer,
+                  const PaStreamCallbackTimeInfo* timeInfo,
+                  PaStreamCallbackFlags statusFlags,
+                  void* userData);
+
+#endif // AUDIO_ENGINE_H
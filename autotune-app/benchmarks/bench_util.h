@@ -0,0 +1,92 @@
+#ifndef BENCH_UTIL_H
+#define BENCH_UTIL_H
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <functional>
+#include <vector>
+
+// Minimal timing helpers shared by the DSP benchmarks.
+// Every benchmark reports cost per buffer against the real-time deadline
+// (buffer length / sample rate) so results read the same across block sizes.
+
+struct BenchResult {
+    double meanUs;
+    double p50Us;
+    double p99Us;
+    double maxUs;
+    double deadlineUs;
+};
+
+// Mean and percentiles of per-buffer timings (sorts the vector in place)
+inline BenchResult summarizeTimings(std::vector<double>& timings, int framesPerBuffer, int sampleRate) {
+    std::sort(timings.begin(), timings.end());
+    double sum = 0.0;
+    for (double t : timings) {
+        sum += t;
+    }
+
+    const size_t count = timings.size();
+    BenchResult result;
+    result.meanUs = count > 0 ? sum / count : 0.0;
+    result.p50Us = count > 0 ? timings[count / 2] : 0.0;
+    result.p99Us = count > 0 ? timings[(size_t)(count * 0.99)] : 0.0;
+    result.maxUs = count > 0 ? timings.back() : 0.0;
+    result.deadlineUs = 1e6 * framesPerBuffer / sampleRate;
+    return result;
+}
+
+// Run fn once per iteration and collect per-call timings
+inline BenchResult measurePerBuffer(const std::function<void()>& fn, int iterations,
+                                    int framesPerBuffer, int sampleRate) {
+    // Warm caches and lazy state before timing
+    for (int i = 0; i < iterations / 10 + 1; ++i) {
+        fn();
+    }
+
+    std::vector<double> timings(iterations);
+    for (int i = 0; i < iterations; ++i) {
+        auto start = std::chrono::steady_clock::now();
+        fn();
+        auto end = std::chrono::steady_clock::now();
+        timings[i] = std::chrono::duration<double, std::micro>(end - start).count();
+    }
+    return summarizeTimings(timings, framesPerBuffer, sampleRate);
+}
+
+inline void printBenchHeader() {
+    std::printf("%-32s %7s %10s %10s %10s %9s\n", "benchmark", "frames", "mean(us)", "p99(us)", "max(us)", "%budget");
+}
+
+inline void printBenchResult(const char* name, int framesPerBuffer, const BenchResult& r) {
+    std::printf("%-32s %7d %10.2f %10.2f %10.2f %8.2f%%\n", name, framesPerBuffer,
+                r.meanUs, r.p99Us, r.maxUs, 100.0 * r.meanUs / r.deadlineUs);
+}
+
+// Compare mean cost against a stated share of the buffer deadline; prints and returns pass/fail
+inline bool checkBudget(const char* name, int framesPerBuffer, const BenchResult& r, double maxPercent) {
+    double used = 100.0 * r.meanUs / r.deadlineUs;
+    bool ok = used <= maxPercent;
+    std::printf("%s %s @ %d frames: %.2f%% of deadline (budget %.1f%%)\n", ok ? "PASS" : "FAIL",
+                name, framesPerBuffer, used, maxPercent);
+    return ok;
+}
+
+// Voice-like test signal: a few harmonics of f0 plus a little noise
+inline void fillTestSignal(std::vector<float>& buffer, int sampleRate, float f0, unsigned seed = 1) {
+    unsigned state = seed;
+    for (size_t i = 0; i < buffer.size(); ++i) {
+        float t = (float)i / sampleRate;
+        float sample = 0.0f;
+        for (int h = 1; h <= 5; ++h) {
+            sample += std::sin(2.0f * (float)M_PI * f0 * h * t) / h;
+        }
+        state = state * 1664525u + 1013904223u;
+        float noise = ((state >> 9) / 8388608.0f) - 1.0f;
+        buffer[i] = 0.3f * sample + 0.01f * noise;
+    }
+}
+
+#endif // BENCH_UTIL_H
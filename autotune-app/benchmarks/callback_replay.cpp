@@ -0,0 +1,342 @@
+// Deterministic replay of the real-time audio callback.
+//
+// Build and run from autotune-app/:  make replay
+//                           or:      benchmarks/callback_replay [vocal.wav [instrumental.wav]]
+//
+// Drives audioCallback() directly, buffer by buffer, for every latency
+// profile: no PortAudio, no pacing and no background DSP threads. Pitch
+// analysis and instrumental decoding run synchronously, so every run sees
+// the same input and produces the same mix (printed as a checksum). Without
+// arguments the vocal and instrumental are synthesized against the fixed
+// melody below; a vocal file must be mono at 48 kHz.
+//
+// For each profile it reports p50/p99/max callback time, buffers that
+// overran the deadline and heap allocations per buffer on the callback
+// thread, and exits non-zero if any of them is over budget.
+
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <filesystem>
+#include <memory>
+#include <new>
+#include <string>
+#include <utility>
+#include <vector>
+#include <sndfile.h>
+#include "audio_engine.h"
+#include "bench_util.h"
+#include "latency_profile.h"
+
+// Budgets for the whole callback. A few overruns are allowed because a
+// preempted benchmark thread looks exactly like a slow callback.
+static const double CALLBACK_P99_BUDGET_PERCENT = 50.0;     // p99 time as a share of the buffer deadline
+static const double OVERRUN_BUDGET_PERCENT = 0.1;           // Buffers past the deadline, as a share of all buffers
+static const uint64_t MAX_CALLBACK_ALLOCATIONS = 0;
+
+static const double REPLAY_SECONDS = 30.0;
+static const int INSTRUMENTAL_SAMPLE_RATE = 44100;   // Synthesized at 44.1 kHz stereo so the resampler and downmix run
+static const float NOTE_SECONDS = 0.5f;
+static const float MELODY_STEP_SECONDS = 0.1f;       // Melody files list a pitch every ~100 ms
+static const float PHRASE_SECONDS = 4.0f;            // The singer breathes for the last note of each phrase
+static const float VOCAL_DETUNE_SEMITONES = -0.4f;   // Sung a little flat so autotune has work to do
+static const float SCALE_HZ[] = {261.63f, 293.66f, 329.63f, 349.23f, 392.00f, 440.00f, 493.88f, 523.25f};
+
+// operator new is counted only on the thread that runs the callback, and
+// only while it does. malloc() from C libraries (aubio) is not seen here.
+static thread_local bool t_countAllocations = false;
+static thread_local uint64_t t_allocations = 0;
+
+void* operator new(std::size_t size) {
+    if (t_countAllocations) {
+        ++t_allocations;
+    }
+    if (void* p = std::malloc(size ? size : 1)) {
+        return p;
+    }
+    throw std::bad_alloc();
+}
+
+void operator delete(void* p) noexcept {
+    std::free(p);
+}
+
+void operator delete(void* p, std::size_t) noexcept {
+    std::free(p);
+}
+
+static bool g_all_within_budget = true;
+
+struct ReplayResult {
+    BenchResult timing;
+    uint64_t buffers;
+    int overruns;
+    uint64_t allocations;
+    uint64_t checksum;    // FNV-1a over the output samples
+};
+
+static float noteAt(float time) {
+    const int count = (int)(sizeof(SCALE_HZ) / sizeof(SCALE_HZ[0]));
+    return SCALE_HZ[(int)(time / NOTE_SECONDS) % count];
+}
+
+static bool isBreath(float time) {
+    return std::fmod(time, PHRASE_SECONDS) >= PHRASE_SECONDS - NOTE_SECONDS;
+}
+
+// The fixed melody every replay is tuned against
+static std::vector<std::pair<float, float>> buildMelody(double seconds) {
+    std::vector<std::pair<float, float>> melody;
+    for (float t = 0.0f; t < seconds; t += MELODY_STEP_SECONDS) {
+        if (!isBreath(t)) {
+            melody.emplace_back(t, noteAt(t));
+        }
+    }
+    return melody;
+}
+
+// Sung line following the melody: harmonics, a little vibrato, breaths between phrases
+static std::vector<float> synthesizeVocal(double seconds) {
+    std::vector<float> vocal((size_t)(seconds * SAMPLE_RATE));
+    const float detune = std::pow(2.0f, VOCAL_DETUNE_SEMITONES / 12.0f);
+    double phase = 0.0;
+    unsigned state = 1;
+    for (size_t i = 0; i < vocal.size(); ++i) {
+        float t = (float)i / SAMPLE_RATE;
+        float vibrato = std::pow(2.0f, 0.2f * std::sin(2.0f * (float)M_PI * 5.0f * t) / 12.0f);
+        phase += 2.0 * M_PI * noteAt(t) * detune * vibrato / SAMPLE_RATE;
+        float sample = 0.0f;
+        if (!isBreath(t)) {
+            for (int h = 1; h <= 5; ++h) {
+                sample += (float)std::sin(h * phase) / h;
+            }
+        }
+        state = state * 1664525u + 1013904223u;
+        float noise = ((state >> 9) / 8388608.0f) - 1.0f;
+        vocal[i] = 0.3f * sample + 0.003f * noise;
+    }
+    return vocal;
+}
+
+// Interleaved stereo backing: root an octave down plus a fifth, slightly different per side
+static std::vector<float> synthesizeInstrumental(double seconds) {
+    const size_t frames = (size_t)(seconds * INSTRUMENTAL_SAMPLE_RATE);
+    std::vector<float> stereo(frames * 2);
+    double root = 0.0;
+    double fifth = 0.0;
+    for (size_t i = 0; i < frames; ++i) {
+        float t = (float)i / INSTRUMENTAL_SAMPLE_RATE;
+        float f0 = noteAt(t) * 0.5f;
+        root += 2.0 * M_PI * f0 / INSTRUMENTAL_SAMPLE_RATE;
+        fifth += 2.0 * M_PI * f0 * 1.5 / INSTRUMENTAL_SAMPLE_RATE;
+        stereo[2 * i] = 0.2f * (float)std::sin(root) + 0.1f * (float)std::sin(fifth);
+        stereo[2 * i + 1] = 0.1f * (float)std::sin(root) + 0.2f * (float)std::sin(fifth);
+    }
+    return stereo;
+}
+
+static bool writeWav(const std::string& path, const std::vector<float>& interleaved, int sampleRate, int channels) {
+    SF_INFO info = {};
+    info.samplerate = sampleRate;
+    info.channels = channels;
+    info.format = SF_FORMAT_WAV | SF_FORMAT_FLOAT;
+    SNDFILE* file = sf_open(path.c_str(), SFM_WRITE, &info);
+    if (!file) {
+        std::fprintf(stderr, "could not write %s: %s\n", path.c_str(), sf_strerror(nullptr));
+        return false;
+    }
+    sf_writef_float(file, interleaved.data(), (sf_count_t)(interleaved.size() / channels));
+    sf_close(file);
+    return true;
+}
+
+static bool readVocal(const std::string& path, std::vector<float>& vocal) {
+    SF_INFO info = {};
+    SNDFILE* file = sf_open(path.c_str(), SFM_READ, &info);
+    if (!file) {
+        std::fprintf(stderr, "could not open %s: %s\n", path.c_str(), sf_strerror(nullptr));
+        return false;
+    }
+    if (info.channels != 1 || info.samplerate != SAMPLE_RATE) {
+        std::fprintf(stderr, "%s: need mono at %d Hz, got %d channel(s) at %d Hz\n", path.c_str(),
+                     SAMPLE_RATE, info.channels, info.samplerate);
+        sf_close(file);
+        return false;
+    }
+    vocal.resize((size_t)info.frames);
+    vocal.resize((size_t)sf_readf_float(file, vocal.data(), info.frames));
+    sf_close(file);
+    return true;
+}
+
+static uint64_t fnv1a(uint64_t hash, const float* samples, int count) {
+    const unsigned char* bytes = reinterpret_cast<const unsigned char*>(samples);
+    for (size_t i = 0; i < count * sizeof(float); ++i) {
+        hash = (hash ^ bytes[i]) * 1099511628211ull;
+    }
+    return hash;
+}
+
+// One full pass of the vocal through the callback with the given profile
+static bool replayProfile(const LatencyProfile& profile, const std::vector<float>& vocal,
+                          const std::string& instrumentalFile,
+                          const std::vector<std::pair<float, float>>& melody, ReplayResult& out) {
+    const int frames = profile.framesPerBuffer;
+
+    StreamingInstrumental instrumental;
+    if (!instrumental.open(instrumentalFile, SAMPLE_RATE)) {
+        std::fprintf(stderr, "could not open %s\n", instrumentalFile.c_str());
+        return false;
+    }
+
+    // Nothing is started: the chain analyses pitch inside process(), and the
+    // pool with no workers runs it on this thread
+    SingerChain chain;
+    if (!chain.init(0, SAMPLE_RATE, profile, profile.pitchHop, melody)) {
+        return false;
+    }
+    SingerPool pool;
+    pool.start({&chain}, 0);
+
+    Chorus chorus;
+    chorus.init(SAMPLE_RATE, frames);
+    chorus.setDepth(0.3f);
+    Reverb reverb;
+    reverb.init(SAMPLE_RATE, frames);
+    reverb.setWetness(0.3f);
+
+    SpscRingBuffer<PitchFrame> plotQueue(1024);
+    SpscRingBuffer<float> recordingQueue(SAMPLE_RATE);
+    // Warnings still print; the per-buffer Info chatter would only add scheduling noise
+    RtLogger logger;
+    logger.setLevel(LogLevel::Warn);
+    logger.start();
+
+    AudioData data;
+    data.current_time = 0.0f;
+    data.instrumental = &instrumental;
+    data.singers = {&chain};
+    data.singer_pool = &pool;
+    data.plot_queue = &plotQueue;
+    data.telemetry = nullptr;
+    data.recording_queue = &recordingQueue;
+    data.recording_enabled = true;
+    data.logger = &logger;
+    data.params.autotune_strength.store(0.8f);
+    data.enable_chorus = true;
+    data.chorus_depth = 0.3f;
+    data.chorus = &chorus;
+    data.enable_reverb = true;
+    data.reverb = &reverb;
+    data.reverb_wetness = 0.3f;
+
+    std::vector<float> output(frames);
+    std::vector<float> drained(frames);
+    std::vector<double> timings;
+    timings.reserve(vocal.size() / frames + 1);
+    PitchFrame frame;
+
+    out.buffers = 0;
+    out.overruns = 0;
+    out.allocations = 0;
+    out.checksum = 1469598103934665603ull;
+    const double deadlineUs = 1e6 * frames / SAMPLE_RATE;
+
+    for (size_t pos = 0; pos + frames <= vocal.size(); pos += frames) {
+        // Feed and drain the callback's neighbours outside the timed region
+        instrumental.prefetch(frames);
+
+        t_allocations = 0;
+        t_countAllocations = true;
+        auto start = std::chrono::steady_clock::now();
+        int status = audioCallback(vocal.data() + pos, output.data(), (unsigned long)frames, nullptr, 0, &data);
+        auto end = std::chrono::steady_clock::now();
+        t_countAllocations = false;
+
+        if (status != paContinue) {
+            std::fprintf(stderr, "callback returned %d at buffer %llu\n", status, (unsigned long long)out.buffers);
+            return false;
+        }
+
+        double us = std::chrono::duration<double, std::micro>(end - start).count();
+        timings.push_back(us);
+        out.overruns += us > deadlineUs ? 1 : 0;
+        out.allocations += t_allocations;
+        out.checksum = fnv1a(out.checksum, output.data(), frames);
+        out.buffers++;
+
+        recordingQueue.popBlock(drained.data(), frames);
+        while (plotQueue.pop(frame)) {
+        }
+    }
+
+    pool.stop();
+    out.timing = summarizeTimings(timings, frames, SAMPLE_RATE);
+    return true;
+}
+
+int main(int argc, char* argv[]) {
+    std::vector<std::pair<float, float>> melody = buildMelody(REPLAY_SECONDS);
+    std::vector<float> vocal;
+    std::string instrumentalFile;
+
+    const std::filesystem::path tempDir = std::filesystem::temp_directory_path();
+    if (argc > 1) {
+        if (!readVocal(argv[1], vocal)) {
+            return 1;
+        }
+    } else {
+        vocal = synthesizeVocal(REPLAY_SECONDS);
+    }
+    if (argc > 2) {
+        instrumentalFile = argv[2];
+    } else {
+        instrumentalFile = (tempDir / "karaoke_replay_instrumental.wav").string();
+        if (!writeWav(instrumentalFile, synthesizeInstrumental(REPLAY_SECONDS), INSTRUMENTAL_SAMPLE_RATE, 2)) {
+            return 1;
+        }
+    }
+
+    std::printf("Replaying %.1fs of vocal through audioCallback (%zu melody points)\n\n",
+                (double)vocal.size() / SAMPLE_RATE, melody.size());
+
+    std::vector<std::pair<const LatencyProfile*, ReplayResult>> results;
+    for (const LatencyProfile& profile : LATENCY_PROFILES) {
+        ReplayResult result;
+        if (!replayProfile(profile, vocal, instrumentalFile, melody, result)) {
+            return 1;
+        }
+        results.emplace_back(&profile, result);
+    }
+
+    std::printf("\n%-12s %7s %8s %9s %9s %9s %8s %8s %10s  %s\n", "profile", "frames", "buffers",
+                "p50(us)", "p99(us)", "max(us)", "%p99", "overrun", "allocs/buf", "checksum");
+    for (const auto& entry : results) {
+        const LatencyProfile& profile = *entry.first;
+        const ReplayResult& r = entry.second;
+        std::printf("%-12s %7d %8llu %9.2f %9.2f %9.2f %7.2f%% %8d %10.3f  %016llx\n", profile.name,
+                    profile.framesPerBuffer, (unsigned long long)r.buffers, r.timing.p50Us, r.timing.p99Us,
+                    r.timing.maxUs, 100.0 * r.timing.p99Us / r.timing.deadlineUs, r.overruns,
+                    r.buffers > 0 ? (double)r.allocations / r.buffers : 0.0, (unsigned long long)r.checksum);
+    }
+
+    std::printf("\n");
+    for (const auto& entry : results) {
+        const LatencyProfile& profile = *entry.first;
+        const ReplayResult& r = entry.second;
+        double p99Percent = 100.0 * r.timing.p99Us / r.timing.deadlineUs;
+        double overrunPercent = r.buffers > 0 ? 100.0 * r.overruns / r.buffers : 0.0;
+        bool timeOk = p99Percent <= CALLBACK_P99_BUDGET_PERCENT;
+        bool overrunOk = overrunPercent <= OVERRUN_BUDGET_PERCENT;
+        bool allocOk = r.allocations <= MAX_CALLBACK_ALLOCATIONS;
+        std::printf("%s %s: p99 %.2f%% of deadline (budget %.1f%%), %d overrun(s) = %.3f%% of buffers (budget %.1f%%), "
+                    "%llu allocation(s) (max %llu)\n",
+                    timeOk && overrunOk && allocOk ? "PASS" : "FAIL", profile.name, p99Percent,
+                    CALLBACK_P99_BUDGET_PERCENT, r.overruns, overrunPercent, OVERRUN_BUDGET_PERCENT,
+                    (unsigned long long)r.allocations, (unsigned long long)MAX_CALLBACK_ALLOCATIONS);
+        g_all_within_budget &= timeOk && overrunOk && allocOk;
+    }
+
+    std::printf("\n%s\n", g_all_within_budget ? "All profiles within budget" : "Callback over budget");
+    return g_all_within_budget ? 0 : 1;
+}
@@ -0,0 +1,228 @@
+// DSP microbenchmarks for the real-time voice chain.
+//
+// Build and run from autotune-app/:  make bench
+// Each stage is timed per buffer at the block sizes the engine uses and
+// reported as a share of the buffer deadline at 48 kHz.
+
+#include <algorithm>
+#include <deque>
+#include <string>
+#include <vector>
+#include "bench_util.h"
+#include "chorus.h"
+#include "dsp_kernels.h"
+#include "pitch_shifter.h"
+#include "reverb.h"
+#include "running_median.h"
+#include "simple_noise_suppression.h"
+
+static const int SAMPLE_RATE = 48000;
+static const int BLOCK_SIZES[] = {256, 1024};
+static const int ITERATIONS = 2000;
+
+// Stated per-stage budgets, as a share of the buffer deadline
+static const double CHORUS_BUDGET_PERCENT = 2.0;
+static const double REVERB_BUDGET_PERCENT = 5.0;
+static const double NOISE_MEDIAN_BUDGET_PERCENT = 1.0;
+static const double NOISE_SUPPRESSOR_BUDGET_PERCENT = 10.0;
+static const double MIX_BUDGET_PERCENT = 0.5;
+
+// Noise-floor window lengths, in buffers (SimpleNoiseSuppressor uses 1000)
+static const int NOISE_WINDOWS[] = {250, 1000, 4000, 16000};
+
+static bool g_all_within_budget = true;
+
+static void benchPitchShifter() {
+    const float ratios[] = {1.0f, 1.06f, 1.5f, 0.75f};
+    const char* names[] = {"pitch_shifter ratio=1.00", "pitch_shifter ratio=1.06",
+                           "pitch_shifter ratio=1.50", "pitch_shifter ratio=0.75"};
+
+    for (int frames : BLOCK_SIZES) {
+        std::vector<float> input(frames);
+        std::vector<float> output(frames);
+        fillTestSignal(input, SAMPLE_RATE, 220.0f);
+
+        for (int r = 0; r < 4; ++r) {
+            PitchShifter shifter;
+            shifter.init(SAMPLE_RATE, frames);
+            const float period = SAMPLE_RATE / 220.0f;
+            BenchResult result = measurePerBuffer([&]() {
+                shifter.process(input.data(), output.data(), frames, period, ratios[r]);
+            }, ITERATIONS, frames, SAMPLE_RATE);
+            printBenchResult(names[r], frames, result);
+        }
+    }
+
+    PitchShifter reference;
+    reference.init(SAMPLE_RATE, 256);
+    std::printf("pitch_shifter fixed latency: %d samples (%.2f ms)\n",
+                reference.getLatencyFrames(), 1000.0 * reference.getLatencyFrames() / SAMPLE_RATE);
+}
+
+static void benchChorus() {
+    for (int frames : BLOCK_SIZES) {
+        std::vector<float> input(frames);
+        std::vector<float> buffer(frames);
+        fillTestSignal(input, SAMPLE_RATE, 220.0f);
+
+        Chorus chorus;
+        chorus.init(SAMPLE_RATE, frames);
+        chorus.setDepth(0.5f);
+        BenchResult result = measurePerBuffer([&]() {
+            std::copy(input.begin(), input.end(), buffer.begin());
+            chorus.process(buffer.data(), frames);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("chorus depth=0.50", frames, result);
+        g_all_within_budget &= checkBudget("chorus", frames, result, CHORUS_BUDGET_PERCENT);
+    }
+}
+
+static void benchReverb() {
+    for (int frames : BLOCK_SIZES) {
+        std::vector<float> input(frames);
+        std::vector<float> buffer(frames);
+        fillTestSignal(input, SAMPLE_RATE, 220.0f);
+
+        Reverb reverb;
+        reverb.init(SAMPLE_RATE, frames);
+        reverb.setWetness(0.3f);
+        BenchResult result = measurePerBuffer([&]() {
+            std::copy(input.begin(), input.end(), buffer.begin());
+            reverb.process(buffer.data(), frames);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("reverb wet=0.30", frames, result);
+        g_all_within_budget &= checkBudget("reverb", frames, result, REVERB_BUDGET_PERCENT);
+    }
+}
+
+// One push + median per buffer, as SimpleNoiseSuppressor does. The old
+// copy-and-sort version is timed next to it to show how it scaled.
+static void benchNoiseMedian() {
+    const int frames = BLOCK_SIZES[0];
+    for (int window : NOISE_WINDOWS) {
+        unsigned state = 1;
+        auto nextLevel = [&state]() {
+            state = state * 1664525u + 1013904223u;
+            return 0.001f + 0.05f * ((state >> 9) / 8388608.0f);
+        };
+
+        RunningMedian median;
+        median.init(window);
+        volatile float sink = 0.0f;
+        BenchResult result = measurePerBuffer([&]() {
+            median.push(nextLevel());
+            sink = median.median();
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        std::string name = "noise_median window=" + std::to_string(window);
+        printBenchResult(name.c_str(), frames, result);
+        g_all_within_budget &= checkBudget(name.c_str(), frames, result, NOISE_MEDIAN_BUDGET_PERCENT);
+
+        std::deque<float> history(window, 0.0f);
+        BenchResult sorted = measurePerBuffer([&]() {
+            history.push_back(nextLevel());
+            history.pop_front();
+            std::vector<float> copy(history.begin(), history.end());
+            std::sort(copy.begin(), copy.end());
+            sink = copy[copy.size() / 2];
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        name = "noise_sort_copy window=" + std::to_string(window);
+        printBenchResult(name.c_str(), frames, sorted);
+        (void)sink;
+    }
+}
+
+// Full suppressor as the callback runs it: VAD, high-pass, STFT Wiener, gate.
+// The first half of the run is silence-level noise so the profile is learned.
+static void benchNoiseSuppressor() {
+    for (int frames : BLOCK_SIZES) {
+        std::vector<float> voice(frames);
+        std::vector<float> noise(frames);
+        std::vector<float> buffer(frames);
+        fillTestSignal(voice, SAMPLE_RATE, 220.0f);
+        fillTestSignal(noise, SAMPLE_RATE, 0.0f, 7);
+
+        SimpleNoiseSuppressor suppressor;
+        suppressor.init(SAMPLE_RATE);
+        suppressor.setNoiseReductionStrength(0.6f);
+        int calls = 0;
+        BenchResult result = measurePerBuffer([&]() {
+            const std::vector<float>& source = (calls++ % 200) < 100 ? noise : voice;
+            std::copy(source.begin(), source.end(), buffer.begin());
+            suppressor.processAudio(buffer.data(), buffer.data(), frames);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("noise_suppressor stft", frames, result);
+        g_all_within_budget &= checkBudget("noise_suppressor", frames, result, NOISE_SUPPRESSOR_BUDGET_PERCENT);
+    }
+}
+
+// Per-buffer kernels next to the scalar loops they replaced
+static void benchKernels() {
+    for (int frames : BLOCK_SIZES) {
+        std::vector<float> instrumental(frames);
+        std::vector<float> voice(frames);
+        std::vector<float> out(frames);
+        std::vector<float> stereo(frames * 2);
+        std::vector<int16_t> pcm(frames);
+        fillTestSignal(instrumental, SAMPLE_RATE, 110.0f);
+        fillTestSignal(voice, SAMPLE_RATE, 220.0f, 3);
+        fillTestSignal(stereo, SAMPLE_RATE, 330.0f, 5);
+        const float instrumentVolume = 2.0f;
+        const float voiceVolume = 1.1f;
+
+        BenchResult scalarMix = measurePerBuffer([&]() {
+            for (int i = 0; i < frames; i++) {
+                out[i] = instrumentVolume * instrumental[i] + voiceVolume * voice[i];
+                if (out[i] > 1.0f) out[i] = 1.0f;
+                if (out[i] < -1.0f) out[i] = -1.0f;
+            }
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("mix+clamp scalar", frames, scalarMix);
+
+        BenchResult kernelMix = measurePerBuffer([&]() {
+            mixWithGains(out.data(), instrumental.data(), instrumentVolume, voice.data(), voiceVolume, frames);
+            clampBuffer(out.data(), frames);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("mix+clamp kernel", frames, kernelMix);
+        g_all_within_budget &= checkBudget("mix+clamp", frames, kernelMix, MIX_BUDGET_PERCENT);
+
+        BenchResult scalarDownmix = measurePerBuffer([&]() {
+            for (int i = 0; i < frames; i++) {
+                float sum = 0.0f;
+                for (int c = 0; c < 2; c++) {
+                    sum += stereo[i * 2 + c];
+                }
+                out[i] = sum * 0.5f;
+            }
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("downmix stereo scalar", frames, scalarDownmix);
+
+        BenchResult kernelDownmix = measurePerBuffer([&]() {
+            downmixToMono(out.data(), stereo.data(), frames, 2);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("downmix stereo kernel", frames, kernelDownmix);
+
+        BenchResult scalarPcm = measurePerBuffer([&]() {
+            for (int i = 0; i < frames; i++) {
+                float clamped = std::clamp(voice[i], -1.0f, 1.0f);
+                pcm[i] = static_cast<int16_t>(clamped * 32767.0f);
+            }
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("float->int16 scalar", frames, scalarPcm);
+
+        BenchResult kernelPcm = measurePerBuffer([&]() {
+            floatToInt16(pcm.data(), voice.data(), frames);
+        }, ITERATIONS, frames, SAMPLE_RATE);
+        printBenchResult("float->int16 kernel", frames, kernelPcm);
+    }
+}
+
+int main() {
+    printBenchHeader();
+    benchPitchShifter();
+    benchChorus();
+    benchReverb();
+    benchNoiseMedian();
+    benchNoiseSuppressor();
+    benchKernels();
+    return g_all_within_budget ? 0 : 1;
+}
@@ -5,6 +5,9 @@
 
 set -e  # Exit on any error
 
+# HEADLESS=1 ./build.sh builds the engine without SDL (no plot window)
+HEADLESS="${HEADLESS:-0}"
+
 echo "🎵 Building Autotune Karaoke Application..."
 echo "=========================================="
 
@@ -46,8 +49,8 @@ if ! pkg-config --exists aubio; then
     sudo apt-get install -y libaubio-dev
 fi
 
-# SDL2
-if ! pkg-config --exists sdl2; then
+# SDL2 (not needed for headless builds)
+if [ "$HEADLESS" != "1" ] && ! pkg-config --exists sdl2; then
     echo "⚠️  SDL2 not found. Installing..."
     sudo apt-get install -y libsdl2-dev
 fi
@@ -60,10 +63,26 @@ rm -f *.o autotune-karaoke
 
 # Build the application
 echo "🔨 Compiling..."
-g++ -std=c++17 -Wall -Wextra -O2 -I. \
-    karaoke.cpp simple_noise_suppression.cpp \
+RT_LIB=""
+if [ "$(uname -s)" = "Linux" ]; then
+    RT_LIB="-lrt"   # shm_open lives in librt on older glibc
+fi
+PLOT_FLAGS=""
+PLOT_SOURCES="pitch_plot.cpp"
+PLOT_LIBS="-lSDL2"
+if [ "$HEADLESS" = "1" ]; then
+    echo "📟 Headless build: SDL and the plot window are left out"
+    PLOT_FLAGS="-DKARAOKE_HEADLESS"
+    PLOT_SOURCES=""
+    PLOT_LIBS=""
+fi
+g++ -std=c++17 -Wall -Wextra -O2 -I. -pthread $PLOT_FLAGS \
+    karaoke.cpp simple_noise_suppression.cpp running_median.cpp spectral_denoiser.cpp fft.cpp dsp_kernels.cpp \
+    wav_recorder.cpp streaming_source.cpp resampler.cpp resample_cache.cpp pitch_shifter.cpp chorus.cpp \
+    reverb.cpp control_channel.cpp pitch_analyzer.cpp singer_chain.cpp singer_pool.cpp audio_engine.cpp \
+    rt_log.cpp telemetry_shm.cpp song_cache.cpp engine_daemon.cpp event_stream.cpp pitch_stream.cpp plot_window.cpp $PLOT_SOURCES \
     -o autotune-karaoke \
-    -lportaudio -lsndfile -laubio -lSDL2
+    -lportaudio -lsndfile -laubio $PLOT_LIBS $RT_LIB
 
 if [ $? -eq 0 ]; then
     echo "✅ Build successful!"
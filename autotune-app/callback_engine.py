@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Callback-driven NumPy karaoke engine
+Replaces the blocking read -> process -> write loops in tests/ with a duplex
+stream callback. All work buffers are allocated once and reused every block,
+and per-block processing time is measured against the block deadline.
+
+Usage: python3 callback_engine.py <song_name> [--block 256] [--backend sounddevice|pyaudio]
+"""
+
+import sys
+import time
+import numpy as np
+import soundfile as sf
+
+from song_finder import find_song_files
+
+try:
+    import aubio
+except ImportError:
+    aubio = None
+
+try:
+    import karaoke_dsp        # C++ pitch shifter and mixer, built with `make python-dsp`
+except ImportError:
+    karaoke_dsp = None
+
+RATE = 48000
+BLOCK = 256
+STATS_WINDOW = 2048          # Blocks kept for percentile reporting
+
+
+def load_melody(melody_file):
+    """Load a time,frequency melody file into two sorted arrays"""
+    times = []
+    freqs = []
+    with open(melody_file) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split(',')
+            if len(parts) >= 2:
+                times.append(float(parts[0]))
+                freqs.append(float(parts[1]))
+    print(f"✅ Loaded {len(times)} melody points")
+    return np.asarray(times, dtype=np.float64), np.asarray(freqs, dtype=np.float32)
+
+
+def load_instrumental(path, rate):
+    """Load an instrumental as mono float32 at the engine rate (done once, off the audio path)"""
+    audio, sr = sf.read(path, dtype='float32', always_2d=True)
+    audio = audio.mean(axis=1).astype(np.float32)
+    if sr != rate:
+        from scipy.signal import resample_poly
+        from math import gcd
+        g = gcd(sr, rate)
+        print(f"🔄 Resampling instrumental {sr}Hz -> {rate}Hz")
+        audio = resample_poly(audio, rate // g, sr // g).astype(np.float32)
+    print(f"✅ Loaded instrumental: {len(audio) / rate:.1f}s")
+    return np.ascontiguousarray(audio)
+
+
+class CircularReader:
+    """Loops over a preloaded signal, copying into a caller-owned buffer (no concatenation)"""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.position = 0
+
+    def read_into(self, out):
+        n = len(out)
+        total = len(self.samples)
+        written = 0
+        while written < n:
+            count = min(n - written, total - self.position)
+            out[written:written + count] = self.samples[self.position:self.position + count]
+            written += count
+            self.position = (self.position + count) % total
+
+
+class BlockStats:
+    """Per-block processing times, recorded into a preallocated ring"""
+
+    def __init__(self, block, rate):
+        self.deadline = block / rate
+        self.timings = np.zeros(STATS_WINDOW, dtype=np.float64)
+        self.count = 0
+        self.over_deadline = 0
+        self.max_time = 0.0
+        self.xruns = 0
+
+    def record(self, elapsed):
+        self.timings[self.count % STATS_WINDOW] = elapsed
+        self.count += 1
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        if elapsed > self.deadline:
+            self.over_deadline += 1
+
+    def summary(self):
+        recent = self.timings[:min(self.count, STATS_WINDOW)]
+        if len(recent) == 0:
+            return "no blocks processed yet"
+        deadline_ms = self.deadline * 1000
+        return (f"blocks: {self.count} | mean: {recent.mean() * 1000:.3f}ms "
+                f"| p99: {np.percentile(recent, 99) * 1000:.3f}ms "
+                f"| max: {self.max_time * 1000:.3f}ms "
+                f"| deadline: {deadline_ms:.2f}ms ({recent.mean() / self.deadline * 100:.1f}% used) "
+                f"| late: {self.over_deadline} | xruns: {self.xruns}")
+
+
+class CallbackEngine:
+    """Duplex karaoke engine; override process() to change the voice chain"""
+
+    def __init__(self, instrumental, melody, rate=RATE, block=BLOCK,
+                 voice_volume=1.1, instrument_volume=1.0, autotune_strength=1.0,
+                 pitch_every=1, input_device=None, output_device=None):
+        self.rate = rate
+        self.block = block
+        self.voice_volume = voice_volume
+        self.instrument_volume = instrument_volume
+        self.autotune_strength = autotune_strength
+        self.pitch_every = max(1, pitch_every)
+        self.input_device = input_device
+        self.output_device = output_device
+
+        self.instrumental = CircularReader(instrumental)
+        self.melody_times, self.melody_freqs = melody
+        self.stats = BlockStats(block, rate)
+
+        # Work buffers, reused every block
+        self.instr_buffer = np.zeros(block, dtype=np.float32)
+        self.voice_buffer = np.zeros(block, dtype=np.float32)
+        self.mix_buffer = np.zeros(block, dtype=np.float32)
+        self.out_buffer = np.zeros(block, dtype=np.float32)      # PyAudio output only
+        self.read_positions = np.zeros(block, dtype=np.float32)
+        self.read_index = np.zeros(block, dtype=np.intp)
+        self.ramp = np.arange(block, dtype=np.float32)
+
+        self.pitch_detector = None
+        if aubio is not None:
+            self.pitch_detector = aubio.pitch("yin", 2048, block, rate)
+            self.pitch_detector.set_unit("Hz")
+            self.pitch_detector.set_silence(-40)
+        else:
+            print("⚠️  aubio not installed - pitch detection disabled")
+
+        self.shifter = None
+        if karaoke_dsp is not None:
+            self.shifter = karaoke_dsp.PitchShifter(rate, block)
+            print(f"⚡ Native pitch shifter ({self.shifter.latency / rate * 1000:.1f}ms latency)")
+
+        self.pitch = 0.0
+        self.confidence = 0.0
+        self.target = 0.0
+        self.block_count = 0
+        self.stream_time = 0.0
+        self._stream = None
+        self._pyaudio = None
+
+    def target_at(self, t):
+        """Closest melody frequency within 0.5s, or 0"""
+        if len(self.melody_times) == 0:
+            return 0.0
+        i = int(np.searchsorted(self.melody_times, t))
+        best = 0.0
+        best_diff = 0.5
+        for j in (i - 1, i):
+            if 0 <= j < len(self.melody_times):
+                diff = abs(self.melody_times[j] - t)
+                if diff < best_diff:
+                    best_diff = diff
+                    best = float(self.melody_freqs[j])
+        return best
+
+    def shift_into(self, samples, ratio, out):
+        """Pitch shift into out: TD-PSOLA when the native core is built, otherwise a
+        block-wise resampling shift that wraps within the block"""
+        if self.shifter is not None:
+            # Runs at ratio 1.0 too, so the shifter's latency never changes
+            self.shifter.process(samples, out, pitch=self.pitch, ratio=ratio)
+            return
+        if ratio == 1.0:
+            out[:] = samples
+            return
+        np.multiply(self.ramp, ratio, out=self.read_positions)
+        np.mod(self.read_positions, self.block, out=self.read_positions)
+        self.read_index[:] = self.read_positions
+        np.take(samples, self.read_index, out=out, mode='wrap')
+
+    def process(self, voice, out):
+        """Voice chain for one block: pitch detect, autotune, mix into out"""
+        if self.pitch_detector is not None and self.block_count % self.pitch_every == 0:
+            pitch = float(self.pitch_detector(voice)[0])
+            confidence = float(self.pitch_detector.get_confidence())
+            if confidence > 0.3 and pitch > 50.0:
+                self.pitch = pitch
+                self.confidence = confidence
+
+        self.target = self.target_at(self.stream_time)
+        ratio = 1.0
+        if self.confidence > 0.5 and self.pitch > 0 and self.target > 0:
+            ratio = 1.0 + (self.target / self.pitch - 1.0) * self.autotune_strength
+            ratio = min(2.0, max(0.5, ratio))
+        self.shift_into(voice, ratio, self.voice_buffer)
+
+        self.instrumental.read_into(self.instr_buffer)
+        if karaoke_dsp is not None:
+            karaoke_dsp.mix(out, self.instr_buffer, self.instrument_volume,
+                            self.voice_buffer, self.voice_volume)
+            return
+        np.multiply(self.instr_buffer, self.instrument_volume, out=out)
+        np.multiply(self.voice_buffer, self.voice_volume, out=self.mix_buffer)
+        np.add(out, self.mix_buffer, out=out)
+        np.clip(out, -1.0, 1.0, out=out)
+
+    def _run_block(self, voice, out):
+        start = time.perf_counter()
+        self.process(voice, out)
+        self.stats.record(time.perf_counter() - start)
+        self.block_count += 1
+        self.stream_time += self.block / self.rate
+
+    def _sounddevice_callback(self, indata, outdata, frames, time_info, status):
+        if status:
+            self.stats.xruns += 1
+        self._run_block(indata[:, 0], outdata[:, 0])
+
+    def _pyaudio_callback(self, in_data, frame_count, time_info, status):
+        import pyaudio
+        if status:
+            self.stats.xruns += 1
+        voice = np.frombuffer(in_data, dtype=np.float32)
+        self._run_block(voice, self.out_buffer)
+        # PyAudio needs bytes back; this is the one copy per block it forces on us
+        return self.out_buffer.tobytes(), pyaudio.paContinue
+
+    def start(self, backend="sounddevice"):
+        """Open a duplex stream with the given backend and start processing"""
+        if backend == "sounddevice":
+            import sounddevice as sd
+            self._stream = sd.Stream(samplerate=self.rate, blocksize=self.block, channels=1,
+                                     dtype='float32', latency='low',
+                                     device=(self.input_device, self.output_device),
+                                     callback=self._sounddevice_callback)
+            self._stream.start()
+        else:
+            import pyaudio
+            self._pyaudio = pyaudio.PyAudio()
+            self._stream = self._pyaudio.open(format=pyaudio.paFloat32, channels=1, rate=self.rate,
+                                              input=True, output=True,
+                                              input_device_index=self.input_device,
+                                              output_device_index=self.output_device,
+                                              frames_per_buffer=self.block,
+                                              stream_callback=self._pyaudio_callback)
+            self._stream.start_stream()
+        print(f"🎤 Callback engine running ({backend}, {self.block} frames = "
+              f"{self.stats.deadline * 1000:.2f}ms deadline)")
+
+    def stop(self):
+        if self._stream is not None:
+            if self._pyaudio is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+                self._pyaudio.terminate()
+            else:
+                self._stream.stop()
+                self._stream.close()
+            self._stream = None
+        print(f"📊 {self.stats.summary()}")
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ['--help', '-h', 'help']:
+        print(__doc__.strip())
+        return
+
+    song_input = sys.argv[1]
+    block = BLOCK
+    backend = "sounddevice"
+    pitch_every = 1
+    i = 2
+    while i < len(sys.argv):
+        arg = sys.argv[i]
+        if arg == '--block' and i + 1 < len(sys.argv):
+            block = int(sys.argv[i + 1])
+            i += 2
+        elif arg == '--backend' and i + 1 < len(sys.argv):
+            backend = sys.argv[i + 1]
+            i += 2
+        elif arg == '--pitch-every' and i + 1 < len(sys.argv):
+            pitch_every = int(sys.argv[i + 1])
+            i += 2
+        else:
+            i += 1
+
+    melody_file, instrumental_file, message = find_song_files(song_input)
+    print(message)
+    if not melody_file or not instrumental_file:
+        return
+
+    engine = CallbackEngine(load_instrumental(instrumental_file, RATE), load_melody(melody_file),
+                            block=block, pitch_every=pitch_every)
+    engine.start(backend)
+    print("🛑 Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(2)
+            print(f"⏱️  {engine.stream_time:.1f}s | 🎤 Pitch: {engine.pitch:.1f}Hz "
+                  f"| 🎼 Target: {engine.target:.1f}Hz | {engine.stats.summary()}")
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping...")
+    finally:
+        engine.stop()
+
+
+if __name__ == "__main__":
+    main()
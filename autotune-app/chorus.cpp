@@ -0,0 +1,99 @@
+#include "chorus.h"
+#include <algorithm>
+#include <cmath>
+
+static constexpr double TWO_PI = 6.283185307179586;
+
+Chorus::Chorus()
+    : m_mask(0)
+    , m_writePos(0)
+    , m_maxBlockSize(0)
+    , m_sampleRate(48000)
+    , m_phase(0.0)
+    , m_depth(0.0f)
+    , m_baseDelay(0.0f)
+    , m_depthSamples(0.0f)
+    , m_rate(DEFAULT_RATE_HZ)
+    , m_mix(DEFAULT_MIX)
+{
+}
+
+void Chorus::init(int sampleRate, int maxBlockSize) {
+    m_sampleRate = sampleRate;
+    m_maxBlockSize = maxBlockSize;
+    m_baseDelay = BASE_DELAY_MS * 0.001f * sampleRate;
+    m_depthSamples = m_depth * MAX_DEPTH_MS * 0.001f * sampleRate;
+
+    // Longest tap plus one block of new input plus the interpolation neighbour
+    const int maxDelay = (int)std::ceil((BASE_DELAY_MS + MAX_DEPTH_MS) * 0.001f * sampleRate);
+    int size = 1;
+    while (size < maxDelay + maxBlockSize + 2) {
+        size <<= 1;
+    }
+    m_line.assign(size, 0.0f);
+    m_mask = size - 1;
+    reset();
+}
+
+float Chorus::delayForPhase(double phase) const {
+    return m_baseDelay + m_depthSamples * (float)std::sin(phase);
+}
+
+void Chorus::process(float* buffer, int numSamples) {
+    numSamples = std::min(numSamples, m_maxBlockSize);
+    if (m_mix <= 0.0f || numSamples <= 0) {
+        return;
+    }
+
+    float* line = m_line.data();
+    const int mask = m_mask;
+    const int writePos = m_writePos;
+
+    // Write the block first; the minimum delay is far larger than one sample,
+    // so every tap below reads samples that are already in the line
+    for (int i = 0; i < numSamples; ++i) {
+        line[(writePos + i) & mask] = buffer[i];
+    }
+
+    // LFO once per block, delay ramped linearly to the next block's start
+    const float startDelay = delayForPhase(m_phase);
+    m_phase += TWO_PI * m_rate * numSamples / m_sampleRate;
+    if (m_phase >= TWO_PI) {
+        m_phase -= TWO_PI;
+    }
+    const float endDelay = delayForPhase(m_phase);
+    const float delayStep = (endDelay - startDelay) / numSamples;
+
+    // Offset by the line size so the read position never goes negative
+    const float base = (float)(writePos + mask + 1) - startDelay;
+    const float mix = m_mix;
+    for (int i = 0; i < numSamples; ++i) {
+        const float position = base + i * (1.0f - delayStep);
+        const int index = (int)position;
+        const float frac = position - index;
+        const float a = line[index & mask];
+        const float b = line[(index + 1) & mask];
+        buffer[i] += mix * (a + frac * (b - a));
+    }
+
+    m_writePos = (writePos + numSamples) & mask;
+}
+
+void Chorus::setDepth(float depth) {
+    m_depth = std::clamp(depth, 0.0f, 1.0f);
+    m_depthSamples = m_depth * MAX_DEPTH_MS * 0.001f * m_sampleRate;
+}
+
+void Chorus::setRate(float rateHz) {
+    m_rate = std::max(0.0f, rateHz);
+}
+
+void Chorus::setMix(float mix) {
+    m_mix = std::clamp(mix, 0.0f, 1.0f);
+}
+
+void Chorus::reset() {
+    std::fill(m_line.begin(), m_line.end(), 0.0f);
+    m_writePos = 0;
+    m_phase = 0.0;
+}
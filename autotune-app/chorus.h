@@ -0,0 +1,49 @@
+#ifndef CHORUS_H
+#define CHORUS_H
+
+#include <vector>
+
+// Mono chorus: a modulated delay line read with linear interpolation.
+// The delay line is a power-of-two ring that persists across buffers, so the
+// modulated tap always reads real history instead of wrapping inside the
+// current block. The LFO is evaluated once per block and the delay is ramped
+// linearly between block boundaries, keeping sin() out of the sample loop.
+class Chorus {
+public:
+    Chorus();
+
+    void init(int sampleRate, int maxBlockSize);
+
+    // Mix the chorus voice into buffer in place: out = dry + mix * delayed(dry)
+    void process(float* buffer, int numSamples);
+
+    void setDepth(float depth);    // 0.0 - 1.0 (share of MAX_DEPTH_MS)
+    void setRate(float rateHz);    // LFO rate
+    void setMix(float mix);        // 0.0 - 1.0
+
+    void reset();
+
+private:
+    float delayForPhase(double phase) const;
+
+    std::vector<float> m_line;
+    int m_mask;
+    int m_writePos;
+    int m_maxBlockSize;
+    int m_sampleRate;
+
+    double m_phase;          // LFO phase in radians
+    float m_depth;
+    float m_baseDelay;       // Samples
+    float m_depthSamples;    // LFO swing either side of the base delay
+    float m_rate;
+    float m_mix;
+
+    // Constants
+    static constexpr float BASE_DELAY_MS = 15.0f;
+    static constexpr float MAX_DEPTH_MS = 5.0f;
+    static constexpr float DEFAULT_RATE_HZ = 0.5f;
+    static constexpr float DEFAULT_MIX = 0.3f;
+};
+
+#endif // CHORUS_H
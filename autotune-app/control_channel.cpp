@@ -0,0 +1,296 @@
+#include "control_channel.h"
+#include <chrono>
+#include <fstream>
+#include <iostream>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <poll.h>
+#include <sys/socket.h>
+#include <sys/stat.h>
+#include <sys/un.h>
+#include <unistd.h>
+#endif
+
+ControlChannel::ControlChannel()
+    : m_params(nullptr)
+    , m_socketDevice(0)
+    , m_socketInode(0)
+    , m_listenFd(-1)
+    , m_running(false)
+    , m_messageCount(0)
+{
+}
+
+ControlChannel::~ControlChannel() {
+    stop();
+}
+
+bool ControlChannel::start(VoiceParams* params, const std::string& socketPath, const std::string& paramFile) {
+    if (m_running.load()) {
+        return false;
+    }
+
+    setParams(params);
+    m_socketPath = socketPath;
+    m_paramFile = paramFile;
+
+    std::error_code ec;
+    m_paramFileTime = std::filesystem::last_write_time(m_paramFile, ec);
+    if (ec) {
+        m_paramFileTime = std::filesystem::file_time_type::min();
+    }
+
+    if (!m_socketPath.empty() && !openSocket()) {
+        std::cerr << "⚠️  Control socket unavailable, falling back to " << m_paramFile << " only" << std::endl;
+    }
+
+    m_running.store(true);
+    m_thread = std::thread(&ControlChannel::run, this);
+    return true;
+}
+
+void ControlChannel::stop() {
+    m_running.store(false);
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+    closeSocket();
+}
+
+void ControlChannel::setParams(VoiceParams* params) {
+    std::lock_guard<std::mutex> lock(m_paramsMutex);
+    m_params = params;
+}
+
+bool ControlChannel::applyMessage(const std::string& line) {
+    size_t eq = line.find('=');
+    if (eq == std::string::npos) {
+        return false;
+    }
+
+    std::string key = line.substr(0, eq);
+    float value;
+    try {
+        value = std::stof(line.substr(eq + 1));
+    } catch (const std::exception&) {
+        return false;
+    }
+
+    std::lock_guard<std::mutex> lock(m_paramsMutex);
+    if (!m_params) {
+        return false;
+    }
+
+    std::atomic<float>* target = nullptr;
+    float minValue = 0.0f;
+    float maxValue = 0.0f;
+    const char* label = "";
+
+    if (key == "voice_volume") {
+        target = &m_params->voice_volume;
+        minValue = 0.0f; maxValue = 5.0f;
+        label = "🎤 Voice volume";
+    } else if (key == "autotune_strength") {
+        target = &m_params->autotune_strength;
+        minValue = 0.0f; maxValue = 2.0f;
+        label = "🎵 Autotune strength";
+    } else if (key == "pitch_shift") {
+        target = &m_params->pitch_shift;
+        minValue = -12.0f; maxValue = 12.0f;
+        label = "🎼 Pitch shift";
+    } else if (key == "instrument_volume") {
+        target = &m_params->instrument_volume;
+        minValue = 0.0f; maxValue = 5.0f;
+        label = "🎛️ Instrument volume";
+    } else {
+        return false;
+    }
+
+    if (value < minValue || value > maxValue) {
+        return false;
+    }
+
+    float previous = target->exchange(value, std::memory_order_relaxed);
+    m_messageCount.fetch_add(1, std::memory_order_relaxed);
+    if (previous != value) {
+        std::cout << label << " updated to: " << value << std::endl;
+    }
+    return true;
+}
+
+const std::string& ControlChannel::getSocketPath() const {
+    return m_socketPath;
+}
+
+uint64_t ControlChannel::getMessageCount() const {
+    return m_messageCount.load(std::memory_order_relaxed);
+}
+
+void ControlChannel::run() {
+    auto lastFileCheck = std::chrono::steady_clock::now();
+    checkParamFile();
+
+    while (m_running.load()) {
+        pollSocket(POLL_TIMEOUT_MS);
+
+        auto now = std::chrono::steady_clock::now();
+        if (now - lastFileCheck >= std::chrono::milliseconds(FILE_CHECK_INTERVAL_MS)) {
+            checkParamFile();
+            lastFileCheck = now;
+        }
+    }
+}
+
+void ControlChannel::checkParamFile() {
+    std::error_code ec;
+    auto modified = std::filesystem::last_write_time(m_paramFile, ec);
+    if (ec || modified == m_paramFileTime) {
+        return;
+    }
+    m_paramFileTime = modified;
+
+    std::ifstream file(m_paramFile);
+    std::string line;
+    while (std::getline(file, line)) {
+        applyMessage(line);
+    }
+}
+
+#ifndef _WIN32
+
+bool ControlChannel::openSocket() {
+    if (m_socketPath.size() >= sizeof(sockaddr_un::sun_path)) {
+        std::cerr << "❌ Control socket path too long: " << m_socketPath << std::endl;
+        return false;
+    }
+
+    m_listenFd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (m_listenFd < 0) {
+        return false;
+    }
+
+    sockaddr_un addr = {};
+    addr.sun_family = AF_UNIX;
+    m_socketPath.copy(addr.sun_path, m_socketPath.size());
+
+    // Remove a stale socket left behind by a killed session
+    unlink(m_socketPath.c_str());
+
+    if (bind(m_listenFd, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) < 0 ||
+        listen(m_listenFd, (int)MAX_CLIENTS) < 0) {
+        std::cerr << "❌ Could not bind control socket " << m_socketPath << std::endl;
+        close(m_listenFd);
+        m_listenFd = -1;
+        return false;
+    }
+    fcntl(m_listenFd, F_SETFL, O_NONBLOCK);
+
+    struct stat info;
+    if (stat(m_socketPath.c_str(), &info) == 0) {
+        m_socketDevice = (uint64_t)info.st_dev;
+        m_socketInode = (uint64_t)info.st_ino;
+    }
+
+    std::cout << "🎛️ Control socket listening on " << m_socketPath << std::endl;
+    return true;
+}
+
+void ControlChannel::closeSocket() {
+    for (int fd : m_clientFds) {
+        close(fd);
+    }
+    m_clientFds.clear();
+    m_clientBuffers.clear();
+
+    if (m_listenFd >= 0) {
+        close(m_listenFd);
+        m_listenFd = -1;
+
+        // Another channel may have rebound the path since; leave its socket alone
+        struct stat info;
+        if (stat(m_socketPath.c_str(), &info) == 0 && (uint64_t)info.st_dev == m_socketDevice &&
+            (uint64_t)info.st_ino == m_socketInode) {
+            unlink(m_socketPath.c_str());
+        }
+    }
+}
+
+void ControlChannel::pollSocket(int timeoutMs) {
+    if (m_listenFd < 0) {
+        std::this_thread::sleep_for(std::chrono::milliseconds(timeoutMs));
+        return;
+    }
+
+    std::vector<pollfd> fds;
+    fds.push_back({m_listenFd, POLLIN, 0});
+    for (int fd : m_clientFds) {
+        fds.push_back({fd, POLLIN, 0});
+    }
+
+    if (poll(fds.data(), fds.size(), timeoutMs) <= 0) {
+        return;
+    }
+
+    // Read client messages; walk backwards so closed clients can be erased in place
+    for (size_t i = fds.size() - 1; i >= 1; --i) {
+        if (!(fds[i].revents & (POLLIN | POLLHUP | POLLERR))) {
+            continue;
+        }
+        size_t client = i - 1;
+        char chunk[512];
+        ssize_t got = read(m_clientFds[client], chunk, sizeof(chunk));
+        if (got <= 0) {
+            close(m_clientFds[client]);
+            m_clientFds.erase(m_clientFds.begin() + client);
+            m_clientBuffers.erase(m_clientBuffers.begin() + client);
+            continue;
+        }
+
+        std::string& buffer = m_clientBuffers[client];
+        buffer.append(chunk, (size_t)got);
+        size_t newline;
+        while ((newline = buffer.find('\n')) != std::string::npos) {
+            std::string line = buffer.substr(0, newline);
+            buffer.erase(0, newline + 1);
+            if (!line.empty() && line.back() == '\r') {
+                line.pop_back();
+            }
+            if (!line.empty() && !applyMessage(line)) {
+                std::cerr << "⚠️  Ignored control message: " << line << std::endl;
+            }
+        }
+        if (buffer.size() > MAX_LINE_LENGTH) {
+            buffer.clear();
+        }
+    }
+
+    // Accept new clients
+    if (fds[0].revents & POLLIN) {
+        int client = accept(m_listenFd, nullptr, nullptr);
+        if (client >= 0) {
+            if (m_clientFds.size() >= MAX_CLIENTS) {
+                close(client);
+            } else {
+                m_clientFds.push_back(client);
+                m_clientBuffers.emplace_back();
+            }
+        }
+    }
+}
+
+#else
+
+// Windows builds only watch voice_params.txt
+bool ControlChannel::openSocket() {
+    return false;
+}
+
+void ControlChannel::closeSocket() {
+}
+
+void ControlChannel::pollSocket(int timeoutMs) {
+    std::this_thread::sleep_for(std::chrono::milliseconds(timeoutMs));
+}
+
+#endif
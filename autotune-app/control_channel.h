@@ -0,0 +1,85 @@
+#ifndef CONTROL_CHANNEL_H
+#define CONTROL_CHANNEL_H
+
+#include <atomic>
+#include <cstdint>
+#include <filesystem>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+// Voice parameters that can change while the stream is running.
+// Written by the control thread, read lock-free by the audio callback.
+struct VoiceParams {
+    std::atomic<float> autotune_strength{1.0f};
+    std::atomic<float> pitch_shift{0.0f};
+    std::atomic<float> voice_volume{1.1f};
+    std::atomic<float> instrument_volume{2.0f};
+};
+
+// Non-real-time thread that feeds parameter changes into VoiceParams.
+//
+// Clients connect to a Unix domain socket and send newline-terminated
+// "key=value" messages (the same keys as voice_params.txt). The thread
+// blocks in poll(), so a message reaches the atomics within microseconds
+// and the audio callback picks it up on its next buffer. voice_params.txt
+// is still honoured as a fallback (and on platforms without Unix sockets),
+// but it is only ever stat()ed and read here, never on the audio thread.
+//
+// The target VoiceParams can be swapped while the channel runs, so a
+// long-lived process (the engine daemon) keeps one socket across sessions.
+class ControlChannel {
+public:
+    ControlChannel();
+    ~ControlChannel();
+
+    // Start listening; an empty socketPath disables the socket. params may be
+    // null, in which case messages are rejected until setParams().
+    bool start(VoiceParams* params, const std::string& socketPath, const std::string& paramFile);
+
+    void stop();
+
+    // Point the channel at another session's parameters (or none). Once this
+    // returns, no message is being applied to the previous target.
+    void setParams(VoiceParams* params);
+
+    // Parse one "key=value" message and apply it. Returns false if rejected.
+    bool applyMessage(const std::string& line);
+
+    const std::string& getSocketPath() const;
+
+    // Messages applied since start (socket and file)
+    uint64_t getMessageCount() const;
+
+private:
+    void run();
+    bool openSocket();
+    void closeSocket();
+    void pollSocket(int timeoutMs);
+    void checkParamFile();
+
+    VoiceParams* m_params;
+    std::mutex m_paramsMutex;        // Held while a message is applied, so setParams() can retire a target
+    std::string m_socketPath;
+    uint64_t m_socketDevice;         // Identity of the socket file we bound, so stop() only removes our own
+    uint64_t m_socketInode;
+    std::string m_paramFile;
+    std::filesystem::file_time_type m_paramFileTime;
+
+    int m_listenFd;
+    std::vector<int> m_clientFds;
+    std::vector<std::string> m_clientBuffers;
+
+    std::thread m_thread;
+    std::atomic<bool> m_running;
+    std::atomic<uint64_t> m_messageCount;
+
+    // Constants
+    static constexpr int POLL_TIMEOUT_MS = 20;
+    static constexpr int FILE_CHECK_INTERVAL_MS = 100;
+    static constexpr size_t MAX_CLIENTS = 8;
+    static constexpr size_t MAX_LINE_LENGTH = 256;
+};
+
+#endif // CONTROL_CHANNEL_H
@@ -0,0 +1,143 @@
+#include "dsp_kernels.h"
+#include <algorithm>
+#include <cstring>
+
+#if defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define KARAOKE_SSE2 1
+#elif defined(__ARM_NEON) || defined(__ARM_NEON__)
+#include <arm_neon.h>
+#define KARAOKE_NEON 1
+#endif
+
+void mixWithGains(float* out, const float* a, float gainA, const float* b, float gainB, int count) {
+    int i = 0;
+#if defined(KARAOKE_SSE2)
+    const __m128 ga = _mm_set1_ps(gainA);
+    const __m128 gb = _mm_set1_ps(gainB);
+    for (; i + 4 <= count; i += 4) {
+        __m128 mixed = _mm_add_ps(_mm_mul_ps(ga, _mm_loadu_ps(a + i)), _mm_mul_ps(gb, _mm_loadu_ps(b + i)));
+        _mm_storeu_ps(out + i, mixed);
+    }
+#elif defined(KARAOKE_NEON)
+    const float32x4_t ga = vdupq_n_f32(gainA);
+    const float32x4_t gb = vdupq_n_f32(gainB);
+    for (; i + 4 <= count; i += 4) {
+        // Separate multiply and add (no fused vmlaq) so results match the scalar loop
+        float32x4_t mixed = vaddq_f32(vmulq_f32(ga, vld1q_f32(a + i)), vmulq_f32(gb, vld1q_f32(b + i)));
+        vst1q_f32(out + i, mixed);
+    }
+#endif
+    for (; i < count; ++i) {
+        out[i] = gainA * a[i] + gainB * b[i];
+    }
+}
+
+void clampBuffer(float* buffer, int count, float limit) {
+    int i = 0;
+#if defined(KARAOKE_SSE2)
+    const __m128 hi = _mm_set1_ps(limit);
+    const __m128 lo = _mm_set1_ps(-limit);
+    for (; i + 4 <= count; i += 4) {
+        _mm_storeu_ps(buffer + i, _mm_min_ps(_mm_max_ps(_mm_loadu_ps(buffer + i), lo), hi));
+    }
+#elif defined(KARAOKE_NEON)
+    const float32x4_t hi = vdupq_n_f32(limit);
+    const float32x4_t lo = vdupq_n_f32(-limit);
+    for (; i + 4 <= count; i += 4) {
+        vst1q_f32(buffer + i, vminq_f32(vmaxq_f32(vld1q_f32(buffer + i), lo), hi));
+    }
+#endif
+    for (; i < count; ++i) {
+        buffer[i] = std::min(std::max(buffer[i], -limit), limit);
+    }
+}
+
+void addBuffer(float* accum, const float* in, int count) {
+    int i = 0;
+#if defined(KARAOKE_SSE2)
+    for (; i + 4 <= count; i += 4) {
+        _mm_storeu_ps(accum + i, _mm_add_ps(_mm_loadu_ps(accum + i), _mm_loadu_ps(in + i)));
+    }
+#elif defined(KARAOKE_NEON)
+    for (; i + 4 <= count; i += 4) {
+        vst1q_f32(accum + i, vaddq_f32(vld1q_f32(accum + i), vld1q_f32(in + i)));
+    }
+#endif
+    for (; i < count; ++i) {
+        accum[i] += in[i];
+    }
+}
+
+void downmixToMono(float* out, const float* interleaved, int frames, int channels) {
+    if (channels == 1) {
+        std::memmove(out, interleaved, frames * sizeof(float));
+        return;
+    }
+
+    int i = 0;
+    if (channels == 2) {
+#if defined(KARAOKE_SSE2)
+        const __m128 half = _mm_set1_ps(0.5f);
+        for (; i + 4 <= frames; i += 4) {
+            __m128 first = _mm_loadu_ps(interleaved + 2 * i);       // L0 R0 L1 R1
+            __m128 second = _mm_loadu_ps(interleaved + 2 * i + 4);  // L2 R2 L3 R3
+            __m128 left = _mm_shuffle_ps(first, second, _MM_SHUFFLE(2, 0, 2, 0));
+            __m128 right = _mm_shuffle_ps(first, second, _MM_SHUFFLE(3, 1, 3, 1));
+            _mm_storeu_ps(out + i, _mm_mul_ps(_mm_add_ps(left, right), half));
+        }
+#elif defined(KARAOKE_NEON)
+        const float32x4_t half = vdupq_n_f32(0.5f);
+        for (; i + 4 <= frames; i += 4) {
+            float32x4x2_t lr = vld2q_f32(interleaved + 2 * i);
+            vst1q_f32(out + i, vmulq_f32(vaddq_f32(lr.val[0], lr.val[1]), half));
+        }
+#endif
+    }
+
+    const float scale = 1.0f / channels;
+    for (; i < frames; ++i) {
+        float sum = 0.0f;
+        for (int c = 0; c < channels; ++c) {
+            sum += interleaved[i * channels + c];
+        }
+        out[i] = sum * scale;
+    }
+}
+
+void extractChannel(float* out, const float* interleaved, int frames, int channels, int channel) {
+    // Strided gather: the compiler unrolls this well and there is no cheaper SIMD form for arbitrary N
+    const float* source = interleaved + channel;
+    for (int i = 0; i < frames; ++i) {
+        out[i] = source[i * channels];
+    }
+}
+
+void floatToInt16(int16_t* out, const float* in, int count) {
+    int i = 0;
+#if defined(KARAOKE_SSE2)
+    const __m128 hi = _mm_set1_ps(1.0f);
+    const __m128 lo = _mm_set1_ps(-1.0f);
+    const __m128 scale = _mm_set1_ps(32767.0f);
+    for (; i + 8 <= count; i += 8) {
+        __m128 first = _mm_mul_ps(_mm_min_ps(_mm_max_ps(_mm_loadu_ps(in + i), lo), hi), scale);
+        __m128 second = _mm_mul_ps(_mm_min_ps(_mm_max_ps(_mm_loadu_ps(in + i + 4), lo), hi), scale);
+        __m128i packed = _mm_packs_epi32(_mm_cvttps_epi32(first), _mm_cvttps_epi32(second));
+        _mm_storeu_si128(reinterpret_cast<__m128i*>(out + i), packed);
+    }
+#elif defined(KARAOKE_NEON)
+    const float32x4_t hi = vdupq_n_f32(1.0f);
+    const float32x4_t lo = vdupq_n_f32(-1.0f);
+    const float32x4_t scale = vdupq_n_f32(32767.0f);
+    for (; i + 8 <= count; i += 8) {
+        float32x4_t first = vmulq_f32(vminq_f32(vmaxq_f32(vld1q_f32(in + i), lo), hi), scale);
+        float32x4_t second = vmulq_f32(vminq_f32(vmaxq_f32(vld1q_f32(in + i + 4), lo), hi), scale);
+        int16x8_t packed = vcombine_s16(vqmovn_s32(vcvtq_s32_f32(first)), vqmovn_s32(vcvtq_s32_f32(second)));
+        vst1q_s16(out + i, packed);
+    }
+#endif
+    for (; i < count; ++i) {
+        float clamped = std::min(std::max(in[i], -1.0f), 1.0f);
+        out[i] = static_cast<int16_t>(clamped * 32767.0f);
+    }
+}
@@ -0,0 +1,30 @@
+#ifndef DSP_KERNELS_H
+#define DSP_KERNELS_H
+
+#include <cstdint>
+
+// Block kernels for the mixing and conversion steps that run on every buffer.
+// Each has an SSE2 path (x86-64 baseline) and a NEON path (ARM64), with a
+// scalar loop for other targets and for the tail. Results match the scalar
+// loops they replaced. Buffers may be unaligned; out may alias an input only
+// where noted.
+
+// out[i] = gainA * a[i] + gainB * b[i]   (out may alias a or b)
+void mixWithGains(float* out, const float* a, float gainA, const float* b, float gainB, int count);
+
+// buffer[i] = clamp(buffer[i], -limit, limit)
+void clampBuffer(float* buffer, int count, float limit = 1.0f);
+
+// accum[i] += in[i]
+void addBuffer(float* accum, const float* in, int count);
+
+// Average interleaved channels into mono (stereo has its own fast path)
+void downmixToMono(float* out, const float* interleaved, int frames, int channels);
+
+// Copy one channel out of an interleaved buffer
+void extractChannel(float* out, const float* interleaved, int frames, int channels, int channel);
+
+// Clamp to [-1, 1] and convert to 16-bit PCM (truncating, like static_cast)
+void floatToInt16(int16_t* out, const float* in, int count);
+
+#endif // DSP_KERNELS_H
@@ -0,0 +1,776 @@
+#include "engine_daemon.h"
+#include "audio_engine.h"
+#include "wav_recorder.h"
+#include <cctype>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <thread>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <poll.h>
+#include <sys/socket.h>
+#include <sys/un.h>
+#include <unistd.h>
+#ifndef MSG_NOSIGNAL
+#define MSG_NOSIGNAL 0   // macOS: SIGPIPE is ignored by runDaemon() instead
+#endif
+#endif
+
+// Everything one song needs while it plays. Built on the command thread,
+// handed to the callback through m_active and torn down once the callback
+// has let go of it.
+struct DaemonSession {
+    std::shared_ptr<const LoadedSong> song;
+    StreamingInstrumental instrumental;
+    std::vector<std::unique_ptr<SingerChain>> chains;
+    SingerPool pool;
+    Chorus chorus;
+    Reverb reverb;
+    SpscRingBuffer<float> recordingQueue{SAMPLE_RATE * 4};   // 4s of headroom for the recorder thread
+    WavRecorder recorder;
+    AudioData audio;
+    std::string outputFile;
+    std::atomic<bool> audible{false};   // Set by the callback on the session's first buffer
+};
+
+namespace {
+
+// Split on whitespace, keeping "double quoted" arguments together
+std::vector<std::string> splitArguments(const std::string& line) {
+    std::vector<std::string> args;
+    size_t i = 0;
+    while (i < line.size()) {
+        if (std::isspace((unsigned char)line[i])) {
+            i++;
+            continue;
+        }
+        std::string arg;
+        if (line[i] == '"') {
+            size_t close = line.find('"', i + 1);
+            if (close == std::string::npos) {
+                close = line.size();
+            }
+            arg = line.substr(i + 1, close - i - 1);
+            i = close + 1;
+        } else {
+            size_t end = i;
+            while (end < line.size() && !std::isspace((unsigned char)line[end])) {
+                end++;
+            }
+            arg = line.substr(i, end - i);
+            i = end;
+        }
+        args.push_back(arg);
+    }
+    return args;
+}
+
+std::string quoted(const std::string& value) {
+    return "\"" + value + "\"";
+}
+
+double millisecondsSince(std::chrono::steady_clock::time_point begin) {
+    return std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - begin).count();
+}
+
+// Reply to a load or start whose song is still being decoded
+std::string loadingReply(const std::string& name) {
+    std::ostringstream reply;
+    reply << "ok song=" << quoted(name) << " cached=0 loading=1";
+    return reply.str();
+}
+
+template <typename Request>
+bool sameSong(const Request& a, const Request& b) {
+    return a.melodyFile == b.melodyFile && a.instrumentalFile == b.instrumentalFile;
+}
+
+} // namespace
+
+EngineDaemon::EngineDaemon()
+    : m_numSingers(1)
+    , m_profile(nullptr)
+    , m_pitchHop(0)
+    , m_stream(nullptr)
+    , m_events(nullptr)
+    , m_running(false)
+    , m_xrunsReported(0)
+    , m_active(nullptr)
+    , m_callbacks(0)
+    , m_loaderRunning(false)
+    , m_listenFd(-1)
+{
+}
+
+EngineDaemon::~EngineDaemon() {
+    stop();
+}
+
+void EngineDaemon::init(int numSingers, const LatencyProfile& profile, int pitchHop) {
+    m_numSingers = numSingers;
+    m_profile = &profile;
+    m_pitchHop = pitchHop;
+}
+
+void EngineDaemon::setEventStream(EventStream* events) {
+    m_events = events;
+}
+
+int EngineDaemon::streamCallback(const void* inputBuffer, void* outputBuffer,
+                                 unsigned long framesPerBuffer,
+                                 const PaStreamCallbackTimeInfo* timeInfo,
+                                 PaStreamCallbackFlags statusFlags,
+                                 void* userData) {
+    EngineDaemon* daemon = static_cast<EngineDaemon*>(userData);
+    DaemonSession* session = daemon->m_active.load(std::memory_order_acquire);
+
+    // Idle (or a buffer the engine rejects): keep the stream alive with silence
+    if (!session || audioCallback(inputBuffer, outputBuffer, framesPerBuffer, timeInfo, statusFlags,
+                                  &session->audio) != paContinue) {
+        if (outputBuffer) {
+            std::memset(outputBuffer, 0, framesPerBuffer * OUTPUT_CHANNELS * sizeof(float));
+        }
+    } else if (!session->audible.load(std::memory_order_relaxed)) {
+        session->audible.store(true, std::memory_order_release);
+    }
+
+    daemon->m_callbacks.fetch_add(1, std::memory_order_release);
+    return paContinue;
+}
+
+bool EngineDaemon::start(PaStream* stream, const std::string& socketPath) {
+    if (m_running || !stream || !m_profile) {
+        return false;
+    }
+    m_stream = stream;
+    m_socketPath = socketPath;
+    if (!openSocket()) {
+        return false;
+    }
+
+    const char* telemetry_env = std::getenv("KARAOKE_TELEMETRY_SHM");
+    m_telemetry.create(telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME);
+    m_logger.setLevel(RtLogger::parseLevel(std::getenv("KARAOKE_LOG_LEVEL"), LogLevel::Info));
+    m_logger.start();
+    startLoader();
+
+    // Live voice parameters; idle (rejecting messages) until a session starts
+    const char* control_socket_env = std::getenv("KARAOKE_CONTROL_SOCKET");
+    m_control.start(nullptr, control_socket_env ? control_socket_env : "karaoke_control.sock", "voice_params.txt");
+
+    PaError err = Pa_StartStream(m_stream);
+    if (err != paNoError) {
+        std::cerr << "❌ Could not start stream: " << Pa_GetErrorText(err) << std::endl;
+        m_control.stop();
+        stopLoader();
+        m_logger.stop();
+        closeSocket();
+        return false;
+    }
+
+    m_running = true;
+    std::cout << "🎛️ Engine daemon ready (" << m_profile->name << ", " << m_numSingers << " singer(s), song cache "
+              << (m_songCache.getBudgetBytes() >> 20) << "MB)" << std::endl;
+    return true;
+}
+
+void EngineDaemon::stop() {
+    m_control.stop();
+    stopLoader();
+    m_pendingStart.reset();
+    if (m_session) {
+        m_active.store(nullptr, std::memory_order_release);
+        retireSession(std::move(m_session));
+    }
+    if (m_stream) {
+        Pa_StopStream(m_stream);
+        m_stream = nullptr;
+    }
+    if (m_running) {
+        m_logger.stop();
+        m_running = false;
+    }
+    m_telemetry.close();
+    closeSocket();
+}
+
+bool EngineDaemon::isRunning() const {
+    return m_running;
+}
+
+SongCache& EngineDaemon::getSongCache() {
+    return m_songCache;
+}
+
+std::string EngineDaemon::handleCommand(const std::string& line) {
+    std::vector<std::string> args = splitArguments(line);
+    if (args.empty()) {
+        return "error empty command";
+    }
+
+    const std::string command = args[0];
+    args.erase(args.begin());
+    if (command == "load") {
+        return loadCommand(args);
+    } else if (command == "start") {
+        return startCommand(args);
+    } else if (command == "stop") {
+        return stopCommand();
+    } else if (command == "status") {
+        return statusCommand();
+    } else if (command == "quit") {
+        m_running = false;
+        return "ok";
+    }
+    return "error unknown command: " + command;
+}
+
+bool EngineDaemon::parseSongRequest(const std::vector<std::string>& args, SongRequest* request,
+                                    std::string* error) const {
+    if (args.empty()) {
+        *error = "missing song name";
+        return false;
+    }
+
+    // Same layout the command line assumes when only a song name is given
+    const std::string& name = args[0];
+    request->name = name;
+    request->melodyFile = "songs/" + name + "/" + name + "_melody.txt";
+    request->instrumentalFile = "songs/" + name + "/" + name + "_separated/" + name
+                                + "(Instrumental model_bs_roformer_ep_317_sdr_1).wav";
+    if (args.size() >= 3) {
+        request->melodyFile = args[1];
+        request->instrumentalFile = args[2];
+    }
+    return true;
+}
+
+std::string EngineDaemon::loadCommand(const std::vector<std::string>& args) {
+    SongRequest request;
+    std::string error;
+    if (!parseSongRequest(args, &request, &error)) {
+        return "error " + error;
+    }
+
+    std::shared_ptr<const LoadedSong> song = m_songCache.find(request.melodyFile, request.instrumentalFile);
+    if (!song) {
+        if (takeFailedLoad(request)) {
+            return "error could not load " + request.name;
+        }
+        queueLoad(request, false);
+        return loadingReply(request.name);
+    }
+
+    std::ostringstream reply;
+    reply << std::fixed << std::setprecision(1) << "ok song=" << quoted(song->name) << " cached=1"
+          << " load_ms=" << song->loadMs << " duration=" << song->durationSeconds(SAMPLE_RATE);
+    return reply.str();
+}
+
+std::string EngineDaemon::startCommand(const std::vector<std::string>& args) {
+    auto begin = std::chrono::steady_clock::now();
+    SongRequest request;
+    std::string error;
+    if (!parseSongRequest(args, &request, &error)) {
+        return "error " + error;
+    }
+
+    std::vector<std::string> params;
+    if (args.size() >= 11) {
+        params.assign(args.begin() + 3, args.begin() + 11);
+    }
+
+    // The last start wins, whether or not an earlier one is still waiting for its song
+    m_pendingStart.reset();
+    takeFailedLoad(request);
+    std::shared_ptr<const LoadedSong> song = m_songCache.find(request.melodyFile, request.instrumentalFile);
+    if (song) {
+        return playSong(song, params, true, begin);
+    }
+
+    // Not decoded yet: reply now and play from poll() once the loader has it
+    m_pendingStart.reset(new PendingStart{request, params, begin});
+    queueLoad(request, true);
+    std::cout << "⏳ Loading " << request.name << " before it starts" << std::endl;
+    if (m_events) {
+        m_events->emit("state", {{"state", "loading"}, {"song", request.name}});
+    }
+    return loadingReply(request.name);
+}
+
+std::string EngineDaemon::playSong(std::shared_ptr<const LoadedSong> song, const std::vector<std::string>& params,
+                                   bool cached, std::chrono::steady_clock::time_point requested) {
+    std::unique_ptr<DaemonSession> session = createSession(song, params);
+    if (!session) {
+        if (m_events) {
+            m_events->error("Could not start " + song->name);
+        }
+        return "error could not start " + song->name;
+    }
+
+    // Publish the new session, then retire the old one once the callback has moved on.
+    // Control messages follow the switch right away.
+    DaemonSession* next = session.get();
+    m_active.store(next, std::memory_order_release);
+    m_control.setParams(&next->audio.params);
+    std::unique_ptr<DaemonSession> previous = std::move(m_session);
+    m_session = std::move(session);
+
+    auto wait_begin = std::chrono::steady_clock::now();
+    while (!next->audible.load(std::memory_order_acquire) && Pa_IsStreamActive(m_stream) == 1 &&
+           millisecondsSince(wait_begin) < HANDOFF_TIMEOUT_MS) {
+        std::this_thread::sleep_for(std::chrono::microseconds(200));
+    }
+    double first_audio_ms = millisecondsSince(requested);
+    if (previous) {
+        retireSession(std::move(previous));
+    }
+
+    std::cout << "🚀 " << song->name << " playing " << std::fixed << std::setprecision(1) << first_audio_ms
+              << "ms after start (" << (cached ? "cached" : "loaded first") << ")" << std::defaultfloat << std::endl;
+    m_xrunsReported = 0;
+    if (m_events) {
+        m_events->emit("state", {{"state", "playing"}, {"song", song->name},
+                                 {"duration", song->durationSeconds(SAMPLE_RATE)}, {"output", m_session->outputFile},
+                                 {"first_audio_ms", first_audio_ms}, {"cached", cached}});
+    }
+
+    std::ostringstream reply;
+    reply << std::fixed << std::setprecision(1) << "ok song=" << quoted(song->name) << " cached=" << (cached ? 1 : 0)
+          << " first_audio_ms=" << first_audio_ms << " duration=" << song->durationSeconds(SAMPLE_RATE)
+          << " output=" << quoted(m_session->outputFile);
+    return reply.str();
+}
+
+std::string EngineDaemon::stopCommand() {
+    if (!m_session && m_pendingStart) {
+        // Still loading: the song stays queued for the cache but will not play
+        std::string name = m_pendingStart->song.name;
+        m_pendingStart.reset();
+        if (m_events) {
+            m_events->emit("state", {{"state", "stopped"}, {"song", name}});
+        }
+        std::ostringstream reply;
+        reply << "ok song=" << quoted(name) << " recorded=0.0 output=" << quoted("");
+        return reply.str();
+    }
+    m_pendingStart.reset();
+    if (!m_session) {
+        return "error no session";
+    }
+    m_active.store(nullptr, std::memory_order_release);
+    m_control.setParams(nullptr);
+    std::string name = m_session->song->name;
+    std::string output = m_session->outputFile;
+    float recorded = retireSession(std::move(m_session));
+    if (m_events) {
+        m_events->emit("state", {{"state", "stopped"}, {"song", name}});
+    }
+
+    std::ostringstream reply;
+    reply << std::fixed << std::setprecision(1) << "ok song=" << quoted(name) << " recorded=" << recorded
+          << " output=" << quoted(output);
+    return reply.str();
+}
+
+std::string EngineDaemon::statusCommand() {
+    std::ostringstream reply;
+    reply << std::fixed << std::setprecision(1) << "ok state="
+          << (m_session ? "playing" : m_pendingStart ? "loading" : "idle");
+    if (m_session) {
+        const VoiceParams& params = m_session->audio.params;
+        reply << " song=" << quoted(m_session->song->name)
+              << " position=" << (double)m_session->instrumental.getSamplesPlayed() / SAMPLE_RATE
+              << " duration=" << m_session->song->durationSeconds(SAMPLE_RATE)
+              << " output=" << quoted(m_session->outputFile) << std::setprecision(2)
+              << " autotune_strength=" << params.autotune_strength.load()
+              << " pitch_shift=" << params.pitch_shift.load()
+              << " voice_volume=" << params.voice_volume.load()
+              << " instrument_volume=" << params.instrument_volume.load() << std::setprecision(1);
+    }
+    reply << " songs=" << m_songCache.getSongCount() << " cache_mb=" << (double)m_songCache.getUsedBytes() / (1 << 20)
+          << " budget_mb=" << (double)m_songCache.getBudgetBytes() / (1 << 20) << " loading=" << getLoadsInFlight();
+    if (m_pendingStart) {
+        reply << " pending=" << quoted(m_pendingStart->song.name);
+    }
+    return reply.str();
+}
+
+std::unique_ptr<DaemonSession> EngineDaemon::createSession(std::shared_ptr<const LoadedSong> song,
+                                                           const std::vector<std::string>& params) {
+    auto session = std::make_unique<DaemonSession>();
+    session->song = song;
+
+    // Same defaults and order as the command line's voice effect arguments
+    float autotune_strength = 1.0f;
+    float pitch_shift_amount = 0.0f;
+    float voice_volume = 1.1f;
+    float instrument_volume = 2.0f;
+    bool enable_chorus = false;
+    float chorus_depth = 0.1f;
+    bool enable_reverb = false;
+    float reverb_wetness = 0.3f;
+    if (params.size() == 8) {
+        try {
+            autotune_strength = std::stof(params[0]);
+            pitch_shift_amount = std::stof(params[1]);
+            voice_volume = std::stof(params[2]);
+            instrument_volume = std::stof(params[3]);
+            enable_chorus = std::stof(params[4]) > 0.5f;
+            chorus_depth = std::stof(params[5]);
+            enable_reverb = std::stof(params[6]) > 0.5f;
+            reverb_wetness = std::stof(params[7]);
+        } catch (const std::exception& e) {
+            std::cout << "⚠️  Warning: Could not parse voice effect parameters: " << e.what() << std::endl;
+        }
+    }
+
+    // The instrumental plays straight out of the cached buffer
+    session->instrumental.openDecoded(std::shared_ptr<const std::vector<float>>(song, &song->instrumental), SAMPLE_RATE);
+
+    std::vector<SingerChain*> singers;
+    for (int s = 0; s < m_numSingers; s++) {
+        session->chains.push_back(std::make_unique<SingerChain>());
+        if (!session->chains.back()->init(s, SAMPLE_RATE, *m_profile, m_pitchHop, song->melody)) {
+            return nullptr;
+        }
+        singers.push_back(session->chains.back().get());
+    }
+    session->pool.start(singers, SingerPool::recommendedWorkers(m_numSingers));
+    for (SingerChain* singer : singers) {
+        singer->start();
+    }
+
+    session->chorus.init(SAMPLE_RATE, m_profile->framesPerBuffer);
+    session->chorus.setDepth(chorus_depth);
+    session->reverb.init(SAMPLE_RATE, m_profile->framesPerBuffer);
+    session->reverb.setWetness(reverb_wetness);
+
+    AudioData& audio = session->audio;
+    audio.current_time = 0.0f;
+    audio.instrumental = &session->instrumental;
+    audio.singers = singers;
+    audio.singer_pool = &session->pool;
+    audio.plot_queue = nullptr;
+    audio.telemetry = m_telemetry.isOpen() ? &m_telemetry : nullptr;
+    audio.recording_queue = &session->recordingQueue;
+    audio.logger = &m_logger;
+    audio.params.autotune_strength.store(autotune_strength);
+    audio.params.pitch_shift.store(pitch_shift_amount);
+    audio.params.voice_volume.store(voice_volume);
+    audio.params.instrument_volume.store(instrument_volume);
+    audio.enable_chorus = enable_chorus;
+    audio.chorus_depth = chorus_depth;
+    audio.chorus = &session->chorus;
+    audio.enable_reverb = enable_reverb;
+    audio.reverb_wetness = reverb_wetness;
+    audio.reverb = &session->reverb;
+
+    session->outputFile = generateUniqueFilename(cleanSongName(song->name));
+    audio.recording_enabled = session->recorder.start(session->outputFile, &session->recordingQueue,
+                                                      SAMPLE_RATE, OUTPUT_CHANNELS);
+    return session;
+}
+
+float EngineDaemon::retireSession(std::unique_ptr<DaemonSession> session) {
+    // Once one more callback has completed, none can still be using the old session
+    uint64_t seen = m_callbacks.load(std::memory_order_acquire);
+    auto wait_begin = std::chrono::steady_clock::now();
+    while (m_callbacks.load(std::memory_order_acquire) == seen && Pa_IsStreamActive(m_stream) == 1 &&
+           millisecondsSince(wait_begin) < HANDOFF_TIMEOUT_MS) {
+        std::this_thread::sleep_for(std::chrono::microseconds(200));
+    }
+
+    session->recorder.stop();
+    session->pool.stop();
+    for (auto& chain : session->chains) {
+        chain->stop();
+    }
+    std::cout << "💾 " << session->song->name << " recording saved to " << session->outputFile << std::endl;
+    if (m_events && session->audio.recording_enabled) {
+        m_events->emit("recording", {{"path", session->outputFile}, {"song", session->song->name},
+                                     {"seconds", session->recorder.getDurationSeconds()},
+                                     {"dropped", session->recordingQueue.droppedCount()}});
+    }
+    return session->recorder.getDurationSeconds();
+}
+
+void EngineDaemon::reportProgress() {
+    auto now = std::chrono::steady_clock::now();
+    if (!m_events || !m_session || now - m_lastProgress < std::chrono::milliseconds(PROGRESS_INTERVAL_MS)) {
+        return;
+    }
+    m_lastProgress = now;
+
+    DaemonSession& session = *m_session;
+    m_events->emit("progress", {{"song", session.song->name},
+                                {"position", (double)session.instrumental.getSamplesPlayed() / SAMPLE_RATE},
+                                {"duration", session.song->durationSeconds(SAMPLE_RATE)},
+                                {"recorded", session.recorder.getDurationSeconds()}});
+    uint64_t xruns = session.audio.xruns.load(std::memory_order_relaxed);
+    if (xruns != m_xrunsReported) {
+        m_events->emit("xrun", {{"count", xruns}, {"new", xruns - m_xrunsReported}});
+        m_xrunsReported = xruns;
+    }
+}
+
+void EngineDaemon::startLoader() {
+    std::lock_guard<std::mutex> lock(m_loadMutex);
+    m_loaderRunning = true;
+    m_loader = std::thread(&EngineDaemon::loaderLoop, this);
+}
+
+void EngineDaemon::stopLoader() {
+    {
+        std::lock_guard<std::mutex> lock(m_loadMutex);
+        if (!m_loaderRunning) {
+            return;
+        }
+        m_loaderRunning = false;
+        m_loadQueue.clear();
+    }
+    m_loadWake.notify_all();
+    // A decode already under way finishes first (one song, a second or two at most)
+    if (m_loader.joinable()) {
+        m_loader.join();
+    }
+    m_loadResults.clear();
+}
+
+void EngineDaemon::loaderLoop() {
+    std::unique_lock<std::mutex> lock(m_loadMutex);
+    while (true) {
+        m_loadWake.wait(lock, [this] { return !m_loaderRunning || !m_loadQueue.empty(); });
+        if (!m_loaderRunning) {
+            return;
+        }
+        m_decoding.reset(new SongRequest(m_loadQueue.front()));
+        m_loadQueue.pop_front();
+        SongRequest request = *m_decoding;
+
+        lock.unlock();
+        std::shared_ptr<const LoadedSong> song =
+            m_songCache.load(request.name, request.melodyFile, request.instrumentalFile, SAMPLE_RATE);
+        lock.lock();
+
+        m_decoding.reset();
+        m_loadResults.emplace_back(request, song);
+    }
+}
+
+void EngineDaemon::queueLoad(const SongRequest& request, bool first) {
+    {
+        std::lock_guard<std::mutex> lock(m_loadMutex);
+        if (m_decoding && sameSong(*m_decoding, request)) {
+            return;
+        }
+        for (auto it = m_loadQueue.begin(); it != m_loadQueue.end(); ++it) {
+            if (sameSong(*it, request)) {
+                if (!first) {
+                    return;
+                }
+                m_loadQueue.erase(it);
+                break;
+            }
+        }
+        // A song someone is waiting to hear jumps ahead of preloads
+        if (first) {
+            m_loadQueue.push_front(request);
+        } else {
+            m_loadQueue.push_back(request);
+        }
+    }
+    m_loadWake.notify_one();
+}
+
+bool EngineDaemon::takeFailedLoad(const SongRequest& request) {
+    for (auto it = m_failedLoads.begin(); it != m_failedLoads.end(); ++it) {
+        if (sameSong(*it, request)) {
+            m_failedLoads.erase(it);
+            return true;
+        }
+    }
+    return false;
+}
+
+void EngineDaemon::finishLoads() {
+    std::vector<std::pair<SongRequest, std::shared_ptr<const LoadedSong>>> results;
+    {
+        std::lock_guard<std::mutex> lock(m_loadMutex);
+        results.swap(m_loadResults);
+    }
+
+    for (const auto& result : results) {
+        const SongRequest& request = result.first;
+        const std::shared_ptr<const LoadedSong>& song = result.second;
+        bool waiting = m_pendingStart && sameSong(m_pendingStart->song, request);
+
+        if (!song) {
+            std::cerr << "❌ Could not load " << request.name << std::endl;
+            if (m_events) {
+                m_events->error("Could not load " + request.name);
+            }
+            if (waiting) {
+                m_pendingStart.reset();
+            } else {
+                m_failedLoads.push_back(request);
+            }
+            continue;
+        }
+
+        std::cout << "📦 " << song->name << " loaded in " << std::fixed << std::setprecision(1) << song->loadMs
+                  << "ms" << std::defaultfloat << std::endl;
+        if (m_events) {
+            m_events->emit("loaded", {{"song", song->name}, {"duration", song->durationSeconds(SAMPLE_RATE)},
+                                      {"load_ms", song->loadMs}});
+        }
+        if (waiting) {
+            std::unique_ptr<PendingStart> pending = std::move(m_pendingStart);
+            playSong(song, pending->params, false, pending->requested);
+        }
+    }
+}
+
+size_t EngineDaemon::getLoadsInFlight() {
+    std::lock_guard<std::mutex> lock(m_loadMutex);
+    return m_loadQueue.size() + (m_decoding ? 1 : 0) + m_loadResults.size();
+}
+
+#ifndef _WIN32
+
+bool EngineDaemon::openSocket() {
+    if (m_socketPath.size() >= sizeof(sockaddr_un::sun_path)) {
+        std::cerr << "❌ Daemon socket path too long: " << m_socketPath << std::endl;
+        return false;
+    }
+
+    m_listenFd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (m_listenFd < 0) {
+        return false;
+    }
+
+    sockaddr_un addr = {};
+    addr.sun_family = AF_UNIX;
+    m_socketPath.copy(addr.sun_path, m_socketPath.size());
+
+    // Remove a stale socket left behind by a killed daemon
+    unlink(m_socketPath.c_str());
+
+    if (bind(m_listenFd, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) < 0 ||
+        listen(m_listenFd, (int)MAX_CLIENTS) < 0) {
+        std::cerr << "❌ Could not bind daemon socket " << m_socketPath << std::endl;
+        close(m_listenFd);
+        m_listenFd = -1;
+        return false;
+    }
+    fcntl(m_listenFd, F_SETFL, O_NONBLOCK);
+
+    std::cout << "🎛️ Daemon socket listening on " << m_socketPath << std::endl;
+    return true;
+}
+
+void EngineDaemon::closeSocket() {
+    for (int fd : m_clientFds) {
+        close(fd);
+    }
+    m_clientFds.clear();
+    m_clientBuffers.clear();
+
+    if (m_listenFd >= 0) {
+        close(m_listenFd);
+        m_listenFd = -1;
+        unlink(m_socketPath.c_str());
+    }
+}
+
+void EngineDaemon::poll(int timeoutMs) {
+    finishLoads();
+    reportProgress();
+    if (m_listenFd < 0) {
+        std::this_thread::sleep_for(std::chrono::milliseconds(timeoutMs));
+        return;
+    }
+
+    std::vector<pollfd> fds;
+    fds.push_back({m_listenFd, POLLIN, 0});
+    for (int fd : m_clientFds) {
+        fds.push_back({fd, POLLIN, 0});
+    }
+
+    if (::poll(fds.data(), fds.size(), timeoutMs) <= 0) {
+        return;
+    }
+
+    // Serve client commands; walk backwards so closed clients can be erased in place
+    for (size_t i = fds.size() - 1; i >= 1; --i) {
+        if (!(fds[i].revents & (POLLIN | POLLHUP | POLLERR))) {
+            continue;
+        }
+        size_t client = i - 1;
+        char chunk[512];
+        ssize_t got = read(m_clientFds[client], chunk, sizeof(chunk));
+        if (got <= 0) {
+            close(m_clientFds[client]);
+            m_clientFds.erase(m_clientFds.begin() + client);
+            m_clientBuffers.erase(m_clientBuffers.begin() + client);
+            continue;
+        }
+
+        std::string& buffer = m_clientBuffers[client];
+        buffer.append(chunk, (size_t)got);
+        size_t newline;
+        while ((newline = buffer.find('\n')) != std::string::npos) {
+            std::string line = buffer.substr(0, newline);
+            buffer.erase(0, newline + 1);
+            if (!line.empty() && line.back() == '\r') {
+                line.pop_back();
+            }
+            if (line.empty()) {
+                continue;
+            }
+            std::string reply = handleCommand(line) + "\n";
+            // A client that hung up before reading its reply is noticed on the next read
+            send(m_clientFds[client], reply.data(), reply.size(), MSG_NOSIGNAL);
+        }
+        if (buffer.size() > MAX_LINE_LENGTH) {
+            buffer.clear();
+        }
+    }
+
+    // Accept new clients
+    if (fds[0].revents & POLLIN) {
+        int client = accept(m_listenFd, nullptr, nullptr);
+        if (client >= 0) {
+            if (m_clientFds.size() >= MAX_CLIENTS) {
+                close(client);
+            } else {
+                m_clientFds.push_back(client);
+                m_clientBuffers.emplace_back();
+            }
+        }
+    }
+}
+
+#else
+
+// The daemon needs Unix sockets; Windows builds run one session per process
+bool EngineDaemon::openSocket() {
+    std::cerr << "❌ The engine daemon is not supported on Windows" << std::endl;
+    return false;
+}
+
+void EngineDaemon::closeSocket() {
+}
+
+void EngineDaemon::poll(int timeoutMs) {
+    finishLoads();
+    reportProgress();
+    std::this_thread::sleep_for(std::chrono::milliseconds(timeoutMs));
+}
+
+#endif
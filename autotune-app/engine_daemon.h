@@ -0,0 +1,167 @@
+#ifndef ENGINE_DAEMON_H
+#define ENGINE_DAEMON_H
+
+#include <portaudio.h>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+#include "control_channel.h"
+#include "event_stream.h"
+#include "latency_profile.h"
+#include "rt_log.h"
+#include "song_cache.h"
+#include "telemetry_shm.h"
+
+struct DaemonSession;
+
+// Long-lived engine process (autotune-karaoke --daemon).
+//
+// The audio stream is opened once and runs for the life of the process,
+// playing silence while idle, and decoded songs stay in a SongCache between
+// sessions. Clients on a Unix socket send newline-terminated commands and
+// get one reply line each, "ok key=value ..." or "error <reason>":
+//
+//   load <name> [melody instrumental]            decode into the cache
+//   start <name> [melody instrumental [params]]  play (loading first if needed)
+//   stop                                         end the session (or a start still loading)
+//   status                                       state, position, voice params, cache use
+//   quit                                         shut the daemon down
+//
+// Songs that are not cached yet are decoded on a background thread, so a
+// command never waits for a decode. load and start reply "ok ... loading=1"
+// straight away; a start then begins playing as soon as its song is ready
+// (status shows it as pending meanwhile), and load can be repeated until it
+// replies cached=1. A failed decode is reported once, to the pending start
+// or the next load of that song, and as an error event.
+//
+// params are the eight voice effect values of the command line, in the same
+// order. Arguments containing spaces are double-quoted; without paths a song
+// resolves to songs/<name>/ like the command line. Starting a session only
+// builds the per-singer chains and hands them to the running callback, so a
+// cached song is audible within a buffer or two. Starting while a song plays
+// swaps to the new one without stopping the stream. Live voice parameters
+// go to the playing session over one control socket that stays up for the
+// daemon's lifetime (KARAOKE_CONTROL_SOCKET). Session state, progress,
+// xruns and finished recordings also go to the EventStream, if one is set.
+class EngineDaemon {
+public:
+    EngineDaemon();
+    ~EngineDaemon();
+
+    // Settings every session uses; call before opening the stream
+    void init(int numSingers, const LatencyProfile& profile, int pitchHop);
+
+    // Where session events go (optional, not owned)
+    void setEventStream(EventStream* events);
+
+    // Open the stream with this callback and the daemon as userData
+    static int streamCallback(const void* inputBuffer, void* outputBuffer,
+                              unsigned long framesPerBuffer,
+                              const PaStreamCallbackTimeInfo* timeInfo,
+                              PaStreamCallbackFlags statusFlags,
+                              void* userData);
+
+    // Start the (opened, stopped) stream and listen for commands
+    bool start(PaStream* stream, const std::string& socketPath);
+
+    // End any session and stop the stream; the caller closes it
+    void stop();
+
+    // Serve commands for up to timeoutMs; the caller loops on this
+    void poll(int timeoutMs);
+
+    // False once a client has sent quit
+    bool isRunning() const;
+
+    // Run one command line and return the reply (without newline)
+    std::string handleCommand(const std::string& line);
+
+    SongCache& getSongCache();
+
+private:
+    struct SongRequest {
+        std::string name;
+        std::string melodyFile;
+        std::string instrumentalFile;
+    };
+
+    struct PendingStart {
+        SongRequest song;
+        std::vector<std::string> params;
+        std::chrono::steady_clock::time_point requested;
+    };
+
+    std::string loadCommand(const std::vector<std::string>& args);
+    std::string startCommand(const std::vector<std::string>& args);
+    std::string stopCommand();
+    std::string statusCommand();
+    bool parseSongRequest(const std::vector<std::string>& args, SongRequest* request, std::string* error) const;
+    std::string playSong(std::shared_ptr<const LoadedSong> song, const std::vector<std::string>& params, bool cached,
+                         std::chrono::steady_clock::time_point requested);
+    std::unique_ptr<DaemonSession> createSession(std::shared_ptr<const LoadedSong> song,
+                                                 const std::vector<std::string>& params);
+    float retireSession(std::unique_ptr<DaemonSession> session);   // Returns seconds recorded
+
+    void reportProgress();   // Once per PROGRESS_INTERVAL_MS from poll()
+
+    // Background decoding
+    void startLoader();
+    void stopLoader();
+    void loaderLoop();
+    void queueLoad(const SongRequest& request, bool first);   // No-op if already queued or decoding
+    bool takeFailedLoad(const SongRequest& request);          // Forget (and report) a failed decode
+    void finishLoads();                                       // From poll(): report decodes, run a pending start
+    size_t getLoadsInFlight();
+
+    bool openSocket();
+    void closeSocket();
+
+    int m_numSingers;
+    const LatencyProfile* m_profile;
+    int m_pitchHop;
+    PaStream* m_stream;
+    SongCache m_songCache;
+    TelemetryWriter m_telemetry;
+    RtLogger m_logger;
+    ControlChannel m_control;   // One control socket for the daemon's lifetime, pointed at the playing session
+    EventStream* m_events;
+    bool m_running;
+    std::chrono::steady_clock::time_point m_lastProgress;
+    uint64_t m_xrunsReported;   // Of the current session
+
+    std::unique_ptr<DaemonSession> m_session;   // Owned by the command thread
+    std::atomic<DaemonSession*> m_active;       // What the callback plays, null when idle
+    std::atomic<uint64_t> m_callbacks;          // Completed callbacks, so a retired session is known to be unused
+
+    // Cold decodes run on m_loader so commands, progress and swaps never wait for one
+    std::thread m_loader;
+    std::mutex m_loadMutex;
+    std::condition_variable m_loadWake;
+    bool m_loaderRunning;                                    // Guarded by m_loadMutex, like the three below
+    std::deque<SongRequest> m_loadQueue;                     // Waiting to decode, next first
+    std::unique_ptr<SongRequest> m_decoding;                 // Being decoded now
+    std::vector<std::pair<SongRequest, std::shared_ptr<const LoadedSong>>> m_loadResults;   // Null song = failed
+    std::vector<SongRequest> m_failedLoads;                  // Command thread only
+    std::unique_ptr<PendingStart> m_pendingStart;            // Command thread only
+
+    std::string m_socketPath;
+    int m_listenFd;
+    std::vector<int> m_clientFds;
+    std::vector<std::string> m_clientBuffers;
+
+    // Constants
+    static constexpr int OUTPUT_CHANNELS = 1;
+    static constexpr size_t MAX_CLIENTS = 8;
+    static constexpr size_t MAX_LINE_LENGTH = 4096;
+    static constexpr int HANDOFF_TIMEOUT_MS = 1000;   // Wait for the callback to pick up or release a session
+    static constexpr int PROGRESS_INTERVAL_MS = 1000;
+};
+
+#endif // ENGINE_DAEMON_H
@@ -0,0 +1,160 @@
+#include "event_stream.h"
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <iostream>
+
+#ifndef _WIN32
+#include <cerrno>
+#include <csignal>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
+EventStream::EventStream()
+    : m_fd(-1)
+    , m_dropped(0)
+{
+    m_line.reserve(512);
+}
+
+EventStream::~EventStream() {
+    close();
+}
+
+bool EventStream::openFromEnv() {
+    const char* fd_env = std::getenv("KARAOKE_EVENT_FD");
+    if (!fd_env || !*fd_env) {
+        return false;
+    }
+    if (!open(std::atoi(fd_env))) {
+        std::cerr << "⚠️  KARAOKE_EVENT_FD=" << fd_env << " is not an open descriptor, events disabled" << std::endl;
+        return false;
+    }
+    return true;
+}
+
+void EventStream::emit(const char* event, std::initializer_list<EventField> fields) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (m_fd < 0) {
+        return;
+    }
+
+    char number[32];
+    double t = std::chrono::duration<double>(std::chrono::steady_clock::now() - m_openTime).count();
+    m_line.assign("{\"event\":");
+    appendString(event);
+    std::snprintf(number, sizeof(number), ",\"t\":%.3f", t);
+    m_line.append(number);
+
+    for (const EventField& field : fields) {
+        m_line.push_back(',');
+        appendString(field.key);
+        m_line.push_back(':');
+        switch (field.type) {
+            case EventField::Type::Number:
+                if (std::isfinite(field.number)) {
+                    std::snprintf(number, sizeof(number), "%.6g", field.number);
+                    m_line.append(number);
+                } else {
+                    m_line.append("null");
+                }
+                break;
+            case EventField::Type::Integer:
+                std::snprintf(number, sizeof(number), "%lld", (long long)field.integer);
+                m_line.append(number);
+                break;
+            case EventField::Type::Bool:
+                m_line.append(field.integer ? "true" : "false");
+                break;
+            case EventField::Type::String:
+                appendString(field.text ? field.text : "");
+                break;
+        }
+    }
+    m_line.append("}\n");
+
+#ifndef _WIN32
+    ssize_t written = ::write(m_fd, m_line.data(), m_line.size());
+    if (written < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
+        m_dropped++;
+    } else if (written < 0 && errno != EINTR) {
+        // Reader went away; stop paying for events nobody sees
+        ::close(m_fd);
+        m_fd = -1;
+    }
+#endif
+}
+
+void EventStream::error(const std::string& message) {
+    emit("error", {{"message", message}});
+}
+
+void EventStream::appendString(const char* text) {
+    m_line.push_back('"');
+    for (const char* c = text; *c; ++c) {
+        unsigned char ch = (unsigned char)*c;
+        if (ch == '"' || ch == '\\') {
+            m_line.push_back('\\');
+            m_line.push_back((char)ch);
+        } else if (ch < 0x20) {
+            char escaped[8];
+            std::snprintf(escaped, sizeof(escaped), "\\u%04x", ch);
+            m_line.append(escaped);
+        } else {
+            m_line.push_back((char)ch);   // UTF-8 passes through untouched
+        }
+    }
+    m_line.push_back('"');
+}
+
+bool EventStream::isOpen() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_fd >= 0;
+}
+
+uint64_t EventStream::getDroppedCount() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_dropped;
+}
+
+#ifndef _WIN32
+
+bool EventStream::open(int fd) {
+    close();
+    if (fd < 0 || fcntl(fd, F_GETFD) < 0) {
+        return false;
+    }
+
+    // Never block the engine on a slow reader, and never die when it exits
+    fcntl(fd, F_SETFL, fcntl(fd, F_GETFL) | O_NONBLOCK);
+    fcntl(fd, F_SETFD, FD_CLOEXEC);
+    signal(SIGPIPE, SIG_IGN);
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_fd = fd;
+    m_openTime = std::chrono::steady_clock::now();
+    m_dropped = 0;
+    return true;
+}
+
+void EventStream::close() {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (m_fd >= 0) {
+        ::close(m_fd);
+        m_fd = -1;
+    }
+}
+
+#else
+
+// No descriptor inheritance from the Node backend on Windows; events stay off
+bool EventStream::open(int fd) {
+    (void)fd;
+    return false;
+}
+
+void EventStream::close() {
+}
+
+#endif
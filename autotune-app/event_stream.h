@@ -0,0 +1,76 @@
+#ifndef EVENT_STREAM_H
+#define EVENT_STREAM_H
+
+#include <chrono>
+#include <cstdint>
+#include <initializer_list>
+#include <mutex>
+#include <string>
+
+// One key/value of an event. Keys are string literals; strings are escaped
+// when the line is written, non-finite numbers become null.
+struct EventField {
+    enum class Type : uint8_t { Number, Integer, Bool, String };
+
+    EventField(const char* key, double value) : key(key), type(Type::Number), number(value) {}
+    EventField(const char* key, float value) : key(key), type(Type::Number), number(value) {}
+    EventField(const char* key, int value) : key(key), type(Type::Integer), integer(value) {}
+    EventField(const char* key, uint64_t value) : key(key), type(Type::Integer), integer((int64_t)value) {}
+    EventField(const char* key, bool value) : key(key), type(Type::Bool), integer(value ? 1 : 0) {}
+    EventField(const char* key, const char* value) : key(key), type(Type::String), text(value) {}
+    EventField(const char* key, const std::string& value) : key(key), type(Type::String), text(value.c_str()) {}
+
+    const char* key;
+    Type type;
+    double number = 0.0;
+    int64_t integer = 0;
+    const char* text = nullptr;
+};
+
+// Machine-readable engine events, one JSON object per line on a file
+// descriptor the parent passes in KARAOKE_EVENT_FD (run_karaoke.py and the
+// Node backend read it instead of matching stdout). Every line has "event"
+// and "t" (seconds since open) first:
+//
+//   {"event":"state","t":0.412,"state":"playing","song":"MySong","duration":215.3,...}
+//   {"event":"progress","t":5.001,"position":4.6,"duration":215.3,"recorded":4.5,...}
+//   {"event":"xrun","t":7.2,"count":3,"new":1}
+//   {"event":"recording","t":60.3,"path":"output/MySong_....wav","seconds":59.8,"dropped":0}
+//   {"event":"error","t":0.01,"message":"Could not open instrumental file: ..."}
+//
+// state is loading, playing or stopped. Events come from the main/control
+// threads, never the audio callback. Each line goes out in a single write()
+// on a non-blocking descriptor: a reader that falls behind loses events
+// (counted) instead of stalling the engine, and one that goes away closes
+// the stream.
+class EventStream {
+public:
+    EventStream();
+    ~EventStream();
+
+    // Take over fd for writing; false if it is not an open descriptor
+    bool open(int fd);
+
+    // open() the descriptor named by KARAOKE_EVENT_FD, if set
+    bool openFromEnv();
+
+    void close();
+    bool isOpen() const;
+
+    void emit(const char* event, std::initializer_list<EventField> fields = {});
+    void error(const std::string& message);
+
+    // Lines lost because the reader was not keeping up
+    uint64_t getDroppedCount() const;
+
+private:
+    void appendString(const char* text);
+
+    int m_fd;
+    std::chrono::steady_clock::time_point m_openTime;
+    std::string m_line;          // Reused for every event, so steady state does not allocate
+    uint64_t m_dropped;
+    mutable std::mutex m_mutex;
+};
+
+#endif // EVENT_STREAM_H
@@ -0,0 +1,86 @@
+#include "fft.h"
+#include <cmath>
+
+Fft::Fft()
+    : m_size(0)
+{
+}
+
+bool Fft::init(int size) {
+    if (size < 2 || (size & (size - 1)) != 0) {
+        return false;
+    }
+    m_size = size;
+    m_buffer.assign(size, std::complex<float>(0.0f, 0.0f));
+
+    m_twiddles.resize(size / 2);
+    for (int k = 0; k < size / 2; ++k) {
+        double angle = -2.0 * M_PI * k / size;
+        m_twiddles[k] = std::complex<float>((float)std::cos(angle), (float)std::sin(angle));
+    }
+
+    int bits = 0;
+    while ((1 << bits) < size) {
+        ++bits;
+    }
+    m_bitReverse.resize(size);
+    for (int i = 0; i < size; ++i) {
+        int reversed = 0;
+        for (int b = 0; b < bits; ++b) {
+            reversed |= ((i >> b) & 1) << (bits - 1 - b);
+        }
+        m_bitReverse[i] = reversed;
+    }
+    return true;
+}
+
+void Fft::forwardReal(const float* input, std::complex<float>* spectrum) {
+    for (int i = 0; i < m_size; ++i) {
+        m_buffer[m_bitReverse[i]] = std::complex<float>(input[i], 0.0f);
+    }
+    transform(false);
+    for (int k = 0; k <= m_size / 2; ++k) {
+        spectrum[k] = m_buffer[k];
+    }
+}
+
+void Fft::inverseReal(const std::complex<float>* spectrum, float* output) {
+    // Rebuild the conjugate-symmetric upper half
+    const int half = m_size / 2;
+    for (int k = 0; k <= half; ++k) {
+        m_buffer[m_bitReverse[k]] = spectrum[k];
+    }
+    for (int k = half + 1; k < m_size; ++k) {
+        m_buffer[m_bitReverse[k]] = std::conj(spectrum[m_size - k]);
+    }
+    transform(true);
+    const float scale = 1.0f / m_size;
+    for (int i = 0; i < m_size; ++i) {
+        output[i] = m_buffer[i].real() * scale;
+    }
+}
+
+int Fft::size() const {
+    return m_size;
+}
+
+// Buffer is already in bit-reversed order
+void Fft::transform(bool inverse) {
+    std::complex<float>* data = m_buffer.data();
+    for (int length = 2; length <= m_size; length <<= 1) {
+        const int half = length / 2;
+        const int stride = m_size / length;
+        for (int start = 0; start < m_size; start += length) {
+            for (int k = 0; k < half; ++k) {
+                // Multiply written out: std::complex operator* adds NaN/Inf handling calls
+                const float wr = m_twiddles[k * stride].real();
+                const float wi = inverse ? -m_twiddles[k * stride].imag() : m_twiddles[k * stride].imag();
+                const float xr = data[start + k + half].real();
+                const float xi = data[start + k + half].imag();
+                const std::complex<float> odd(xr * wr - xi * wi, xr * wi + xi * wr);
+                data[start + k + half] = data[start + k] - odd;
+                data[start + k] += odd;
+            }
+        }
+    }
+}
@@ -0,0 +1,33 @@
+#ifndef FFT_H
+#define FFT_H
+
+#include <complex>
+#include <vector>
+
+// In-place iterative radix-2 FFT for real-time use. init() builds the
+// twiddle and bit-reversal tables once, so transforms never allocate.
+class Fft {
+public:
+    Fft();
+
+    // size must be a power of two
+    bool init(int size);
+
+    // Real input of length size() -> bins 0..size()/2 (size()/2 + 1 values)
+    void forwardReal(const float* input, std::complex<float>* spectrum);
+
+    // Bins 0..size()/2 of a real signal -> real output of length size(), scaled by 1/size()
+    void inverseReal(const std::complex<float>* spectrum, float* output);
+
+    int size() const;
+
+private:
+    void transform(bool inverse);
+
+    int m_size;
+    std::vector<std::complex<float>> m_buffer;
+    std::vector<std::complex<float>> m_twiddles;
+    std::vector<int> m_bitReverse;
+};
+
+#endif // FFT_H
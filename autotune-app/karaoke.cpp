@@ -6,20 +6,40 @@
 #include <deque>
 #include <fstream>
 #include <ctime>
+#include <cstdlib>
+#include <cstring>
+#include <algorithm>
+#include <memory>
 #include <portaudio.h>
 #include <sndfile.h>
 #include <aubio/aubio.h>
-#include <SDL2/SDL.h>
 #include <filesystem>
 #include <iomanip>
 #include <sstream>
 #include <signal.h>
-#include "simple_noise_suppression.h"
+#include "ring_buffer.h"
+#include "audio_engine.h"
+#include "wav_recorder.h"
+#include "streaming_source.h"
+#include "resample_cache.h"
+#include "chorus.h"
+#include "reverb.h"
+#include "control_channel.h"
+#include "singer_chain.h"
+#include "singer_pool.h"
+#include "latency_profile.h"
+#include "rt_log.h"
+#include "telemetry_shm.h"
+#include "plot_window.h"
+#include "song_cache.h"
+#include "engine_daemon.h"
+#include "event_stream.h"
+#include "pitch_stream.h"
 
 // Global variables for signal handling
 volatile bool g_quit_requested = false;
 std::string g_output_filename;
-std::vector<float>* g_recording_frames = nullptr;
+EventStream g_events;   // JSON-lines events for the parent process (KARAOKE_EVENT_FD)
 
 // Signal handler for graceful shutdown
 void signalHandler(int signum) {
@@ -29,112 +49,13 @@ void signalHandler(int signum) {
     }
 }
 
-// Function declarations
-std::vector<std::pair<float, float>> loadMelodyMap(const std::string& filename);
-void saveRecording(const std::vector<float>& recording_frames, const std::string& filename);
-std::string generateUniqueFilename(const std::string& song_name);
-
-// Function to load melody map from file
-std::vector<std::pair<float, float>> loadMelodyMap(const std::string& filename) {
-    std::vector<std::pair<float, float>> melody_map;
-    
-    // Check file extension (compatible with older C++ versions)
-    if (filename.length() >= 4 && filename.substr(filename.length() - 4) == ".npz") {
-        // Load from numpy .npz file (Python format)
-        std::cout << "🎼 Loading melody map from numpy file: " << filename << std::endl;
-        // For now, we'll use a simple text format, but you can extend this
-        std::cout << "⚠️  .npz files not yet supported, please convert to .txt format" << std::endl;
-        return melody_map;
-    } else if (filename.length() >= 4 && filename.substr(filename.length() - 4) == ".txt") {
-        // Load from simple text file
-        std::cout << "🎼 Loading melody map from text file: " << filename << std::endl;
-        std::ifstream file(filename);
-        if (!file.is_open()) {
-            std::cerr << "❌ Could not open melody file: " << filename << std::endl;
-            return melody_map;
-        }
-        
-        std::string line;
-        // Skip header lines (start with #)
-        while (std::getline(file, line) && line[0] == '#') {
-            continue;
-        }
-        
-        // Read melody data: time,frequency format
-        while (std::getline(file, line)) {
-            if (line.empty()) continue;
-            
-            size_t comma_pos = line.find(',');
-            if (comma_pos != std::string::npos) {
-                float time = std::stof(line.substr(0, comma_pos));
-                float freq = std::stof(line.substr(comma_pos + 1));
-                melody_map.push_back({time, freq});
-            }
-        }
-        
-        file.close();
-        std::cout << "✅ Loaded " << melody_map.size() << " melody points" << std::endl;
-    } else {
-        std::cerr << "❌ Unsupported file format. Use .txt or .npz files" << std::endl;
-    }
-    
-    return melody_map;
-}
-
-// Function to generate unique filename
-std::string generateUniqueFilename(const std::string& song_name) {
-    // Create output directory if it doesn't exist
-    // Use absolute path to ensure it's created in the right location
-    std::string output_dir = "output";
-    std::filesystem::create_directories(output_dir);
-    
-    // Get current timestamp
-    auto now = std::chrono::system_clock::now();
-    auto time_t = std::chrono::system_clock::to_time_t(now);
-    auto ms = std::chrono::duration_cast<std::chrono::milliseconds>(now.time_since_epoch()) % 1000;
-    
-    // Format: output/songname_YYYYMMDD_HHMMSS_mmm.wav
-    std::stringstream ss;
-    ss << output_dir << "/" << song_name << "_" 
-       << std::put_time(std::localtime(&time_t), "%Y%m%d_%H%M%S")
-       << "_" << std::setfill('0') << std::setw(3) << ms.count()
-       << ".wav";
-    
-    std::cout << "📁 Will save recording to: " << ss.str() << std::endl;
-    return ss.str();
-}
-
-#define SAMPLE_RATE 48000
-#define FRAMES_PER_BUFFER 256  // Smaller buffer for faster response
-#define NUM_CHANNELS 1
-#define PLOT_WIDTH 800
-#define PLOT_HEIGHT 400
-#define PLOT_HISTORY 200
-
-struct AudioData {
-    std::deque<float> pitch_history;
-    std::deque<float> target_pitch_history;
-    std::vector<std::pair<float, float>> melody_map;
-    float current_time;
-    std::vector<float> instrumental;
-    size_t instrumental_pos;
-    aubio_pitch_t* pitch_detector;
-    float last_pitch;
-    float last_confidence;
-    std::deque<float> target_history;  // Added back target history
-    std::deque<float> time_history;    // Added back time history
-    std::vector<float> recording_frames; // For recording the mixed audio
-    bool recording_enabled;
-    SimpleNoiseSuppressor* noise_suppressor; // Added noise suppressor
-    float autotune_strength;        // 0.0 = no effect, 1.0 = full autotune
-    float pitch_shift_amount;       // -12.0 to +12.0 semitones
-    float voice_volume;             // 0.0 to 2.0 multiplier
-    float instrument_volume;        // 0.0 to 2.0 multiplier for instrumental
-    bool enable_chorus;             // Enable chorus effect
-    float chorus_depth;             // Chorus intensity
-    bool enable_reverb;             // Enable reverb effect
-    float reverb_wetness;
-};
+#define NUM_CHANNELS 1                        // Output (and recording) channels
+#define MAX_SINGERS 16                        // One input channel per singer
+#define VOICE_CPU_BUDGET_PERCENT 50.0         // Share of each buffer deadline the voice chains may use
+#define CPU_REPORT_INTERVAL_S 5
+#define PROGRESS_EVENT_INTERVAL_MS 1000       // How often the event stream gets a progress line
+#define PITCH_QUEUE_SIZE 1024                 // ~5s of per-buffer pitch frames
+#define RECORDING_QUEUE_SIZE (SAMPLE_RATE * 4) // 4s of headroom for the recorder thread
 
 // Function to find default input and output devices
 PaDeviceIndex findDefaultInputDevice() {
@@ -201,426 +122,291 @@ PaDeviceIndex findDefaultOutputDevice() {
     return paNoDevice;
 }
 
-// Function to check for parameter updates from file
-void checkParameterUpdates(AudioData* data) {
-    static time_t last_check = 0;
-    time_t current_time = time(nullptr);
-    
-    // Only check every 100ms to avoid excessive file I/O
-    if (current_time - last_check < 0.1) {
-        return;
-    }
-    last_check = current_time;
-    
-    std::ifstream param_file("voice_params.txt");
-    if (param_file.is_open()) {
-        std::string line;
-        while (std::getline(param_file, line)) {
-            if (line.find("voice_volume=") == 0) {
-                float new_volume = std::stof(line.substr(13));
-                if (new_volume >= 0.0f && new_volume <= 5.0f) {
-                    data->voice_volume = new_volume;
-                    std::cout << "🎤 Voice volume updated to: " << new_volume << std::endl;
-                }
-            } else if (line.find("autotune_strength=") == 0) {
-                float new_strength = std::stof(line.substr(18));
-                if (new_strength >= 0.0f && new_strength <= 2.0f) {
-                    data->autotune_strength = new_strength;
-                    std::cout << "🎵 Autotune strength updated to: " << new_strength << std::endl;
-                }
-            } else if (line.find("pitch_shift=") == 0) {
-                float new_shift = std::stof(line.substr(12));
-                if (new_shift >= -12.0f && new_shift <= 12.0f) {
-                    data->pitch_shift_amount = new_shift;
-                    std::cout << "🎼 Pitch shift updated to: " << new_shift << " semitones" << std::endl;
-                }
-            } else if (line.find("instrument_volume=") == 0) {
-                float new_volume = std::stof(line.substr(18));
-                if (new_volume >= 0.0f && new_volume <= 5.0f) {
-                    data->instrument_volume = new_volume;
-                    std::cout << "🎛️ Instrument volume updated to: " << new_volume << std::endl;
-                }
-            }
-        }
-        param_file.close();
-    }
-}
-
-static int audioCallback(const void* inputBuffer, void* outputBuffer,
-                        unsigned long framesPerBuffer,
-                        const PaStreamCallbackTimeInfo* timeInfo,
-                        PaStreamCallbackFlags statusFlags,
-                        void* userData) {
-    
-    (void)framesPerBuffer; // Suppress unused parameter warning
-    (void)timeInfo;        // Suppress unused parameter warning
-    (void)statusFlags;     // Suppress unused parameter warning
-    
-    AudioData* data = (AudioData*)userData;
-    float* in = (float*)inputBuffer;
-    float* out = (float*)outputBuffer;
-    
-    // Safety check for null pointers
-    if (!in || !out || !data) {
-        return paAbort;
-    }
+// Open the duplex stream: one interleaved input channel per singer, mono output
+PaError openEngineStream(PaStream** stream, PaDeviceIndex inputDevice, PaDeviceIndex outputDevice, int num_singers,
+                         const LatencyProfile& profile, PaStreamCallback* callback, void* userData) {
+    PaStreamParameters inputParameters;
+    inputParameters.device = inputDevice;
+    inputParameters.channelCount = num_singers;   // Interleaved, one channel per singer
+    inputParameters.sampleFormat = paFloat32;
+    inputParameters.suggestedLatency = profile.deviceLatency == DeviceLatency::Low
+        ? Pa_GetDeviceInfo(inputDevice)->defaultLowInputLatency
+        : Pa_GetDeviceInfo(inputDevice)->defaultHighInputLatency;
+    inputParameters.hostApiSpecificStreamInfo = nullptr;
     
-    // Check for parameter updates
-    checkParameterUpdates(data);
+    PaStreamParameters outputParameters;
+    outputParameters.device = outputDevice;
+    outputParameters.channelCount = NUM_CHANNELS;
+    outputParameters.sampleFormat = paFloat32;
+    outputParameters.suggestedLatency = profile.deviceLatency == DeviceLatency::Low
+        ? Pa_GetDeviceInfo(outputDevice)->defaultLowOutputLatency
+        : Pa_GetDeviceInfo(outputDevice)->defaultHighOutputLatency;
+    outputParameters.hostApiSpecificStreamInfo = nullptr;
     
-    // Get instrumental chunk
-    std::vector<float> instrumental_chunk(FRAMES_PER_BUFFER, 0.0f);
-    for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-        if (data->instrumental_pos >= data->instrumental.size()) {
-            data->instrumental_pos = 0;
-        }
-        if (!data->instrumental.empty()) {
-            instrumental_chunk[i] = data->instrumental[data->instrumental_pos++];
-        }
+    return Pa_OpenStream(stream, &inputParameters, &outputParameters, SAMPLE_RATE,
+                         profile.framesPerBuffer, paClipOff, callback, userData);
+}
+
+// Pull everything the audio thread has published since the last frame
+void drainPitchFrames(SpscRingBuffer<PitchFrame>& queue, PlotWindow& plot, PitchFrame& latest) {
+    PitchFrame frame;
+    while (queue.pop(frame)) {
+        plot.addFrame(frame);
+        latest = frame;
     }
-    
-    // Debug: Check if instrumental has non-zero values
-    static int debug_counter = 0;
-    if (debug_counter++ % 100 == 0) {  // Print every 100th callback
-        float max_instrumental = 0.0f;
-        float max_raw_instrumental = 0.0f;
-        
-        // Check the raw instrumental data
-        if (!data->instrumental.empty()) {
-            size_t start_pos = data->instrumental_pos;
-            for (int i = 0; i < std::min(FRAMES_PER_BUFFER, (int)data->instrumental.size() - (int)start_pos); i++) {
-                max_raw_instrumental = std::max(max_raw_instrumental, std::abs(data->instrumental[start_pos + i]));
-            }
-        }
-        
-        // Check the chunk data
-        for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-            max_instrumental = std::max(max_instrumental, std::abs(instrumental_chunk[i]));
+}
+
+// Convert instrumentals into the resample cache ahead of time
+int runIngest(int argc, char* argv[]) {
+    ResampleCache cache;
+    int failures = 0;
+    for (int i = 2; i < argc; i++) {
+        std::string playable;
+        if (!cache.ingest(argv[i], SAMPLE_RATE, &playable)) {
+            failures++;
         }
-        
-        std::cout << "🔍 Debug - Raw instrumental max: " << max_raw_instrumental 
-                  << ", Chunk max: " << max_instrumental 
-                  << ", Position: " << data->instrumental_pos 
-                  << ", Total size: " << data->instrumental.size() << std::endl;
     }
-    
-    // Process input audio with higher sensitivity
-    fvec_t* input_vec = new_fvec(FRAMES_PER_BUFFER);
-    if (!input_vec) {
-        return paAbort;
+    return failures == 0 ? 0 : 1;
+}
+
+// Drive the audio callback from a recorded dry vocal instead of the sound card, as fast as
+// the CPU allows. The vocal needs one channel per singer at the engine rate, like the live input.
+int renderOffline(AudioData& data, const std::string& vocal_file, const std::string& output_file,
+                  int frames_per_buffer) {
+    SF_INFO info = {};
+    SNDFILE* vocal = sf_open(vocal_file.c_str(), SFM_READ, &info);
+    if (!vocal) {
+        std::cerr << "❌ Could not open vocal file: " << vocal_file << " (" << sf_strerror(nullptr) << ")" << std::endl;
+        g_events.error("Could not open vocal file: " + vocal_file);
+        return 1;
     }
-    
-    for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-        input_vec->data[i] = in[i];
+    const int num_singers = (int)data.singers.size();
+    if (info.channels != num_singers || info.samplerate != SAMPLE_RATE) {
+        std::cerr << "❌ " << vocal_file << " has " << info.channels << " channel(s) at " << info.samplerate
+                  << "Hz, offline rendering needs " << num_singers << " (one per singer) at " << SAMPLE_RATE << "Hz" << std::endl;
+        g_events.error("Vocal file needs one channel per singer at the engine rate: " + vocal_file);
+        sf_close(vocal);
+        return 1;
     }
     
-    // Detect pitch with improved sensitivity
-    fvec_t* pitch_output = new_fvec(1);
-    if (!pitch_output) {
-        del_fvec(input_vec);
-        return paAbort;
+    // Nothing watches the plot or telemetry here; the mix goes straight to the recorder
+    data.plot_queue = nullptr;
+    data.telemetry = nullptr;
+    WavRecorder recorder;
+    if (!recorder.start(output_file, data.recording_queue, SAMPLE_RATE, NUM_CHANNELS)) {
+        g_events.error("Could not open output file: " + output_file);
+        sf_close(vocal);
+        return 1;
     }
+    data.recording_enabled = true;
     
-    aubio_pitch_do(data->pitch_detector, input_vec, pitch_output);
-    float pitch = pitch_output->data[0];
-    float confidence = aubio_pitch_get_confidence(data->pitch_detector);
-    
-    // Lower confidence threshold for faster detection
-    if (confidence > 0.3f && pitch > 50.0f) {  // Lower threshold, higher minimum pitch
-        data->last_pitch = pitch;
-        data->last_confidence = confidence;
-    }
+    signal(SIGINT, signalHandler);
+    signal(SIGTERM, signalHandler);
     
-    // Get target melody frequency
-    float target_pitch = 0.0f;
-    // More flexible lookup - find closest melody note within 0.5 seconds
-    float best_time_diff = 0.5f;
-    for (const auto& note : data->melody_map) {
-        float time_diff = std::abs(note.first - data->current_time);
-        if (time_diff < best_time_diff) {
-            best_time_diff = time_diff;
-            target_pitch = note.second;
+    std::vector<float> input((size_t)frames_per_buffer * num_singers);
+    std::vector<float> output(frames_per_buffer);
+    const double vocal_seconds = (double)info.frames / SAMPLE_RATE;
+    std::cout << "🖥️  Rendering " << vocal_file << " offline (" << std::fixed << std::setprecision(1)
+              << vocal_seconds << "s, " << num_singers << " singer(s))..." << std::defaultfloat << std::endl;
+    g_events.emit("state", {{"state", "rendering"}, {"vocal", vocal_file}, {"duration", vocal_seconds},
+                            {"singers", num_singers}});
+    
+    uint64_t frames_rendered = 0;
+    uint64_t buffers = 0;
+    double callback_total_us = 0.0;
+    double callback_max_us = 0.0;
+    auto render_start = std::chrono::steady_clock::now();
+    while (!g_quit_requested) {
+        sf_count_t got = sf_readf_float(vocal, input.data(), frames_per_buffer);
+        if (got <= 0) {
+            break;
         }
-    }
-    
-    // Initialize processed audio buffer
-    std::vector<float> processed_audio(FRAMES_PER_BUFFER);
-    
-    // Apply autotune with variable strength
-    if (data->last_confidence > 0.5f && data->last_pitch > 0.0f && target_pitch > 0.0f) {
-        float base_shift_ratio = target_pitch / data->last_pitch;
         
-        // Apply autotune strength (0.0 = original pitch, 1.0 = full autotune)
-        float shift_ratio = 1.0f + (base_shift_ratio - 1.0f) * data->autotune_strength;
+        // Decode the instrumental on this thread; nothing reads ahead without a sound card
+        data.instrumental->prefetch((size_t)got);
         
-        // Apply additional pitch shift
-        float semitone_shift = pow(2.0f, data->pitch_shift_amount / 12.0f);
-        shift_ratio *= semitone_shift;
-        
-        // Debug output for autotune and pitch shift
-        static int effect_debug_counter = 0;
-        if (effect_debug_counter++ % 1000 == 0) {  // Print every 1000th callback
-            std::cout << "🎵 Effects applied - Autotune: " << data->autotune_strength 
-                      << ", Pitch shift: " << data->pitch_shift_amount << " semitones" << std::endl;
+        // The recorder only writes at disk speed, so wait for room instead of dropping the mix
+        while (data.recording_queue->space() < (size_t)got) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(1));
         }
         
-        // Process audio with new ratio
-        for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-            int shifted_idx = (int)(i * shift_ratio);
-            if (shifted_idx < FRAMES_PER_BUFFER) {
-                processed_audio[i] = in[shifted_idx];
-            } else {
-                processed_audio[i] = 0.0f;
-            }
-        }
-    } else {
-        // If no autotune, copy input directly
-        static int no_effect_debug_counter = 0;
-        if (no_effect_debug_counter++ % 1000 == 0) {  // Print every 1000th callback
-            std::cout << "🔇 No effects - Autotune: " << data->autotune_strength 
-                      << ", Pitch shift: " << data->pitch_shift_amount << " semitones" << std::endl;
-        }
-        
-        for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-            processed_audio[i] = in[i];
+        auto callback_start = std::chrono::steady_clock::now();
+        if (audioCallback(input.data(), output.data(), (unsigned long)got, nullptr, 0, &data) != paContinue) {
+            std::cerr << "❌ Audio callback aborted after " << frames_rendered << " frames" << std::endl;
+            break;
         }
+        double callback_us = std::chrono::duration<double, std::micro>(std::chrono::steady_clock::now() - callback_start).count();
+        callback_total_us += callback_us;
+        callback_max_us = std::max(callback_max_us, callback_us);
+        frames_rendered += (uint64_t)got;
+        buffers++;
+    }
+    double render_seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - render_start).count();
+    sf_close(vocal);
+    
+    std::cout << "💾 Finalizing recording..." << std::endl;
+    recorder.stop();
+    
+    // Real-time factor = processing time / audio time, so below 1.0 is faster than real time
+    const double audio_seconds = (double)frames_rendered / SAMPLE_RATE;
+    const double buffer_deadline_us = 1e6 * frames_per_buffer / SAMPLE_RATE;
+    const double rtf = audio_seconds > 0.0 ? render_seconds / audio_seconds : 0.0;
+    std::cout << "⏱️  Rendered " << std::fixed << std::setprecision(2) << audio_seconds << "s of audio in "
+              << render_seconds << "s | RTF: " << std::setprecision(3) << rtf
+              << " (" << std::setprecision(1) << (rtf > 0.0 ? 1.0 / rtf : 0.0) << "x real time)" << std::endl;
+    if (buffers > 0) {
+        std::cout << "⏱️  Callback: mean " << callback_total_us / buffers << "us, max " << callback_max_us
+                  << "us per " << frames_per_buffer << "-frame buffer (deadline " << buffer_deadline_us << "us)" << std::endl;
+    }
+    std::cout << std::defaultfloat;
+    g_events.emit("recording", {{"path", output_file}, {"seconds", recorder.getDurationSeconds()},
+                                {"dropped", data.recording_queue->droppedCount()}, {"rtf", rtf}});
+    g_events.emit("state", {{"state", "stopped"}, {"interrupted", (bool)g_quit_requested}});
+    return g_quit_requested ? 1 : 0;
+}
+
+// Long-lived engine: the devices stay open and decoded songs stay cached between sessions,
+// which are started and stopped over a Unix socket (see engine_daemon.h)
+int runDaemon(const LatencyProfile& profile, int pitch_hop, int num_singers, const std::string& socket_path) {
+    PaError err = Pa_Initialize();
+    if (err != paNoError) {
+        std::cerr << "❌ PortAudio initialization failed: " << Pa_GetErrorText(err) << std::endl;
+        return 1;
     }
     
-    // Apply noise suppression
-    if (data->noise_suppressor) {
-        data->noise_suppressor->processAudio(processed_audio.data(), processed_audio.data(), FRAMES_PER_BUFFER);
+    PaDeviceIndex inputDevice = findDefaultInputDevice();
+    PaDeviceIndex outputDevice = findDefaultOutputDevice();
+    if (inputDevice == paNoDevice || outputDevice == paNoDevice) {
+        std::cerr << "❌ No " << (inputDevice == paNoDevice ? "input" : "output") << " device found!" << std::endl;
+        Pa_Terminate();
+        return 1;
     }
-    
-    // Dynamic mixing based on voice and instrument volume settings
-    static int volume_debug_counter = 0;
-    if (volume_debug_counter++ % 1000 == 0) {  // Print every 1000th callback
-        std::cout << "🔊 Audio mixing - Instrument vol: " << data->instrument_volume 
-                  << ", Voice vol: " << data->voice_volume << std::endl;
+    if (Pa_GetDeviceInfo(inputDevice)->maxInputChannels < num_singers) {
+        std::cerr << "❌ " << num_singers << " singers need " << num_singers << " input channels, but "
+                  << Pa_GetDeviceInfo(inputDevice)->name << " has " << Pa_GetDeviceInfo(inputDevice)->maxInputChannels << std::endl;
+        Pa_Terminate();
+        return 1;
     }
+    std::cout << "🎤 Input device: " << Pa_GetDeviceInfo(inputDevice)->name << std::endl;
+    std::cout << "🔊 Output device: " << Pa_GetDeviceInfo(outputDevice)->name << std::endl;
     
-    for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-        out[i] = data->instrument_volume * instrumental_chunk[i] + data->voice_volume * processed_audio[i];
-        
-        // Apply chorus effect if enabled
-        if (data->enable_chorus) {
-            // Simple chorus implementation
-            float chorus_offset = sin(data->current_time * 2.0f * M_PI * 0.5f) * data->chorus_depth;
-            int chorus_idx = (int)(i + chorus_offset) % FRAMES_PER_BUFFER;
-            out[i] += 0.3f * processed_audio[chorus_idx];
-            
-            // Debug output for chorus (only once per buffer)
-            if (i == 0) {
-                static int chorus_debug_counter = 0;
-                if (chorus_debug_counter++ % 1000 == 0) {  // Print every 1000th buffer
-                    std::cout << "🎭 Chorus enabled - Depth: " << data->chorus_depth << std::endl;
-                }
-            }
-        }
-        
-        // Clamp to prevent clipping
-        if (out[i] > 1.0f) out[i] = 1.0f;
-        if (out[i] < -1.0f) out[i] = -1.0f;
+    EngineDaemon daemon;
+    daemon.init(num_singers, profile, pitch_hop);
+    daemon.setEventStream(&g_events);
+    if (const char* budget_env = std::getenv("KARAOKE_SONG_CACHE_MB")) {
+        daemon.getSongCache().setBudgetBytes((size_t)std::max(1, std::atoi(budget_env)) << 20);
     }
     
-    data->current_time += (float)FRAMES_PER_BUFFER / SAMPLE_RATE;
-    
-    // Record the mixed audio output for saving later
-    for (int i = 0; i < FRAMES_PER_BUFFER; i++) {
-        data->recording_frames.push_back(out[i]);
+    PaStream* stream;
+    err = openEngineStream(&stream, inputDevice, outputDevice, num_singers, profile, EngineDaemon::streamCallback, &daemon);
+    if (err != paNoError) {
+        std::cerr << "❌ Could not open audio stream: " << Pa_GetErrorText(err) << std::endl;
+        Pa_Terminate();
+        return 1;
     }
-    
-    // Debug: Print recording progress every 1000 frames
-    static int recording_debug_counter = 0;
-    if (recording_debug_counter++ % 1000 == 0) {
-        std::cout << "🎙️  Recording frames collected: " << data->recording_frames.size() 
-                  << " (" << (data->recording_frames.size() / (float)SAMPLE_RATE) << "s)" << std::endl;
+    if (!daemon.start(stream, socket_path)) {
+        Pa_CloseStream(stream);
+        Pa_Terminate();
+        return 1;
     }
     
-    // Update history for plotting
-    data->pitch_history.push_back(data->last_pitch);
-    data->target_history.push_back(target_pitch);
-    data->time_history.push_back(data->current_time);
+    signal(SIGINT, signalHandler);
+    signal(SIGTERM, signalHandler);
+#ifndef _WIN32
+    signal(SIGPIPE, SIG_IGN);   // A client hanging up must not kill the daemon
+#endif
     
-    if (data->pitch_history.size() > PLOT_HISTORY) {
-        data->pitch_history.pop_front();
-        data->target_history.pop_front();
-        data->time_history.pop_front();
-    }
+    const char* telemetry_env = std::getenv("KARAOKE_TELEMETRY_SHM");
+    PitchStream pitch_stream;
+    pitch_stream.startFromEnv(telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME);
     
-    // Cleanup
-    del_fvec(input_vec);
-    del_fvec(pitch_output);
+    while (!g_quit_requested && daemon.isRunning()) {
+        daemon.poll(50);
+    }
     
-    return paContinue;
+    pitch_stream.stop();
+    daemon.stop();
+    Pa_CloseStream(stream);
+    Pa_Terminate();
+    std::cout << "✅ Daemon stopped" << std::endl;
+    return 0;
 }
 
-void drawPlot(SDL_Renderer* renderer, const AudioData& data) {
-    // Clear screen
-    SDL_SetRenderDrawColor(renderer, 0, 0, 0, 255);
-    SDL_RenderClear(renderer);
-    
-    // Draw grid
-    SDL_SetRenderDrawColor(renderer, 50, 50, 50, 255);
-    for (int i = 0; i <= 10; i++) {
-        int x = (PLOT_WIDTH * i) / 10;
-        SDL_RenderDrawLine(renderer, x, 0, x, PLOT_HEIGHT);
-    }
-    for (int i = 0; i <= 8; i++) {
-        int y = (PLOT_HEIGHT * i) / 8;
-        SDL_RenderDrawLine(renderer, 0, y, PLOT_WIDTH, y);
-    }
-    
-    // Draw pitch history (green)
-    if (data.pitch_history.size() > 1) {
-        SDL_SetRenderDrawColor(renderer, 0, 255, 0, 255);
-        for (size_t i = 1; i < data.pitch_history.size(); i++) {
-            float pitch1 = data.pitch_history[i-1];
-            float pitch2 = data.pitch_history[i];
-            float time1 = data.time_history[i-1];
-            float time2 = data.time_history[i];
-            
-            if (pitch1 > 0 && pitch2 > 0) {
-                int x1 = (int)((time1 - data.time_history.front()) * 100) % PLOT_WIDTH;
-                int x2 = (int)((time2 - data.time_history.front()) * 100) % PLOT_WIDTH;
-                int y1 = PLOT_HEIGHT - (int)((pitch1 - 50) * PLOT_HEIGHT / 800);
-                int y2 = PLOT_HEIGHT - (int)((pitch2 - 50) * PLOT_HEIGHT / 800);
-                
-                y1 = std::max(0, std::min(PLOT_HEIGHT-1, y1));
-                y2 = std::max(0, std::min(PLOT_HEIGHT-1, y2));
-                
-                SDL_RenderDrawLine(renderer, x1, y1, x2, y2);
-            }
-        }
-    }
-    
-    // Draw target melody (red)
-    if (data.target_history.size() > 1) {
-        SDL_SetRenderDrawColor(renderer, 255, 0, 0, 255);
-        for (size_t i = 1; i < data.target_history.size(); i++) {
-            float target1 = data.target_history[i-1];
-            float target2 = data.target_history[i];
-            float time1 = data.time_history[i-1];
-            float time2 = data.time_history[i];
-            
-            if (target1 > 0 && target2 > 0) {
-                int x1 = (int)((time1 - data.time_history.front()) * 100) % PLOT_WIDTH;
-                int x2 = (int)((time2 - data.time_history.front()) * 100) % PLOT_WIDTH;
-                int y1 = PLOT_HEIGHT - (int)((target1 - 50) * PLOT_HEIGHT / 800);
-                int y2 = PLOT_HEIGHT - (int)((target2 - 50) * PLOT_HEIGHT / 800);
-                
-                y1 = std::max(0, std::min(PLOT_HEIGHT-1, y1));
-                y2 = std::max(0, std::min(PLOT_HEIGHT-1, y2));
-                
-                SDL_RenderDrawLine(renderer, x1, y1, x2, y2);
-            }
+int main(int argc, char* argv[]) {
+    if (argc >= 3 && std::string(argv[1]) == "--ingest") {
+        return runIngest(argc, argv);
+    }
+    auto startup_begin = std::chrono::steady_clock::now();
+    g_events.openFromEnv();
+    
+    // Pull the option flags out of argv so the positional arguments below are unchanged
+    const char* profile_name = std::getenv("KARAOKE_LATENCY_PROFILE");
+    const char* singers_env = std::getenv("KARAOKE_SINGERS");
+    int num_singers = singers_env ? std::atoi(singers_env) : 1;
+    std::vector<std::string> singer_melody_files;   // Melodies for singers 2..N, in order
+    std::string offline_vocal_file;                 // Render this dry vocal instead of opening devices
+    std::string offline_output_file;
+    const char* headless_env = std::getenv("KARAOKE_HEADLESS");
+    bool headless = headless_env && std::atoi(headless_env) != 0;   // No plot window, telemetry only
+    bool daemon_mode = false;                       // Stay resident and take songs over a socket
+    const char* daemon_socket_env = std::getenv("KARAOKE_DAEMON_SOCKET");
+    std::string daemon_socket = daemon_socket_env ? daemon_socket_env : "karaoke_daemon.sock";
+    std::vector<char*> positional_args;
+    for (int i = 0; i < argc; i++) {
+        std::string arg = argv[i];
+        if (arg == "--latency-profile" && i + 1 < argc) {
+            profile_name = argv[++i];
+        } else if (arg.rfind("--latency-profile=", 0) == 0) {
+            profile_name = argv[i] + std::strlen("--latency-profile=");
+        } else if (arg == "--singers" && i + 1 < argc) {
+            num_singers = std::atoi(argv[++i]);
+        } else if (arg == "--singer-melody" && i + 1 < argc) {
+            singer_melody_files.push_back(argv[++i]);
+        } else if (arg == "--offline" && i + 1 < argc) {
+            offline_vocal_file = argv[++i];
+        } else if (arg == "--output" && i + 1 < argc) {
+            offline_output_file = argv[++i];
+        } else if (arg == "--headless") {
+            headless = true;
+        } else if (arg == "--daemon") {
+            daemon_mode = true;
+        } else if (arg == "--daemon-socket" && i + 1 < argc) {
+            daemon_socket = argv[++i];
+        } else {
+            positional_args.push_back(argv[i]);
         }
     }
-    
-    // Draw noise suppression info
-    if (data.noise_suppressor) {
-        float vad_prob = data.noise_suppressor->getVADProbability();
-        float noise_level = data.noise_suppressor->getNoiseLevel();
-        bool voice_active = data.noise_suppressor->isVoiceActive();
-        
-        // Draw VAD probability bar (top right)
-        int bar_width = 100;
-        int bar_height = 20;
-        int bar_x = PLOT_WIDTH - bar_width - 10; // Adjusted to be relative to plot width
-        int bar_y = 10;
-        
-        // Background
-        SDL_SetRenderDrawColor(renderer, 50, 50, 50, 255);
-        SDL_Rect bar_bg = {bar_x, bar_y, bar_width, bar_height};
-        SDL_RenderFillRect(renderer, &bar_bg);
-        
-        // VAD level
-        SDL_SetRenderDrawColor(renderer, 
-            voice_active ? 0 : 255, 
-            voice_active ? 255 : 0, 
-            0, 255);
-        int vad_width = (int)(bar_width * vad_prob);
-        SDL_Rect vad_bar = {bar_x, bar_y, vad_width, bar_height};
-        SDL_RenderFillRect(renderer, &vad_bar);
-        
-        // Border
-        SDL_SetRenderDrawColor(renderer, 200, 200, 200, 255);
-        SDL_RenderDrawRect(renderer, &bar_bg);
-        
-        // Text
-        char info_text[128];
-        snprintf(info_text, sizeof(info_text), "VAD: %.1f%% Noise: %.3f", 
-                vad_prob * 100.0f, noise_level);
-        
-        // Simple text rendering (you might want to use SDL_ttf for better text)
-        // For now, we'll just show the info in the console
-        static int info_counter = 0;
-        if (++info_counter % 100 == 0) { // Update every 100 frames
-            std::cout << "🎤 VAD: " << (vad_prob * 100.0f) << "%, Noise: " << noise_level 
-                      << ", Voice: " << (voice_active ? "ON" : "OFF") << std::endl;
+    positional_args.push_back(nullptr);
+    argc = (int)positional_args.size() - 1;
+    argv = positional_args.data();
+#ifdef KARAOKE_HEADLESS
+    headless = true;   // Built without SDL
+#endif
+    
+    const LatencyProfile* profile = findLatencyProfile(profile_name ? profile_name : DEFAULT_LATENCY_PROFILE);
+    if (!profile) {
+        std::cerr << "❌ Unknown latency profile: " << profile_name << std::endl;
+        g_events.error(std::string("Unknown latency profile: ") + profile_name);
+        for (const LatencyProfile& p : LATENCY_PROFILES) {
+            std::cerr << "   " << p.name << " - " << p.description << std::endl;
         }
+        return 1;
     }
-    
-    SDL_RenderPresent(renderer);
-}
-
-
-
-// Function to save recording as WAV file
-void saveRecording(const std::vector<float>& recording_frames, const std::string& filename) {
-    if (recording_frames.empty()) {
-        std::cout << "❌ No recording data to save!" << std::endl;
-        return;
+    if (num_singers < 1 || num_singers > MAX_SINGERS) {
+        std::cerr << "❌ --singers must be between 1 and " << MAX_SINGERS << std::endl;
+        return 1;
     }
     
-    std::ofstream file(filename, std::ios::binary);
-    if (!file.is_open()) {
-        std::cout << "❌ Could not open file for writing: " << filename << std::endl;
-        return;
+    // The pitch hop sets how often each singer's pitch is re-estimated
+    int pitch_hop = profile->pitchHop;
+    if (const char* hop_env = std::getenv("KARAOKE_PITCH_HOP")) {
+        pitch_hop = std::max(64, std::min(profile->pitchWindow, std::atoi(hop_env)));
     }
     
-    // WAV header
-    const int sampleRate = SAMPLE_RATE;
-    const int numChannels = 1;
-    const int bitsPerSample = 16;
-    const int byteRate = sampleRate * numChannels * bitsPerSample / 8;
-    const int blockAlign = numChannels * bitsPerSample / 8;
-    const int dataSize = recording_frames.size() * sizeof(int16_t);
-    const int fileSize = 36 + dataSize;
-    
-    // Write WAV header
-    file.write("RIFF", 4);
-    file.write(reinterpret_cast<const char*>(&fileSize), 4);
-    file.write("WAVE", 4);
-    file.write("fmt ", 4);
-    
-    int32_t fmtSize = 16;
-    file.write(reinterpret_cast<const char*>(&fmtSize), 4);
-    
-    int16_t audioFormat = 1; // PCM
-    file.write(reinterpret_cast<const char*>(&audioFormat), 2);
-    
-    file.write(reinterpret_cast<const char*>(&numChannels), 2);
-    file.write(reinterpret_cast<const char*>(&sampleRate), 4);
-    file.write(reinterpret_cast<const char*>(&byteRate), 4);
-    file.write(reinterpret_cast<const char*>(&blockAlign), 2);
-    file.write(reinterpret_cast<const char*>(&bitsPerSample), 2);
-    
-    file.write("data", 4);
-    file.write(reinterpret_cast<const char*>(&dataSize), 4);
-    
-    // Write audio data
-    for (float sample : recording_frames) {
-        // Convert float to int16_t
-        int16_t intSample = static_cast<int16_t>(sample * 32767.0f);
-        file.write(reinterpret_cast<const char*>(&intSample), 2);
+    if (daemon_mode) {
+        return runDaemon(*profile, pitch_hop, num_singers, daemon_socket);
     }
     
-    file.close();
-    std::cout << "✅ Recording saved to " << filename << std::endl;
-    std::cout << "📊 Duration: " << recording_frames.size() / (float)SAMPLE_RATE << "s" << std::endl;
-}
-
-int main(int argc, char* argv[]) {
     std::cout << "🎵 C++ Karaoke System with Dynamic Song Loading" << std::endl;
     std::cout << "💡 Tip: Use 'python3 song_finder.py --list' to see available songs" << std::endl;
     std::cout << "🚀 Recommended: Use 'python3 run_karaoke.py <song_name>' for best experience" << std::endl;
@@ -636,12 +422,29 @@ int main(int argc, char* argv[]) {
         std::cout << "🎤 Voice effect parameters (optional):" << std::endl;
         std::cout << "   autotune_strength (0.0-1.0) pitch_shift (-12 to +12) voice_volume (0.5-2.0) instrument_volume (0.0-2.0)" << std::endl;
         std::cout << "   enable_chorus (0/1) chorus_depth (0.0-1.0) enable_reverb (0/1) reverb_wetness (0.0-1.0)" << std::endl;
+        std::cout << "⏱️  Latency profile (optional, or KARAOKE_LATENCY_PROFILE):" << std::endl;
+        for (const LatencyProfile& p : LATENCY_PROFILES) {
+            std::cout << "   --latency-profile " << p.name << " - " << p.description << std::endl;
+        }
+        std::cout << "🎤 Duet / group mode (optional, or KARAOKE_SINGERS):" << std::endl;
+        std::cout << "   --singers N                 one microphone per input channel, each with its own autotune" << std::endl;
+        std::cout << "   --singer-melody path.txt    melody for the next singer (2, 3, ...); others follow the song" << std::endl;
+        std::cout << "🖥️  Offline render (no audio devices or window):" << std::endl;
+        std::cout << "   --offline vocal.wav         run the dry vocal through the chain as fast as possible" << std::endl;
+        std::cout << "   --output mix.wav            where to write the mix (default: output/<song>_<timestamp>.wav)" << std::endl;
+        std::cout << "📟 Headless (optional, or KARAOKE_HEADLESS=1):" << std::endl;
+        std::cout << "   --headless                  no plot window; pitch telemetry only on shared memory (see pitch-viewer)" << std::endl;
+        std::cout << "🎛️ Engine daemon (devices stay open, songs stay decoded between sessions):" << std::endl;
+        std::cout << "   --daemon [--daemon-socket path]   take load/start/stop/status/quit commands on a Unix socket" << std::endl;
+        std::cout << "                                     (default karaoke_daemon.sock, or KARAOKE_DAEMON_SOCKET)" << std::endl;
         std::cout << "💡 Examples:" << std::endl;
         std::cout << "   " << argv[0] << " Taylor_Swift_-_Love_Story" << std::endl;
         std::cout << "   " << argv[0] << " songs/my_song/my_song_melody.txt" << std::endl;
         std::cout << "   " << argv[0] << " melody.txt instrumental.wav" << std::endl;
         std::cout << "   " << argv[0] << " MySong melody.txt instrumental.wav" << std::endl;
         std::cout << "   " << argv[0] << " MySong melody.txt instrumental.wav 0.8 2 1.2 2.0 1 0.1 1 0.3" << std::endl;
+        std::cout << "   " << argv[0] << " --offline take1.wav --output take1_mix.wav MySong melody.txt instrumental.wav" << std::endl;
+        std::cout << "💾 Pre-convert instrumentals: " << argv[0] << " --ingest path/to/instrumental.wav [...]" << std::endl;
         std::cout << "🔍 To see available songs: python3 song_finder.py --list" << std::endl;
         std::cout << "🚀 Recommended: python3 run_karaoke.py <song_name>" << std::endl;
         std::cout << "📁 Directory structure:" << std::endl;
@@ -759,172 +562,161 @@ int main(int argc, char* argv[]) {
         }
     }
     
-    // Initialize SDL2 for plotting
-    if (SDL_Init(SDL_INIT_VIDEO) < 0) {
-        std::cerr << "❌ SDL2 initialization failed: " << SDL_GetError() << std::endl;
-        return 1;
-    }
-    
-    SDL_Window* window = SDL_CreateWindow("Karaoke Pitch Plot", 
-                                         SDL_WINDOWPOS_UNDEFINED, SDL_WINDOWPOS_UNDEFINED,
-                                         PLOT_WIDTH, PLOT_HEIGHT, SDL_WINDOW_SHOWN);
-    if (!window) {
-        std::cerr << "❌ Could not create window: " << SDL_GetError() << std::endl;
-        SDL_Quit();
-        return 1;
-    }
-    
-    SDL_Renderer* renderer = SDL_CreateRenderer(window, -1, SDL_RENDERER_ACCELERATED);
-    if (!renderer) {
-        std::cerr << "❌ Could not create renderer: " << SDL_GetError() << std::endl;
-        SDL_DestroyWindow(window);
-        SDL_Quit();
-        return 1;
-    }
+    g_events.emit("state", {{"state", "loading"}, {"song", song_name}, {"melody", melody_file},
+                            {"instrumental", instrumental_file}});
     
-    // Initialize PortAudio
-    PaError err = Pa_Initialize();
-    if (err != paNoError) {
-        std::cerr << "❌ PortAudio initialization failed: " << Pa_GetErrorText(err) << std::endl;
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
-        return 1;
+    // Prefer the ingested mono copy at the engine rate so no conversion runs during the session
+    std::cout << "🎼 Loading instrumental..." << std::endl;
+    ResampleCache resample_cache;
+    std::string playable_file = instrumental_file;
+    if (resample_cache.lookup(instrumental_file, SAMPLE_RATE, &playable_file)) {
+        if (playable_file != instrumental_file) {
+            std::cout << "⚡ Using cached " << SAMPLE_RATE << "Hz mono copy: " << playable_file << std::endl;
+        }
+    } else {
+        playable_file = instrumental_file;
+        std::cout << "💡 Not ingested yet, converting while streaming. Run: " << argv[0] 
+                  << " --ingest \"" << instrumental_file << "\"" << std::endl;
     }
     
-    // Load instrumental audio
-    std::cout << "🎼 Loading instrumental..." << std::endl;
-    SF_INFO sfinfo;
-    sfinfo.format = 0;
-    SNDFILE* sndfile = sf_open(instrumental_file.c_str(), SFM_READ, &sfinfo);
-    if (!sndfile) {
+    // Open instrumental audio; decoding happens on a read-ahead thread once the stream starts
+    StreamingInstrumental instrumental;
+    if (!instrumental.open(playable_file, SAMPLE_RATE)) {
         std::cerr << "❌ Could not open instrumental file: " << instrumental_file << std::endl;
+        g_events.error("Could not open instrumental file: " + instrumental_file);
         std::cerr << "💡 Try using: python3 song_finder.py " << song_name << std::endl;
         std::cerr << "🚀 Or use: python3 run_karaoke.py " << song_name << std::endl;
-        Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
-    std::cout << "📊 WAV Info - Channels: " << sfinfo.channels << ", Sample Rate: " << sfinfo.samplerate << "Hz, Frames: " << sfinfo.frames << std::endl;
-    
-    // Handle stereo files by converting to mono and resampling if needed
-    std::vector<float> instrumental;
-    if (sfinfo.channels == 2) {
-        // Stereo file - read all samples and convert to mono
-        std::vector<float> stereo_data(sfinfo.frames * sfinfo.channels);
-        sf_read_float(sndfile, stereo_data.data(), sfinfo.frames * sfinfo.channels);
-        
-        // Convert stereo to mono by averaging channels
-        instrumental.resize(sfinfo.frames);
-        for (int i = 0; i < sfinfo.frames; i++) {
-            instrumental[i] = (stereo_data[i * 2] + stereo_data[i * 2 + 1]) * 0.5f;
-        }
-        std::cout << "🔄 Converted stereo to mono" << std::endl;
-    } else {
-        // Mono file - read directly
-        instrumental.resize(sfinfo.frames);
-        sf_read_float(sndfile, instrumental.data(), sfinfo.frames);
-    }
-    
-    // Resample if sample rate doesn't match target
-    if (sfinfo.samplerate != SAMPLE_RATE) {
-        std::cout << "🔄 Resampling from " << sfinfo.samplerate << "Hz to " << SAMPLE_RATE << "Hz" << std::endl;
-        
-        // Simple linear interpolation resampling
-        float ratio = (float)SAMPLE_RATE / sfinfo.samplerate;
-        int new_size = (int)(instrumental.size() * ratio);
-        std::vector<float> resampled(new_size);
-        
-        for (int i = 0; i < new_size; i++) {
-            float old_pos = i / ratio;
-            int old_idx = (int)old_pos;
-            float fraction = old_pos - old_idx;
-            
-            if (old_idx >= (int)instrumental.size() - 1) {
-                resampled[i] = instrumental.back();
-            } else {
-                resampled[i] = instrumental[old_idx] * (1.0f - fraction) + instrumental[old_idx + 1] * fraction;
-            }
-        }
-        
-        instrumental = std::move(resampled);
-        std::cout << "✅ Resampled to " << instrumental.size() << " samples" << std::endl;
-    }
-    
-    sf_close(sndfile);
-    std::cout << "✅ Loaded " << instrumental.size() << " samples" << std::endl;
-    
     // Load melody map from generated header
     std::vector<std::pair<float, float>> melody_map = loadMelodyMap(melody_file);
     
     if (melody_map.empty()) {
         std::cerr << "❌ Failed to load melody map from: " << melody_file << std::endl;
+        g_events.error("Failed to load melody map from: " + melody_file);
         std::cerr << "💡 Try using: python3 song_finder.py " << song_name << std::endl;
         std::cerr << "🚀 Or use: python3 run_karaoke.py " << song_name << std::endl;
-        Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
-    // Initialize aubio pitch detector with safe parameters
-    aubio_pitch_t* pitch_detector = new_aubio_pitch("default", 2048, FRAMES_PER_BUFFER, SAMPLE_RATE);
-    if (!pitch_detector) {
-        std::cerr << "❌ Failed to create aubio pitch detector!" << std::endl;
-        Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
-        return 1;
-    }
-    aubio_pitch_set_unit(pitch_detector, "Hz");
-    aubio_pitch_set_silence(pitch_detector, -50);  // Lower silence threshold for better detection
-    
-    // Initialize noise suppressor
-    SimpleNoiseSuppressor* noise_suppressor = new SimpleNoiseSuppressor();
-    if (!noise_suppressor) {
-        std::cerr << "❌ Failed to create noise suppressor!" << std::endl;
-        del_aubio_pitch(pitch_detector);
-        Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
-        return 1;
+    // Each singer gets its own melody map: singer 1 follows the song, the rest
+    // follow --singer-melody files in order, falling back to the song melody
+    std::vector<std::vector<std::pair<float, float>>> singer_melodies(num_singers, melody_map);
+    for (size_t i = 0; i < singer_melody_files.size() && (int)i + 1 < num_singers; i++) {
+        singer_melodies[i + 1] = loadMelodyMap(singer_melody_files[i]);
+        if (singer_melodies[i + 1].empty()) {
+            std::cerr << "❌ Failed to load melody map for singer " << (i + 2) << ": " << singer_melody_files[i] << std::endl;
+            g_events.error("Failed to load melody map for singer " + std::to_string(i + 2) + ": " + singer_melody_files[i]);
+            return 1;
+        }
     }
     
-    // Initialize and configure noise suppressor
-    noise_suppressor->init(SAMPLE_RATE);
-    noise_suppressor->setNoiseGateThreshold(0.01f);  // 1% threshold
-    noise_suppressor->setVADThreshold(0.3f);         // 30% VAD threshold
-    noise_suppressor->setGracePeriod(200);           // 200ms grace period
-    noise_suppressor->setNoiseReductionStrength(0.6f); // 60% noise reduction
+    // One chain per singer: pitch analyzer, autotune shifter and noise suppressor, all preallocated here
+    std::vector<std::unique_ptr<SingerChain>> singer_chains;
+    std::vector<SingerChain*> singers;
+    for (int s = 0; s < num_singers; s++) {
+        singer_chains.push_back(std::make_unique<SingerChain>());
+        if (!singer_chains.back()->init(s, SAMPLE_RATE, *profile, pitch_hop, singer_melodies[s])) {
+            return 1;
+        }
+        singers.push_back(singer_chains.back().get());
+    }
+    const SingerChain& lead_singer = *singers[0];
+    std::cout << "🔇 Spectral suppression latency: " << lead_singer.getNoiseSuppressor().getLatencyFrames() << " samples ("
+              << (1000.0f * lead_singer.getNoiseSuppressor().getLatencyFrames() / SAMPLE_RATE) << " ms)" << std::endl;
+    std::cout << "🎵 Pitch shifter latency: " << lead_singer.getPitchShifter().getLatencyFrames() << " samples ("
+              << (1000.0f * lead_singer.getPitchShifter().getLatencyFrames() / SAMPLE_RATE) << " ms)" << std::endl;
+    
+    SingerPool singer_pool;
+    singer_pool.start(singers, SingerPool::recommendedWorkers(num_singers));
+    if (num_singers > 1) {
+        std::cout << "🎤 " << num_singers << " singers, " << (singer_pool.getWorkerCount() + 1)
+                  << " DSP thread(s), per-singer budget " << std::fixed << std::setprecision(1)
+                  << singer_pool.getPerSingerBudgetPercent(VOICE_CPU_BUDGET_PERCENT) << "% of each buffer"
+                  << std::defaultfloat << std::endl;
+    }
+    
+    // Chorus and reverb state is sized here so the callback never allocates
+    Chorus chorus;
+    chorus.init(SAMPLE_RATE, profile->framesPerBuffer);
+    chorus.setDepth(chorus_depth);
+    Reverb reverb;
+    reverb.init(SAMPLE_RATE, profile->framesPerBuffer);
+    reverb.setWetness(reverb_wetness);
     
     // Setup audio data
     AudioData audio_data;
-    audio_data.instrumental = instrumental;
-    audio_data.instrumental_pos = 0;
-    audio_data.melody_map = melody_map;
+    audio_data.instrumental = &instrumental;
     audio_data.current_time = 0.0f;
-    audio_data.pitch_detector = pitch_detector;
-    audio_data.last_pitch = 0.0f;
-    audio_data.last_confidence = 0.0f;
+    audio_data.singers = singers;
+    audio_data.singer_pool = &singer_pool;
     audio_data.recording_enabled = true;  // Enable recording
-    audio_data.recording_frames.clear();
-    audio_data.noise_suppressor = noise_suppressor; // Assign noise suppressor
+    
+    // Lock-free queues between the audio callback and its consumers
+    SpscRingBuffer<PitchFrame> plot_queue(PITCH_QUEUE_SIZE);
+    SpscRingBuffer<float> recording_queue(RECORDING_QUEUE_SIZE);
+    audio_data.plot_queue = &plot_queue;
+    
+    // Shared-memory copy of the telemetry so pitch_viewer (or anything else) can render out of process
+    const char* telemetry_env = std::getenv("KARAOKE_TELEMETRY_SHM");
+    TelemetryWriter telemetry;
+    if (offline_vocal_file.empty()) {
+        telemetry.create(telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME);
+    }
+    audio_data.telemetry = telemetry.isOpen() ? &telemetry : nullptr;
+    audio_data.recording_queue = &recording_queue;
+    
+    // The callback logs through a lock-free queue drained by its own thread
+    RtLogger rt_logger;
+    rt_logger.setLevel(RtLogger::parseLevel(std::getenv("KARAOKE_LOG_LEVEL"), LogLevel::Info));
+    rt_logger.start();
+    audio_data.logger = &rt_logger;
     
     // Initialize voice effect parameters with parsed values
-    audio_data.autotune_strength = autotune_strength;
-    audio_data.pitch_shift_amount = pitch_shift_amount;
-    audio_data.voice_volume = voice_volume;
-    audio_data.instrument_volume = instrument_volume;
+    audio_data.params.autotune_strength.store(autotune_strength);
+    audio_data.params.pitch_shift.store(pitch_shift_amount);
+    audio_data.params.voice_volume.store(voice_volume);
+    audio_data.params.instrument_volume.store(instrument_volume);
     audio_data.enable_chorus = enable_chorus;
     audio_data.chorus_depth = chorus_depth;
+    audio_data.chorus = &chorus;
     audio_data.enable_reverb = enable_reverb;
     audio_data.reverb_wetness = reverb_wetness;
+    audio_data.reverb = &reverb;
+    
+    // Offline render: the same chain, driven from a file instead of the sound card
+    if (!offline_vocal_file.empty()) {
+        std::string output_filename = offline_output_file.empty()
+            ? generateUniqueFilename(cleanSongName(song_name))
+            : offline_output_file;
+        int result = renderOffline(audio_data, offline_vocal_file, output_filename, profile->framesPerBuffer);
+        singer_pool.stop();
+        instrumental.stop();
+        rt_logger.stop();
+        return result;
+    }
+    
+    // Pitch plot window; headless runs skip SDL entirely and rely on the shared-memory telemetry
+    PlotWindow plot_window;
+    double window_ms = 0.0;
+    if (!headless) {
+        auto window_begin = std::chrono::steady_clock::now();
+        if (!plot_window.open()) {
+            g_events.error("Could not open the plot window");
+            return 1;
+        }
+        window_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - window_begin).count();
+    }
+    
+    // Initialize PortAudio
+    auto devices_begin = std::chrono::steady_clock::now();
+    PaError err = Pa_Initialize();
+    if (err != paNoError) {
+        std::cerr << "❌ PortAudio initialization failed: " << Pa_GetErrorText(err) << std::endl;
+        g_events.error(std::string("PortAudio initialization failed: ") + Pa_GetErrorText(err));
+        return 1;
+    }
     
     // Find audio devices
     PaDeviceIndex inputDevice = findDefaultInputDevice();
@@ -932,41 +724,25 @@ int main(int argc, char* argv[]) {
     
     if (inputDevice == paNoDevice) {
         std::cerr << "❌ No input device found!" << std::endl;
-        del_aubio_pitch(pitch_detector);
-        delete noise_suppressor; // Clean up noise suppressor
+        g_events.error("No input device found");
         Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
     if (outputDevice == paNoDevice) {
         std::cerr << "❌ No output device found!" << std::endl;
-        del_aubio_pitch(pitch_detector);
-        delete noise_suppressor; // Clean up noise suppressor
+        g_events.error("No output device found");
         Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
-    // Setup input parameters
-    PaStreamParameters inputParameters;
-    inputParameters.device = inputDevice;
-    inputParameters.channelCount = NUM_CHANNELS;
-    inputParameters.sampleFormat = paFloat32;
-    inputParameters.suggestedLatency = Pa_GetDeviceInfo(inputDevice)->defaultLowInputLatency;
-    inputParameters.hostApiSpecificStreamInfo = nullptr;
-    
-    // Setup output parameters
-    PaStreamParameters outputParameters;
-    outputParameters.device = outputDevice;
-    outputParameters.channelCount = NUM_CHANNELS;
-    outputParameters.sampleFormat = paFloat32;
-    outputParameters.suggestedLatency = Pa_GetDeviceInfo(outputDevice)->defaultLowOutputLatency;
-    outputParameters.hostApiSpecificStreamInfo = nullptr;
+    if (Pa_GetDeviceInfo(inputDevice)->maxInputChannels < num_singers) {
+        std::cerr << "❌ " << num_singers << " singers need " << num_singers << " input channels, but "
+                  << Pa_GetDeviceInfo(inputDevice)->name << " has " << Pa_GetDeviceInfo(inputDevice)->maxInputChannels << std::endl;
+        g_events.error(std::to_string(num_singers) + " singers need more input channels than the device has");
+        Pa_Terminate();
+        return 1;
+    }
     
     // Open audio stream
     PaStream* stream;
@@ -977,64 +753,84 @@ int main(int argc, char* argv[]) {
     
     std::cout << "🎤 Input device: " << inputDeviceInfo->name << " (channels: " << inputDeviceInfo->maxInputChannels << ")" << std::endl;
     std::cout << "🔊 Output device: " << outputDeviceInfo->name << " (channels: " << outputDeviceInfo->maxOutputChannels << ")" << std::endl;
-    std::cout << "⚙️  Sample rate: " << SAMPLE_RATE << "Hz, Buffer size: " << FRAMES_PER_BUFFER << std::endl;
+    std::cout << "⚙️  Latency profile: " << profile->name << " | Sample rate: " << SAMPLE_RATE
+              << "Hz, Buffer size: " << profile->framesPerBuffer
+              << ", Pitch window/hop: " << profile->pitchWindow << "/" << pitch_hop << std::endl;
     
-    err = Pa_OpenStream(&stream,
-                        &inputParameters,
-                        &outputParameters,
-                        SAMPLE_RATE,
-                        FRAMES_PER_BUFFER,
-                        paClipOff,
-                        audioCallback, &audio_data);
+    err = openEngineStream(&stream, inputDevice, outputDevice, num_singers, *profile, audioCallback, &audio_data);
     
     if (err != paNoError) {
         std::cerr << "❌ Could not open audio stream: " << Pa_GetErrorText(err) << std::endl;
-        del_aubio_pitch(pitch_detector);
-        delete noise_suppressor; // Clean up noise suppressor
+        g_events.error(std::string("Could not open audio stream: ") + Pa_GetErrorText(err));
         Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
+    // Report what PortAudio actually negotiated; the voice also passes the spectral
+    // suppressor and the shifter, each with a fixed delay
+    if (const PaStreamInfo* stream_info = Pa_GetStreamInfo(stream)) {
+        double suppressor_ms = 1000.0 * lead_singer.getNoiseSuppressor().getLatencyFrames() / SAMPLE_RATE;
+        double shifter_ms = 1000.0 * lead_singer.getPitchShifter().getLatencyFrames() / SAMPLE_RATE;
+        double round_trip_ms = 1000.0 * (stream_info->inputLatency + stream_info->outputLatency) + suppressor_ms
+                               + shifter_ms;
+        std::cout << "⏱️  Negotiated latency - Input: " << std::fixed << std::setprecision(1)
+                  << 1000.0 * stream_info->inputLatency << "ms, Output: " << 1000.0 * stream_info->outputLatency
+                  << "ms, Suppressor: " << suppressor_ms << "ms, Shifter: " << shifter_ms << "ms, Round trip: ~"
+                  << round_trip_ms << "ms" << std::defaultfloat << std::endl;
+    }
+    
+    // Prime the instrumental ring and start read-ahead decoding
+    instrumental.start();
+    for (SingerChain* singer : singers) {
+        singer->start();
+    }
+    
     // Start stream
     err = Pa_StartStream(stream);
     if (err != paNoError) {
         std::cerr << "❌ Could not start stream: " << Pa_GetErrorText(err) << std::endl;
+        g_events.error(std::string("Could not start stream: ") + Pa_GetErrorText(err));
         Pa_CloseStream(stream);
-        del_aubio_pitch(pitch_detector);
-        delete noise_suppressor; // Clean up noise suppressor
         Pa_Terminate();
-        SDL_DestroyRenderer(renderer);
-        SDL_DestroyWindow(window);
-        SDL_Quit();
         return 1;
     }
     
-    // Extract clean song name for filename
-    std::string clean_song_name = song_name;
-    
-    // If it's a full path, extract just the song name
-    if (song_name.find('/') != std::string::npos) {
-        // Find the last directory name in the path
-        size_t last_slash = song_name.find_last_of("/\\");
-        if (last_slash != std::string::npos) {
-            clean_song_name = song_name.substr(last_slash + 1);
-            // Remove any file extensions
-            size_t dot_pos = clean_song_name.find('.');
-            if (dot_pos != std::string::npos) {
-                clean_song_name = clean_song_name.substr(0, dot_pos);
-            }
-        }
+    // Time from launch until audio is flowing, split into the window and the device setup
+    auto startup_end = std::chrono::steady_clock::now();
+    double devices_ms = std::chrono::duration<double, std::milli>(startup_end - devices_begin).count();
+    double startup_ms = std::chrono::duration<double, std::milli>(startup_end - startup_begin).count();
+    std::cout << "🚀 Startup: " << std::fixed << std::setprecision(1) << startup_ms << "ms (";
+    if (headless) {
+        std::cout << "headless";
+    } else {
+        std::cout << "window " << window_ms << "ms";
     }
+    std::cout << ", audio devices " << devices_ms << "ms)" << std::defaultfloat << std::endl;
     
     // Generate unique filename for this session
-    std::string output_filename = generateUniqueFilename(clean_song_name);
+    std::string output_filename = generateUniqueFilename(cleanSongName(song_name));
     
     // Set up global variables for signal handling
     g_output_filename = output_filename;
-    g_recording_frames = &audio_data.recording_frames;
+    
+    // Stream the mix to disk from a background thread for the whole session
+    WavRecorder recorder;
+    if (!recorder.start(output_filename, &recording_queue, SAMPLE_RATE, NUM_CHANNELS)) {
+        std::cerr << "⚠️  Recording disabled: could not open " << output_filename << std::endl;
+        audio_data.recording_enabled = false;
+    }
+    
+    // Live parameter updates arrive on a control thread, never on the audio thread
+    const char* control_socket_env = std::getenv("KARAOKE_CONTROL_SOCKET");
+    std::string control_socket = control_socket_env ? control_socket_env : "karaoke_control.sock";
+    ControlChannel control_channel;
+    control_channel.start(&audio_data.params, control_socket, "voice_params.txt");
+    
+    // Fixed-rate binary pitch feed for the web frontend, read back from the telemetry segment
+    PitchStream pitch_stream;
+    if (audio_data.telemetry) {
+        pitch_stream.startFromEnv(telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME);
+    }
     
     // Set up signal handlers
     signal(SIGINT, signalHandler);
@@ -1042,56 +838,116 @@ int main(int argc, char* argv[]) {
     
     std::cout << "🎤 C++ Karaoke with Recording started! Sing into your microphone..." << std::endl;
     std::cout << "🛑 Press Ctrl+C to stop" << std::endl;
-    std::cout << "📊 Green line = Your pitch, Red line = Target melody" << std::endl;
+    if (headless) {
+        std::cout << "📟 Headless: no plot window, pitch telemetry on shared memory "
+                  << (audio_data.telemetry ? (telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME) : "(unavailable)") << std::endl;
+    } else {
+        std::cout << "📊 Green line = Your pitch, Red line = Target melody" << std::endl;
+    }
     std::cout << "📹 Recording will be saved to " << output_filename << std::endl;
+    g_events.emit("state", {{"state", "playing"}, {"song", song_name}, {"duration", instrumental.getDurationSeconds()},
+                            {"output", audio_data.recording_enabled ? output_filename : std::string()},
+                            {"startup_ms", startup_ms}, {"profile", profile->name}, {"singers", num_singers}});
     
     // Main loop with plotting
     auto start_time = std::chrono::high_resolution_clock::now();
-    SDL_Event event;
     bool quit = false;
     
+    // Consumer-side state, only touched by this thread
+    PitchFrame latest_frame = {};
+    auto last_cpu_report = start_time;
+    auto last_progress_event = start_time;
+    uint64_t xruns_reported = 0;
+    const double buffer_deadline_us = 1e6 * profile->framesPerBuffer / SAMPLE_RATE;
+    const double singer_budget_percent = singer_pool.getPerSingerBudgetPercent(VOICE_CPU_BUDGET_PERCENT);
+    
     while (!quit && !g_quit_requested) {
-        // Handle SDL events
-        while (SDL_PollEvent(&event)) {
-            if (event.type == SDL_QUIT) {
-                quit = true;
-            }
+        // Handle window events (closing the window ends the session)
+        if (!plot_window.pollEvents()) {
+            quit = true;
         }
         
+        // Drain pitch telemetry at our own pace
+        drainPitchFrames(plot_queue, plot_window, latest_frame);
+        
         // Draw the plot
-        drawPlot(renderer, audio_data);
+        plot_window.draw();
         
         // Print debug info every 2 seconds
         auto now = std::chrono::high_resolution_clock::now();
         auto elapsed = std::chrono::duration_cast<std::chrono::seconds>(now - start_time).count();
         
         if (elapsed % 2 == 0 && elapsed > 0) {
-            std::cout << "⏱️  " << elapsed << "s | 🎤 Pitch: " << audio_data.last_pitch 
-                      << "Hz | Confidence: " << audio_data.last_confidence 
-                      << " | Target: " << (audio_data.target_history.empty() ? 0.0f : audio_data.target_history.back()) << "Hz" << std::endl;
+            std::cout << "⏱️  " << elapsed << "s | 🎤 Pitch: " << latest_frame.pitch 
+                      << "Hz | Confidence: " << latest_frame.confidence 
+                      << " | Target: " << latest_frame.target << "Hz"
+                      << " | 🎙️  Recorded: " << recorder.getDurationSeconds() << "s"
+                      << " | Pitch lag: " << singers[0]->getPitchAnalyzer().getLagSamples() << " samples"
+                      << " | Dropped (plot/rec): " << plot_queue.droppedCount() << "/" << recording_queue.droppedCount() << std::endl;
+        }
+        
+        // Per-singer DSP cost against its share of the buffer deadline
+        if (num_singers > 1 && now - last_cpu_report >= std::chrono::seconds(CPU_REPORT_INTERVAL_S)) {
+            last_cpu_report = now;
+            for (SingerChain* singer : singers) {
+                SingerCpuStats stats = singer->takeCpuStats();
+                double mean_percent = 100.0 * stats.meanUs / buffer_deadline_us;
+                double max_percent = 100.0 * stats.maxUs / buffer_deadline_us;
+                std::cout << (max_percent > singer_budget_percent ? "⚠️  " : "🎤 ") << "Singer " << (singer->getIndex() + 1)
+                          << " CPU: mean " << std::fixed << std::setprecision(1) << mean_percent
+                          << "%, max " << max_percent << "% of buffer (budget " << singer_budget_percent
+                          << "%) | Pitch: " << singer->getLastPitch() << "Hz" << std::defaultfloat << std::endl;
+            }
+        }
+        
+        // Progress and newly reported xruns for whoever is reading the event stream
+        if (now - last_progress_event >= std::chrono::milliseconds(PROGRESS_EVENT_INTERVAL_MS)) {
+            last_progress_event = now;
+            g_events.emit("progress", {{"position", (double)instrumental.getSamplesPlayed() / SAMPLE_RATE},
+                                       {"duration", instrumental.getDurationSeconds()},
+                                       {"recorded", recorder.getDurationSeconds()},
+                                       {"pitch", latest_frame.pitch}, {"confidence", latest_frame.confidence},
+                                       {"target", latest_frame.target},
+                                       {"decoder_underruns", instrumental.getUnderrunCount()}});
+            uint64_t xruns = audio_data.xruns.load(std::memory_order_relaxed);
+            if (xruns != xruns_reported) {
+                g_events.emit("xrun", {{"count", xruns}, {"new", xruns - xruns_reported}});
+                xruns_reported = xruns;
+            }
         }
         
         std::this_thread::sleep_for(std::chrono::milliseconds(50)); // 20 FPS
     }
     
-    // Save recording
-    if (!audio_data.recording_frames.empty()) {
-        std::cout << "💾 Saving recording..." << std::endl;
-        saveRecording(audio_data.recording_frames, output_filename);
-    } else {
-        std::cout << "⚠️  No recording frames to save!" << std::endl;
+    // Stop the stream first so the recorder sees the final samples, then finalize the file.
+    // Everything up to here is already on disk; this only flushes the tail.
+    Pa_StopStream(stream);
+    std::cout << "💾 Finalizing recording..." << std::endl;
+    recorder.stop();
+    if (audio_data.recording_enabled) {
+        g_events.emit("recording", {{"path", output_filename}, {"seconds", recorder.getDurationSeconds()},
+                                    {"dropped", recording_queue.droppedCount()}});
+    }
+    
+    if (recording_queue.droppedCount() > 0 || plot_queue.droppedCount() > 0) {
+        std::cout << "⚠️  Queue drops - Recording: " << recording_queue.droppedCount() 
+                  << " samples, Plot: " << plot_queue.droppedCount() << " frames" << std::endl;
     }
     
     // Cleanup
-    Pa_StopStream(stream);
     Pa_CloseStream(stream);
-    del_aubio_pitch(pitch_detector);
-    delete noise_suppressor; // Clean up noise suppressor
+    control_channel.stop();
+    pitch_stream.stop();
+    instrumental.stop();
+    singer_pool.stop();
+    for (SingerChain* singer : singers) {
+        singer->stop();
+    }
+    rt_logger.stop();
     Pa_Terminate();
-    SDL_DestroyRenderer(renderer);
-    SDL_DestroyWindow(window);
-    SDL_Quit();
+    plot_window.close();
     
     std::cout << "✅ Cleanup complete!" << std::endl;
+    g_events.emit("state", {{"state", "stopped"}, {"song", song_name}});
     return 0;
 } 
\ No newline at end of file
@@ -0,0 +1,193 @@
+#include "karaoke_dsp.h"
+#include "dsp_kernels.h"
+#include "pitch_analyzer.h"
+#include "pitch_shifter.h"
+#include "simple_noise_suppression.h"
+#include <algorithm>
+#include <new>
+#include <vector>
+
+// The handles wrap the same classes the engine runs, used synchronously on
+// the caller's thread (the pitch analyzer is never start()ed).
+
+struct KdspPitchDetector {
+    PitchAnalyzer analyzer;
+};
+
+struct KdspPitchShifter {
+    PitchShifter shifter;
+    int maxBlockSize;
+    std::vector<float> scratch;   // Staging for in-place calls (input and output may not alias)
+};
+
+struct KdspNoiseSuppressor {
+    SimpleNoiseSuppressor suppressor;
+};
+
+int kdsp_abi_version(void) {
+    return KARAOKE_DSP_ABI_VERSION;
+}
+
+// ---- Pitch detector ----
+
+KdspPitchDetector* kdsp_pitch_create(int sample_rate, int window_size, int hop_size) {
+    if (sample_rate <= 0 || hop_size <= 0 || window_size < hop_size) {
+        return nullptr;
+    }
+    try {
+        KdspPitchDetector* detector = new KdspPitchDetector();
+        if (!detector->analyzer.init(sample_rate, window_size, hop_size)) {
+            delete detector;
+            return nullptr;
+        }
+        return detector;
+    } catch (const std::bad_alloc&) {
+        return nullptr;
+    }
+}
+
+void kdsp_pitch_destroy(KdspPitchDetector* detector) {
+    delete detector;
+}
+
+int kdsp_pitch_hop_size(const KdspPitchDetector* detector) {
+    return detector->analyzer.getHopSize();
+}
+
+int kdsp_pitch_process(KdspPitchDetector* detector, const float* samples, int count,
+                       float* pitches, float* confidences, int max_estimates) {
+    PitchAnalyzer& analyzer = detector->analyzer;
+    const int hop = analyzer.getHopSize();
+    int written = 0;
+
+    // One hop at a time keeps the analyzer's ring from ever filling up
+    for (int offset = 0; offset < count; offset += hop) {
+        analyzer.pushAudio(samples + offset, std::min(hop, count - offset));
+        if (analyzer.analyzePending() > 0 && written < max_estimates) {
+            PitchEstimate estimate = analyzer.getEstimate();
+            pitches[written] = estimate.pitch;
+            confidences[written] = estimate.confidence;
+            ++written;
+        }
+    }
+    return written;
+}
+
+// ---- Pitch shifter ----
+
+KdspPitchShifter* kdsp_shifter_create(int sample_rate, int max_block_size, float min_pitch_hz) {
+    if (sample_rate <= 0 || max_block_size <= 0 || min_pitch_hz <= 0.0f) {
+        return nullptr;
+    }
+    try {
+        KdspPitchShifter* shifter = new KdspPitchShifter();
+        shifter->shifter.init(sample_rate, max_block_size, min_pitch_hz);
+        shifter->maxBlockSize = max_block_size;
+        shifter->scratch.assign(max_block_size, 0.0f);
+        return shifter;
+    } catch (const std::bad_alloc&) {
+        return nullptr;
+    }
+}
+
+void kdsp_shifter_destroy(KdspPitchShifter* shifter) {
+    delete shifter;
+}
+
+void kdsp_shifter_process(KdspPitchShifter* shifter, const float* input, float* output, int count,
+                          float period_samples, float ratio) {
+    const int block = shifter->maxBlockSize;
+    float* scratch = shifter->scratch.data();
+
+    for (int offset = 0; offset < count; offset += block) {
+        int n = std::min(block, count - offset);
+        const float* in = input + offset;
+        if (input == output) {
+            std::copy(in, in + n, scratch);
+            in = scratch;
+        }
+        shifter->shifter.process(in, output + offset, n, period_samples, ratio);
+    }
+}
+
+int kdsp_shifter_latency(const KdspPitchShifter* shifter) {
+    return shifter->shifter.getLatencyFrames();
+}
+
+void kdsp_shifter_reset(KdspPitchShifter* shifter) {
+    shifter->shifter.reset();
+}
+
+// ---- Noise suppressor ----
+
+KdspNoiseSuppressor* kdsp_noise_create(int sample_rate) {
+    if (sample_rate <= 0) {
+        return nullptr;
+    }
+    try {
+        KdspNoiseSuppressor* suppressor = new KdspNoiseSuppressor();
+        SimpleNoiseSuppressor& ns = suppressor->suppressor;
+        ns.init(sample_rate);
+        ns.setNoiseGateThreshold(0.01f);
+        ns.setVADThreshold(0.3f);
+        ns.setGracePeriod(200);
+        ns.setNoiseReductionStrength(0.6f);
+        return suppressor;
+    } catch (const std::bad_alloc&) {
+        return nullptr;
+    }
+}
+
+void kdsp_noise_destroy(KdspNoiseSuppressor* suppressor) {
+    delete suppressor;
+}
+
+void kdsp_noise_process(KdspNoiseSuppressor* suppressor, float* samples, int count) {
+    suppressor->suppressor.processAudio(samples, samples, count);
+}
+
+void kdsp_noise_set_gate_threshold(KdspNoiseSuppressor* suppressor, float threshold) {
+    suppressor->suppressor.setNoiseGateThreshold(threshold);
+}
+
+void kdsp_noise_set_vad_threshold(KdspNoiseSuppressor* suppressor, float threshold) {
+    suppressor->suppressor.setVADThreshold(threshold);
+}
+
+void kdsp_noise_set_grace_period(KdspNoiseSuppressor* suppressor, int ms) {
+    suppressor->suppressor.setGracePeriod(ms);
+}
+
+void kdsp_noise_set_reduction_strength(KdspNoiseSuppressor* suppressor, float strength) {
+    suppressor->suppressor.setNoiseReductionStrength(strength);
+}
+
+float kdsp_noise_vad_probability(const KdspNoiseSuppressor* suppressor) {
+    return suppressor->suppressor.getVADProbability();
+}
+
+float kdsp_noise_level(const KdspNoiseSuppressor* suppressor) {
+    return suppressor->suppressor.getNoiseLevel();
+}
+
+int kdsp_noise_voice_active(const KdspNoiseSuppressor* suppressor) {
+    return suppressor->suppressor.isVoiceActive() ? 1 : 0;
+}
+
+int kdsp_noise_latency(const KdspNoiseSuppressor* suppressor) {
+    return suppressor->suppressor.getLatencyFrames();
+}
+
+void kdsp_noise_reset(KdspNoiseSuppressor* suppressor) {
+    suppressor->suppressor.reset();
+}
+
+// ---- Mixer ----
+
+void kdsp_mix(float* out, const float* a, float gain_a, const float* b, float gain_b,
+              int count, float limit) {
+    mixWithGains(out, a, gain_a, b, gain_b, count);
+    if (limit > 0.0f) {
+        clampBuffer(out, count, limit);
+    }
+}
@@ -0,0 +1,87 @@
+#ifndef KARAOKE_DSP_H
+#define KARAOKE_DSP_H
+
+// C ABI over the engine's DSP core for in-process use from other languages
+// (karaoke_dsp.py loads it with ctypes). Built as libkaraoke_dsp by
+// `make python-dsp`.
+//
+// Every object is an opaque handle from a *_create() call, which returns
+// NULL on failure, and must be released with the matching *_destroy().
+// Buffers are mono float32 and are read and written where they lie; nothing
+// is copied on the way in or out. A handle is not thread safe, but separate
+// handles can be used from separate threads.
+
+#if defined(_WIN32)
+#define KARAOKE_DSP_API __declspec(dllexport)
+#else
+#define KARAOKE_DSP_API __attribute__((visibility("default")))
+#endif
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+// Bumped whenever a signature below changes
+#define KARAOKE_DSP_ABI_VERSION 1
+KARAOKE_DSP_API int kdsp_abi_version(void);
+
+// ---- Pitch detector (aubio YIN, as used by the engine) ----
+
+typedef struct KdspPitchDetector KdspPitchDetector;
+
+KARAOKE_DSP_API KdspPitchDetector* kdsp_pitch_create(int sample_rate, int window_size, int hop_size);
+KARAOKE_DSP_API void kdsp_pitch_destroy(KdspPitchDetector* detector);
+KARAOKE_DSP_API int kdsp_pitch_hop_size(const KdspPitchDetector* detector);
+
+// Feed count samples. Writes the held estimate after every completed hop to
+// pitches/confidences (up to max_estimates; count / hop + 1 is always
+// enough) and returns how many were written. A partial hop is kept for the
+// next call.
+KARAOKE_DSP_API int kdsp_pitch_process(KdspPitchDetector* detector, const float* samples, int count,
+                                       float* pitches, float* confidences, int max_estimates);
+
+// ---- TD-PSOLA pitch shifter ----
+
+typedef struct KdspPitchShifter KdspPitchShifter;
+
+KARAOKE_DSP_API KdspPitchShifter* kdsp_shifter_create(int sample_rate, int max_block_size, float min_pitch_hz);
+KARAOKE_DSP_API void kdsp_shifter_destroy(KdspPitchShifter* shifter);
+
+// Shift count samples by ratio; period_samples is the detected period or 0
+// when unvoiced. Any count is accepted, and output may be the input buffer.
+KARAOKE_DSP_API void kdsp_shifter_process(KdspPitchShifter* shifter, const float* input, float* output, int count,
+                                          float period_samples, float ratio);
+KARAOKE_DSP_API int kdsp_shifter_latency(const KdspPitchShifter* shifter);
+KARAOKE_DSP_API void kdsp_shifter_reset(KdspPitchShifter* shifter);
+
+// ---- Noise suppressor (configured like a singer chain) ----
+
+typedef struct KdspNoiseSuppressor KdspNoiseSuppressor;
+
+KARAOKE_DSP_API KdspNoiseSuppressor* kdsp_noise_create(int sample_rate);
+KARAOKE_DSP_API void kdsp_noise_destroy(KdspNoiseSuppressor* suppressor);
+
+// Suppress noise in place
+KARAOKE_DSP_API void kdsp_noise_process(KdspNoiseSuppressor* suppressor, float* samples, int count);
+KARAOKE_DSP_API void kdsp_noise_set_gate_threshold(KdspNoiseSuppressor* suppressor, float threshold);
+KARAOKE_DSP_API void kdsp_noise_set_vad_threshold(KdspNoiseSuppressor* suppressor, float threshold);
+KARAOKE_DSP_API void kdsp_noise_set_grace_period(KdspNoiseSuppressor* suppressor, int ms);
+KARAOKE_DSP_API void kdsp_noise_set_reduction_strength(KdspNoiseSuppressor* suppressor, float strength);
+KARAOKE_DSP_API float kdsp_noise_vad_probability(const KdspNoiseSuppressor* suppressor);
+KARAOKE_DSP_API float kdsp_noise_level(const KdspNoiseSuppressor* suppressor);
+KARAOKE_DSP_API int kdsp_noise_voice_active(const KdspNoiseSuppressor* suppressor);
+KARAOKE_DSP_API int kdsp_noise_latency(const KdspNoiseSuppressor* suppressor);
+KARAOKE_DSP_API void kdsp_noise_reset(KdspNoiseSuppressor* suppressor);
+
+// ---- Mixer (dsp_kernels.h) ----
+
+// out = gain_a * a + gain_b * b, clamped to [-limit, limit] when limit > 0.
+// out may be a or b.
+KARAOKE_DSP_API void kdsp_mix(float* out, const float* a, float gain_a, const float* b, float gain_b,
+                              int count, float limit);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif // KARAOKE_DSP_H
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+In-process bindings for the C++ DSP core
+Loads libkaraoke_dsp (karaoke_dsp.h, built with `make python-dsp`) through
+ctypes and runs the engine's pitch detector, pitch shifter, noise suppressor
+and mixer directly on NumPy buffers. Arrays are passed by pointer, never
+copied: they must be 1-D, C-contiguous float32, and anything else raises
+instead of being converted behind the caller's back.
+
+Set KARAOKE_DSP_LIB to load the library from a different path.
+
+Usage: python3 karaoke_dsp.py [wav_file]    (prints pitch and timing)
+"""
+
+import ctypes
+import os
+import sys
+import time
+import numpy as np
+
+ABI_VERSION = 1
+RATE = 48000
+
+_float_p = ctypes.POINTER(ctypes.c_float)
+_LIBRARY_NAMES = ("libkaraoke_dsp.so", "libkaraoke_dsp.dylib", "karaoke_dsp.dll")
+
+
+def _find_library():
+    override = os.environ.get("KARAOKE_DSP_LIB")
+    if override:
+        return override
+    here = os.path.dirname(os.path.abspath(__file__))
+    for directory in (here, os.path.join(here, "build")):
+        for name in _LIBRARY_NAMES:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                return path
+    raise ImportError("libkaraoke_dsp not found - build it with `make python-dsp`")
+
+
+def _declare(lib):
+    """Attach argument and return types to every exported function"""
+    c_int, c_float, c_void_p = ctypes.c_int, ctypes.c_float, ctypes.c_void_p
+    signatures = {
+        "kdsp_abi_version": ([], c_int),
+        "kdsp_pitch_create": ([c_int, c_int, c_int], c_void_p),
+        "kdsp_pitch_destroy": ([c_void_p], None),
+        "kdsp_pitch_hop_size": ([c_void_p], c_int),
+        "kdsp_pitch_process": ([c_void_p, _float_p, c_int, _float_p, _float_p, c_int], c_int),
+        "kdsp_shifter_create": ([c_int, c_int, c_float], c_void_p),
+        "kdsp_shifter_destroy": ([c_void_p], None),
+        "kdsp_shifter_process": ([c_void_p, _float_p, _float_p, c_int, c_float, c_float], None),
+        "kdsp_shifter_latency": ([c_void_p], c_int),
+        "kdsp_shifter_reset": ([c_void_p], None),
+        "kdsp_noise_create": ([c_int], c_void_p),
+        "kdsp_noise_destroy": ([c_void_p], None),
+        "kdsp_noise_process": ([c_void_p, _float_p, c_int], None),
+        "kdsp_noise_set_gate_threshold": ([c_void_p, c_float], None),
+        "kdsp_noise_set_vad_threshold": ([c_void_p, c_float], None),
+        "kdsp_noise_set_grace_period": ([c_void_p, c_int], None),
+        "kdsp_noise_set_reduction_strength": ([c_void_p, c_float], None),
+        "kdsp_noise_vad_probability": ([c_void_p], c_float),
+        "kdsp_noise_level": ([c_void_p], c_float),
+        "kdsp_noise_voice_active": ([c_void_p], c_int),
+        "kdsp_noise_latency": ([c_void_p], c_int),
+        "kdsp_noise_reset": ([c_void_p], None),
+        "kdsp_mix": ([_float_p, _float_p, c_float, _float_p, c_float, c_int, c_float], None),
+    }
+    for name, (argtypes, restype) in signatures.items():
+        function = getattr(lib, name)
+        function.argtypes = argtypes
+        function.restype = restype
+    return lib
+
+
+_lib = _declare(ctypes.CDLL(_find_library()))
+if _lib.kdsp_abi_version() != ABI_VERSION:
+    raise ImportError(f"libkaraoke_dsp ABI {_lib.kdsp_abi_version()} does not match "
+                      f"karaoke_dsp.py ABI {ABI_VERSION} - rebuild with `make python-dsp`")
+
+
+def _pointer(array, name, writable=False):
+    """Pointer to an array's data; raises rather than copying"""
+    if not isinstance(array, np.ndarray):
+        raise TypeError(f"{name} must be a numpy array, got {type(array).__name__}")
+    if array.dtype != np.float32:
+        raise TypeError(f"{name} must be float32, got {array.dtype}")
+    if array.ndim != 1 or not array.flags.c_contiguous:
+        raise ValueError(f"{name} must be a 1-D C-contiguous array")
+    if writable and not array.flags.writeable:
+        raise ValueError(f"{name} is read-only")
+    return array.ctypes.data_as(_float_p)
+
+
+def _check_length(name, array, count):
+    if len(array) != count:
+        raise ValueError(f"{name} has {len(array)} samples, expected {count}")
+
+
+class _Handle:
+    """Owns one native object; released on close() or garbage collection"""
+
+    _destroy = None
+
+    def __init__(self, handle, what):
+        self._handle = None
+        if not handle:
+            raise ValueError(f"Could not create {what} with these parameters")
+        self._handle = handle
+
+    def close(self):
+        if self._handle:
+            type(self)._destroy(self._handle)
+            self._handle = None
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PitchDetector(_Handle):
+    """aubio YIN detector with the engine's confidence gate and hold"""
+
+    _destroy = _lib.kdsp_pitch_destroy
+
+    def __init__(self, rate=RATE, window=2048, hop=256):
+        super().__init__(_lib.kdsp_pitch_create(rate, window, hop), "pitch detector")
+        self.hop = _lib.kdsp_pitch_hop_size(self._handle)
+
+    def process(self, samples, pitches=None, confidences=None):
+        """Analyse samples; returns (pitches, confidences), one per completed hop.
+
+        Pass preallocated output arrays (len(samples) // hop + 1 long) to avoid
+        allocating per call; views of the filled part are returned.
+        """
+        count = len(samples)
+        capacity = count // self.hop + 1
+        if pitches is None:
+            pitches = np.empty(capacity, dtype=np.float32)
+        if confidences is None:
+            confidences = np.empty(capacity, dtype=np.float32)
+        limit = min(len(pitches), len(confidences))
+        written = _lib.kdsp_pitch_process(self._handle, _pointer(samples, "samples"), count,
+                                          _pointer(pitches, "pitches", writable=True),
+                                          _pointer(confidences, "confidences", writable=True), limit)
+        return pitches[:written], confidences[:written]
+
+
+class PitchShifter(_Handle):
+    """TD-PSOLA shifter; output lags input by `latency` samples"""
+
+    _destroy = _lib.kdsp_shifter_destroy
+
+    def __init__(self, rate=RATE, max_block=1024, min_pitch_hz=80.0):
+        super().__init__(_lib.kdsp_shifter_create(rate, max_block, min_pitch_hz), "pitch shifter")
+        self.rate = rate
+
+    @property
+    def latency(self):
+        return _lib.kdsp_shifter_latency(self._handle)
+
+    def reset(self):
+        _lib.kdsp_shifter_reset(self._handle)
+
+    def process(self, samples, out=None, pitch=0.0, ratio=1.0):
+        """Shift samples by ratio into out (may be samples itself); pitch is the
+        detected frequency in Hz, 0 when unvoiced. Returns out."""
+        count = len(samples)
+        if out is None:
+            out = samples
+        _check_length("out", out, count)
+        if out is not samples and np.may_share_memory(out, samples):
+            raise ValueError("out must be samples itself or not overlap it")
+        period = self.rate / pitch if pitch > 0 else 0.0
+        _lib.kdsp_shifter_process(self._handle, _pointer(samples, "samples"),
+                                  _pointer(out, "out", writable=True), count, period, ratio)
+        return out
+
+
+class NoiseSuppressor(_Handle):
+    """Spectral noise reduction, VAD and gate, set up like a singer chain"""
+
+    _destroy = _lib.kdsp_noise_destroy
+
+    def __init__(self, rate=RATE):
+        super().__init__(_lib.kdsp_noise_create(rate), "noise suppressor")
+
+    def process(self, samples):
+        """Suppress noise in place; returns samples"""
+        _lib.kdsp_noise_process(self._handle, _pointer(samples, "samples", writable=True), len(samples))
+        return samples
+
+    def set_gate_threshold(self, threshold):
+        _lib.kdsp_noise_set_gate_threshold(self._handle, threshold)
+
+    def set_vad_threshold(self, threshold):
+        _lib.kdsp_noise_set_vad_threshold(self._handle, threshold)
+
+    def set_grace_period(self, ms):
+        _lib.kdsp_noise_set_grace_period(self._handle, int(ms))
+
+    def set_reduction_strength(self, strength):
+        _lib.kdsp_noise_set_reduction_strength(self._handle, strength)
+
+    @property
+    def vad_probability(self):
+        return _lib.kdsp_noise_vad_probability(self._handle)
+
+    @property
+    def noise_level(self):
+        return _lib.kdsp_noise_level(self._handle)
+
+    @property
+    def voice_active(self):
+        return bool(_lib.kdsp_noise_voice_active(self._handle))
+
+    @property
+    def latency(self):
+        return _lib.kdsp_noise_latency(self._handle)
+
+    def reset(self):
+        _lib.kdsp_noise_reset(self._handle)
+
+
+def mix(out, a, gain_a, b, gain_b, limit=1.0):
+    """out = gain_a * a + gain_b * b, clamped to +/-limit (0 disables); out may be a or b"""
+    count = len(out)
+    _check_length("a", a, count)
+    _check_length("b", b, count)
+    _lib.kdsp_mix(_pointer(out, "out", writable=True), _pointer(a, "a"), gain_a,
+                  _pointer(b, "b"), gain_b, count, limit)
+    return out
+
+
+def main():
+    if len(sys.argv) > 1:
+        import soundfile as sf
+        voice, rate = sf.read(sys.argv[1], dtype='float32', always_2d=True)
+        voice = np.ascontiguousarray(voice.mean(axis=1), dtype=np.float32)
+    else:
+        rate = RATE
+        t = np.arange(rate * 5, dtype=np.float32) / rate
+        voice = (0.3 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+
+    detector = PitchDetector(rate)
+    shifter = PitchShifter(rate)
+    suppressor = NoiseSuppressor(rate)
+
+    start = time.perf_counter()
+    suppressor.process(voice)
+    pitches, confidences = detector.process(voice)
+    shifter.process(voice, pitch=float(np.median(pitches)) if len(pitches) else 0.0, ratio=1.05)
+    elapsed = time.perf_counter() - start
+
+    duration = len(voice) / rate
+    voiced = pitches[confidences > 0.5]
+    print(f"🎵 {duration:.1f}s processed in {elapsed * 1000:.1f}ms ({duration / elapsed:.0f}x real time)")
+    if len(voiced):
+        print(f"🎤 Median pitch {np.median(voiced):.1f}Hz over {len(pitches)} hops")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#ifndef LATENCY_PROFILE_H
+#define LATENCY_PROFILE_H
+
+#include <cstring>
+
+// Runtime latency profiles.
+//
+// A profile picks the audio buffer size, how PortAudio's suggested latency
+// is chosen and the pitch analysis window/hop together, so the whole chain
+// moves in one step when trading latency against xrun risk. The times in
+// the descriptions are buffer latency only. The pitch shifter adds its own
+// fixed delay on top of any profile (PitchShifter::getLatencyFrames()).
+enum class DeviceLatency {
+    Low,    // Device defaultLow{Input,Output}Latency
+    High    // Device defaultHigh{Input,Output}Latency
+};
+
+struct LatencyProfile {
+    const char* name;
+    int framesPerBuffer;
+    DeviceLatency deviceLatency;
+    int pitchWindow;
+    int pitchHop;
+    const char* description;
+};
+
+static constexpr int MAX_FRAMES_PER_BUFFER = 1024;
+
+static const LatencyProfile LATENCY_PROFILES[] = {
+    {"ultra-low", 128,  DeviceLatency::Low,  1024, 128, "2.7ms buffers, shorter pitch window; needs a quiet, well-tuned machine"},
+    {"balanced",  256,  DeviceLatency::Low,  2048, 256, "5.3ms buffers (default)"},
+    {"safe",      1024, DeviceLatency::High, 2048, 512, "21ms buffers for busy machines and Bluetooth/USB hubs"},
+};
+
+static const char* const DEFAULT_LATENCY_PROFILE = "balanced";
+
+// Look up a profile by name; returns nullptr when unknown
+inline const LatencyProfile* findLatencyProfile(const char* name) {
+    for (const LatencyProfile& profile : LATENCY_PROFILES) {
+        if (std::strcmp(profile.name, name) == 0) {
+            return &profile;
+        }
+    }
+    return nullptr;
+}
+
+#endif // LATENCY_PROFILE_H
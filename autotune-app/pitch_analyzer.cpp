@@ -0,0 +1,154 @@
+#include "pitch_analyzer.h"
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <iostream>
+
+PitchAnalyzer::PitchAnalyzer()
+    : m_detector(nullptr)
+    , m_hopBuffer(nullptr)
+    , m_result(nullptr)
+    , m_sampleRate(0)
+    , m_windowSize(0)
+    , m_hopSize(0)
+    , m_packed(0)
+    , m_position(0)
+    , m_samplesPushed(0)
+    , m_hopsAnalyzed(0)
+    , m_running(false)
+{
+}
+
+PitchAnalyzer::~PitchAnalyzer() {
+    stop();
+    if (m_detector) {
+        del_aubio_pitch(m_detector);
+    }
+    if (m_hopBuffer) {
+        del_fvec(m_hopBuffer);
+    }
+    if (m_result) {
+        del_fvec(m_result);
+    }
+}
+
+bool PitchAnalyzer::init(int sampleRate, int windowSize, int hopSize) {
+    if (hopSize <= 0 || windowSize < hopSize) {
+        std::cerr << "❌ Invalid pitch analysis window/hop: " << windowSize << "/" << hopSize << std::endl;
+        return false;
+    }
+
+    m_detector = new_aubio_pitch("default", windowSize, hopSize, sampleRate);
+    if (!m_detector) {
+        std::cerr << "❌ Failed to create aubio pitch detector!" << std::endl;
+        return false;
+    }
+    aubio_pitch_set_unit(m_detector, "Hz");
+    aubio_pitch_set_silence(m_detector, -50);  // Lower silence threshold for better detection
+
+    m_hopBuffer = new_fvec(hopSize);
+    m_result = new_fvec(1);
+    m_ring.reset(new SpscRingBuffer<float>((size_t)hopSize * RING_HOPS));
+
+    m_sampleRate = sampleRate;
+    m_windowSize = windowSize;
+    m_hopSize = hopSize;
+    return m_hopBuffer && m_result;
+}
+
+bool PitchAnalyzer::start() {
+    if (!m_detector || m_running.load()) {
+        return false;
+    }
+    m_running.store(true);
+    m_thread = std::thread(&PitchAnalyzer::run, this);
+    std::cout << "🎯 Pitch analysis thread started (window " << m_windowSize << ", hop " << m_hopSize
+              << " = " << (1000.0f * m_hopSize / m_sampleRate) << " ms)" << std::endl;
+    return true;
+}
+
+void PitchAnalyzer::stop() {
+    m_running.store(false);
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+}
+
+void PitchAnalyzer::pushAudio(const float* samples, int numSamples) {
+    m_ring->pushBlock(samples, (size_t)numSamples);
+    m_samplesPushed.fetch_add(numSamples, std::memory_order_release);
+}
+
+int PitchAnalyzer::analyzePending() {
+    int hops = 0;
+    while (m_ring->available() >= (size_t)m_hopSize) {
+        m_ring->popBlock(m_hopBuffer->data, (size_t)m_hopSize);
+        aubio_pitch_do(m_detector, m_hopBuffer, m_result);
+
+        float pitch = m_result->data[0];
+        float confidence = aubio_pitch_get_confidence(m_detector);
+
+        // Hold the last good estimate through unvoiced or uncertain hops
+        if (confidence > MIN_CONFIDENCE && pitch > MIN_PITCH_HZ) {
+            publish(pitch, confidence);
+        }
+        m_position.fetch_add(m_hopSize, std::memory_order_release);
+        m_hopsAnalyzed.fetch_add(1, std::memory_order_relaxed);
+        ++hops;
+    }
+    return hops;
+}
+
+PitchEstimate PitchAnalyzer::getEstimate() const {
+    uint64_t packed = m_packed.load(std::memory_order_acquire);
+    uint32_t pitchBits = (uint32_t)(packed >> 32);
+    uint32_t confidenceBits = (uint32_t)packed;
+
+    PitchEstimate estimate;
+    std::memcpy(&estimate.pitch, &pitchBits, sizeof(float));
+    std::memcpy(&estimate.confidence, &confidenceBits, sizeof(float));
+    estimate.position = m_position.load(std::memory_order_acquire);
+    return estimate;
+}
+
+int64_t PitchAnalyzer::getLagSamples() const {
+    return m_samplesPushed.load(std::memory_order_acquire) - m_position.load(std::memory_order_acquire);
+}
+
+int PitchAnalyzer::getHopSize() const {
+    return m_hopSize;
+}
+
+int PitchAnalyzer::getWindowSize() const {
+    return m_windowSize;
+}
+
+uint64_t PitchAnalyzer::getHopsAnalyzed() const {
+    return m_hopsAnalyzed.load(std::memory_order_relaxed);
+}
+
+uint64_t PitchAnalyzer::getDroppedSamples() const {
+    return m_ring ? m_ring->droppedCount() : 0;
+}
+
+void PitchAnalyzer::publish(float pitch, float confidence) {
+    uint32_t pitchBits;
+    uint32_t confidenceBits;
+    std::memcpy(&pitchBits, &pitch, sizeof(float));
+    std::memcpy(&confidenceBits, &confidence, sizeof(float));
+    m_packed.store(((uint64_t)pitchBits << 32) | confidenceBits, std::memory_order_release);
+}
+
+void PitchAnalyzer::run() {
+    const auto hopDuration = std::chrono::microseconds((int64_t)1000000 * m_hopSize / m_sampleRate);
+
+    while (m_running.load()) {
+        analyzePending();
+
+        // Sleep until roughly the next hop boundary instead of spinning
+        size_t queued = m_ring->available();
+        size_t missing = queued < (size_t)m_hopSize ? (size_t)m_hopSize - queued : 0;
+        auto wait = hopDuration * (int64_t)missing / m_hopSize;
+        std::this_thread::sleep_for(std::max(wait, std::chrono::microseconds(500)));
+    }
+}
@@ -0,0 +1,85 @@
+#ifndef PITCH_ANALYZER_H
+#define PITCH_ANALYZER_H
+
+#include <aubio/aubio.h>
+#include <atomic>
+#include <cstdint>
+#include <memory>
+#include <thread>
+#include "ring_buffer.h"
+
+// Latest pitch estimate published by the analyzer
+struct PitchEstimate {
+    float pitch;          // Hz, 0 when nothing has been detected yet
+    float confidence;     // 0..1 as reported by aubio
+    int64_t position;     // Input sample index at the end of the analysed hop
+};
+
+// Pitch detection moved off the audio thread.
+//
+// The audio callback hands its input to pushAudio() (a lock-free ring
+// write) and reads the most recent result with getEstimate(). A worker
+// thread wakes on hop boundaries, runs aubio over each complete hop and
+// publishes pitch and confidence as one 64-bit atomic, so the callback
+// never sees a torn pair. The hop size sets the detection rate and can be
+// tuned independently of the audio buffer size.
+//
+// Without start() the analyzer runs synchronously: analyzePending() does
+// the work on the calling thread, which is what offline rendering uses.
+class PitchAnalyzer {
+public:
+    PitchAnalyzer();
+    ~PitchAnalyzer();
+
+    // Create the detector. hopSize is the number of samples between estimates.
+    bool init(int sampleRate, int windowSize, int hopSize);
+
+    // Run analysis on a background thread
+    bool start();
+    void stop();
+
+    // Queue input audio (real-time safe, drops if the analyzer falls behind)
+    void pushAudio(const float* samples, int numSamples);
+
+    // Analyse every complete hop currently queued; returns hops processed
+    int analyzePending();
+
+    // Most recent estimate (real-time safe)
+    PitchEstimate getEstimate() const;
+
+    // Samples between the newest queued input and the latest estimate
+    int64_t getLagSamples() const;
+
+    int getHopSize() const;
+    int getWindowSize() const;
+    uint64_t getHopsAnalyzed() const;
+    uint64_t getDroppedSamples() const;
+
+private:
+    void run();
+    void publish(float pitch, float confidence);
+
+    aubio_pitch_t* m_detector;
+    fvec_t* m_hopBuffer;
+    fvec_t* m_result;
+    std::unique_ptr<SpscRingBuffer<float>> m_ring;
+
+    int m_sampleRate;
+    int m_windowSize;
+    int m_hopSize;
+
+    std::atomic<uint64_t> m_packed;       // pitch bits (high) | confidence bits (low)
+    std::atomic<int64_t> m_position;
+    std::atomic<int64_t> m_samplesPushed;
+    std::atomic<uint64_t> m_hopsAnalyzed;
+
+    std::thread m_thread;
+    std::atomic<bool> m_running;
+
+    // Constants
+    static constexpr float MIN_CONFIDENCE = 0.3f;
+    static constexpr float MIN_PITCH_HZ = 50.0f;
+    static constexpr int RING_HOPS = 32;
+};
+
+#endif // PITCH_ANALYZER_H
@@ -0,0 +1,126 @@
+#include "pitch_plot.h"
+#include <algorithm>
+#include <cstdio>
+#include <iostream>
+
+void addPitchFrame(PlotHistory& history, const PitchFrame& frame) {
+    history.pitch_history.push_back(frame.pitch);
+    history.target_history.push_back(frame.target);
+    history.time_history.push_back(frame.time);
+    history.latest = frame;
+    
+    while (history.pitch_history.size() > PLOT_HISTORY) {
+        history.pitch_history.pop_front();
+        history.target_history.pop_front();
+        history.time_history.pop_front();
+    }
+}
+
+void drawPlot(SDL_Renderer* renderer, const PlotHistory& data) {
+    // Clear screen
+    SDL_SetRenderDrawColor(renderer, 0, 0, 0, 255);
+    SDL_RenderClear(renderer);
+    
+    // Draw grid
+    SDL_SetRenderDrawColor(renderer, 50, 50, 50, 255);
+    for (int i = 0; i <= 10; i++) {
+        int x = (PLOT_WIDTH * i) / 10;
+        SDL_RenderDrawLine(renderer, x, 0, x, PLOT_HEIGHT);
+    }
+    for (int i = 0; i <= 8; i++) {
+        int y = (PLOT_HEIGHT * i) / 8;
+        SDL_RenderDrawLine(renderer, 0, y, PLOT_WIDTH, y);
+    }
+    
+    // Draw pitch history (green)
+    if (data.pitch_history.size() > 1) {
+        SDL_SetRenderDrawColor(renderer, 0, 255, 0, 255);
+        for (size_t i = 1; i < data.pitch_history.size(); i++) {
+            float pitch1 = data.pitch_history[i-1];
+            float pitch2 = data.pitch_history[i];
+            float time1 = data.time_history[i-1];
+            float time2 = data.time_history[i];
+            
+            if (pitch1 > 0 && pitch2 > 0) {
+                int x1 = (int)((time1 - data.time_history.front()) * 100) % PLOT_WIDTH;
+                int x2 = (int)((time2 - data.time_history.front()) * 100) % PLOT_WIDTH;
+                int y1 = PLOT_HEIGHT - (int)((pitch1 - 50) * PLOT_HEIGHT / 800);
+                int y2 = PLOT_HEIGHT - (int)((pitch2 - 50) * PLOT_HEIGHT / 800);
+                
+                y1 = std::max(0, std::min(PLOT_HEIGHT-1, y1));
+                y2 = std::max(0, std::min(PLOT_HEIGHT-1, y2));
+                
+                SDL_RenderDrawLine(renderer, x1, y1, x2, y2);
+            }
+        }
+    }
+    
+    // Draw target melody (red)
+    if (data.target_history.size() > 1) {
+        SDL_SetRenderDrawColor(renderer, 255, 0, 0, 255);
+        for (size_t i = 1; i < data.target_history.size(); i++) {
+            float target1 = data.target_history[i-1];
+            float target2 = data.target_history[i];
+            float time1 = data.time_history[i-1];
+            float time2 = data.time_history[i];
+            
+            if (target1 > 0 && target2 > 0) {
+                int x1 = (int)((time1 - data.time_history.front()) * 100) % PLOT_WIDTH;
+                int x2 = (int)((time2 - data.time_history.front()) * 100) % PLOT_WIDTH;
+                int y1 = PLOT_HEIGHT - (int)((target1 - 50) * PLOT_HEIGHT / 800);
+                int y2 = PLOT_HEIGHT - (int)((target2 - 50) * PLOT_HEIGHT / 800);
+                
+                y1 = std::max(0, std::min(PLOT_HEIGHT-1, y1));
+                y2 = std::max(0, std::min(PLOT_HEIGHT-1, y2));
+                
+                SDL_RenderDrawLine(renderer, x1, y1, x2, y2);
+            }
+        }
+    }
+    
+    // Draw noise suppression info (as published with the latest frame)
+    if (!data.time_history.empty()) {
+        float vad_prob = data.latest.vad;
+        float noise_level = data.latest.noise_level;
+        bool voice_active = data.latest.voice_active != 0;
+        
+        // Draw VAD probability bar (top right)
+        int bar_width = 100;
+        int bar_height = 20;
+        int bar_x = PLOT_WIDTH - bar_width - 10; // Adjusted to be relative to plot width
+        int bar_y = 10;
+        
+        // Background
+        SDL_SetRenderDrawColor(renderer, 50, 50, 50, 255);
+        SDL_Rect bar_bg = {bar_x, bar_y, bar_width, bar_height};
+        SDL_RenderFillRect(renderer, &bar_bg);
+        
+        // VAD level
+        SDL_SetRenderDrawColor(renderer, 
+            voice_active ? 0 : 255, 
+            voice_active ? 255 : 0, 
+            0, 255);
+        int vad_width = (int)(bar_width * vad_prob);
+        SDL_Rect vad_bar = {bar_x, bar_y, vad_width, bar_height};
+        SDL_RenderFillRect(renderer, &vad_bar);
+        
+        // Border
+        SDL_SetRenderDrawColor(renderer, 200, 200, 200, 255);
+        SDL_RenderDrawRect(renderer, &bar_bg);
+        
+        // Text
+        char info_text[128];
+        snprintf(info_text, sizeof(info_text), "VAD: %.1f%% Noise: %.3f", 
+                vad_prob * 100.0f, noise_level);
+        
+        // Simple text rendering (you might want to use SDL_ttf for better text)
+        // For now, we'll just show the info in the console
+        static int info_counter = 0;
+        if (++info_counter % 100 == 0) { // Update every 100 frames
+            std::cout << "🎤 VAD: " << (vad_prob * 100.0f) << "%, Noise: " << noise_level 
+                      << ", Voice: " << (voice_active ? "ON" : "OFF") << std::endl;
+        }
+    }
+    
+    SDL_RenderPresent(renderer);
+}
@@ -0,0 +1,27 @@
+#ifndef PITCH_PLOT_H
+#define PITCH_PLOT_H
+
+#include <SDL2/SDL.h>
+#include <deque>
+#include "telemetry_shm.h"
+
+static constexpr int PLOT_WIDTH = 800;
+static constexpr int PLOT_HEIGHT = 400;
+static constexpr size_t PLOT_HISTORY = 200;
+
+// Plot state owned by whichever thread renders; filled only from PitchFrames
+// so drawing never reads live DSP state
+struct PlotHistory {
+    std::deque<float> pitch_history;
+    std::deque<float> target_history;
+    std::deque<float> time_history;
+    PitchFrame latest = {};
+};
+
+// Append one frame, keeping the last PLOT_HISTORY entries
+void addPitchFrame(PlotHistory& history, const PitchFrame& frame);
+
+// Draw pitch (green), target melody (red) and the voice-activity bar
+void drawPlot(SDL_Renderer* renderer, const PlotHistory& data);
+
+#endif // PITCH_PLOT_H
@@ -0,0 +1,145 @@
+#include "pitch_shifter.h"
+#include <algorithm>
+#include <cmath>
+
+PitchShifter::PitchShifter()
+    : m_sampleRate(48000)
+    , m_maxPeriod(600)
+    , m_minPeriod(48)
+    , m_unvoicedPeriod(240)
+    , m_latency(1200)
+    , m_holdSamples(7200)
+    , m_fadeStep(1.0f / 240.0f)
+    , m_mask(0)
+    , m_samplesIn(0)
+    , m_analysisMark(0)
+    , m_synthesisMark(0.0)
+    , m_wetGain(0.0f)
+    , m_holdRemaining(0)
+{
+}
+
+void PitchShifter::init(int sampleRate, int maxBlockSize, float minPitchHz) {
+    m_sampleRate = sampleRate;
+    m_maxPeriod = (int)std::ceil(sampleRate / minPitchHz);
+    m_minPeriod = std::max(2, (int)(sampleRate / MAX_PITCH_HZ));
+    m_unvoicedPeriod = std::min(m_maxPeriod, (int)(sampleRate * UNVOICED_GRAIN_MS / 1000.0f));
+
+    // A grain reaches at most one max period either side of its mark, and a mark is
+    // processed once its input is complete, so everything older than two max
+    // periods is final
+    m_latency = 2 * m_maxPeriod;
+    m_holdSamples = (int)(sampleRate * BYPASS_HOLD_MS / 1000.0f);
+    m_fadeStep = 1.0f / std::max(1.0f, sampleRate * BYPASS_FADE_MS / 1000.0f);
+
+    size_t size = 1;
+    while (size < (size_t)(4 * m_maxPeriod + maxBlockSize)) {
+        size <<= 1;
+    }
+    m_input.assign(size, 0.0f);
+    m_output.assign(size, 0.0f);
+    m_mask = size - 1;
+
+    m_window.resize(WINDOW_TABLE_SIZE);
+    for (int i = 0; i < WINDOW_TABLE_SIZE; ++i) {
+        m_window[i] = 0.5f - 0.5f * std::cos(2.0f * (float)M_PI * i / WINDOW_TABLE_SIZE);
+    }
+
+    reset();
+}
+
+void PitchShifter::process(const float* input, float* output, int numSamples,
+                           float periodSamples, float ratio) {
+    // Append new input to the circular history
+    for (int i = 0; i < numSamples; ++i) {
+        m_input[(size_t)(m_samplesIn + i) & m_mask] = input[i];
+    }
+    const int64_t blockStart = m_samplesIn;
+    m_samplesIn += numSamples;
+
+    // Any real shift (re)arms the hold; the delayed input only returns after it runs out
+    if (std::fabs(ratio - 1.0f) > IDLE_RATIO_TOLERANCE) {
+        m_holdRemaining = m_holdSamples;
+    } else {
+        m_holdRemaining = std::max(0, m_holdRemaining - numSamples);
+    }
+    const float wetTarget = m_holdRemaining > 0 ? 1.0f : 0.0f;
+
+    int period = periodSamples > 0.0f ? (int)std::lround(periodSamples) : m_unvoicedPeriod;
+    period = std::clamp(period, m_minPeriod, m_maxPeriod);
+    ratio = std::clamp(ratio, MIN_RATIO, MAX_RATIO);
+
+    // Synthesis marks are period / ratio apart. Grains cover at least one hop so
+    // lowering pitch does not leave gaps, and are scaled so overlaps sum to unity.
+    const double hop = period / ratio;
+    const int halfWidth = std::min(m_maxPeriod, std::max(period, (int)std::lround(hop)));
+    const float gain = std::min(1.0f, (float)(hop / halfWidth));
+
+    // Place every grain whose input is fully available
+    while ((int64_t)m_synthesisMark + halfWidth <= m_samplesIn) {
+        const int64_t synthesisMark = (int64_t)m_synthesisMark;
+
+        // Latest analysis mark at or before the synthesis mark keeps time aligned
+        while (m_analysisMark + period <= synthesisMark) {
+            m_analysisMark += period;
+        }
+
+        overlapAddGrain(synthesisMark, m_analysisMark, halfWidth, gain);
+        m_synthesisMark += hop;
+    }
+
+    // Emit the finished part of the accumulator, crossfaded with the input from the
+    // same moment, so both paths lag by the fixed latency and switching never moves the voice
+    for (int i = 0; i < numSamples; ++i) {
+        const int64_t index = blockStart + i - m_latency;
+        float wet = 0.0f;
+        float dry = 0.0f;
+        if (index >= 0) {
+            const size_t slot = (size_t)index & m_mask;
+            wet = m_output[slot];
+            dry = m_input[slot];
+            m_output[slot] = 0.0f;
+        }
+
+        if (m_wetGain < wetTarget) {
+            m_wetGain = std::min(wetTarget, m_wetGain + m_fadeStep);
+        } else if (m_wetGain > wetTarget) {
+            m_wetGain = std::max(wetTarget, m_wetGain - m_fadeStep);
+        }
+        output[i] = dry + (wet - dry) * m_wetGain;
+    }
+}
+
+void PitchShifter::overlapAddGrain(int64_t synthesisMark, int64_t analysisMark, int halfWidth, float gain) {
+    const int length = 2 * halfWidth;
+    const float tableStep = (float)WINDOW_TABLE_SIZE / length;
+    const int64_t inStart = analysisMark - halfWidth;
+    const int64_t outStart = synthesisMark - halfWidth;
+
+    for (int j = 0; j < length; ++j) {
+        const int64_t inIndex = inStart + j;
+        if (inIndex < 0 || outStart + j < 0) {
+            continue;
+        }
+        const float w = m_window[(int)(j * tableStep)] * gain;
+        m_output[(size_t)(outStart + j) & m_mask] += w * m_input[(size_t)inIndex & m_mask];
+    }
+}
+
+int PitchShifter::getLatencyFrames() const {
+    return m_latency;
+}
+
+bool PitchShifter::isShifting() const {
+    return m_holdRemaining > 0 || m_wetGain > 0.0f;
+}
+
+void PitchShifter::reset() {
+    std::fill(m_input.begin(), m_input.end(), 0.0f);
+    std::fill(m_output.begin(), m_output.end(), 0.0f);
+    m_samplesIn = 0;
+    m_analysisMark = 0;
+    m_synthesisMark = 0.0;
+    m_wetGain = 0.0f;
+    m_holdRemaining = 0;
+}
@@ -0,0 +1,83 @@
+#ifndef PITCH_SHIFTER_H
+#define PITCH_SHIFTER_H
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// Streaming TD-PSOLA pitch shifter.
+//
+// Input is kept in a circular buffer and cut into Hann-windowed grains two
+// periods long, centred on analysis marks spaced one detected period apart.
+// Grains are overlap-added at synthesis marks spaced period / ratio apart,
+// which changes pitch without changing duration. Unvoiced input uses a
+// fixed grain size. All state is allocated in init() and process() does no
+// allocation.
+//
+// The output always lags the input by getLatencyFrames() (two of the
+// longest periods, 25ms at 80Hz). At ratio 1.0 it is the input delayed by
+// exactly that much rather than resynthesized grains: the grains keep being
+// placed, and the output crossfades to them when a shift starts and back
+// once the shifter has been idle for a moment. An uncorrected voice is
+// therefore bit-exact, and toggling autotune never changes latency.
+class PitchShifter {
+public:
+    PitchShifter();
+
+    // Allocate state for blocks of up to maxBlockSize samples. minPitchHz sets
+    // the longest supported period and therefore the fixed latency.
+    void init(int sampleRate, int maxBlockSize, float minPitchHz = 80.0f);
+
+    // Shift numSamples of input by ratio (2.0 = one octave up).
+    // periodSamples is the detected pitch period, or 0 when unvoiced.
+    // input and output may not alias.
+    void process(const float* input, float* output, int numSamples,
+                 float periodSamples, float ratio);
+
+    // Fixed delay between input and output, in samples
+    int getLatencyFrames() const;
+
+    // True while the output is (fading to) the resynthesized grains
+    bool isShifting() const;
+
+    // Clear all buffered audio
+    void reset();
+
+private:
+    void overlapAddGrain(int64_t synthesisMark, int64_t analysisMark, int halfWidth, float gain);
+
+    int m_sampleRate;
+    int m_maxPeriod;
+    int m_minPeriod;
+    int m_unvoicedPeriod;
+    int m_latency;
+    int m_holdSamples;
+    float m_fadeStep;
+
+    // Circular input history and output accumulator (power-of-two sizes)
+    std::vector<float> m_input;
+    std::vector<float> m_output;
+    size_t m_mask;
+
+    // Hann window lookup, indexed by position within the grain
+    std::vector<float> m_window;
+
+    int64_t m_samplesIn;      // Absolute number of input samples written
+    int64_t m_analysisMark;   // Current analysis mark (absolute input index)
+    double m_synthesisMark;   // Next synthesis mark (absolute output index)
+
+    float m_wetGain;          // 0 = delayed input, 1 = shifted output
+    int m_holdRemaining;      // Samples left before an idle shifter fades back to the delayed input
+
+    // Constants
+    static constexpr int WINDOW_TABLE_SIZE = 2048;
+    static constexpr float MAX_PITCH_HZ = 1000.0f;
+    static constexpr float UNVOICED_GRAIN_MS = 5.0f;
+    static constexpr float MIN_RATIO = 0.5f;
+    static constexpr float MAX_RATIO = 2.0f;
+    static constexpr float IDLE_RATIO_TOLERANCE = 0.001f;  // Closer to 1.0 than this counts as no shift
+    static constexpr float BYPASS_FADE_MS = 5.0f;          // Crossfade between delayed input and shifted output
+    static constexpr float BYPASS_HOLD_MS = 150.0f;        // Stay shifted through brief confidence drops
+};
+
+#endif // PITCH_SHIFTER_H
@@ -0,0 +1,149 @@
+#include "pitch_stream.h"
+#include "telemetry_shm.h"
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <iostream>
+
+#ifndef _WIN32
+#include <cerrno>
+#include <csignal>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
+PitchStream::PitchStream()
+    : m_fd(-1)
+    , m_rateHz(DEFAULT_RATE_HZ)
+    , m_running(false)
+    , m_sent(0)
+    , m_dropped(0)
+{
+}
+
+PitchStream::~PitchStream() {
+    stop();
+}
+
+bool PitchStream::startFromEnv(const std::string& telemetryName) {
+    const char* fd_env = std::getenv("KARAOKE_PITCH_FD");
+    if (!fd_env || !*fd_env) {
+        return false;
+    }
+    const char* rate_env = std::getenv("KARAOKE_PITCH_RATE");
+    int rate = rate_env ? std::atoi(rate_env) : DEFAULT_RATE_HZ;
+    if (!start(telemetryName, std::atoi(fd_env), rate)) {
+        std::cerr << "⚠️  KARAOKE_PITCH_FD=" << fd_env << " is not usable, pitch stream disabled" << std::endl;
+        return false;
+    }
+    return true;
+}
+
+bool PitchStream::isRunning() const {
+    return m_running.load();
+}
+
+uint64_t PitchStream::getSentCount() const {
+    return m_sent.load(std::memory_order_relaxed);
+}
+
+uint64_t PitchStream::getDroppedCount() const {
+    return m_dropped.load(std::memory_order_relaxed);
+}
+
+#ifndef _WIN32
+
+bool PitchStream::start(const std::string& telemetryName, int fd, int rateHz) {
+    stop();
+    if (fd < 0 || fcntl(fd, F_GETFD) < 0) {
+        return false;
+    }
+
+    // Same rules as the event stream: never block on the reader, never die when it exits
+    fcntl(fd, F_SETFL, fcntl(fd, F_GETFL) | O_NONBLOCK);
+    fcntl(fd, F_SETFD, FD_CLOEXEC);
+    signal(SIGPIPE, SIG_IGN);
+
+    m_fd = fd;
+    m_rateHz = std::max(1, std::min(MAX_RATE_HZ, rateHz));
+    m_sent.store(0);
+    m_dropped.store(0);
+    m_running.store(true);
+    m_thread = std::thread(&PitchStream::run, this, telemetryName);
+
+    std::cout << "📈 Pitch stream: " << m_rateHz << "Hz on fd " << fd << std::endl;
+    return true;
+}
+
+void PitchStream::stop() {
+    if (m_running.exchange(false)) {
+        m_thread.join();
+    }
+    if (m_fd >= 0) {
+        ::close(m_fd);
+        m_fd = -1;
+    }
+}
+
+void PitchStream::run(std::string telemetryName) {
+    TelemetryReader reader;
+    PitchFrame frames[READ_BATCH];
+    PitchStreamRecord record = {};
+    const auto interval = std::chrono::microseconds(1000000 / m_rateHz);
+    auto next_tick = std::chrono::steady_clock::now();
+
+    while (m_running.load(std::memory_order_relaxed)) {
+        next_tick += interval;
+        auto now = std::chrono::steady_clock::now();
+        if (next_tick < now) {
+            next_tick = now;   // Fell behind (suspended?); resume the cadence instead of bursting
+        }
+        std::this_thread::sleep_until(next_tick);
+
+        // The segment may not exist yet (daemon still starting)
+        if (!reader.isOpen() && !reader.open(telemetryName)) {
+            continue;
+        }
+
+        // Only the newest frame goes out; the rest of the batch is older than this tick
+        bool fresh = false;
+        size_t got;
+        while ((got = reader.read(frames, READ_BATCH)) > 0) {
+            const PitchFrame& latest = frames[got - 1];
+            record.position = latest.time;
+            record.pitch = latest.pitch;
+            record.confidence = latest.confidence;
+            record.target = latest.target;
+            fresh = true;
+        }
+        if (!fresh) {
+            continue;
+        }
+
+        ssize_t written = ::write(m_fd, &record, sizeof(record));
+        if (written == (ssize_t)sizeof(record)) {
+            record.sequence++;
+            m_sent.fetch_add(1, std::memory_order_relaxed);
+        } else if (written < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
+            record.sequence++;   // The gap tells the reader it missed one
+            m_dropped.fetch_add(1, std::memory_order_relaxed);
+        } else if (written < 0 && errno != EINTR) {
+            break;   // Reader went away
+        }
+    }
+}
+
+#else
+
+// No descriptor inheritance from the Node backend on Windows
+bool PitchStream::start(const std::string& telemetryName, int fd, int rateHz) {
+    (void)telemetryName;
+    (void)fd;
+    (void)rateHz;
+    return false;
+}
+
+void PitchStream::stop() {
+}
+
+#endif
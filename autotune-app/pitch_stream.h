@@ -0,0 +1,63 @@
+#ifndef PITCH_STREAM_H
+#define PITCH_STREAM_H
+
+#include <atomic>
+#include <cstdint>
+#include <string>
+#include <thread>
+
+// One pitch sample as sent to the web frontend: 20 bytes, host byte order
+// (little-endian on every platform we build for). The Node backend forwards
+// these unchanged as binary WebSocket messages.
+struct PitchStreamRecord {
+    uint32_t sequence;    // Increments per record sent; gaps mean records were dropped
+    float position;       // Playback position in the song (s)
+    float pitch;          // Detected voice pitch (Hz), 0 when none
+    float confidence;
+    float target;         // Melody target (Hz), 0 when none
+};
+static_assert(sizeof(PitchStreamRecord) == 20, "PitchStreamRecord is a wire format");
+
+// Fixed-rate binary pitch feed for the web frontend.
+//
+// A background thread follows the shared-memory telemetry ring (the same one
+// pitch_viewer reads) and, rateHz times a second, writes the newest frame as
+// a PitchStreamRecord to a descriptor inherited from the parent
+// (KARAOKE_PITCH_FD, rate from KARAOKE_PITCH_RATE). Nothing is sent while no
+// new frames arrive. The descriptor is non-blocking: when the reader falls
+// behind, records are dropped and counted, so the engine never waits on it.
+class PitchStream {
+public:
+    PitchStream();
+    ~PitchStream();
+
+    // Follow the named telemetry segment and write to fd
+    bool start(const std::string& telemetryName, int fd, int rateHz = DEFAULT_RATE_HZ);
+
+    // start() with KARAOKE_PITCH_FD / KARAOKE_PITCH_RATE, if set
+    bool startFromEnv(const std::string& telemetryName);
+
+    void stop();
+    bool isRunning() const;
+
+    uint64_t getSentCount() const;
+    uint64_t getDroppedCount() const;
+
+    static constexpr int DEFAULT_RATE_HZ = 60;
+    static constexpr int MAX_RATE_HZ = 200;
+
+private:
+    void run(std::string telemetryName);
+
+    int m_fd;
+    int m_rateHz;
+    std::thread m_thread;
+    std::atomic<bool> m_running;
+    std::atomic<uint64_t> m_sent;
+    std::atomic<uint64_t> m_dropped;
+
+    // Constants
+    static constexpr size_t READ_BATCH = 64;   // Telemetry frames drained per tick
+};
+
+#endif // PITCH_STREAM_H
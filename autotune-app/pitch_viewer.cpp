@@ -0,0 +1,81 @@
+// Out-of-process pitch viewer.
+//
+// Reads the engine's pitch telemetry from shared memory and draws the same
+// plot as the in-process window. Rendering stalls here (window drags, a slow
+// GPU) cannot delay audio: the engine never waits for readers.
+//
+// Usage: ./pitch-viewer [shm_name]   (default /karaoke_telemetry)
+
+#include <SDL2/SDL.h>
+#include <chrono>
+#include <cstdlib>
+#include <iostream>
+#include <thread>
+#include "pitch_plot.h"
+#include "telemetry_shm.h"
+
+static constexpr int FRAME_INTERVAL_MS = 33;      // ~30 FPS
+static constexpr int REOPEN_AFTER_MS = 2000;      // Engine restarted or not up yet
+static constexpr size_t READ_BATCH = 256;
+
+int main(int argc, char* argv[]) {
+    const char* telemetry_env = std::getenv("KARAOKE_TELEMETRY_SHM");
+    std::string name = argc >= 2 ? argv[1] : (telemetry_env ? telemetry_env : DEFAULT_TELEMETRY_NAME);
+
+    if (SDL_Init(SDL_INIT_VIDEO) < 0) {
+        std::cerr << "❌ SDL2 initialization failed: " << SDL_GetError() << std::endl;
+        return 1;
+    }
+    SDL_Window* window = SDL_CreateWindow("Karaoke Pitch Viewer", SDL_WINDOWPOS_UNDEFINED, SDL_WINDOWPOS_UNDEFINED,
+                                          PLOT_WIDTH, PLOT_HEIGHT, SDL_WINDOW_SHOWN);
+    SDL_Renderer* renderer = window ? SDL_CreateRenderer(window, -1, SDL_RENDERER_ACCELERATED) : nullptr;
+    if (!renderer) {
+        std::cerr << "❌ Could not create viewer window: " << SDL_GetError() << std::endl;
+        SDL_Quit();
+        return 1;
+    }
+
+    std::cout << "📊 Waiting for telemetry on " << name << " ..." << std::endl;
+
+    TelemetryReader reader;
+    PlotHistory history;
+    PitchFrame batch[READ_BATCH];
+    auto last_data = std::chrono::steady_clock::now();
+    bool quit = false;
+
+    while (!quit) {
+        SDL_Event event;
+        while (SDL_PollEvent(&event)) {
+            if (event.type == SDL_QUIT) {
+                quit = true;
+            }
+        }
+
+        auto now = std::chrono::steady_clock::now();
+        if (!reader.isOpen() ||
+            now - last_data > std::chrono::milliseconds(REOPEN_AFTER_MS)) {
+            if (reader.open(name)) {
+                last_data = now;
+            }
+        }
+
+        size_t got;
+        while ((got = reader.read(batch, READ_BATCH)) > 0) {
+            for (size_t i = 0; i < got; i++) {
+                addPitchFrame(history, batch[i]);
+            }
+            last_data = now;
+        }
+
+        drawPlot(renderer, history);
+        std::this_thread::sleep_for(std::chrono::milliseconds(FRAME_INTERVAL_MS));
+    }
+
+    if (reader.getMissedCount() > 0) {
+        std::cout << "⚠️  Viewer fell behind and skipped " << reader.getMissedCount() << " frames" << std::endl;
+    }
+    SDL_DestroyRenderer(renderer);
+    SDL_DestroyWindow(window);
+    SDL_Quit();
+    return 0;
+}
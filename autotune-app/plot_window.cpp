@@ -0,0 +1,118 @@
+#include "plot_window.h"
+#include <iostream>
+
+#ifndef KARAOKE_HEADLESS
+
+PlotWindow::PlotWindow()
+    : m_window(nullptr)
+    , m_renderer(nullptr)
+{
+}
+
+PlotWindow::~PlotWindow() {
+    close();
+}
+
+bool PlotWindow::open() {
+    if (isOpen()) {
+        return true;
+    }
+
+    if (SDL_Init(SDL_INIT_VIDEO) < 0) {
+        std::cerr << "❌ SDL2 initialization failed: " << SDL_GetError() << std::endl;
+        return false;
+    }
+
+    m_window = SDL_CreateWindow("Karaoke Pitch Plot",
+                                SDL_WINDOWPOS_UNDEFINED, SDL_WINDOWPOS_UNDEFINED,
+                                PLOT_WIDTH, PLOT_HEIGHT, SDL_WINDOW_SHOWN);
+    if (!m_window) {
+        std::cerr << "❌ Could not create window: " << SDL_GetError() << std::endl;
+        SDL_Quit();
+        return false;
+    }
+
+    m_renderer = SDL_CreateRenderer(m_window, -1, SDL_RENDERER_ACCELERATED);
+    if (!m_renderer) {
+        std::cerr << "❌ Could not create renderer: " << SDL_GetError() << std::endl;
+        SDL_DestroyWindow(m_window);
+        m_window = nullptr;
+        SDL_Quit();
+        return false;
+    }
+    return true;
+}
+
+void PlotWindow::close() {
+    if (!isOpen()) {
+        return;
+    }
+    SDL_DestroyRenderer(m_renderer);
+    SDL_DestroyWindow(m_window);
+    SDL_Quit();
+    m_renderer = nullptr;
+    m_window = nullptr;
+}
+
+bool PlotWindow::isOpen() const {
+    return m_renderer != nullptr;
+}
+
+bool PlotWindow::pollEvents() {
+    if (!isOpen()) {
+        return true;
+    }
+    bool keepRunning = true;
+    SDL_Event event;
+    while (SDL_PollEvent(&event)) {
+        if (event.type == SDL_QUIT) {
+            keepRunning = false;
+        }
+    }
+    return keepRunning;
+}
+
+void PlotWindow::addFrame(const PitchFrame& frame) {
+    if (isOpen()) {
+        addPitchFrame(m_history, frame);
+    }
+}
+
+void PlotWindow::draw() {
+    if (isOpen()) {
+        drawPlot(m_renderer, m_history);
+    }
+}
+
+#else  // KARAOKE_HEADLESS
+
+PlotWindow::PlotWindow() {
+}
+
+PlotWindow::~PlotWindow() {
+}
+
+bool PlotWindow::open() {
+    std::cerr << "❌ This build has no pitch plot window (KARAOKE_HEADLESS); run with --headless" << std::endl;
+    return false;
+}
+
+void PlotWindow::close() {
+}
+
+bool PlotWindow::isOpen() const {
+    return false;
+}
+
+bool PlotWindow::pollEvents() {
+    return true;
+}
+
+void PlotWindow::addFrame(const PitchFrame& frame) {
+    (void)frame;
+}
+
+void PlotWindow::draw() {
+}
+
+#endif // KARAOKE_HEADLESS
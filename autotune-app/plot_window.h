@@ -0,0 +1,39 @@
+#ifndef PLOT_WINDOW_H
+#define PLOT_WINDOW_H
+
+#include "telemetry_shm.h"
+
+#ifndef KARAOKE_HEADLESS
+#include "pitch_plot.h"
+#endif
+
+// The engine's SDL pitch plot window. The main loop feeds it PitchFrames and
+// it keeps its own history, so drawing never touches live DSP state. A window
+// that was never opened ignores everything, which is how --headless runs.
+// Building with KARAOKE_HEADLESS leaves SDL out entirely: open() then always
+// fails and nothing here links against SDL.
+class PlotWindow {
+public:
+    PlotWindow();
+    ~PlotWindow();
+
+    // Initialise SDL video and create the window; false (with a message) on failure
+    bool open();
+    void close();
+    bool isOpen() const;
+
+    // Handle pending window events; false once the user has closed the window
+    bool pollEvents();
+
+    void addFrame(const PitchFrame& frame);
+    void draw();
+
+private:
+#ifndef KARAOKE_HEADLESS
+    SDL_Window* m_window;
+    SDL_Renderer* m_renderer;
+    PlotHistory m_history;
+#endif
+};
+
+#endif // PLOT_WINDOW_H
@@ -0,0 +1,185 @@
+#include "resample_cache.h"
+#include "resampler.h"
+#include "dsp_kernels.h"
+#include <sndfile.h>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <filesystem>
+#include <fstream>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <vector>
+
+ResampleCache::ResampleCache(const std::string& cacheDir)
+    : m_cacheDir(cacheDir)
+{
+}
+
+bool ResampleCache::lookup(const std::string& sourcePath, int targetRate, std::string* playablePath) {
+    if (isNativeFormat(sourcePath, targetRate)) {
+        *playablePath = sourcePath;
+        return true;
+    }
+
+    std::string cached = cachePathFor(sourcePath, targetRate);
+    if (cached.empty() || !std::filesystem::exists(cached)) {
+        return false;
+    }
+    *playablePath = cached;
+    return true;
+}
+
+bool ResampleCache::ingest(const std::string& sourcePath, int targetRate, std::string* playablePath) {
+    if (lookup(sourcePath, targetRate, playablePath)) {
+        std::cout << "✅ Already playable without conversion: " << *playablePath << std::endl;
+        return true;
+    }
+
+    std::string cached = cachePathFor(sourcePath, targetRate);
+    if (cached.empty()) {
+        std::cerr << "❌ Could not read instrumental for hashing: " << sourcePath << std::endl;
+        return false;
+    }
+
+    std::filesystem::create_directories(m_cacheDir);
+    std::string tempPath = cached + ".tmp";
+
+    auto start = std::chrono::steady_clock::now();
+    if (!convert(sourcePath, tempPath, targetRate)) {
+        std::filesystem::remove(tempPath);
+        return false;
+    }
+    std::filesystem::rename(tempPath, cached);
+    auto elapsed = std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::steady_clock::now() - start);
+
+    std::cout << "💾 Cached " << sourcePath << " -> " << cached
+              << " (" << elapsed.count() << " ms)" << std::endl;
+    *playablePath = cached;
+    return true;
+}
+
+std::string ResampleCache::cachePathFor(const std::string& sourcePath, int targetRate) {
+    std::string hash = hashFile(sourcePath);
+    if (hash.empty()) {
+        return "";
+    }
+    return m_cacheDir + "/" + hash + "_" + std::to_string(targetRate) + "_mono.wav";
+}
+
+std::string ResampleCache::hashFile(const std::string& path) {
+    std::ifstream file(path, std::ios::binary);
+    if (!file.is_open()) {
+        return "";
+    }
+
+    // FNV-1a style mixing over 64-bit words; the tail is zero padded
+    uint64_t hash = 14695981039346656037ULL;
+    const uint64_t prime = 1099511628211ULL;
+    std::vector<char> chunk(1 << 16);
+    while (file) {
+        file.read(chunk.data(), chunk.size());
+        size_t got = (size_t)file.gcount();
+        if (got == 0) {
+            break;
+        }
+        size_t words = (got + 7) / 8;
+        std::memset(chunk.data() + got, 0, words * 8 - got);
+        for (size_t i = 0; i < words; ++i) {
+            uint64_t word;
+            std::memcpy(&word, chunk.data() + i * 8, 8);
+            hash ^= word;
+            hash *= prime;
+        }
+        hash ^= got;
+        hash *= prime;
+    }
+
+    std::stringstream ss;
+    ss << std::hex << std::setfill('0') << std::setw(16) << hash;
+    return ss.str();
+}
+
+bool ResampleCache::isNativeFormat(const std::string& sourcePath, int targetRate) {
+    SF_INFO info;
+    info.format = 0;
+    SNDFILE* file = sf_open(sourcePath.c_str(), SFM_READ, &info);
+    if (!file) {
+        return false;
+    }
+    sf_close(file);
+    return info.channels == 1 && info.samplerate == targetRate;
+}
+
+bool ResampleCache::convert(const std::string& sourcePath, const std::string& destPath, int targetRate) {
+    SF_INFO inInfo;
+    inInfo.format = 0;
+    SNDFILE* in = sf_open(sourcePath.c_str(), SFM_READ, &inInfo);
+    if (!in) {
+        std::cerr << "❌ Could not open instrumental file: " << sourcePath << std::endl;
+        return false;
+    }
+
+    SF_INFO outInfo;
+    std::memset(&outInfo, 0, sizeof(outInfo));
+    outInfo.samplerate = targetRate;
+    outInfo.channels = 1;
+    outInfo.format = SF_FORMAT_WAV | SF_FORMAT_FLOAT;
+    SNDFILE* out = sf_open(destPath.c_str(), SFM_WRITE, &outInfo);
+    if (!out) {
+        std::cerr << "❌ Could not create cache file: " << destPath << std::endl;
+        sf_close(in);
+        return false;
+    }
+
+    std::cout << "🔄 Converting " << inInfo.channels << "ch " << inInfo.samplerate << "Hz -> mono "
+              << targetRate << "Hz (polyphase)" << std::endl;
+
+    PolyphaseResampler resampler;
+    resampler.init(inInfo.samplerate, targetRate, CONVERT_BLOCK_FRAMES);
+
+    std::vector<float> interleaved(CONVERT_BLOCK_FRAMES * inInfo.channels);
+    std::vector<float> mono(CONVERT_BLOCK_FRAMES, 0.0f);
+    std::vector<float> converted(resampler.maxOutputFrames(CONVERT_BLOCK_FRAMES));
+
+    // Drop the filter's group delay so the cached audio lines up with the melody map
+    size_t toSkip = (size_t)std::lround(resampler.getLatencyFrames());
+    const sf_count_t expected = (sf_count_t)std::llround((double)inInfo.frames * targetRate / inInfo.samplerate);
+    sf_count_t written = 0;
+    bool sourceDone = false;
+
+    while (written < expected) {
+        sf_count_t frames = 0;
+        if (!sourceDone) {
+            frames = sf_readf_float(in, interleaved.data(), CONVERT_BLOCK_FRAMES);
+            if (frames <= 0) {
+                sourceDone = true;
+                frames = 0;
+            }
+        }
+
+        if (sourceDone) {
+            // Flush the filter tail with silence
+            std::fill(mono.begin(), mono.end(), 0.0f);
+            frames = CONVERT_BLOCK_FRAMES;
+        } else {
+            downmixToMono(mono.data(), interleaved.data(), (int)frames, inInfo.channels);
+        }
+
+        size_t produced = resampler.process(mono.data(), (size_t)frames, converted.data());
+        size_t offset = std::min(toSkip, produced);
+        toSkip -= offset;
+
+        sf_count_t count = std::min((sf_count_t)(produced - offset), expected - written);
+        if (count > 0) {
+            sf_writef_float(out, converted.data() + offset, count);
+            written += count;
+        }
+    }
+
+    sf_close(in);
+    sf_close(out);
+    return true;
+}
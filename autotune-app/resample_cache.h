@@ -0,0 +1,40 @@
+#ifndef RESAMPLE_CACHE_H
+#define RESAMPLE_CACHE_H
+
+#include <string>
+
+// On-disk cache of instrumentals converted to mono at the engine sample rate.
+//
+// Entries are keyed by a hash of the source file contents plus the target
+// rate, so a song is decoded, downmixed and resampled once (at ingest) and
+// every later session streams native-rate PCM with no conversion work.
+// Entries are written to a temporary file and renamed into place, so an
+// interrupted ingest never leaves a truncated cache file behind.
+class ResampleCache {
+public:
+    explicit ResampleCache(const std::string& cacheDir = "cache/resampled");
+
+    // Find a file that can be streamed without conversion. Returns the source
+    // itself if it is already mono at targetRate, or an existing cache entry.
+    bool lookup(const std::string& sourcePath, int targetRate, std::string* playablePath);
+
+    // Convert sourcePath and store it in the cache (no-op if already cached)
+    bool ingest(const std::string& sourcePath, int targetRate, std::string* playablePath);
+
+    // Where the cache entry for this source would live
+    std::string cachePathFor(const std::string& sourcePath, int targetRate);
+
+    // 64-bit content hash of a file as 16 hex digits (empty string on error)
+    static std::string hashFile(const std::string& path);
+
+private:
+    bool isNativeFormat(const std::string& sourcePath, int targetRate);
+    bool convert(const std::string& sourcePath, const std::string& destPath, int targetRate);
+
+    std::string m_cacheDir;
+
+    // Constants
+    static constexpr size_t CONVERT_BLOCK_FRAMES = 16384;
+};
+
+#endif // RESAMPLE_CACHE_H
@@ -0,0 +1,127 @@
+#include "resampler.h"
+#include <algorithm>
+#include <cmath>
+#include <numeric>
+
+namespace {
+
+// Zeroth-order modified Bessel function of the first kind (series expansion)
+double besselI0(double x) {
+    double sum = 1.0;
+    double term = 1.0;
+    double halfX = x * 0.5;
+    for (int k = 1; k < 50; ++k) {
+        term *= (halfX / k) * (halfX / k);
+        sum += term;
+        if (term < sum * 1e-12) {
+            break;
+        }
+    }
+    return sum;
+}
+
+} // namespace
+
+PolyphaseResampler::PolyphaseResampler()
+    : m_inRate(48000)
+    , m_outRate(48000)
+    , m_upFactor(1)
+    , m_downFactor(1)
+    , m_inputIndex(0)
+    , m_phase(0)
+{
+}
+
+void PolyphaseResampler::init(int inRate, int outRate, size_t maxInputFrames) {
+    m_inRate = inRate;
+    m_outRate = outRate;
+
+    int divisor = std::gcd(inRate, outRate);
+    m_upFactor = outRate / divisor;
+    m_downFactor = inRate / divisor;
+
+    m_buffer.assign(TAPS_PER_PHASE - 1 + maxInputFrames, 0.0f);
+    designFilter();
+    reset();
+}
+
+void PolyphaseResampler::designFilter() {
+    const int L = m_upFactor;
+    const int length = L * TAPS_PER_PHASE;
+    const double center = (length - 1) * 0.5;
+
+    // Cutoff relative to the upsampled rate (L * inRate)
+    const double cutoff = PASSBAND * 0.5 * std::min(1.0, (double)m_upFactor / m_downFactor) / L;
+    const double norm = besselI0(KAISER_BETA);
+
+    std::vector<double> prototype(length);
+    for (int n = 0; n < length; ++n) {
+        double x = n - center;
+        double sinc = (x == 0.0) ? 2.0 * cutoff : std::sin(2.0 * M_PI * cutoff * x) / (M_PI * x);
+        double ratio = x / center;
+        double window = besselI0(KAISER_BETA * std::sqrt(std::max(0.0, 1.0 - ratio * ratio))) / norm;
+        prototype[n] = sinc * window * L;  // Gain L compensates for zero stuffing
+    }
+
+    // Split into phases; store taps reversed so the inner loop walks the input forwards
+    m_phases.assign((size_t)L * TAPS_PER_PHASE, 0.0f);
+    for (int p = 0; p < L; ++p) {
+        for (int k = 0; k < TAPS_PER_PHASE; ++k) {
+            m_phases[(size_t)p * TAPS_PER_PHASE + (TAPS_PER_PHASE - 1 - k)] = (float)prototype[(size_t)k * L + p];
+        }
+    }
+}
+
+size_t PolyphaseResampler::process(const float* in, size_t numInput, float* out) {
+    if (numInput == 0) {
+        return 0;
+    }
+    if (isPassthrough()) {
+        std::copy(in, in + numInput, out);
+        return numInput;
+    }
+
+    // Append the block after the retained history
+    const size_t history = TAPS_PER_PHASE - 1;
+    std::copy(in, in + numInput, m_buffer.begin() + history);
+
+    size_t produced = 0;
+    while (m_inputIndex < numInput) {
+        // Window covers inputs [m_inputIndex - (TAPS - 1), m_inputIndex]
+        const float* window = m_buffer.data() + m_inputIndex;
+        const float* taps = m_phases.data() + (size_t)m_phase * TAPS_PER_PHASE;
+        float acc = 0.0f;
+        for (int k = 0; k < TAPS_PER_PHASE; ++k) {
+            acc += window[k] * taps[k];
+        }
+        out[produced++] = acc;
+
+        m_phase += m_downFactor;
+        m_inputIndex += m_phase / m_upFactor;
+        m_phase %= m_upFactor;
+    }
+
+    // Keep the tail as history for the next block
+    std::copy(m_buffer.begin() + numInput, m_buffer.begin() + numInput + history, m_buffer.begin());
+    m_inputIndex -= numInput;
+    return produced;
+}
+
+size_t PolyphaseResampler::maxOutputFrames(size_t numInput) const {
+    return (numInput * (size_t)m_upFactor) / m_downFactor + 2;
+}
+
+void PolyphaseResampler::reset() {
+    std::fill(m_buffer.begin(), m_buffer.end(), 0.0f);
+    m_inputIndex = 0;
+    m_phase = 0;
+}
+
+double PolyphaseResampler::getLatencyFrames() const {
+    // Prototype is symmetric; its centre sits (L * TAPS - 1) / 2 upsampled samples in
+    return ((double)m_upFactor * TAPS_PER_PHASE - 1.0) * 0.5 / m_downFactor;
+}
+
+bool PolyphaseResampler::isPassthrough() const {
+    return m_upFactor == 1 && m_downFactor == 1;
+}
@@ -0,0 +1,59 @@
+#ifndef RESAMPLER_H
+#define RESAMPLER_H
+
+#include <cstddef>
+#include <vector>
+
+// Streaming polyphase resampler with a Kaiser-windowed sinc prototype.
+//
+// The rate change is reduced to an integer ratio L/M (upsample by L,
+// downsample by M). Only the output samples are ever computed: each one is
+// a dot product of TAPS_PER_PHASE input samples with one of the L filter
+// phases, so the cost per output sample is constant regardless of the ratio.
+// State is carried across calls, so blocks of any size can be fed in.
+class PolyphaseResampler {
+public:
+    PolyphaseResampler();
+
+    // Design the filter bank for inRate -> outRate and size buffers for
+    // blocks of up to maxInputFrames
+    void init(int inRate, int outRate, size_t maxInputFrames);
+
+    // Resample one block. Returns the number of samples written to out,
+    // which must hold at least maxOutputFrames(numInput) samples.
+    size_t process(const float* in, size_t numInput, float* out);
+
+    // Upper bound on the output produced by numInput input samples
+    size_t maxOutputFrames(size_t numInput) const;
+
+    // Clear the filter history (e.g. after seeking)
+    void reset();
+
+    // Group delay of the filter in output samples
+    double getLatencyFrames() const;
+
+    bool isPassthrough() const;
+
+private:
+    void designFilter();
+
+    int m_inRate;
+    int m_outRate;
+    int m_upFactor;    // L
+    int m_downFactor;  // M
+
+    // Filter bank, phase-major: m_phases[p * TAPS_PER_PHASE + k]
+    std::vector<float> m_phases;
+
+    // History of the last TAPS_PER_PHASE - 1 inputs followed by the current block
+    std::vector<float> m_buffer;
+    size_t m_inputIndex;  // Newest input sample used by the next output, relative to the block
+    int m_phase;          // Current filter phase (0..L-1)
+
+    // Constants
+    static constexpr int TAPS_PER_PHASE = 32;
+    static constexpr double KAISER_BETA = 8.0;   // ~80 dB stopband
+    static constexpr double PASSBAND = 0.94;     // Cutoff as a fraction of the lower Nyquist
+};
+
+#endif // RESAMPLER_H
@@ -0,0 +1,104 @@
+#include "reverb.h"
+#include <algorithm>
+#include <cmath>
+
+Reverb::Reverb()
+    : m_wetness(0.3f)
+    , m_feedback(ROOM_OFFSET + 0.5f * ROOM_SCALE)
+    , m_damp(0.5f * DAMP_SCALE)
+{
+}
+
+void Reverb::init(int sampleRate, int maxBlockSize) {
+    const float scale = sampleRate / TUNING_RATE;
+    for (int i = 0; i < 8; ++i) {
+        m_combs[i].buffer.assign(std::max(1, (int)std::lround(COMB_TUNING[i] * scale)), 0.0f);
+    }
+    for (int i = 0; i < 4; ++i) {
+        m_allpasses[i].buffer.assign(std::max(1, (int)std::lround(ALLPASS_TUNING[i] * scale)), 0.0f);
+    }
+    m_input.assign(maxBlockSize, 0.0f);
+    m_wet.assign(maxBlockSize, 0.0f);
+    reset();
+}
+
+void Reverb::process(float* buffer, int numSamples) {
+    numSamples = std::min(numSamples, (int)m_input.size());
+    if (m_wetness <= 0.0f || numSamples <= 0) {
+        return;
+    }
+
+    float* input = m_input.data();
+    float* wet = m_wet.data();
+    for (int i = 0; i < numSamples; ++i) {
+        input[i] = buffer[i] * INPUT_GAIN;
+        wet[i] = 0.0f;
+    }
+
+    // Parallel combs, one filter at a time over the whole block
+    const float damp1 = m_damp;
+    const float damp2 = 1.0f - m_damp;
+    for (Comb& comb : m_combs) {
+        float* line = comb.buffer.data();
+        const int length = (int)comb.buffer.size();
+        int index = comb.index;
+        float store = comb.store;
+        for (int i = 0; i < numSamples; ++i) {
+            const float delayed = line[index];
+            store = delayed * damp2 + store * damp1;
+            line[index] = input[i] + store * m_feedback;
+            wet[i] += delayed;
+            if (++index == length) {
+                index = 0;
+            }
+        }
+        // Flush denormals left in the feedback path by a decaying tail
+        comb.store = std::fabs(store) < 1e-20f ? 0.0f : store;
+        comb.index = index;
+    }
+
+    // Series all-passes
+    for (Allpass& allpass : m_allpasses) {
+        float* line = allpass.buffer.data();
+        const int length = (int)allpass.buffer.size();
+        int index = allpass.index;
+        for (int i = 0; i < numSamples; ++i) {
+            const float delayed = line[index];
+            line[index] = wet[i] + delayed * ALLPASS_FEEDBACK;
+            wet[i] = delayed - wet[i];
+            if (++index == length) {
+                index = 0;
+            }
+        }
+        allpass.index = index;
+    }
+
+    const float wetGain = m_wetness * WET_SCALE;
+    for (int i = 0; i < numSamples; ++i) {
+        buffer[i] += wetGain * wet[i];
+    }
+}
+
+void Reverb::setWetness(float wetness) {
+    m_wetness = std::clamp(wetness, 0.0f, 1.0f);
+}
+
+void Reverb::setRoomSize(float roomSize) {
+    m_feedback = ROOM_OFFSET + std::clamp(roomSize, 0.0f, 1.0f) * ROOM_SCALE;
+}
+
+void Reverb::setDamping(float damping) {
+    m_damp = std::clamp(damping, 0.0f, 1.0f) * DAMP_SCALE;
+}
+
+void Reverb::reset() {
+    for (Comb& comb : m_combs) {
+        std::fill(comb.buffer.begin(), comb.buffer.end(), 0.0f);
+        comb.index = 0;
+        comb.store = 0.0f;
+    }
+    for (Allpass& allpass : m_allpasses) {
+        std::fill(allpass.buffer.begin(), allpass.buffer.end(), 0.0f);
+        allpass.index = 0;
+    }
+}
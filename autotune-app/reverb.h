@@ -0,0 +1,59 @@
+#ifndef REVERB_H
+#define REVERB_H
+
+#include <vector>
+
+// Freeverb-style mono reverb: eight parallel lowpass-feedback comb filters
+// followed by four series all-pass diffusers. Delay lengths are the classic
+// Freeverb tunings scaled to the sample rate. All buffers are allocated in
+// init(); process() only touches preallocated state, and each filter runs
+// over the whole block at a time to keep its state in registers.
+class Reverb {
+public:
+    Reverb();
+
+    void init(int sampleRate, int maxBlockSize);
+
+    // Mix reverb into buffer in place: out = dry + wetness * reverb(dry)
+    void process(float* buffer, int numSamples);
+
+    void setWetness(float wetness);     // 0.0 - 1.0
+    void setRoomSize(float roomSize);   // 0.0 - 1.0 (comb feedback)
+    void setDamping(float damping);     // 0.0 - 1.0 (high-frequency absorption)
+
+    void reset();
+
+private:
+    struct Comb {
+        std::vector<float> buffer;
+        int index = 0;
+        float store = 0.0f;
+    };
+
+    struct Allpass {
+        std::vector<float> buffer;
+        int index = 0;
+    };
+
+    Comb m_combs[8];
+    Allpass m_allpasses[4];
+    std::vector<float> m_input;     // Scaled input for the block
+    std::vector<float> m_wet;       // Comb/all-pass accumulator for the block
+
+    float m_wetness;
+    float m_feedback;
+    float m_damp;
+
+    // Constants
+    static constexpr int COMB_TUNING[8] = {1116, 1188, 1277, 1356, 1422, 1491, 1557, 1617};
+    static constexpr int ALLPASS_TUNING[4] = {556, 441, 341, 225};
+    static constexpr float TUNING_RATE = 44100.0f;
+    static constexpr float INPUT_GAIN = 0.015f;
+    static constexpr float ALLPASS_FEEDBACK = 0.5f;
+    static constexpr float ROOM_SCALE = 0.28f;
+    static constexpr float ROOM_OFFSET = 0.7f;
+    static constexpr float DAMP_SCALE = 0.4f;
+    static constexpr float WET_SCALE = 3.0f;
+};
+
+#endif // REVERB_H
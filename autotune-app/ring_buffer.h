@@ -0,0 +1,118 @@
+#ifndef RING_BUFFER_H
+#define RING_BUFFER_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// Single-producer / single-consumer lock-free ring buffer.
+//
+// The producer (usually the audio callback) never blocks and never allocates:
+// when the consumer falls behind, new items are dropped and counted instead.
+// Each consumer drains at its own rate; use one ring per consumer.
+template <typename T>
+class SpscRingBuffer {
+public:
+    // Capacity is rounded up to the next power of two
+    explicit SpscRingBuffer(size_t capacity)
+        : m_head(0)
+        , m_tail(0)
+        , m_dropped(0)
+    {
+        size_t size = 1;
+        while (size < capacity) {
+            size <<= 1;
+        }
+        m_buffer.resize(size);
+        m_mask = size - 1;
+    }
+
+    SpscRingBuffer(const SpscRingBuffer&) = delete;
+    SpscRingBuffer& operator=(const SpscRingBuffer&) = delete;
+
+    // Producer side: push one item, returns false (and counts a drop) if full
+    bool push(const T& item) {
+        const size_t head = m_head.load(std::memory_order_relaxed);
+        const size_t tail = m_tail.load(std::memory_order_acquire);
+        if (head - tail > m_mask) {
+            m_dropped.fetch_add(1, std::memory_order_relaxed);
+            return false;
+        }
+        m_buffer[head & m_mask] = item;
+        m_head.store(head + 1, std::memory_order_release);
+        return true;
+    }
+
+    // Producer side: push up to count items, returns how many were written.
+    // Items that do not fit are dropped and counted.
+    size_t pushBlock(const T* items, size_t count) {
+        const size_t head = m_head.load(std::memory_order_relaxed);
+        const size_t tail = m_tail.load(std::memory_order_acquire);
+        const size_t space = capacity() - (head - tail);
+        const size_t n = count < space ? count : space;
+        for (size_t i = 0; i < n; ++i) {
+            m_buffer[(head + i) & m_mask] = items[i];
+        }
+        m_head.store(head + n, std::memory_order_release);
+        if (n < count) {
+            m_dropped.fetch_add(count - n, std::memory_order_relaxed);
+        }
+        return n;
+    }
+
+    // Consumer side: pop one item, returns false if empty
+    bool pop(T& item) {
+        const size_t tail = m_tail.load(std::memory_order_relaxed);
+        const size_t head = m_head.load(std::memory_order_acquire);
+        if (head == tail) {
+            return false;
+        }
+        item = m_buffer[tail & m_mask];
+        m_tail.store(tail + 1, std::memory_order_release);
+        return true;
+    }
+
+    // Consumer side: pop up to maxCount items, returns how many were read
+    size_t popBlock(T* out, size_t maxCount) {
+        const size_t tail = m_tail.load(std::memory_order_relaxed);
+        const size_t head = m_head.load(std::memory_order_acquire);
+        const size_t avail = head - tail;
+        const size_t n = maxCount < avail ? maxCount : avail;
+        for (size_t i = 0; i < n; ++i) {
+            out[i] = m_buffer[(tail + i) & m_mask];
+        }
+        m_tail.store(tail + n, std::memory_order_release);
+        return n;
+    }
+
+    // Number of items ready for the consumer
+    size_t available() const {
+        return m_head.load(std::memory_order_acquire) - m_tail.load(std::memory_order_acquire);
+    }
+
+    // Free slots for the producer
+    size_t space() const {
+        return capacity() - available();
+    }
+
+    size_t capacity() const {
+        return m_mask + 1;
+    }
+
+    // Items the producer had to drop because the consumer was too slow
+    uint64_t droppedCount() const {
+        return m_dropped.load(std::memory_order_relaxed);
+    }
+
+private:
+    std::vector<T> m_buffer;
+    size_t m_mask;
+
+    // Keep producer and consumer indices on separate cache lines
+    alignas(64) std::atomic<size_t> m_head;
+    alignas(64) std::atomic<size_t> m_tail;
+    alignas(64) std::atomic<uint64_t> m_dropped;
+};
+
+#endif // RING_BUFFER_H
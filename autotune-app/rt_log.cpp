@@ -0,0 +1,147 @@
+#include "rt_log.h"
+#include <chrono>
+#include <cstdio>
+#include <cstring>
+
+bool RtRateLimiter::allow(uint32_t* suppressedOut) {
+    int64_t now = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count();
+    if (now - m_lastNs < m_intervalNs) {
+        ++m_suppressed;
+        return false;
+    }
+    m_lastNs = now;
+    *suppressedOut = m_suppressed;
+    m_suppressed = 0;
+    return true;
+}
+
+RtLogger::RtLogger()
+    : m_queue(QUEUE_CAPACITY)
+    , m_level((uint8_t)LogLevel::Info)
+    , m_running(false)
+    , m_reportedDrops(0)
+{
+}
+
+RtLogger::~RtLogger() {
+    stop();
+}
+
+void RtLogger::start() {
+    if (m_running.load()) {
+        return;
+    }
+    m_running.store(true);
+    m_thread = std::thread(&RtLogger::run, this);
+}
+
+void RtLogger::stop() {
+    m_running.store(false);
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+    drain();
+}
+
+void RtLogger::setLevel(LogLevel level) {
+    m_level.store((uint8_t)level, std::memory_order_relaxed);
+}
+
+LogLevel RtLogger::getLevel() const {
+    return (LogLevel)m_level.load(std::memory_order_relaxed);
+}
+
+void RtLogger::log(LogLevel level, const char* format, double a, double b, double c, double d) {
+    if (level < getLevel()) {
+        return;
+    }
+    push(level, format, a, b, c, d, 0);
+}
+
+void RtLogger::logLimited(RtRateLimiter& limiter, LogLevel level, const char* format,
+                          double a, double b, double c, double d) {
+    uint32_t suppressed = 0;
+    if (level < getLevel() || !limiter.allow(&suppressed)) {
+        return;
+    }
+    push(level, format, a, b, c, d, suppressed);
+}
+
+uint64_t RtLogger::getDroppedCount() const {
+    return m_queue.droppedCount();
+}
+
+LogLevel RtLogger::parseLevel(const char* name, LogLevel fallback) {
+    if (!name) {
+        return fallback;
+    }
+    if (std::strcmp(name, "debug") == 0) return LogLevel::Debug;
+    if (std::strcmp(name, "info") == 0) return LogLevel::Info;
+    if (std::strcmp(name, "warn") == 0) return LogLevel::Warn;
+    if (std::strcmp(name, "error") == 0) return LogLevel::Error;
+    return fallback;
+}
+
+void RtLogger::push(LogLevel level, const char* format, double a, double b, double c, double d,
+                    uint32_t suppressed) {
+    LogRecord record;
+    record.format = format;
+    record.args[0] = a;
+    record.args[1] = b;
+    record.args[2] = c;
+    record.args[3] = d;
+    record.suppressed = suppressed;
+    record.level = level;
+    m_queue.push(record);
+}
+
+void RtLogger::run() {
+    while (m_running.load()) {
+        if (drain() == 0) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(DRAIN_INTERVAL_MS));
+        }
+    }
+}
+
+int RtLogger::drain() {
+    int count = 0;
+    LogRecord record;
+    while (m_queue.pop(record)) {
+        write(record);
+        ++count;
+    }
+
+    uint64_t drops = m_queue.droppedCount();
+    if (drops != m_reportedDrops) {
+        std::fprintf(stdout, "⚠️  Log queue full, %llu messages dropped\n",
+                     (unsigned long long)(drops - m_reportedDrops));
+        std::fflush(stdout);
+        m_reportedDrops = drops;
+    }
+    return count;
+}
+
+void RtLogger::write(const LogRecord& record) {
+    char line[LINE_LENGTH];
+    // Records only ever carry string literals written for four double arguments
+#if defined(__GNUC__)
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wformat-nonliteral"
+#pragma GCC diagnostic ignored "-Wformat-security"
+#endif
+    std::snprintf(line, sizeof(line), record.format,
+                  record.args[0], record.args[1], record.args[2], record.args[3]);
+#if defined(__GNUC__)
+#pragma GCC diagnostic pop
+#endif
+
+    // Errors go to stderr; everything else stays on stdout where the backend watches it
+    FILE* stream = record.level == LogLevel::Error ? stderr : stdout;
+    if (record.suppressed > 0) {
+        std::fprintf(stream, "%s (+%u similar)\n", line, record.suppressed);
+    } else {
+        std::fprintf(stream, "%s\n", line);
+    }
+    std::fflush(stream);
+}
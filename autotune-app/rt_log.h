@@ -0,0 +1,93 @@
+#ifndef RT_LOG_H
+#define RT_LOG_H
+
+#include <atomic>
+#include <cstdint>
+#include <thread>
+#include "ring_buffer.h"
+
+enum class LogLevel : uint8_t {
+    Debug = 0,
+    Info,
+    Warn,
+    Error
+};
+
+// One queued log message. The format must be a string literal (only the
+// pointer is stored) and may use up to four floating-point conversions
+// (%f, %g, %.1f, ...); every argument is passed as a double.
+struct LogRecord {
+    const char* format;
+    double args[4];
+    uint32_t suppressed;   // Messages dropped by the call site's rate limiter since the last one
+    LogLevel level;
+};
+
+// Per-call-site rate limiter, meant to live in a function-local static
+// next to the log call. Lets one message through per interval.
+class RtRateLimiter {
+public:
+    constexpr explicit RtRateLimiter(double intervalSeconds)
+        : m_intervalNs((int64_t)(intervalSeconds * 1e9)), m_lastNs(INT64_MIN / 2), m_suppressed(0) {}
+
+    // True if a message may be logged now; suppressedOut receives the skipped count
+    bool allow(uint32_t* suppressedOut);
+
+private:
+    int64_t m_intervalNs;
+    int64_t m_lastNs;
+    uint32_t m_suppressed;
+};
+
+// Real-time-safe logger for the audio callback.
+//
+// log() copies a fixed-size record into a lock-free ring and returns;
+// it never allocates, formats or touches a stream. A background thread
+// formats records with snprintf and writes them to stdout (errors to
+// stderr). If the consumer falls behind, records are dropped and counted
+// rather than blocking the producer. Single producer: only the audio
+// thread may call log().
+class RtLogger {
+public:
+    RtLogger();
+    ~RtLogger();
+
+    void start();
+    void stop();   // Flushes everything still queued
+
+    void setLevel(LogLevel level);
+    LogLevel getLevel() const;
+
+    void log(LogLevel level, const char* format, double a = 0.0, double b = 0.0,
+             double c = 0.0, double d = 0.0);
+
+    // Log at most once per limiter interval; skipped messages are counted
+    // and reported with the next one that gets through
+    void logLimited(RtRateLimiter& limiter, LogLevel level, const char* format, double a = 0.0,
+                    double b = 0.0, double c = 0.0, double d = 0.0);
+
+    uint64_t getDroppedCount() const;
+
+    // Parse "debug", "info", "warn" or "error"; returns fallback otherwise
+    static LogLevel parseLevel(const char* name, LogLevel fallback);
+
+private:
+    void push(LogLevel level, const char* format, double a, double b, double c, double d,
+              uint32_t suppressed);
+    void run();
+    int drain();
+    void write(const LogRecord& record);
+
+    SpscRingBuffer<LogRecord> m_queue;
+    std::atomic<uint8_t> m_level;
+    std::atomic<bool> m_running;
+    std::thread m_thread;
+    uint64_t m_reportedDrops;
+
+    // Constants
+    static constexpr size_t QUEUE_CAPACITY = 1024;
+    static constexpr int DRAIN_INTERVAL_MS = 20;
+    static constexpr size_t LINE_LENGTH = 512;
+};
+
+#endif // RT_LOG_H
@@ -16,7 +16,7 @@ if [ ! -x "autotune-karaoke" ]; then
         echo "❌ Build script not found! Please build manually:"
         echo "   make all"
         echo "   or"
-        echo "   g++ -std=c++17 -Wall -Wextra -O2 -I. karaoke.cpp simple_noise_suppression.cpp -o autotune-karaoke -lportaudio -lsndfile -laubio -lSDL2"
+        echo "   g++ -std=c++17 -Wall -Wextra -O2 -I. -pthread karaoke.cpp simple_noise_suppression.cpp running_median.cpp spectral_denoiser.cpp fft.cpp dsp_kernels.cpp wav_recorder.cpp streaming_source.cpp resampler.cpp resample_cache.cpp pitch_shifter.cpp chorus.cpp reverb.cpp control_channel.cpp pitch_analyzer.cpp singer_chain.cpp singer_pool.cpp audio_engine.cpp rt_log.cpp telemetry_shm.cpp song_cache.cpp engine_daemon.cpp event_stream.cpp pitch_stream.cpp plot_window.cpp pitch_plot.cpp -o autotune-karaoke -lportaudio -lsndfile -laubio -lSDL2 -lrt"
         exit 1
     fi
 fi
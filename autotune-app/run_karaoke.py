@@ -1,12 +1,62 @@
 """
 Simple wrapper script to run the C++ karaoke program with automatic song detection.
 This script finds the correct file paths and runs the karaoke program.
+
+If KARAOKE_EVENT_FD names an open descriptor, the engine writes JSON-lines
+events to it (see event_stream.h) and this script adds its own: errors it
+hits before the engine starts, and the engine's exit code. KARAOKE_PITCH_FD
+(the binary pitch feed, see pitch_stream.h) is passed through the same way.
 """
 
+import json
+import os
 import sys
 import subprocess
+import time
 from song_finder import find_song_files
 
+_START_TIME = time.monotonic()
+
+def inherited_fd(variable):
+    """The descriptor named by an environment variable, or None if unset or not open."""
+    try:
+        fd = int(os.environ[variable])
+        os.fstat(fd)
+        return fd
+    except (KeyError, ValueError, OSError):
+        return None
+
+def event_fd():
+    return inherited_fd("KARAOKE_EVENT_FD")
+
+def emit_event(event, **fields):
+    """Write one event line in the engine's format; silently dropped if nobody listens."""
+    fd = event_fd()
+    if fd is None:
+        return
+    line = json.dumps({"event": event, "t": round(time.monotonic() - _START_TIME, 3), **fields}) + "\n"
+    try:
+        os.write(fd, line.encode())
+    except OSError:
+        pass
+
+def ingest_songs(song_inputs):
+    """Convert each song's instrumental into the engine's resample cache."""
+    for song_input in song_inputs:
+        melody_file, instrumental_file, message = find_song_files(song_input)
+        if not instrumental_file:
+            print(message)
+            continue
+        
+        print(f"💾 Ingesting instrumental for: {song_input}")
+        try:
+            subprocess.run(["./autotune-karaoke", "--ingest", instrumental_file], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Ingest failed with exit code: {e.returncode}")
+        except FileNotFoundError:
+            print("❌ Karaoke executable not found! Make sure to compile the C++ program first.")
+            return
+
 def main():
     if len(sys.argv) < 2 or sys.argv[1] in ['--help', '-h', 'help']:
         print("🎵 Karaoke Runner")
@@ -14,7 +64,15 @@ def main():
         print("\n💡 Examples:")
         print("   python3 run_karaoke.py Taylor_Swift_-_Love_Story")
         print("\n🔍 To see available songs: python3 song_finder.py --list")
+        print("💾 Pre-convert a song's instrumental: python3 run_karaoke.py --ingest <song_name>")
         print("Usage: python3 run_karaoke.py <song_name> [--autotune 0.8] [--pitch-shift 2] [--voice-volume 1.2] [--instrument-volume 2.0]")
+        print("       [--singers 2] [--singer-melody harmony_melody.txt]  # duet: one mic per input channel")
+        print("       [--offline take1.wav] [--output take1_mix.wav]       # render a recorded vocal, no devices")
+        print("       [--headless]                                          # no plot window (telemetry only)")
+        return
+    
+    if sys.argv[1] == '--ingest':
+        ingest_songs(sys.argv[2:])
         return
     
     song_input = sys.argv[1]
@@ -30,6 +88,12 @@ def main():
         'enable_reverb': False,      # Default: no reverb
         'reverb_wetness': 0.3        # Default: moderate reverb
     }
+    latency_profile = None           # Default: engine's "balanced" profile
+    singers = None                   # Default: one singer on input channel 1
+    singer_melodies = []             # Melody files for singers 2, 3, ...
+    offline_vocal = None             # Default: live session with audio devices
+    output_file = None               # Default: output/<song>_<timestamp>.wav
+    headless = False                 # Default: open the pitch plot window
 
         # Parse command line arguments for voice effects
     i = 2
@@ -59,6 +123,24 @@ def main():
         elif arg == '--reverb-wetness' and i + 1 < len(sys.argv):
             voice_params['reverb_wetness'] = float(sys.argv[i + 1])
             i += 2
+        elif arg == '--latency-profile' and i + 1 < len(sys.argv):
+            latency_profile = sys.argv[i + 1]
+            i += 2
+        elif arg == '--singers' and i + 1 < len(sys.argv):
+            singers = sys.argv[i + 1]
+            i += 2
+        elif arg == '--singer-melody' and i + 1 < len(sys.argv):
+            singer_melodies.append(sys.argv[i + 1])
+            i += 2
+        elif arg == '--offline' and i + 1 < len(sys.argv):
+            offline_vocal = sys.argv[i + 1]
+            i += 2
+        elif arg == '--output' and i + 1 < len(sys.argv):
+            output_file = sys.argv[i + 1]
+            i += 2
+        elif arg == '--headless':
+            headless = True
+            i += 1
         else:
             i += 1
     
@@ -78,6 +160,7 @@ def main():
     
     if not melody_file or not instrumental_file:
         print(message)
+        emit_event("error", message=f"Song not found: {song_input}")
         return
     
     print(message)
@@ -86,8 +169,22 @@ def main():
     
     try:
         # Run the C++ karaoke program with song name first, then file paths
+        profile_args = ["--latency-profile", latency_profile] if latency_profile else []
+        if singers:
+            profile_args += ["--singers", singers]
+        for melody in singer_melodies:
+            profile_args += ["--singer-melody", melody]
+        if offline_vocal:
+            profile_args += ["--offline", offline_vocal]
+        if output_file:
+            profile_args += ["--output", output_file]
+        if headless:
+            profile_args.append("--headless")
+        # The engine inherits the event and pitch descriptors and writes to them directly
+        engine_fds = tuple(fd for fd in (event_fd(), inherited_fd("KARAOKE_PITCH_FD")) if fd is not None)
         result = subprocess.run([
                 "./autotune-karaoke", 
+                *profile_args,
                 song_input, 
                 melody_file, 
                 instrumental_file,
@@ -95,17 +192,20 @@ def main():
                 str(voice_params['pitch_shift']),
                 str(voice_params['voice_volume']),
                 str(voice_params['instrument_volume']),
-                str(voice_params['enable_chorus']),
+                '1' if voice_params['enable_chorus'] else '0',
                 str(voice_params['chorus_depth']),
-                str(voice_params['enable_reverb']),
+                '1' if voice_params['enable_reverb'] else '0',
                 str(voice_params['reverb_wetness'])
-            ], check=True)        
+            ], check=True, pass_fds=engine_fds)
         print("\n✅ Karaoke session completed!")
+        emit_event("exit", code=0)
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Karaoke program failed with exit code: {e.returncode}")
+        emit_event("exit", code=e.returncode)
     except FileNotFoundError:
         print("\n❌ Karaoke executable not found! Make sure to compile the C++ program first.")
         print("💡 Run: make clean && make")
+        emit_event("error", message="Karaoke executable not found")
     except KeyboardInterrupt:
         print("\n\n🛑 Karaoke session interrupted by user.")
 
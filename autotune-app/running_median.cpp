@@ -0,0 +1,142 @@
+#include "running_median.h"
+#include <algorithm>
+
+RunningMedian::RunningMedian()
+    : m_heapOffset(0)
+    , m_next(0)
+{
+}
+
+void RunningMedian::init(int windowSize, float initialValue) {
+    windowSize = std::max(1, windowSize);
+    m_values.assign(windowSize, initialValue);
+    m_positions.assign(windowSize, 0);
+    m_heap.assign(windowSize, 0);
+    m_heapOffset = windowSize / 2;
+    reset(initialValue);
+}
+
+void RunningMedian::reset(float initialValue) {
+    // Equal values satisfy both heap orders, so any interleaved layout is valid
+    std::fill(m_values.begin(), m_values.end(), initialValue);
+    for (int slot = 0; slot < size(); ++slot) {
+        int position = ((slot + 1) / 2) * ((slot & 1) ? -1 : 1);
+        m_positions[slot] = position;
+        heapAt(position) = slot;
+    }
+    m_next = 0;
+}
+
+void RunningMedian::push(float value) {
+    if (m_values.empty()) {
+        return;
+    }
+
+    const int slot = m_next;
+    const int position = m_positions[slot];
+    const float old = m_values[slot];
+    m_values[slot] = value;
+    m_next = (slot + 1 == size()) ? 0 : slot + 1;
+
+    if (position > 0) {
+        // Slot is in the upper-half min-heap
+        if (old < value) {
+            minSortDown(position * 2);
+        } else if (minSortUp(position)) {
+            maxSortDown(-1);
+        }
+    } else if (position < 0) {
+        // Slot is in the lower-half max-heap
+        if (value < old) {
+            maxSortDown(position * 2);
+        } else if (maxSortUp(position)) {
+            minSortDown(1);
+        }
+    } else {
+        // Slot is the median itself
+        if (maxCount() > 0) {
+            maxSortDown(-1);
+        }
+        if (minCount() > 0) {
+            minSortDown(1);
+        }
+    }
+}
+
+float RunningMedian::median() const {
+    return m_values.empty() ? 0.0f : m_values[heapAt(0)];
+}
+
+int RunningMedian::size() const {
+    return (int)m_values.size();
+}
+
+int& RunningMedian::heapAt(int position) {
+    return m_heap[position + m_heapOffset];
+}
+
+int RunningMedian::heapAt(int position) const {
+    return m_heap[position + m_heapOffset];
+}
+
+bool RunningMedian::less(int a, int b) const {
+    return m_values[heapAt(a)] < m_values[heapAt(b)];
+}
+
+// Swap heap positions a and b if value(a) < value(b); returns whether it swapped
+bool RunningMedian::compareExchange(int a, int b) {
+    if (!less(a, b)) {
+        return false;
+    }
+    std::swap(heapAt(a), heapAt(b));
+    m_positions[heapAt(a)] = a;
+    m_positions[heapAt(b)] = b;
+    return true;
+}
+
+int RunningMedian::minCount() const {
+    return (size() - 1) / 2;
+}
+
+int RunningMedian::maxCount() const {
+    return size() / 2;
+}
+
+// position is a child index; walks down swapping with the smaller child
+void RunningMedian::minSortDown(int position) {
+    for (; position <= minCount(); position *= 2) {
+        if (position > 1 && position < minCount() && less(position + 1, position)) {
+            ++position;
+        }
+        if (!compareExchange(position, position / 2)) {
+            break;
+        }
+    }
+}
+
+// position is a child index; walks down swapping with the larger child
+void RunningMedian::maxSortDown(int position) {
+    for (; position >= -maxCount(); position *= 2) {
+        if (position < -1 && position > -maxCount() && less(position, position - 1)) {
+            --position;
+        }
+        if (!compareExchange(position / 2, position)) {
+            break;
+        }
+    }
+}
+
+// Returns true if the value reached the median slot
+bool RunningMedian::minSortUp(int position) {
+    while (position > 0 && compareExchange(position, position / 2)) {
+        position /= 2;
+    }
+    return position == 0;
+}
+
+bool RunningMedian::maxSortUp(int position) {
+    while (position < 0 && compareExchange(position / 2, position)) {
+        position /= 2;
+    }
+    return position == 0;
+}
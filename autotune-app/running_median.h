@@ -0,0 +1,47 @@
+#ifndef RUNNING_MEDIAN_H
+#define RUNNING_MEDIAN_H
+
+#include <vector>
+
+// Median of the last N values, updated in O(log N) per push with no
+// allocation after init(). Values live in a ring; a combined max-heap /
+// min-heap of ring indices sits around a median slot at heap position 0
+// (negative positions are the max-heap of the lower half, positive ones the
+// min-heap of the upper half). Replacing the oldest value only re-sifts the
+// slot it occupied, so the cost does not depend on the window length.
+class RunningMedian {
+public:
+    RunningMedian();
+
+    // Allocate a window of windowSize values, all starting at initialValue
+    void init(int windowSize, float initialValue = 0.0f);
+
+    // Replace the oldest value with value
+    void push(float value);
+
+    // Element at sorted position size() / 2 (the upper median for even sizes)
+    float median() const;
+
+    int size() const;
+    void reset(float initialValue = 0.0f);
+
+private:
+    int& heapAt(int position);
+    int heapAt(int position) const;
+    bool less(int a, int b) const;
+    bool compareExchange(int a, int b);
+    void minSortDown(int position);
+    void maxSortDown(int position);
+    bool minSortUp(int position);
+    bool maxSortUp(int position);
+    int minCount() const;
+    int maxCount() const;
+
+    std::vector<float> m_values;     // Ring of the last N values
+    std::vector<int> m_positions;    // Heap position of each ring slot
+    std::vector<int> m_heap;         // Ring slot at each heap position, offset by m_heapOffset
+    int m_heapOffset;
+    int m_next;                      // Ring slot the next push overwrites
+};
+
+#endif // RUNNING_MEDIAN_H
@@ -15,13 +15,20 @@ SimpleNoiseSuppressor::SimpleNoiseSuppressor()
     , m_voiceActive(false)
     , m_graceCounter(0)
     , m_inGracePeriod(false)
+    , m_highPassAlpha(1.0f)
+    , m_highPassPrevInput(0.0f)
+    , m_highPassPrevOutput(0.0f)
 {
-    m_noiseHistory.resize(NOISE_HISTORY_SIZE, 0.0f);
-    m_spectrum.resize(256, 0.0f);
+    m_noiseHistory.init(NOISE_HISTORY_SIZE, 0.0f);
 }
 
 void SimpleNoiseSuppressor::init(int sampleRate) {
     m_sampleRate = sampleRate;
+    float rc = 1.0f / (2.0f * M_PI * HIGH_PASS_CUTOFF_HZ);
+    float dt = 1.0f / m_sampleRate;
+    m_highPassAlpha = rc / (rc + dt);
+    m_denoiser.init(sampleRate);
+    m_denoiser.setStrength(m_noiseReductionStrength);
     reset();
     std::cout << "🔇 Noise suppressor initialized at " << sampleRate << " Hz" << std::endl;
 }
@@ -54,15 +61,14 @@ void SimpleNoiseSuppressor::processAudio(float* input, float* output, int numSam
         }
     }
     
+    // Spectral stage runs on every buffer (strength 0 is a pass-through) so its
+    // latency never changes, and before the gate so it learns from real noise
+    applySpectralNoiseReduction(output, numSamples);
+    
     // Apply noise gate if no voice activity
     if (!m_voiceActive && !m_inGracePeriod) {
         applyNoiseGate(output, numSamples);
     }
-    
-    // Apply spectral noise reduction
-    if (m_noiseReductionStrength > 0.0f) {
-        applySpectralNoiseReduction(output, numSamples);
-    }
 }
 
 void SimpleNoiseSuppressor::setNoiseGateThreshold(float threshold) {
@@ -82,6 +88,7 @@ void SimpleNoiseSuppressor::setGracePeriod(int ms) {
 
 void SimpleNoiseSuppressor::setNoiseReductionStrength(float strength) {
     m_noiseReductionStrength = std::clamp(strength, 0.0f, 1.0f);
+    m_denoiser.setStrength(m_noiseReductionStrength);
     std::cout << "🔊 Noise reduction strength set to: " << m_noiseReductionStrength << std::endl;
 }
 
@@ -97,6 +104,10 @@ bool SimpleNoiseSuppressor::isVoiceActive() const {
     return m_voiceActive || m_inGracePeriod;
 }
 
+int SimpleNoiseSuppressor::getLatencyFrames() const {
+    return m_denoiser.getLatencyFrames();
+}
+
 void SimpleNoiseSuppressor::reset() {
     m_noiseLevel = MIN_NOISE_LEVEL;
     m_signalLevel = 0.0f;
@@ -105,8 +116,10 @@ void SimpleNoiseSuppressor::reset() {
     m_graceCounter = 0;
     m_inGracePeriod = false;
     
-    std::fill(m_noiseHistory.begin(), m_noiseHistory.end(), 0.0f);
-    std::fill(m_spectrum.begin(), m_spectrum.end(), 0.0f);
+    m_noiseHistory.reset(0.0f);
+    m_highPassPrevInput = 0.0f;
+    m_highPassPrevOutput = 0.0f;
+    m_denoiser.reset();
 }
 
 float SimpleNoiseSuppressor::estimateNoiseLevel(const float* samples, int numSamples) {
@@ -117,14 +130,10 @@ float SimpleNoiseSuppressor::estimateNoiseLevel(const float* samples, int numSam
     }
     float rms = std::sqrt(sum / numSamples);
     
-    // Update noise history (sliding window)
-    m_noiseHistory.push_back(rms);
-    m_noiseHistory.pop_front();
-    
-    // Calculate median noise level (more robust than mean)
-    std::vector<float> sortedNoise(m_noiseHistory.begin(), m_noiseHistory.end());
-    std::sort(sortedNoise.begin(), sortedNoise.end());
-    float medianNoise = sortedNoise[sortedNoise.size() / 2];
+    // Update noise history (sliding window) and take its median,
+    // which is more robust than the mean; O(log n), no allocation
+    m_noiseHistory.push(rms);
+    float medianNoise = m_noiseHistory.median();
     
     // Smooth the noise level estimate
     m_noiseLevel = 0.95f * m_noiseLevel + 0.05f * medianNoise;
@@ -172,43 +181,18 @@ void SimpleNoiseSuppressor::applyNoiseGate(float* samples, int numSamples) {
 }
 
 void SimpleNoiseSuppressor::applySpectralNoiseReduction(float* samples, int numSamples) {
-    // Simple frequency-domain noise reduction
-    // This is a simplified version - real implementations use FFT
-    
-    // Apply high-pass filter to reduce low-frequency noise
-    static float prevSample = 0.0f;
-    float cutoffFreq = 80.0f; // Hz
-    float rc = 1.0f / (2.0f * M_PI * cutoffFreq);
-    float dt = 1.0f / m_sampleRate;
-    float alpha = rc / (rc + dt);
-    
+    // One-pole high-pass to remove DC and low-frequency rumble
+    float prevInput = m_highPassPrevInput;
+    float prevOutput = m_highPassPrevOutput;
     for (int i = 0; i < numSamples; ++i) {
         float currentSample = samples[i];
-        samples[i] = alpha * (prevSample + currentSample - prevSample);
-        prevSample = currentSample;
+        prevOutput = m_highPassAlpha * (prevOutput + currentSample - prevInput);
+        prevInput = currentSample;
+        samples[i] = prevOutput;
     }
+    m_highPassPrevInput = prevInput;
+    m_highPassPrevOutput = prevOutput;
     
-    // Apply noise reduction based on VAD
-    if (!m_voiceActive) {
-        float reductionFactor = 1.0f - m_noiseReductionStrength;
-        for (int i = 0; i < numSamples; ++i) {
-            samples[i] *= reductionFactor;
-        }
-    }
-}
-
-void SimpleNoiseSuppressor::computeSpectrum(const float* samples, int numSamples) {
-    // Simplified spectrum computation (real implementations use FFT)
-    // This is just a placeholder for more advanced spectral processing
-    
-    // Reset spectrum
-    std::fill(m_spectrum.begin(), m_spectrum.end(), 0.0f);
-    
-    // Simple frequency analysis (very basic)
-    for (int i = 0; i < numSamples && i < 256; ++i) {
-        int bin = (i * 256) / numSamples;
-        if (bin < 256) {
-            m_spectrum[bin] += std::abs(samples[i]);
-        }
-    }
+    // Noise profile is only learned while nobody is singing
+    m_denoiser.process(samples, numSamples, !isVoiceActive());
 }
@@ -2,8 +2,9 @@
 #define SIMPLE_NOISE_SUPPRESSION_H
 
 #include <vector>
-#include <deque>
 #include <cmath>
+#include "running_median.h"
+#include "spectral_denoiser.h"
 
 class SimpleNoiseSuppressor {
 public:
@@ -38,6 +39,9 @@ public:
     
     // Check if voice is detected
     bool isVoiceActive() const;
+    
+    // Delay added by the spectral stage, in samples
+    int getLatencyFrames() const;
 
 private:
     // Audio processing parameters
@@ -48,7 +52,7 @@ private:
     float m_noiseReductionStrength;
     
     // Noise estimation
-    std::deque<float> m_noiseHistory;
+    RunningMedian m_noiseHistory;   // Sliding window of per-buffer RMS
     float m_noiseLevel;
     float m_signalLevel;
     
@@ -69,14 +73,17 @@ private:
     void applyNoiseGate(float* samples, int numSamples);
     void applySpectralNoiseReduction(float* samples, int numSamples);
     
-    // Simple spectral analysis
-    std::vector<float> m_spectrum;
-    void computeSpectrum(const float* samples, int numSamples);
+    // Spectral stage: DC/rumble high-pass then STFT Wiener suppression
+    SpectralDenoiser m_denoiser;
+    float m_highPassAlpha;
+    float m_highPassPrevInput;
+    float m_highPassPrevOutput;
     
     // Constants
     static constexpr size_t NOISE_HISTORY_SIZE = 1000;
     static constexpr float MIN_NOISE_LEVEL = 0.001f;
     static constexpr float MAX_NOISE_LEVEL = 0.5f;
+    static constexpr float HIGH_PASS_CUTOFF_HZ = 80.0f;
 };
 
 #endif // SIMPLE_NOISE_SUPPRESSION_H
@@ -0,0 +1,173 @@
+#include "singer_chain.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstring>
+
+SingerChain::SingerChain()
+    : m_index(0)
+    , m_sampleRate(48000)
+    , m_lastPitch(0.0f)
+    , m_lastConfidence(0.0f)
+    , m_targetPitch(0.0f)
+    , m_shifted(false)
+    , m_analyzerThreaded(false)
+    , m_busyNs(0)
+    , m_maxNs(0)
+    , m_buffers(0)
+{
+    std::memset(m_input, 0, sizeof(m_input));
+    std::memset(m_output, 0, sizeof(m_output));
+}
+
+bool SingerChain::init(int index, int sampleRate, const LatencyProfile& profile, int pitchHop,
+                       const std::vector<std::pair<float, float>>& melodyMap) {
+    m_index = index;
+    m_sampleRate = sampleRate;
+    m_melodyMap = melodyMap;
+
+    // Index the notes by time once so the callback only does a binary search.
+    // loadMelodyMap() already sorts; stable so equal times keep file order.
+    if (!std::is_sorted(m_melodyMap.begin(), m_melodyMap.end(),
+                        [](const auto& a, const auto& b) { return a.first < b.first; })) {
+        std::stable_sort(m_melodyMap.begin(), m_melodyMap.end(),
+                         [](const auto& a, const auto& b) { return a.first < b.first; });
+    }
+    m_noteTimes.resize(m_melodyMap.size());
+    for (size_t i = 0; i < m_melodyMap.size(); ++i) {
+        m_noteTimes[i] = m_melodyMap[i].first;
+    }
+
+    if (!m_pitchAnalyzer.init(sampleRate, profile.pitchWindow, pitchHop)) {
+        return false;
+    }
+
+    m_noiseSuppressor.init(sampleRate);
+    m_noiseSuppressor.setNoiseGateThreshold(0.01f);  // 1% threshold
+    m_noiseSuppressor.setVADThreshold(0.3f);         // 30% VAD threshold
+    m_noiseSuppressor.setGracePeriod(200);           // 200ms grace period
+    m_noiseSuppressor.setNoiseReductionStrength(0.6f); // 60% noise reduction
+
+    m_pitchShifter.init(sampleRate, profile.framesPerBuffer);
+    return true;
+}
+
+bool SingerChain::start() {
+    m_analyzerThreaded = m_pitchAnalyzer.start();
+    return m_analyzerThreaded;
+}
+
+void SingerChain::stop() {
+    m_pitchAnalyzer.stop();
+    m_analyzerThreaded = false;
+}
+
+float* SingerChain::inputBuffer() {
+    return m_input;
+}
+
+void SingerChain::process(int frames, float currentTime, float autotuneStrength, float pitchShift) {
+    auto start = std::chrono::steady_clock::now();
+
+    // Hand the input to this singer's analysis thread and pick up its latest estimate
+    m_pitchAnalyzer.pushAudio(m_input, frames);
+    if (!m_analyzerThreaded) {
+        m_pitchAnalyzer.analyzePending();
+    }
+    PitchEstimate estimate = m_pitchAnalyzer.getEstimate();
+    m_lastPitch = estimate.pitch;
+    m_lastConfidence = estimate.confidence;
+    m_targetPitch = findTargetPitch(currentTime);
+
+    // Apply autotune with variable strength (0.0 = original pitch, 1.0 = full autotune)
+    float shiftRatio = 1.0f;
+    m_shifted = m_lastConfidence > MIN_CONFIDENCE && m_lastPitch > 0.0f && m_targetPitch > 0.0f;
+    if (m_shifted) {
+        float baseShiftRatio = m_targetPitch / m_lastPitch;
+        shiftRatio = 1.0f + (baseShiftRatio - 1.0f) * autotuneStrength;
+        shiftRatio *= std::pow(2.0f, pitchShift / 12.0f);
+    }
+
+    // Voice always goes through the shifter (ratio 1.0 when idle) so its latency never changes
+    float period = m_lastPitch > 0.0f ? m_sampleRate / m_lastPitch : 0.0f;
+    m_pitchShifter.process(m_input, m_output, frames, period, shiftRatio);
+    m_noiseSuppressor.processAudio(m_output, m_output, frames);
+
+    // Only one thread runs a given chain per buffer, so plain load/store is enough for the max
+    uint64_t elapsed = (uint64_t)std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - start).count();
+    m_busyNs.fetch_add(elapsed, std::memory_order_relaxed);
+    m_buffers.fetch_add(1, std::memory_order_relaxed);
+    if (elapsed > m_maxNs.load(std::memory_order_relaxed)) {
+        m_maxNs.store(elapsed, std::memory_order_relaxed);
+    }
+}
+
+const float* SingerChain::outputBuffer() const {
+    return m_output;
+}
+
+int SingerChain::getIndex() const {
+    return m_index;
+}
+
+float SingerChain::getLastPitch() const {
+    return m_lastPitch;
+}
+
+float SingerChain::getLastConfidence() const {
+    return m_lastConfidence;
+}
+
+float SingerChain::getTargetPitch() const {
+    return m_targetPitch;
+}
+
+bool SingerChain::wasShifted() const {
+    return m_shifted;
+}
+
+PitchAnalyzer& SingerChain::getPitchAnalyzer() {
+    return m_pitchAnalyzer;
+}
+
+const PitchShifter& SingerChain::getPitchShifter() const {
+    return m_pitchShifter;
+}
+
+const SimpleNoiseSuppressor& SingerChain::getNoiseSuppressor() const {
+    return m_noiseSuppressor;
+}
+
+SingerCpuStats SingerChain::takeCpuStats() {
+    SingerCpuStats stats;
+    uint64_t busy = m_busyNs.exchange(0, std::memory_order_relaxed);
+    stats.buffers = m_buffers.exchange(0, std::memory_order_relaxed);
+    stats.maxUs = m_maxNs.exchange(0, std::memory_order_relaxed) / 1000.0;
+    stats.meanUs = stats.buffers > 0 ? busy / 1000.0 / stats.buffers : 0.0;
+    return stats;
+}
+
+// Closest melody note within MELODY_SEARCH_SECONDS of the current time. Only the
+// notes either side of currentTime can be closest; on a tie the earlier one wins.
+float SingerChain::findTargetPitch(float currentTime) const {
+    float targetPitch = 0.0f;
+    float bestTimeDiff = MELODY_SEARCH_SECONDS;
+    auto after = std::lower_bound(m_noteTimes.begin(), m_noteTimes.end(), currentTime);
+    if (after != m_noteTimes.begin()) {
+        // First of any notes sharing the preceding time
+        auto before = std::lower_bound(m_noteTimes.begin(), after, *(after - 1));
+        float timeDiff = std::abs(*before - currentTime);
+        if (timeDiff < bestTimeDiff) {
+            bestTimeDiff = timeDiff;
+            targetPitch = m_melodyMap[before - m_noteTimes.begin()].second;
+        }
+    }
+    if (after != m_noteTimes.end()) {
+        float timeDiff = std::abs(*after - currentTime);
+        if (timeDiff < bestTimeDiff) {
+            targetPitch = m_melodyMap[after - m_noteTimes.begin()].second;
+        }
+    }
+    return targetPitch;
+}
@@ -0,0 +1,85 @@
+#ifndef SINGER_CHAIN_H
+#define SINGER_CHAIN_H
+
+#include <atomic>
+#include <cstdint>
+#include <utility>
+#include <vector>
+#include "latency_profile.h"
+#include "pitch_analyzer.h"
+#include "pitch_shifter.h"
+#include "simple_noise_suppression.h"
+
+// CPU spent in one singer's chain since the last report
+struct SingerCpuStats {
+    double meanUs;
+    double maxUs;
+    uint64_t buffers;
+};
+
+// Everything one microphone needs: its own pitch tracker, autotune shifter,
+// noise suppressor and melody map. process() runs the whole voice chain for
+// one buffer and may be called from the audio thread or a SingerPool worker,
+// but never from two threads at once. All state is allocated in init().
+// Without start() pitch analysis runs inside process() instead of on the
+// analyzer thread, so offline renders are deterministic.
+class SingerChain {
+public:
+    SingerChain();
+
+    bool init(int index, int sampleRate, const LatencyProfile& profile, int pitchHop,
+              const std::vector<std::pair<float, float>>& melodyMap);
+
+    bool start();
+    void stop();
+
+    // Buffer the caller fills with this singer's input before process()
+    float* inputBuffer();
+
+    // Pitch-track, autotune and denoise inputBuffer() into outputBuffer()
+    void process(int frames, float currentTime, float autotuneStrength, float pitchShift);
+
+    const float* outputBuffer() const;
+
+    int getIndex() const;
+    float getLastPitch() const;
+    float getLastConfidence() const;
+    float getTargetPitch() const;
+    bool wasShifted() const;              // Last buffer had a confident pitch and a target
+
+    PitchAnalyzer& getPitchAnalyzer();
+    const PitchShifter& getPitchShifter() const;
+    const SimpleNoiseSuppressor& getNoiseSuppressor() const;
+
+    // Main thread: CPU use since the previous call
+    SingerCpuStats takeCpuStats();
+
+private:
+    float findTargetPitch(float currentTime) const;
+
+    int m_index;
+    int m_sampleRate;
+    std::vector<std::pair<float, float>> m_melodyMap;   // Sorted by time
+    std::vector<float> m_noteTimes;                     // m_melodyMap times, for binary search
+    PitchAnalyzer m_pitchAnalyzer;
+    PitchShifter m_pitchShifter;
+    SimpleNoiseSuppressor m_noiseSuppressor;
+
+    float m_input[MAX_FRAMES_PER_BUFFER];
+    float m_output[MAX_FRAMES_PER_BUFFER];
+    float m_lastPitch;
+    float m_lastConfidence;
+    float m_targetPitch;
+    bool m_shifted;
+    bool m_analyzerThreaded;              // start() succeeded: the analyzer thread does the pitch work
+
+    std::atomic<uint64_t> m_busyNs;
+    std::atomic<uint64_t> m_maxNs;
+    std::atomic<uint64_t> m_buffers;
+
+    // Constants
+    static constexpr float MIN_CONFIDENCE = 0.5f;
+    static constexpr float MELODY_SEARCH_SECONDS = 0.5f;
+};
+
+#endif // SINGER_CHAIN_H
@@ -0,0 +1,118 @@
+#include "singer_pool.h"
+#include <algorithm>
+#include <chrono>
+
+SingerPool::SingerPool()
+    : m_running(false)
+    , m_frames(0)
+    , m_currentTime(0.0f)
+    , m_autotuneStrength(0.0f)
+    , m_pitchShift(0.0f)
+    , m_generation(0)
+    , m_next(0)
+    , m_remaining(0)
+{
+}
+
+SingerPool::~SingerPool() {
+    stop();
+}
+
+void SingerPool::start(const std::vector<SingerChain*>& chains, int workerThreads) {
+    stop();
+    m_chains = chains;
+    // All chains start out claimed so a worker that wakes early finds nothing to do
+    m_next.store((int)m_chains.size(), std::memory_order_relaxed);
+    m_remaining.store(0, std::memory_order_relaxed);
+
+    m_running.store(true);
+    for (int i = 0; i < workerThreads; ++i) {
+        m_workers.emplace_back(&SingerPool::workerLoop, this);
+    }
+}
+
+void SingerPool::stop() {
+    m_running.store(false);
+    for (std::thread& worker : m_workers) {
+        if (worker.joinable()) {
+            worker.join();
+        }
+    }
+    m_workers.clear();
+}
+
+void SingerPool::run(int frames, float currentTime, float autotuneStrength, float pitchShift) {
+    const int count = (int)m_chains.size();
+    if (m_workers.empty()) {
+        for (SingerChain* chain : m_chains) {
+            chain->process(frames, currentTime, autotuneStrength, pitchShift);
+        }
+        return;
+    }
+
+    m_frames = frames;
+    m_currentTime = currentTime;
+    m_autotuneStrength = autotuneStrength;
+    m_pitchShift = pitchShift;
+    m_remaining.store(count, std::memory_order_relaxed);
+    // Release: a worker whose claim reads this value also sees the job above
+    m_next.store(0, std::memory_order_release);
+    m_generation.fetch_add(1, std::memory_order_release);
+
+    drain();
+
+    // Only chains a worker is actively processing are left
+    while (m_remaining.load(std::memory_order_acquire) > 0) {
+    }
+}
+
+int SingerPool::getWorkerCount() const {
+    return (int)m_workers.size();
+}
+
+double SingerPool::getPerSingerBudgetPercent(double totalPercent) const {
+    const int threads = (int)m_workers.size() + 1;
+    const int chainsPerThread = std::max(1, ((int)m_chains.size() + threads - 1) / threads);
+    return totalPercent / chainsPerThread;
+}
+
+int SingerPool::recommendedWorkers(int singers) {
+    if (singers < PARALLEL_MIN_SINGERS) {
+        return 0;
+    }
+    const int cores = (int)std::thread::hardware_concurrency();
+    // The audio thread takes a share too, so leave it its own core
+    return std::max(0, std::min(singers - 1, cores - 1));
+}
+
+void SingerPool::drain() {
+    const int count = (int)m_chains.size();
+    for (;;) {
+        const int index = m_next.fetch_add(1, std::memory_order_acquire);
+        if (index >= count) {
+            return;
+        }
+        m_chains[index]->process(m_frames, m_currentTime, m_autotuneStrength, m_pitchShift);
+        m_remaining.fetch_sub(1, std::memory_order_release);
+    }
+}
+
+void SingerPool::workerLoop() {
+    uint64_t seen = m_generation.load(std::memory_order_acquire);
+    int idle = 0;
+    while (m_running.load(std::memory_order_relaxed)) {
+        const uint64_t generation = m_generation.load(std::memory_order_acquire);
+        if (generation == seen) {
+            // Poll briefly for the next buffer, then back off so idle workers do not burn a core
+            if (++idle < IDLE_SPINS) {
+                std::this_thread::yield();
+            } else {
+                std::this_thread::sleep_for(std::chrono::microseconds(IDLE_SLEEP_US));
+            }
+            continue;
+        }
+        seen = generation;
+        idle = 0;
+        drain();
+    }
+}
@@ -0,0 +1,64 @@
+#ifndef SINGER_POOL_H
+#define SINGER_POOL_H
+
+#include <atomic>
+#include <cstdint>
+#include <thread>
+#include <vector>
+#include "singer_chain.h"
+
+// Runs every singer's chain once per buffer, spread over worker threads
+// when there are enough singers to be worth it.
+//
+// The audio thread publishes the buffer's parameters, bumps a generation
+// counter and then claims chains itself from a shared atomic index, exactly
+// like the workers do. It only ever waits for chains a worker has already
+// claimed and is actively processing: a worker that is asleep claims
+// nothing, so the audio thread simply does that work itself. No locks or
+// allocation on the audio thread.
+class SingerPool {
+public:
+    SingerPool();
+    ~SingerPool();
+
+    // workerThreads == 0 runs every chain on the calling thread
+    void start(const std::vector<SingerChain*>& chains, int workerThreads);
+    void stop();
+
+    // Audio thread: process all chains for one buffer and return when done
+    void run(int frames, float currentTime, float autotuneStrength, float pitchShift);
+
+    int getWorkerCount() const;
+
+    // Share of the buffer deadline each singer can use if the voice chains get
+    // totalPercent of it, given how many chains end up on each thread
+    double getPerSingerBudgetPercent(double totalPercent) const;
+
+    // Workers for n singers on this machine: none below PARALLEL_MIN_SINGERS
+    static int recommendedWorkers(int singers);
+
+private:
+    void workerLoop();
+    void drain();
+
+    std::vector<SingerChain*> m_chains;
+    std::vector<std::thread> m_workers;
+    std::atomic<bool> m_running;
+
+    // Current job, written by the audio thread before m_next is reset
+    int m_frames;
+    float m_currentTime;
+    float m_autotuneStrength;
+    float m_pitchShift;
+
+    std::atomic<uint64_t> m_generation;
+    std::atomic<int> m_next;         // Next chain to claim
+    std::atomic<int> m_remaining;    // Chains not yet finished
+
+    // Constants
+    static constexpr int PARALLEL_MIN_SINGERS = 3;
+    static constexpr int IDLE_SPINS = 2000;          // Yielding polls before a worker starts sleeping
+    static constexpr int IDLE_SLEEP_US = 100;
+};
+
+#endif // SINGER_POOL_H
@@ -0,0 +1,200 @@
+#include "song_cache.h"
+#include "resample_cache.h"
+#include "streaming_source.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <fstream>
+#include <iostream>
+
+// Function to load melody map from file
+std::vector<std::pair<float, float>> loadMelodyMap(const std::string& filename) {
+    std::vector<std::pair<float, float>> melody_map;
+    
+    // Check file extension (compatible with older C++ versions)
+    if (filename.length() >= 4 && filename.substr(filename.length() - 4) == ".npz") {
+        // Load from numpy .npz file (Python format)
+        std::cout << "🎼 Loading melody map from numpy file: " << filename << std::endl;
+        // For now, we'll use a simple text format, but you can extend this
+        std::cout << "⚠️  .npz files not yet supported, please convert to .txt format" << std::endl;
+        return melody_map;
+    } else if (filename.length() >= 4 && filename.substr(filename.length() - 4) == ".txt") {
+        // Load from simple text file
+        std::cout << "🎼 Loading melody map from text file: " << filename << std::endl;
+        std::ifstream file(filename);
+        if (!file.is_open()) {
+            std::cerr << "❌ Could not open melody file: " << filename << std::endl;
+            return melody_map;
+        }
+        
+        std::string line;
+        // Skip header lines (start with #)
+        while (std::getline(file, line) && line[0] == '#') {
+            continue;
+        }
+        
+        // Read melody data: time,frequency format
+        while (std::getline(file, line)) {
+            if (line.empty()) continue;
+            
+            size_t comma_pos = line.find(',');
+            if (comma_pos != std::string::npos) {
+                float time = std::stof(line.substr(0, comma_pos));
+                float freq = std::stof(line.substr(comma_pos + 1));
+                melody_map.push_back({time, freq});
+            }
+        }
+        
+        file.close();
+
+        // Sorted by time, so singers (and the daemon's cached copy) can binary-search it
+        std::stable_sort(melody_map.begin(), melody_map.end(),
+                         [](const auto& a, const auto& b) { return a.first < b.first; });
+        std::cout << "✅ Loaded " << melody_map.size() << " melody points" << std::endl;
+    } else {
+        std::cerr << "❌ Unsupported file format. Use .txt or .npz files" << std::endl;
+    }
+    
+    return melody_map;
+}
+
+size_t LoadedSong::bytes() const {
+    return instrumental.size() * sizeof(float) + melody.size() * sizeof(melody[0]);
+}
+
+double LoadedSong::durationSeconds(int sampleRate) const {
+    return sampleRate > 0 ? (double)instrumental.size() / sampleRate : 0.0;
+}
+
+SongCache::SongCache(size_t budgetBytes)
+    : m_budgetBytes(budgetBytes)
+    , m_usedBytes(0)
+{
+}
+
+std::shared_ptr<const LoadedSong> SongCache::load(const std::string& name, const std::string& melodyFile,
+                                                  const std::string& instrumentalFile, int sampleRate,
+                                                  bool* hit) {
+    if (std::shared_ptr<const LoadedSong> cached = find(melodyFile, instrumentalFile)) {
+        if (hit) {
+            *hit = true;
+        }
+        return cached;
+    }
+    if (hit) {
+        *hit = false;
+    }
+
+    std::shared_ptr<const LoadedSong> song = decode(name, melodyFile, instrumentalFile, sampleRate);
+    if (!song) {
+        return nullptr;
+    }
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_songs.push_front(song);
+    m_usedBytes += song->bytes();
+    evictLocked();
+    return song;
+}
+
+std::shared_ptr<const LoadedSong> SongCache::find(const std::string& melodyFile, const std::string& instrumentalFile) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    for (auto it = m_songs.begin(); it != m_songs.end(); ++it) {
+        if ((*it)->melodyFile == melodyFile && (*it)->instrumentalFile == instrumentalFile) {
+            m_songs.splice(m_songs.begin(), m_songs, it);
+            return m_songs.front();
+        }
+    }
+    return nullptr;
+}
+
+std::shared_ptr<const LoadedSong> SongCache::peek(const std::string& melodyFile, const std::string& instrumentalFile) const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    for (const auto& song : m_songs) {
+        if (song->melodyFile == melodyFile && song->instrumentalFile == instrumentalFile) {
+            return song;
+        }
+    }
+    return nullptr;
+}
+
+void SongCache::setBudgetBytes(size_t budgetBytes) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    m_budgetBytes = budgetBytes;
+    evictLocked();
+}
+
+size_t SongCache::getBudgetBytes() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_budgetBytes;
+}
+
+size_t SongCache::getUsedBytes() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_usedBytes;
+}
+
+size_t SongCache::getSongCount() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    return m_songs.size();
+}
+
+std::vector<std::string> SongCache::getSongNames() const {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    std::vector<std::string> names;
+    for (const auto& song : m_songs) {
+        names.push_back(song->name);
+    }
+    return names;
+}
+
+void SongCache::evictLocked() {
+    // Always keep the newest song, even if it alone is over budget
+    while (m_usedBytes > m_budgetBytes && m_songs.size() > 1) {
+        const auto& oldest = m_songs.back();
+        std::cout << "🗑️  Song cache: evicting " << oldest->name << std::endl;
+        m_usedBytes -= oldest->bytes();
+        m_songs.pop_back();
+    }
+}
+
+std::shared_ptr<LoadedSong> SongCache::decode(const std::string& name, const std::string& melodyFile,
+                                              const std::string& instrumentalFile, int sampleRate) {
+    auto begin = std::chrono::steady_clock::now();
+    auto song = std::make_shared<LoadedSong>();
+    song->name = name;
+    song->melodyFile = melodyFile;
+    song->instrumentalFile = instrumentalFile;
+
+    song->melody = loadMelodyMap(melodyFile);
+    if (song->melody.empty()) {
+        std::cerr << "❌ Failed to load melody map from: " << melodyFile << std::endl;
+        return nullptr;
+    }
+
+    // Decode through the same path as streaming playback, just all at once
+    ResampleCache resampleCache;
+    std::string playable = instrumentalFile;
+    if (!resampleCache.lookup(instrumentalFile, sampleRate, &playable)) {
+        playable = instrumentalFile;
+    }
+    StreamingInstrumental source;
+    if (!source.open(playable, sampleRate)) {
+        std::cerr << "❌ Could not open instrumental file: " << instrumentalFile << std::endl;
+        return nullptr;
+    }
+    size_t total = (size_t)std::llround(source.getDurationSeconds() * sampleRate);
+    song->instrumental.resize(total);
+    for (size_t done = 0; done < total; ) {
+        size_t n = std::min(DECODE_CHUNK, total - done);
+        source.prefetch(n);
+        source.read(song->instrumental.data() + done, n);
+        done += n;
+    }
+    source.stop();
+
+    song->loadMs = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - begin).count();
+    std::cout << "✅ Decoded " << name << " (" << (int)song->durationSeconds(sampleRate) << "s, "
+              << (song->bytes() >> 20) << "MB) in " << (int)song->loadMs << "ms" << std::endl;
+    return song;
+}
@@ -0,0 +1,78 @@
+#ifndef SONG_CACHE_H
+#define SONG_CACHE_H
+
+#include <cstddef>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+// Load a time,frequency melody map from a .txt file, sorted by time (empty on failure)
+std::vector<std::pair<float, float>> loadMelodyMap(const std::string& filename);
+
+// A song ready to play with no further work: the instrumental decoded to mono
+// at the engine rate and the parsed melody map. Never modified after loading,
+// so sessions share it with the cache.
+struct LoadedSong {
+    std::string name;
+    std::string melodyFile;
+    std::string instrumentalFile;
+    std::vector<float> instrumental;
+    std::vector<std::pair<float, float>> melody;
+    double loadMs;                           // Decode + parse time when it was loaded
+
+    size_t bytes() const;
+    double durationSeconds(int sampleRate) const;
+};
+
+// In-memory LRU cache of decoded songs for the engine daemon.
+//
+// load() returns the cached song, or decodes the instrumental (through the
+// ingested resample-cache copy when there is one) and parses the melody.
+// Once the total size goes over the budget the least recently used songs
+// are dropped. A song that is still playing stays alive through its
+// shared_ptr until the session ends. load() may be called from several
+// threads; decoding happens outside the lock.
+class SongCache {
+public:
+    explicit SongCache(size_t budgetBytes = DEFAULT_BUDGET_BYTES);
+
+    // Cached or freshly decoded song, nullptr if either file cannot be read.
+    // hit (optional) reports whether it came from the cache.
+    std::shared_ptr<const LoadedSong> load(const std::string& name, const std::string& melodyFile,
+                                           const std::string& instrumentalFile, int sampleRate,
+                                           bool* hit = nullptr);
+
+    // Cached song, marked most recently used; nullptr if absent. Never decodes.
+    std::shared_ptr<const LoadedSong> find(const std::string& melodyFile, const std::string& instrumentalFile);
+
+    // Cached song without loading or touching its LRU position, nullptr if absent
+    std::shared_ptr<const LoadedSong> peek(const std::string& melodyFile, const std::string& instrumentalFile) const;
+
+    void setBudgetBytes(size_t budgetBytes);
+    size_t getBudgetBytes() const;
+    size_t getUsedBytes() const;
+    size_t getSongCount() const;
+
+    // Song names, most recently used first
+    std::vector<std::string> getSongNames() const;
+
+    static constexpr size_t DEFAULT_BUDGET_BYTES = (size_t)512 << 20;   // ~11 four-minute songs
+
+private:
+    static std::shared_ptr<LoadedSong> decode(const std::string& name, const std::string& melodyFile,
+                                              const std::string& instrumentalFile, int sampleRate);
+    void evictLocked();
+
+    std::list<std::shared_ptr<const LoadedSong>> m_songs;   // Most recently used first
+    size_t m_budgetBytes;
+    size_t m_usedBytes;
+    mutable std::mutex m_mutex;
+
+    // Constants
+    static constexpr size_t DECODE_CHUNK = 16384;
+};
+
+#endif // SONG_CACHE_H
@@ -0,0 +1,120 @@
+#include "spectral_denoiser.h"
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+
+SpectralDenoiser::SpectralDenoiser()
+    : m_fill(FFT_SIZE - HOP_SIZE)
+    , m_noiseFrames(0)
+    , m_strength(0.5f)
+{
+}
+
+void SpectralDenoiser::init(int sampleRate) {
+    (void)sampleRate;   // Frame length is fixed in samples; latency scales with the rate
+    m_fft.init(FFT_SIZE);
+
+    m_window.resize(FFT_SIZE);
+    for (int i = 0; i < FFT_SIZE; ++i) {
+        // Periodic Hann so overlapping windows sum to a constant
+        m_window[i] = std::sqrt(0.5f - 0.5f * (float)std::cos(2.0 * M_PI * i / FFT_SIZE));
+    }
+
+    m_inputFifo.assign(FFT_SIZE, 0.0f);
+    m_outputFifo.assign(HOP_SIZE, 0.0f);
+    m_overlap.assign(FFT_SIZE, 0.0f);
+    m_frame.assign(FFT_SIZE, 0.0f);
+    m_spectrum.assign(FFT_SIZE / 2 + 1, std::complex<float>(0.0f, 0.0f));
+    m_noisePower.assign(FFT_SIZE / 2 + 1, 0.0f);
+    m_cleanPower.assign(FFT_SIZE / 2 + 1, 0.0f);
+    reset();
+}
+
+void SpectralDenoiser::process(float* samples, int numSamples, bool learnNoise) {
+    if (m_frame.empty()) {
+        return;
+    }
+
+    int done = 0;
+    while (done < numSamples) {
+        const int chunk = std::min(numSamples - done, FFT_SIZE - m_fill);
+        const int outOffset = m_fill - (FFT_SIZE - HOP_SIZE);
+
+        std::memcpy(&m_inputFifo[m_fill], samples + done, chunk * sizeof(float));
+        std::memcpy(samples + done, &m_outputFifo[outOffset], chunk * sizeof(float));
+        m_fill += chunk;
+        done += chunk;
+
+        if (m_fill == FFT_SIZE) {
+            processFrame(learnNoise);
+            std::memmove(m_inputFifo.data(), m_inputFifo.data() + HOP_SIZE,
+                         (FFT_SIZE - HOP_SIZE) * sizeof(float));
+            m_fill = FFT_SIZE - HOP_SIZE;
+        }
+    }
+}
+
+void SpectralDenoiser::processFrame(bool learnNoise) {
+    for (int i = 0; i < FFT_SIZE; ++i) {
+        m_frame[i] = m_inputFifo[i] * m_window[i];
+    }
+    m_fft.forwardReal(m_frame.data(), m_spectrum.data());
+
+    const int bins = FFT_SIZE / 2 + 1;
+    for (int k = 0; k < bins; ++k) {
+        const float re = m_spectrum[k].real();
+        const float im = m_spectrum[k].imag();
+        const float power = re * re + im * im;
+
+        if (learnNoise) {
+            m_noisePower[k] = m_noiseFrames == 0
+                ? power
+                : NOISE_SMOOTHING * m_noisePower[k] + (1.0f - NOISE_SMOOTHING) * power;
+        }
+
+        // Nothing learned yet: pass through rather than guess a profile
+        float gain = 1.0f;
+        if (m_noiseFrames > 0) {
+            // Decision-directed a priori SNR (Ephraim-Malah): leaning on the previous
+            // frame's clean estimate keeps residual noise from flickering between bins
+            const float noise = m_noisePower[k] + 1e-12f;
+            const float snrPost = power / noise;
+            const float snrPrior = DD_ALPHA * m_cleanPower[k] / noise
+                                 + (1.0f - DD_ALPHA) * std::max(snrPost - 1.0f, 0.0f);
+            const float wiener = snrPrior / (1.0f + snrPrior);
+            m_cleanPower[k] = wiener * wiener * power;
+            gain = std::max(1.0f - m_strength * (1.0f - wiener), MIN_GAIN);
+        }
+        m_spectrum[k] = std::complex<float>(re * gain, im * gain);
+    }
+    if (learnNoise) {
+        ++m_noiseFrames;
+    }
+
+    m_fft.inverseReal(m_spectrum.data(), m_frame.data());
+    for (int i = 0; i < FFT_SIZE; ++i) {
+        m_overlap[i] += m_frame[i] * m_window[i] * OVERLAP_SCALE;
+    }
+
+    std::memcpy(m_outputFifo.data(), m_overlap.data(), HOP_SIZE * sizeof(float));
+    std::memmove(m_overlap.data(), m_overlap.data() + HOP_SIZE, (FFT_SIZE - HOP_SIZE) * sizeof(float));
+    std::fill(m_overlap.end() - HOP_SIZE, m_overlap.end(), 0.0f);
+}
+
+void SpectralDenoiser::setStrength(float strength) {
+    m_strength = std::clamp(strength, 0.0f, 1.0f);
+}
+
+int SpectralDenoiser::getLatencyFrames() const {
+    return FFT_SIZE;
+}
+
+void SpectralDenoiser::reset() {
+    std::fill(m_inputFifo.begin(), m_inputFifo.end(), 0.0f);
+    std::fill(m_outputFifo.begin(), m_outputFifo.end(), 0.0f);
+    std::fill(m_overlap.begin(), m_overlap.end(), 0.0f);
+    std::fill(m_noisePower.begin(), m_noisePower.end(), 0.0f);
+    std::fill(m_cleanPower.begin(), m_cleanPower.end(), 0.0f);
+    m_fill = FFT_SIZE - HOP_SIZE;
+    m_noiseFrames = 0;
+}
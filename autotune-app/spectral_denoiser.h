@@ -0,0 +1,52 @@
+#ifndef SPECTRAL_DENOISER_H
+#define SPECTRAL_DENOISER_H
+
+#include <complex>
+#include <vector>
+#include "fft.h"
+
+// Streaming STFT Wiener suppressor. Audio is cut into FFT_SIZE frames every
+// HOP_SIZE samples (75% overlap, sqrt-Hann on analysis and synthesis) and
+// resynthesised by overlap-add. The per-bin noise power is learned only on
+// frames the caller marks as noise (VAD inactive), then each bin is scaled by
+// a decision-directed Wiener gain blended by strength. All buffers and FFT
+// tables are allocated in init(); process() accepts any block length.
+class SpectralDenoiser {
+public:
+    SpectralDenoiser();
+
+    void init(int sampleRate);
+
+    // Denoise in place; learnNoise marks this block as noise-only
+    void process(float* samples, int numSamples, bool learnNoise);
+
+    void setStrength(float strength);   // 0.0 (bypass) - 1.0 (full Wiener gain)
+    int getLatencyFrames() const;
+    void reset();
+
+private:
+    void processFrame(bool learnNoise);
+
+    Fft m_fft;
+    std::vector<float> m_window;                   // sqrt-Hann
+    std::vector<float> m_inputFifo;                // Last FFT_SIZE input samples
+    std::vector<float> m_outputFifo;               // One hop of finished output
+    std::vector<float> m_overlap;                  // Overlap-add accumulator
+    std::vector<float> m_frame;
+    std::vector<std::complex<float>> m_spectrum;
+    std::vector<float> m_noisePower;               // Learned noise profile per bin
+    std::vector<float> m_cleanPower;               // Previous frame's speech power estimate
+    int m_fill;
+    int m_noiseFrames;
+    float m_strength;
+
+    // Constants
+    static constexpr int FFT_SIZE = 256;           // 5.3 ms at 48 kHz
+    static constexpr int HOP_SIZE = FFT_SIZE / 4;
+    static constexpr float OVERLAP_SCALE = 0.5f;   // sqrt-Hann^2 at 75% overlap sums to 2
+    static constexpr float NOISE_SMOOTHING = 0.9f;
+    static constexpr float DD_ALPHA = 0.98f;       // Decision-directed SNR smoothing
+    static constexpr float MIN_GAIN = 0.1f;        // -20 dB floor
+};
+
+#endif // SPECTRAL_DENOISER_H
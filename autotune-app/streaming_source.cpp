@@ -0,0 +1,187 @@
+#include "streaming_source.h"
+#include "dsp_kernels.h"
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <iostream>
+
+StreamingInstrumental::StreamingInstrumental()
+    : m_file(nullptr)
+    , m_info()
+    , m_targetSampleRate(48000)
+    , m_ring(RING_CAPACITY)
+    , m_running(false)
+    , m_underruns(0)
+    , m_samplesPlayed(0)
+    , m_decodedPosition(0)
+{
+}
+
+StreamingInstrumental::~StreamingInstrumental() {
+    stop();
+}
+
+bool StreamingInstrumental::open(const std::string& filename, int targetSampleRate) {
+    m_info.format = 0;
+    m_file = sf_open(filename.c_str(), SFM_READ, &m_info);
+    if (!m_file) {
+        return false;
+    }
+
+    m_filename = filename;
+    m_targetSampleRate = targetSampleRate;
+    m_resampler.init(m_info.samplerate, targetSampleRate, READ_BLOCK_FRAMES);
+
+    // Size the decode buffers once for the worst-case output of one block
+    m_interleaved.resize(READ_BLOCK_FRAMES * m_info.channels);
+    m_mono.resize(READ_BLOCK_FRAMES);
+    m_converted.resize(m_resampler.maxOutputFrames(READ_BLOCK_FRAMES));
+
+    std::cout << "📊 WAV Info - Channels: " << m_info.channels << ", Sample Rate: " << m_info.samplerate
+              << "Hz, Frames: " << m_info.frames << std::endl;
+    if (m_info.channels > 1) {
+        std::cout << "🔄 Downmixing " << m_info.channels << " channels to mono while streaming" << std::endl;
+    }
+    if (m_info.samplerate != targetSampleRate) {
+        std::cout << "🔄 Resampling from " << m_info.samplerate << "Hz to " << targetSampleRate
+                  << "Hz while streaming" << std::endl;
+    }
+    return true;
+}
+
+bool StreamingInstrumental::openDecoded(std::shared_ptr<const std::vector<float>> samples, int sampleRate) {
+    if (!samples || samples->empty()) {
+        return false;
+    }
+    m_decoded = std::move(samples);
+    m_decodedPosition = 0;
+    m_targetSampleRate = sampleRate;
+    m_info = SF_INFO();
+    m_info.samplerate = sampleRate;
+    m_info.channels = 1;
+    m_info.frames = (sf_count_t)m_decoded->size();
+    return true;
+}
+
+void StreamingInstrumental::start() {
+    if (!m_file || m_running.load()) {
+        return;
+    }
+
+    // Prime the ring so the first callback already has audio
+    decodeBlock();
+
+    m_running.store(true);
+    m_thread = std::thread(&StreamingInstrumental::run, this);
+    std::cout << "✅ Instrumental streaming started (" << m_ring.available() << " samples buffered)" << std::endl;
+}
+
+void StreamingInstrumental::stop() {
+    m_running.store(false);
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+    if (m_file) {
+        sf_close(m_file);
+        m_file = nullptr;
+    }
+}
+
+void StreamingInstrumental::prefetch(size_t count) {
+    if (!m_file || m_running.load()) {
+        return;
+    }
+    while (m_ring.available() < count && m_ring.space() >= m_converted.size()) {
+        if (decodeBlock() == 0) {
+            return;
+        }
+    }
+}
+
+size_t StreamingInstrumental::read(float* out, size_t count) {
+    if (m_decoded) {
+        return readDecoded(out, count);
+    }
+    size_t got = m_ring.popBlock(out, count);
+    if (got < count) {
+        std::fill(out + got, out + count, 0.0f);
+        m_underruns.fetch_add(1, std::memory_order_relaxed);
+    }
+    m_samplesPlayed.fetch_add(got, std::memory_order_relaxed);
+    return got;
+}
+
+uint64_t StreamingInstrumental::getUnderrunCount() const {
+    return m_underruns.load(std::memory_order_relaxed);
+}
+
+uint64_t StreamingInstrumental::getSamplesPlayed() const {
+    return m_samplesPlayed.load(std::memory_order_relaxed);
+}
+
+int StreamingInstrumental::getSourceSampleRate() const {
+    return m_info.samplerate;
+}
+
+int StreamingInstrumental::getSourceChannels() const {
+    return m_info.channels;
+}
+
+int64_t StreamingInstrumental::getSourceFrames() const {
+    return m_info.frames;
+}
+
+double StreamingInstrumental::getDurationSeconds() const {
+    if (m_info.samplerate <= 0) {
+        return 0.0;
+    }
+    return (double)m_info.frames / m_info.samplerate;
+}
+
+void StreamingInstrumental::run() {
+    while (m_running.load()) {
+        // Only decode when a whole converted block is guaranteed to fit
+        if (m_ring.space() < m_converted.size() || decodeBlock() == 0) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(IDLE_SLEEP_MS));
+        }
+    }
+}
+
+size_t StreamingInstrumental::readDecoded(float* out, size_t count) {
+    // Loop back to the start at the end of the song, like decodeBlock()
+    const float* samples = m_decoded->data();
+    const size_t length = m_decoded->size();
+    size_t copied = 0;
+    while (copied < count) {
+        size_t n = std::min(count - copied, length - m_decodedPosition);
+        std::copy(samples + m_decodedPosition, samples + m_decodedPosition + n, out + copied);
+        copied += n;
+        m_decodedPosition += n;
+        if (m_decodedPosition == length) {
+            m_decodedPosition = 0;
+        }
+    }
+    m_samplesPlayed.fetch_add(count, std::memory_order_relaxed);
+    return count;
+}
+
+size_t StreamingInstrumental::decodeBlock() {
+    sf_count_t frames = sf_readf_float(m_file, m_interleaved.data(), READ_BLOCK_FRAMES);
+    if (frames <= 0) {
+        // End of song: loop back to the start like the in-memory player did
+        if (sf_seek(m_file, 0, SEEK_SET) < 0) {
+            return 0;
+        }
+        frames = sf_readf_float(m_file, m_interleaved.data(), READ_BLOCK_FRAMES);
+        if (frames <= 0) {
+            return 0;
+        }
+    }
+
+    // Downmix by averaging all channels
+    downmixToMono(m_mono.data(), m_interleaved.data(), (int)frames, m_info.channels);
+
+    size_t produced = m_resampler.process(m_mono.data(), (size_t)frames, m_converted.data());
+    m_ring.pushBlock(m_converted.data(), produced);
+    return produced;
+}
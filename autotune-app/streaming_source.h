@@ -0,0 +1,102 @@
+#ifndef STREAMING_SOURCE_H
+#define STREAMING_SOURCE_H
+
+#include <atomic>
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <thread>
+#include <vector>
+#include <sndfile.h>
+#include "ring_buffer.h"
+#include "resampler.h"
+
+// Streams an instrumental file into the audio callback.
+//
+// A read-ahead thread decodes fixed-size blocks with libsndfile, downmixes
+// them to mono, resamples them to the engine rate with a polyphase filter and
+// pushes the result into a lock-free ring buffer. The audio callback only copies out of that
+// ring, so playback can start as soon as the first block is decoded and
+// memory use is bounded by the ring size, independent of song length.
+// The source loops back to the start when the file ends.
+//
+// Without start() nothing decodes in the background: call prefetch() before
+// each read() to decode on the calling thread, which is what offline
+// rendering uses.
+//
+// openDecoded() plays a song that is already decoded in memory (the engine
+// daemon's song cache) instead: read() copies straight from the shared
+// buffer, loops the same way and there is nothing to decode or start.
+class StreamingInstrumental {
+public:
+    StreamingInstrumental();
+    ~StreamingInstrumental();
+
+    // Open the file and prepare conversion to targetSampleRate
+    bool open(const std::string& filename, int targetSampleRate);
+
+    // Play mono samples already at sampleRate; the buffer is shared, not copied
+    bool openDecoded(std::shared_ptr<const std::vector<float>> samples, int sampleRate);
+
+    // Decode the first block synchronously, then start the read-ahead thread
+    void start();
+
+    // Stop the read-ahead thread and close the file
+    void stop();
+
+    // Without start(): decode on the calling thread until count samples are buffered
+    void prefetch(size_t count);
+
+    // Audio thread: copy up to count samples into out. Never blocks; a short
+    // read is padded with silence and counted as an underrun.
+    size_t read(float* out, size_t count);
+
+    // Underruns seen by read() (read-ahead thread fell behind)
+    uint64_t getUnderrunCount() const;
+
+    // Samples delivered to the audio thread so far
+    uint64_t getSamplesPlayed() const;
+
+    // Source file properties
+    int getSourceSampleRate() const;
+    int getSourceChannels() const;
+    int64_t getSourceFrames() const;
+
+    // Song length at the engine sample rate, in seconds
+    double getDurationSeconds() const;
+
+private:
+    void run();
+    size_t decodeBlock();
+    size_t readDecoded(float* out, size_t count);
+
+    std::string m_filename;
+    SNDFILE* m_file;
+    SF_INFO m_info;
+    int m_targetSampleRate;
+
+    SpscRingBuffer<float> m_ring;
+    std::thread m_thread;
+    std::atomic<bool> m_running;
+    std::atomic<uint64_t> m_underruns;
+    std::atomic<uint64_t> m_samplesPlayed;
+
+    // Preallocated decode buffers
+    std::vector<float> m_interleaved;
+    std::vector<float> m_mono;
+    std::vector<float> m_converted;
+
+    // Sample rate conversion, state carried across blocks
+    PolyphaseResampler m_resampler;
+
+    // Preloaded song and the read position in it (audio thread only)
+    std::shared_ptr<const std::vector<float>> m_decoded;
+    size_t m_decodedPosition;
+
+    // Constants
+    static constexpr size_t READ_BLOCK_FRAMES = 4096;
+    static constexpr size_t RING_CAPACITY = 65536;  // ~1.4s at 48 kHz
+    static constexpr int IDLE_SLEEP_MS = 5;
+};
+
+#endif // STREAMING_SOURCE_H
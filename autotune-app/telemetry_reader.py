@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Pitch telemetry reader
+Reads the engine's shared-memory pitch telemetry (telemetry_shm.h) from
+Python without touching the audio process. Prints frames by default.
+
+Usage: python3 telemetry_reader.py [shm_name]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+DEFAULT_NAME = "/karaoke_telemetry"
+MAGIC = 0x4B50544D
+VERSION = 1
+HEADER = struct.Struct("<IIII")        # magic, version, capacity, frame size
+WRITE_INDEX_OFFSET = 64                # alignas(64) std::atomic<uint64_t>
+HEADER_SIZE = 128
+FRAME = struct.Struct("<ffffffII")     # time, pitch, confidence, target, vad, noise, voice_active, reserved
+
+
+class TelemetryReader:
+    """Follows the writer's ring; skips ahead (and counts) if it falls behind"""
+
+    def __init__(self, name=DEFAULT_NAME):
+        path = os.path.join("/dev/shm", name.lstrip("/"))
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+        magic, version, self.capacity, frame_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or frame_size != FRAME.size:
+            raise ValueError(f"Unexpected telemetry layout in {path}")
+        self.read_index = self._write_index()
+        self.missed = 0
+
+    def _write_index(self):
+        return struct.unpack_from("<Q", self.map, WRITE_INDEX_OFFSET)[0]
+
+    def read(self):
+        """Return a list of new frames as dicts"""
+        write_index = self._write_index()
+        if write_index < self.read_index:
+            self.read_index = 0
+        if write_index - self.read_index >= self.capacity:
+            # The writer fills a slot before advancing, so the oldest one may be mid-write
+            self.missed += write_index - self.read_index - self.capacity + 1
+            self.read_index = write_index - self.capacity + 1
+
+        frames = []
+        while self.read_index < write_index:
+            offset = HEADER_SIZE + (self.read_index % self.capacity) * FRAME.size
+            t, pitch, confidence, target, vad, noise, active, _ = FRAME.unpack_from(self.map, offset)
+            # Drop the copy if the writer reached this slot meanwhile
+            latest = self._write_index()
+            if latest - self.read_index >= self.capacity:
+                self.missed += latest - self.read_index - self.capacity + 1
+                self.read_index = latest - self.capacity + 1
+                continue
+            self.read_index += 1
+            frames.append({"time": t, "pitch": pitch, "confidence": confidence, "target": target,
+                           "vad": vad, "noise_level": noise, "voice_active": bool(active)})
+        return frames
+
+    def close(self):
+        self.map.close()
+
+
+def main():
+    name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_NAME
+    try:
+        reader = TelemetryReader(name)
+    except FileNotFoundError:
+        print(f"❌ No telemetry segment {name} - is the engine running?")
+        return 1
+    print(f"📡 Reading telemetry from {name}")
+    try:
+        while True:
+            for frame in reader.read():
+                print(f"{frame['time']:8.2f}s  pitch {frame['pitch']:7.1f}Hz  "
+                      f"target {frame['target']:7.1f}Hz  conf {frame['confidence']:.2f}")
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if reader.missed:
+            print(f"⚠️  Skipped {reader.missed} frames")
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#include "telemetry_shm.h"
+#include <cstring>
+#include <iostream>
+#include <new>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+static uint32_t roundUpPowerOfTwo(uint32_t value) {
+    uint32_t size = 1;
+    while (size < value) {
+        size <<= 1;
+    }
+    return size;
+}
+
+TelemetryWriter::TelemetryWriter()
+    : m_header(nullptr)
+    , m_frames(nullptr)
+    , m_mappedSize(0)
+    , m_mask(0)
+{
+}
+
+TelemetryWriter::~TelemetryWriter() {
+    close();
+}
+
+void TelemetryWriter::publish(const PitchFrame& frame) {
+    if (!m_header) {
+        return;
+    }
+    uint64_t index = m_header->writeIndex.load(std::memory_order_relaxed);
+    m_frames[index & m_mask] = frame;
+    m_header->writeIndex.store(index + 1, std::memory_order_release);
+}
+
+bool TelemetryWriter::isOpen() const {
+    return m_header != nullptr;
+}
+
+TelemetryReader::TelemetryReader()
+    : m_header(nullptr)
+    , m_frames(nullptr)
+    , m_mappedSize(0)
+    , m_mask(0)
+    , m_readIndex(0)
+    , m_missed(0)
+{
+}
+
+TelemetryReader::~TelemetryReader() {
+    close();
+}
+
+size_t TelemetryReader::read(PitchFrame* out, size_t maxFrames) {
+    if (!m_header) {
+        return 0;
+    }
+
+    uint64_t capacity = (uint64_t)m_mask + 1;
+    uint64_t writeIndex = m_header->writeIndex.load(std::memory_order_acquire);
+    if (writeIndex < m_readIndex) {
+        // Writer restarted with a fresh segment under the same name
+        m_readIndex = 0;
+    }
+    // publish() writes a slot before advancing writeIndex, so at a distance of exactly
+    // capacity the oldest slot is the one the writer fills next
+    if (writeIndex - m_readIndex >= capacity) {
+        m_missed += writeIndex - m_readIndex - capacity + 1;
+        m_readIndex = writeIndex - capacity + 1;
+    }
+
+    size_t count = 0;
+    while (m_readIndex < writeIndex && count < maxFrames) {
+        out[count] = m_frames[m_readIndex & m_mask];
+
+        // The writer may have reached this slot while we copied it
+        std::atomic_thread_fence(std::memory_order_acquire);
+        uint64_t latest = m_header->writeIndex.load(std::memory_order_relaxed);
+        if (latest - m_readIndex >= capacity) {
+            m_missed += latest - m_readIndex - capacity + 1;
+            m_readIndex = latest - capacity + 1;
+            continue;
+        }
+        ++m_readIndex;
+        ++count;
+    }
+    return count;
+}
+
+bool TelemetryReader::isOpen() const {
+    return m_header != nullptr;
+}
+
+uint64_t TelemetryReader::getMissedCount() const {
+    return m_missed;
+}
+
+#ifndef _WIN32
+
+bool TelemetryWriter::create(const std::string& name, uint32_t capacity) {
+    close();
+    capacity = roundUpPowerOfTwo(capacity);
+    size_t size = sizeof(TelemetryHeader) + sizeof(PitchFrame) * capacity;
+
+    shm_unlink(name.c_str());
+    int fd = shm_open(name.c_str(), O_CREAT | O_RDWR, 0644);
+    if (fd < 0) {
+        std::cerr << "❌ Could not create telemetry segment " << name << std::endl;
+        return false;
+    }
+    if (ftruncate(fd, (off_t)size) < 0) {
+        ::close(fd);
+        shm_unlink(name.c_str());
+        return false;
+    }
+    void* memory = mmap(nullptr, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (memory == MAP_FAILED) {
+        shm_unlink(name.c_str());
+        return false;
+    }
+
+    std::memset(memory, 0, size);
+    m_header = new (memory) TelemetryHeader();
+    m_header->magic = TELEMETRY_MAGIC;
+    m_header->version = TELEMETRY_VERSION;
+    m_header->capacity = capacity;
+    m_header->frameSize = sizeof(PitchFrame);
+    m_header->writeIndex.store(0, std::memory_order_release);
+
+    m_frames = reinterpret_cast<PitchFrame*>(static_cast<char*>(memory) + sizeof(TelemetryHeader));
+    m_mappedSize = size;
+    m_mask = capacity - 1;
+    m_name = name;
+
+    std::cout << "📡 Pitch telemetry published to shared memory " << name
+              << " (" << capacity << " frames)" << std::endl;
+    return true;
+}
+
+void TelemetryWriter::close() {
+    if (m_header) {
+        munmap(m_header, m_mappedSize);
+        shm_unlink(m_name.c_str());
+        m_header = nullptr;
+        m_frames = nullptr;
+    }
+}
+
+bool TelemetryReader::open(const std::string& name) {
+    close();
+    int fd = shm_open(name.c_str(), O_RDONLY, 0);
+    if (fd < 0) {
+        return false;
+    }
+
+    struct stat info;
+    if (fstat(fd, &info) < 0 || (size_t)info.st_size < sizeof(TelemetryHeader)) {
+        ::close(fd);
+        return false;
+    }
+    void* memory = mmap(nullptr, (size_t)info.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    ::close(fd);
+    if (memory == MAP_FAILED) {
+        return false;
+    }
+
+    TelemetryHeader* header = static_cast<TelemetryHeader*>(memory);
+    size_t expected = sizeof(TelemetryHeader) + sizeof(PitchFrame) * (size_t)header->capacity;
+    if (header->magic != TELEMETRY_MAGIC || header->version != TELEMETRY_VERSION ||
+        header->frameSize != sizeof(PitchFrame) || (size_t)info.st_size < expected) {
+        std::cerr << "❌ Telemetry segment " << name << " has an unexpected layout" << std::endl;
+        munmap(memory, (size_t)info.st_size);
+        return false;
+    }
+
+    m_header = header;
+    m_frames = reinterpret_cast<const PitchFrame*>(static_cast<char*>(memory) + sizeof(TelemetryHeader));
+    m_mappedSize = (size_t)info.st_size;
+    m_mask = header->capacity - 1;
+    // Start from the newest frame rather than replaying history
+    m_readIndex = header->writeIndex.load(std::memory_order_acquire);
+    m_missed = 0;
+    return true;
+}
+
+void TelemetryReader::close() {
+    if (m_header) {
+        munmap(m_header, m_mappedSize);
+        m_header = nullptr;
+        m_frames = nullptr;
+    }
+}
+
+#else
+
+// Shared-memory telemetry is POSIX only; Windows builds keep the in-process plot
+bool TelemetryWriter::create(const std::string& name, uint32_t capacity) {
+    (void)name;
+    (void)capacity;
+    return false;
+}
+
+void TelemetryWriter::close() {
+}
+
+bool TelemetryReader::open(const std::string& name) {
+    (void)name;
+    return false;
+}
+
+void TelemetryReader::close() {
+}
+
+#endif
@@ -0,0 +1,85 @@
+#ifndef TELEMETRY_SHM_H
+#define TELEMETRY_SHM_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+// One telemetry sample, produced once per audio buffer
+struct PitchFrame {
+    float time;           // Seconds since the stream started
+    float pitch;          // Detected voice pitch (Hz), 0 when none
+    float confidence;
+    float target;         // Melody target (Hz), 0 when none
+    float vad;            // Voice activity probability (0..1)
+    float noise_level;
+    uint32_t voice_active;
+    uint32_t reserved;
+};
+
+// Shared-memory layout: header followed by `capacity` PitchFrame slots.
+// Version and frame size let readers reject a segment they do not understand.
+struct TelemetryHeader {
+    uint32_t magic;
+    uint32_t version;
+    uint32_t capacity;     // Power of two
+    uint32_t frameSize;
+    alignas(64) std::atomic<uint64_t> writeIndex;   // Frames published so far
+};
+
+static constexpr uint32_t TELEMETRY_MAGIC = 0x4B50544D;  // "KPTM"
+static constexpr uint32_t TELEMETRY_VERSION = 1;
+static constexpr const char* DEFAULT_TELEMETRY_NAME = "/karaoke_telemetry";
+
+// Single writer (the audio callback). publish() is two memory writes and an
+// atomic store, so it is real-time safe; readers never slow it down.
+class TelemetryWriter {
+public:
+    TelemetryWriter();
+    ~TelemetryWriter();
+
+    // Create (or replace) the named segment
+    bool create(const std::string& name, uint32_t capacity = DEFAULT_CAPACITY);
+    void close();
+
+    void publish(const PitchFrame& frame);
+    bool isOpen() const;
+
+    static constexpr uint32_t DEFAULT_CAPACITY = 4096;   // ~20s of 256-frame buffers
+
+private:
+    std::string m_name;
+    TelemetryHeader* m_header;
+    PitchFrame* m_frames;
+    size_t m_mappedSize;
+    uint32_t m_mask;
+};
+
+// Any number of readers, each in its own process. A reader that falls
+// `capacity` frames behind (the writer is then reusing its oldest slot)
+// skips ahead and counts what it missed.
+class TelemetryReader {
+public:
+    TelemetryReader();
+    ~TelemetryReader();
+
+    bool open(const std::string& name);
+    void close();
+
+    // Copy up to maxFrames new frames into out; returns the number copied
+    size_t read(PitchFrame* out, size_t maxFrames);
+
+    bool isOpen() const;
+    uint64_t getMissedCount() const;
+
+private:
+    TelemetryHeader* m_header;
+    const PitchFrame* m_frames;
+    size_t m_mappedSize;
+    uint32_t m_mask;
+    uint64_t m_readIndex;
+    uint64_t m_missed;
+};
+
+#endif // TELEMETRY_SHM_H
@@ -0,0 +1,120 @@
+// Checks for the shared-memory telemetry ring (telemetry_shm.h).
+//
+// Build and run from autotune-app/:  make check
+//
+// A reader that is lapped by exactly `capacity` frames must drop the oldest
+// slot, because the writer fills it next. A reader racing a writer thread
+// must never return a torn frame. Exits non-zero on the first failure.
+
+#include <atomic>
+#include <cstdio>
+#include <string>
+#include <thread>
+#include <unistd.h>
+#include "telemetry_shm.h"
+
+static const uint32_t TEST_CAPACITY = 8;
+static const uint64_t RACE_FRAMES = 1 << 20;   // Sequence numbers stay exact as floats
+
+static int g_failures = 0;
+
+static void check(bool ok, const char* what) {
+    std::printf("%s %s\n", ok ? "✅" : "❌", what);
+    if (!ok) {
+        g_failures++;
+    }
+}
+
+// Every field carries the same sequence number, so a torn copy shows up as a mismatch
+static PitchFrame frameFor(uint64_t sequence) {
+    float value = (float)sequence;
+    PitchFrame frame = {};
+    frame.time = value;
+    frame.pitch = value;
+    frame.confidence = value;
+    frame.target = value;
+    frame.vad = value;
+    frame.noise_level = value;
+    frame.voice_active = (uint32_t)sequence;
+    return frame;
+}
+
+static bool isWhole(const PitchFrame& frame) {
+    return frame.pitch == frame.time && frame.confidence == frame.time && frame.target == frame.time &&
+           frame.vad == frame.time && frame.noise_level == frame.time && (float)frame.voice_active == frame.time;
+}
+
+static void testExactLap(const std::string& name) {
+    TelemetryWriter writer;
+    TelemetryReader reader;
+    if (!writer.create(name, TEST_CAPACITY) || !reader.open(name)) {
+        check(false, "open telemetry segment");
+        return;
+    }
+
+    PitchFrame frames[TEST_CAPACITY];
+    for (uint64_t i = 0; i < TEST_CAPACITY; ++i) {
+        writer.publish(frameFor(i));
+    }
+    size_t got = reader.read(frames, TEST_CAPACITY);
+    check(got == TEST_CAPACITY - 1, "lapped by exactly capacity: oldest slot is skipped");
+    check(reader.getMissedCount() == 1, "lapped by exactly capacity: one frame counted as missed");
+    check(got > 0 && frames[0].time == 1.0f && frames[got - 1].time == (float)(TEST_CAPACITY - 1),
+          "lapped by exactly capacity: newest frames returned in order");
+
+    // One short of a lap is still entirely readable
+    for (uint64_t i = TEST_CAPACITY; i < 2 * TEST_CAPACITY - 1; ++i) {
+        writer.publish(frameFor(i));
+    }
+    got = reader.read(frames, TEST_CAPACITY);
+    check(got == TEST_CAPACITY - 1 && reader.getMissedCount() == 1, "capacity - 1 behind: nothing skipped");
+}
+
+static void testConcurrentWriter(const std::string& name) {
+    TelemetryWriter writer;
+    TelemetryReader reader;
+    if (!writer.create(name, TEST_CAPACITY) || !reader.open(name)) {
+        check(false, "open telemetry segment");
+        return;
+    }
+
+    std::atomic<bool> done(false);
+    std::thread producer([&]() {
+        for (uint64_t i = 0; i < RACE_FRAMES; ++i) {
+            writer.publish(frameFor(i));
+        }
+        done.store(true);
+    });
+
+    PitchFrame frames[TEST_CAPACITY];
+    uint64_t received = 0;
+    uint64_t torn = 0;
+    uint64_t reordered = 0;
+    float last = -1.0f;
+    while (!done.load()) {
+        size_t got = reader.read(frames, TEST_CAPACITY);
+        for (size_t i = 0; i < got; ++i) {
+            if (!isWhole(frames[i])) {
+                torn++;
+            } else if (frames[i].time <= last) {
+                reordered++;
+            } else {
+                last = frames[i].time;
+            }
+        }
+        received += got;
+    }
+    producer.join();
+
+    std::printf("   %llu frames read, %llu skipped while racing the writer\n",
+                (unsigned long long)received, (unsigned long long)reader.getMissedCount());
+    check(torn == 0, "racing the writer: no torn frames");
+    check(reordered == 0, "racing the writer: frames stay in order");
+}
+
+int main() {
+    std::string name = "/karaoke_telemetry_test_" + std::to_string(getpid());
+    testExactLap(name);
+    testConcurrentWriter(name);
+    return g_failures == 0 ? 0 : 1;
+}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Engine daemon control socket check
+Starts `autotune-karaoke --daemon` on two short synthesized songs, swaps
+from the first to the second (start A, start B) and then sends a live voice
+parameter over the control socket. Neither song is cached, so each start
+replies at once and plays when its decode finishes. The daemon must still be
+listening after the swap and the playing session must pick the value up.
+Needs an audio device, like running the engine itself.
+
+Usage (from autotune-app/): python3 tests/test_daemon_control.py [path/to/autotune-karaoke]
+"""
+
+import math
+import os
+import shlex
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+RATE = 48000
+SONG_SECONDS = 5
+STARTUP_TIMEOUT = 10.0
+LOAD_TIMEOUT = 10.0
+APPLY_TIMEOUT = 2.0
+TEST_STRENGTH = 0.25
+
+
+def write_song(directory, name, freq):
+    """A sine instrumental and a flat melody map; returns (melody, instrumental)"""
+    melody = os.path.join(directory, f"{name}_melody.txt")
+    with open(melody, "w") as f:
+        f.write("# time,frequency\n")
+        for i in range(SONG_SECONDS * 10):
+            f.write(f"{i / 10:.1f},{freq}\n")
+
+    instrumental = os.path.join(directory, f"{name}.wav")
+    with wave.open(instrumental, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        samples = (int(8000 * math.sin(2 * math.pi * freq * i / RATE)) for i in range(RATE * SONG_SECONDS))
+        wav.writeframes(b"".join(struct.pack("<h", s) for s in samples))
+    return melody, instrumental
+
+
+def command(path, *words):
+    """Send one daemon command; returns (ok, {key: value})"""
+    line = " ".join(f'"{w}"' for w in words) + "\n"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(STARTUP_TIMEOUT)
+        conn.connect(path)
+        conn.sendall(line.encode())
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = conn.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    status, _, rest = reply.decode().strip().partition(" ")
+    fields = dict(field.partition("=")[::2] for field in shlex.split(rest)) if status == "ok" else {"error": rest}
+    return status == "ok", fields
+
+
+def wait_for(predicate, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    engine = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else "autotune-karaoke")
+    if not os.path.exists(engine):
+        print(f"❌ Engine not found: {engine} (build it first)")
+        return 1
+
+    with tempfile.TemporaryDirectory() as work:
+        daemon_socket = os.path.join(work, "daemon.sock")
+        control_socket = os.path.join(work, "control.sock")
+        song_a = write_song(work, "SongA", 220.0)
+        song_b = write_song(work, "SongB", 330.0)
+
+        env = dict(os.environ, KARAOKE_CONTROL_SOCKET=control_socket, KARAOKE_TELEMETRY_SHM=f"/karaoke_test_{os.getpid()}")
+        daemon = subprocess.Popen([engine, "--daemon", "--daemon-socket", daemon_socket], cwd=work, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        failures = 0
+        try:
+            if not wait_for(lambda: os.path.exists(daemon_socket), STARTUP_TIMEOUT):
+                print("❌ Daemon did not start")
+                return 1
+
+            for name, (melody, instrumental) in (("SongA", song_a), ("SongB", song_b)):
+                ok, reply = command(daemon_socket, "start", name, melody, instrumental)
+                print(f"{'✅' if ok else '❌'} start {name}: {reply}")
+                failures += not ok
+
+                def playing():
+                    ok, status = command(daemon_socket, "status")
+                    return ok and status.get("state") == "playing" and status.get("song") == name
+                ok = wait_for(playing, LOAD_TIMEOUT)
+                print(f"{'✅' if ok else '❌'} {name} playing")
+                failures += not ok
+
+            # Second song playing; the control socket must have survived the swap
+            listening = os.path.exists(control_socket)
+            print(f"{'✅' if listening else '❌'} control socket still listening after the swap")
+            failures += not listening
+            if listening:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                    conn.connect(control_socket)
+                    conn.sendall(f"autotune_strength={TEST_STRENGTH}\n".encode())
+
+                    def applied():
+                        ok, status = command(daemon_socket, "status")
+                        return ok and status.get("song") == "SongB" and \
+                            abs(float(status.get("autotune_strength", -1)) - TEST_STRENGTH) < 1e-3
+                    ok = wait_for(applied, APPLY_TIMEOUT)
+                print(f"{'✅' if ok else '❌'} control message reached the playing session")
+                failures += not ok
+
+            command(daemon_socket, "quit")
+            daemon.wait(timeout=STARTUP_TIMEOUT)
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+                daemon.wait()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#include "wav_recorder.h"
+#include "dsp_kernels.h"
+#include <algorithm>
+#include <chrono>
+#include <ctime>
+#include <filesystem>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+
+WavRecorder::WavRecorder()
+    : m_source(nullptr)
+    , m_sampleRate(48000)
+    , m_numChannels(1)
+    , m_running(false)
+    , m_samplesWritten(0)
+    , m_samplesAtLastPatch(0)
+{
+    m_block.resize(BLOCK_SIZE, 0.0f);
+    m_pcm.resize(BLOCK_SIZE, 0);
+}
+
+WavRecorder::~WavRecorder() {
+    stop();
+}
+
+bool WavRecorder::start(const std::string& filename, SpscRingBuffer<float>* source,
+                        int sampleRate, int numChannels) {
+    if (m_running.load() || !source) {
+        return false;
+    }
+
+    m_file.open(filename, std::ios::binary | std::ios::out | std::ios::trunc);
+    if (!m_file.is_open()) {
+        std::cout << "❌ Could not open file for writing: " << filename << std::endl;
+        return false;
+    }
+
+    m_filename = filename;
+    m_source = source;
+    m_sampleRate = sampleRate;
+    m_numChannels = numChannels;
+    m_samplesWritten.store(0);
+    m_samplesAtLastPatch = 0;
+
+    // Placeholder sizes, patched while recording and on stop()
+    writeWavHeader(m_file, m_sampleRate, m_numChannels, BITS_PER_SAMPLE, 0);
+    m_file.flush();
+
+    m_running.store(true);
+    m_thread = std::thread(&WavRecorder::run, this);
+
+    std::cout << "🎙️  Streaming recording to " << filename << std::endl;
+    return true;
+}
+
+void WavRecorder::stop() {
+    if (!m_running.exchange(false)) {
+        return;
+    }
+
+    if (m_thread.joinable()) {
+        m_thread.join();
+    }
+
+    // Pick up anything pushed after the writer thread's last pass
+    while (drainOnce() > 0) {
+    }
+
+    patchHeader();
+    m_file.close();
+
+    if (m_samplesWritten.load() == 0) {
+        std::cout << "❌ No recording data to save!" << std::endl;
+        return;
+    }
+
+    std::cout << "✅ Recording saved to " << m_filename << std::endl;
+    std::cout << "📊 Duration: " << getDurationSeconds() << "s" << std::endl;
+}
+
+bool WavRecorder::isRecording() const {
+    return m_running.load();
+}
+
+uint64_t WavRecorder::getFramesWritten() const {
+    return m_samplesWritten.load() / m_numChannels;
+}
+
+float WavRecorder::getDurationSeconds() const {
+    return getFramesWritten() / (float)m_sampleRate;
+}
+
+const std::string& WavRecorder::getFilename() const {
+    return m_filename;
+}
+
+void WavRecorder::writeWavHeader(std::ostream& out, int sampleRate, int numChannels,
+                                 int bitsPerSample, uint32_t dataSize) {
+    const uint32_t byteRate = sampleRate * numChannels * bitsPerSample / 8;
+    const uint16_t blockAlign = numChannels * bitsPerSample / 8;
+    const uint32_t riffSize = 36 + dataSize;
+    const uint32_t fmtSize = 16;
+    const uint16_t audioFormat = 1; // PCM
+    const uint16_t channels = (uint16_t)numChannels;
+    const uint32_t rate = (uint32_t)sampleRate;
+    const uint16_t bits = (uint16_t)bitsPerSample;
+
+    out.write("RIFF", 4);
+    out.write(reinterpret_cast<const char*>(&riffSize), 4);
+    out.write("WAVE", 4);
+    out.write("fmt ", 4);
+    out.write(reinterpret_cast<const char*>(&fmtSize), 4);
+    out.write(reinterpret_cast<const char*>(&audioFormat), 2);
+    out.write(reinterpret_cast<const char*>(&channels), 2);
+    out.write(reinterpret_cast<const char*>(&rate), 4);
+    out.write(reinterpret_cast<const char*>(&byteRate), 4);
+    out.write(reinterpret_cast<const char*>(&blockAlign), 2);
+    out.write(reinterpret_cast<const char*>(&bits), 2);
+    out.write("data", 4);
+    out.write(reinterpret_cast<const char*>(&dataSize), 4);
+}
+
+void WavRecorder::run() {
+    while (m_running.load()) {
+        if (drainOnce() == 0) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(IDLE_SLEEP_MS));
+        }
+
+        // Keep the on-disk header valid roughly once per second
+        if (m_samplesWritten.load() - m_samplesAtLastPatch >= (uint64_t)m_sampleRate * m_numChannels) {
+            patchHeader();
+        }
+    }
+}
+
+size_t WavRecorder::drainOnce() {
+    size_t count = m_source->popBlock(m_block.data(), m_block.size());
+    if (count > 0) {
+        writeBlock(m_block.data(), count);
+    }
+    return count;
+}
+
+void WavRecorder::writeBlock(const float* samples, size_t count) {
+    floatToInt16(m_pcm.data(), samples, (int)count);
+    m_file.write(reinterpret_cast<const char*>(m_pcm.data()), count * sizeof(int16_t));
+    m_samplesWritten.fetch_add(count);
+}
+
+void WavRecorder::patchHeader() {
+    const uint64_t samples = m_samplesWritten.load();
+    const uint32_t dataSize = (uint32_t)(samples * sizeof(int16_t));
+    const uint32_t riffSize = 36 + dataSize;
+
+    std::streampos end = m_file.tellp();
+    m_file.seekp(4, std::ios::beg);
+    m_file.write(reinterpret_cast<const char*>(&riffSize), 4);
+    m_file.seekp(HEADER_SIZE - 4, std::ios::beg);
+    m_file.write(reinterpret_cast<const char*>(&dataSize), 4);
+    m_file.seekp(end);
+    m_file.flush();
+
+    m_samplesAtLastPatch = samples;
+}
+
+// Function to generate unique filename
+std::string generateUniqueFilename(const std::string& song_name) {
+    // Create output directory if it doesn't exist
+    // Use absolute path to ensure it's created in the right location
+    std::string output_dir = "output";
+    std::filesystem::create_directories(output_dir);
+    
+    // Get current timestamp
+    auto now = std::chrono::system_clock::now();
+    auto time_t = std::chrono::system_clock::to_time_t(now);
+    auto ms = std::chrono::duration_cast<std::chrono::milliseconds>(now.time_since_epoch()) % 1000;
+    
+    // Format: output/songname_YYYYMMDD_HHMMSS_mmm.wav
+    std::stringstream ss;
+    ss << output_dir << "/" << song_name << "_" 
+       << std::put_time(std::localtime(&time_t), "%Y%m%d_%H%M%S")
+       << "_" << std::setfill('0') << std::setw(3) << ms.count()
+       << ".wav";
+    
+    std::cout << "📁 Will save recording to: " << ss.str() << std::endl;
+    return ss.str();
+}
+
+// Song name for output files: a path is reduced to its last component without extension
+std::string cleanSongName(const std::string& song_name) {
+    std::string clean_song_name = song_name;
+    
+    // If it's a full path, extract just the song name
+    if (song_name.find('/') != std::string::npos) {
+        // Find the last directory name in the path
+        size_t last_slash = song_name.find_last_of("/\\");
+        if (last_slash != std::string::npos) {
+            clean_song_name = song_name.substr(last_slash + 1);
+            // Remove any file extensions
+            size_t dot_pos = clean_song_name.find('.');
+            if (dot_pos != std::string::npos) {
+                clean_song_name = clean_song_name.substr(0, dot_pos);
+            }
+        }
+    }
+    return clean_song_name;
+}
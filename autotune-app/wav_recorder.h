@@ -0,0 +1,77 @@
+#ifndef WAV_RECORDER_H
+#define WAV_RECORDER_H
+
+#include <atomic>
+#include <cstdint>
+#include <fstream>
+#include <string>
+#include <thread>
+#include <vector>
+#include "ring_buffer.h"
+
+// Background recorder that streams 16-bit PCM to a WAV file while the
+// session runs. The audio callback only pushes into a ring buffer; this
+// class drains it on its own thread, writes whole blocks and re-patches the
+// RIFF/data sizes periodically, so the file on disk is always playable and
+// memory use does not grow with session length.
+class WavRecorder {
+public:
+    WavRecorder();
+    ~WavRecorder();
+
+    // Open the file and start the writer thread
+    bool start(const std::string& filename, SpscRingBuffer<float>* source,
+               int sampleRate, int numChannels = 1);
+
+    // Drain whatever is left in the queue, finalize the header and close
+    void stop();
+
+    bool isRecording() const;
+
+    // Frames written to disk so far
+    uint64_t getFramesWritten() const;
+
+    // Recorded duration in seconds
+    float getDurationSeconds() const;
+
+    const std::string& getFilename() const;
+
+    // Write a canonical 44-byte PCM WAV header
+    static void writeWavHeader(std::ostream& out, int sampleRate, int numChannels,
+                               int bitsPerSample, uint32_t dataSize);
+
+private:
+    void run();
+    size_t drainOnce();
+    void writeBlock(const float* samples, size_t count);
+    void patchHeader();
+
+    std::string m_filename;
+    std::ofstream m_file;
+    SpscRingBuffer<float>* m_source;
+    int m_sampleRate;
+    int m_numChannels;
+
+    std::thread m_thread;
+    std::atomic<bool> m_running;
+    std::atomic<uint64_t> m_samplesWritten;
+    uint64_t m_samplesAtLastPatch;
+
+    // Preallocated conversion buffers
+    std::vector<float> m_block;
+    std::vector<int16_t> m_pcm;
+
+    // Constants
+    static constexpr size_t BLOCK_SIZE = 4096;
+    static constexpr int BITS_PER_SAMPLE = 16;
+    static constexpr int HEADER_SIZE = 44;
+    static constexpr int IDLE_SLEEP_MS = 20;
+};
+
+// Session output path: output/<song>_<YYYYMMDD_HHMMSS_mmm>.wav
+std::string generateUniqueFilename(const std::string& song_name);
+
+// Song name for output files: a path is reduced to its last component without extension
+std::string cleanSongName(const std::string& song_name);
+
+#endif // WAV_RECORDER_H
@@ -2,6 +2,8 @@ const WebSocket = require('ws');
 const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
+const net = require('net');
+const readline = require('readline');
 
 const wss = new WebSocket.Server({ port: 8765 });
 
@@ -13,6 +15,18 @@ console.log('🎵 Backend: autotune-app/');
 let currentSession = null;
 let availableSongs = [];
 
+const controlSocketPath = path.join(__dirname, 'autotune-app', 'karaoke_control.sock');
+const paramFilePath = path.join(__dirname, 'autotune-app', 'voice_params.txt');
+const CONTROL_RETRY_MS = 200;   // Until the engine's control socket accepts connections
+
+// Map UI effect names to the engine's parameter keys (only these update live)
+const realTimeParamKeys = {
+  voice_volume: 'voice_volume',
+  instrument_volume: 'instrument_volume',
+  autotune: 'autotune_strength',
+  pitch_shift: 'pitch_shift'
+};
+
 // Discover available songs on startup
 function discoverSongs() {
   const songsDir = path.join(__dirname, 'autotune-app', 'songs');
@@ -64,6 +78,103 @@ function discoverSongs() {
   }
 }
 
+// The engine reports state on fd 3 as JSON lines (see autotune-app/event_stream.h);
+// stdout and stderr are only logged
+const ENGINE_EVENT_FD = 3;
+
+// Live pitch arrives on fd 4 as fixed 20-byte records at 60Hz (see autotune-app/pitch_stream.h):
+// uint32 sequence, float32 position, pitch, confidence, target, little-endian. Each record is
+// forwarded unchanged as one binary WebSocket message to clients that sent subscribe_pitch.
+const PITCH_STREAM_FD = 4;
+const PITCH_RECORD_BYTES = 20;
+const PITCH_STREAM_RATE_HZ = 60;
+const PITCH_MAX_BUFFERED_BYTES = 4096;   // Skip frames for a client whose socket is this far behind
+
+// Decimate to each subscriber's rate and drop frames for clients that are not keeping up;
+// only the newest record matters to a display
+function forwardPitchRecord(record) {
+  const now = Date.now();
+  wss.clients.forEach((client) => {
+    if (!client.pitchRateHz || client.readyState !== WebSocket.OPEN) {
+      return;
+    }
+    // Half an engine frame of slack so arrival jitter does not halve a full-rate subscriber
+    if (now - client.pitchLastSent < 1000 / client.pitchRateHz - 500 / PITCH_STREAM_RATE_HZ) {
+      return;
+    }
+    if (client.bufferedAmount > PITCH_MAX_BUFFERED_BYTES) {
+      client.pitchDropped = (client.pitchDropped || 0) + 1;
+      return;
+    }
+    client.pitchLastSent = now;
+    client.send(record, { binary: true });
+  });
+}
+
+function readPitchStream(stream) {
+  let pending = Buffer.alloc(0);
+  stream.on('data', (chunk) => {
+    pending = pending.length ? Buffer.concat([pending, chunk]) : chunk;
+    const whole = pending.length - (pending.length % PITCH_RECORD_BYTES);
+    if (whole > 0) {
+      // Anything older than the newest record in this chunk would be decimated away anyway
+      forwardPitchRecord(Buffer.from(pending.subarray(whole - PITCH_RECORD_BYTES, whole)));
+    }
+    pending = pending.subarray(whole);
+  });
+}
+
+function handleEngineEvent(event, songName, ws) {
+  switch (event.event) {
+    case 'state':
+      if (event.state === 'playing') {
+        console.log('🎤 C++ Karaoke backend started successfully!');
+        // The control socket is listening by now; don't wait for the next retry
+        if (currentSession && !currentSession.controlSocketReady) {
+          connectControlSocket(currentSession);
+        }
+        ws.send(JSON.stringify({ 
+          type: 'state', 
+          playing: true, 
+          positionSec: 0,
+          song: { id: songName, title: songName.replace(/_/g, ' '), durationSec: event.duration }
+        }));
+        ws.send(JSON.stringify({ 
+          type: 'backend_status', 
+          status: 'recording',
+          message: 'C++ backend is now recording and processing audio'
+        }));
+      }
+      break;
+    case 'progress':
+      ws.send(JSON.stringify({ type: 'tick', positionSec: event.position }));
+      break;
+    case 'xrun':
+      console.warn(`⚠️  Audio glitch: ${event.new} new xrun(s), ${event.count} total`);
+      ws.send(JSON.stringify({ type: 'backend_status', status: 'xrun', count: event.count }));
+      break;
+    case 'recording':
+      console.log(`💾 Recording saved: ${event.path} (${event.seconds}s)`);
+      ws.send(JSON.stringify({ 
+        type: 'backend_status', 
+        status: 'recording_completed',
+        path: event.path,
+        message: 'Recording has been saved successfully'
+      }));
+      break;
+    case 'error':
+      ws.send(JSON.stringify({ 
+        type: 'error', 
+        message: `Karaoke failed to start: ${event.message}` 
+      }));
+      stopSession();
+      break;
+    case 'exit':
+      console.log(`🎵 Engine exited with code ${event.code}`);
+      break;
+  }
+}
+
 // Run autotune karaoke with Python wrapper
 function runKaraoke(songName, ws) {
   // Check if there's already a running process
@@ -131,8 +242,7 @@ function runKaraoke(songName, ws) {
   
   console.log('🐍 Starting Python with args:', pythonArgs);
   
-  // Create initial parameter file for real-time updates
-  const paramFilePath = path.join(__dirname, 'autotune-app', 'voice_params.txt');
+  // Create initial parameter file (fallback for when the control socket is unavailable)
   try {
     const initialParams = [
       `voice_volume=${voiceEffects.voice_volume}`,
@@ -154,57 +264,40 @@ function runKaraoke(songName, ws) {
   
   const pythonProcess = spawn('python3', pythonArgs, {
     cwd: path.join(__dirname, 'autotune-app'),
-    stdio: ['pipe', 'pipe', 'pipe']
+    stdio: ['pipe', 'pipe', 'pipe', 'pipe', 'pipe'],
+    env: {
+      ...process.env,
+      KARAOKE_CONTROL_SOCKET: controlSocketPath,
+      KARAOKE_EVENT_FD: String(ENGINE_EVENT_FD),
+      KARAOKE_PITCH_FD: String(PITCH_STREAM_FD),
+      KARAOKE_PITCH_RATE: String(PITCH_STREAM_RATE_HZ)
+    }
   });
 
   currentSession.process = pythonProcess;
+  connectControlSocket(currentSession);
 
-  // Handle Python output
-  pythonProcess.stdout.on('data', (data) => {
-    const output = data.toString().trim();
-    console.log('🐍 Python output:', output);
-    
-    if (output.includes('Starting karaoke')) {
-      console.log('🎤 C++ Karaoke backend started successfully!');
-      ws.send(JSON.stringify({ 
-        type: 'state', 
-        playing: true, 
-        positionSec: 0,
-        song: { id: songName, title: songName.replace(/_/g, ' '), durationSec: 180 }
-      }));
-    }
-    
-    if (output.includes('C++ Karaoke with Recording started')) {
-      console.log('🎵 C++ backend is now recording and processing audio!');
-      ws.send(JSON.stringify({ 
-        type: 'backend_status', 
-        status: 'recording',
-        message: 'C++ backend is now recording and processing audio'
-      }));
-    }
-    
-    // Check for recording completion
-    if (output.includes('Recording saved to') || output.includes('✅ Recording saved to')) {
-      console.log('💾 Recording completed and saved!');
-      ws.send(JSON.stringify({ 
-        type: 'backend_status', 
-        status: 'recording_completed',
-        message: 'Recording has been saved successfully'
-      }));
+  // Typed engine events, one JSON object per line
+  readline.createInterface({ input: pythonProcess.stdio[ENGINE_EVENT_FD] }).on('line', (line) => {
+    let event;
+    try {
+      event = JSON.parse(line);
+    } catch (error) {
+      console.error('❌ Bad engine event:', line);
+      return;
     }
+    handleEngineEvent(event, songName, ws);
+  });
+
+  readPitchStream(pythonProcess.stdio[PITCH_STREAM_FD]);
+
+  // Human-readable output, logged only
+  pythonProcess.stdout.on('data', (data) => {
+    console.log('🐍 Python output:', data.toString().trim());
   });
 
   pythonProcess.stderr.on('data', (data) => {
-    const error = data.toString().trim();
-    console.error('🐍 Python error:', error);
-    
-    if (error.includes('not found') || error.includes('failed')) {
-      ws.send(JSON.stringify({ 
-        type: 'error', 
-        message: `Karaoke failed to start: ${error}` 
-      }));
-      stopSession();
-    }
+    console.error('🐍 Python error:', data.toString().trim());
   });
 
   pythonProcess.on('close', (code) => {
@@ -247,7 +340,98 @@ function stopSession() {
   // This preserves song name and voice effects for restarting
   if (currentSession) {
     currentSession.process = null;
+    disconnectControlSocket(currentSession);
+  }
+}
+
+// Write parameters to the fallback file, merging with what is already there
+function writeParamFile(params) {
+  try {
+    let existingParams = {};
+    if (fs.existsSync(paramFilePath)) {
+      const content = fs.readFileSync(paramFilePath, 'utf8');
+      content.split('\n').forEach(line => {
+        const [key, value] = line.split('=');
+        if (key && value) {
+          existingParams[key.trim()] = value.trim();
+        }
+      });
+    }
+    Object.assign(existingParams, params);
+    const paramContent = Object.entries(existingParams)
+      .map(([key, val]) => `${key}=${val}`)
+      .join('\n') + '\n';
+    fs.writeFileSync(paramFilePath, paramContent);
+    console.log('📝 Parameters written to file:', params);
+  } catch (error) {
+    console.error('❌ Failed to write parameters to file:', error);
+  }
+}
+
+// Keep a connection to the engine's control socket for as long as the session's
+// engine runs: tried from spawn, retried until the socket accepts, reopened if it
+// drops. Until it is up, updates go to voice_params.txt.
+function connectControlSocket(session) {
+  clearTimeout(session.controlRetry);
+  session.controlRetry = null;
+  if (!session.process || session.controlSocketReady) {
+    return;
+  }
+  if (session.controlSocket) {
+    session.controlSocket.destroy();
+  }
+
+  const socket = net.createConnection(controlSocketPath);
+  session.controlSocket = socket;
+  session.controlSocketReady = false;
+  socket.on('connect', () => {
+    session.controlSocketReady = true;
+    console.log('🔌 Connected to control socket');
+  });
+  socket.on('error', (error) => {
+    // ENOENT/ECONNREFUSED are expected while the engine starts up
+    if (session.controlSocketReady) {
+      console.error('⚠️  Control socket error:', error.message);
+    }
+  });
+  socket.on('close', () => {
+    if (session.controlSocket !== socket) {
+      return;
+    }
+    session.controlSocket = null;
+    session.controlSocketReady = false;
+    if (session.process && !session.controlRetry) {
+      session.controlRetry = setTimeout(() => connectControlSocket(session), CONTROL_RETRY_MS);
+    }
+  });
+}
+
+function disconnectControlSocket(session) {
+  clearTimeout(session.controlRetry);
+  session.controlRetry = null;
+  const socket = session.controlSocket;
+  session.controlSocket = null;
+  session.controlSocketReady = false;
+  if (socket) {
+    socket.destroy();
+  }
+}
+
+// Send real-time parameters to the C++ engine over its control socket, or
+// through voice_params.txt while that is not connected
+function sendVoiceParams(params) {
+  const lines = Object.entries(params)
+    .map(([key, val]) => `${key}=${val}\n`)
+    .join('');
+
+  const session = currentSession;
+  if (session && session.controlSocket && session.controlSocketReady) {
+    session.controlSocket.write(lines);
+    console.log('🎛️ Parameters sent over control socket:', params);
+    return;
   }
+
+  writeParamFile(params);
 }
 
 // Clear session completely (used when loading new songs)
@@ -471,6 +655,13 @@ wss.on('connection', (ws) => {
         }
         break;
 
+      case 'subscribe_pitch':
+        // rateHz 0 unsubscribes; the client picks a rate it can actually draw
+        ws.pitchRateHz = Math.max(0, Math.min(PITCH_STREAM_RATE_HZ, Number(payload?.rateHz) || 0));
+        ws.pitchLastSent = 0;
+        console.log(`📈 Pitch stream for client: ${ws.pitchRateHz}Hz`);
+        break;
+
       case 'refresh_songs':
         discoverSongs();
         ws.send(JSON.stringify({ 
@@ -532,45 +723,9 @@ wss.on('connection', (ws) => {
               runKaraoke(currentSession.songName, ws);
             }, 1000); // Small delay to ensure clean shutdown
           } else if (['voice_volume', 'instrument_volume', 'autotune', 'pitch_shift'].includes(effect)) {
-            // Update real-time parameters by writing to parameter file
-            console.log(`✅ ${effect} updated - writing to parameter file for real-time update`);
-            const paramFilePath = path.join(__dirname, 'autotune-app', 'voice_params.txt');
-            try {
-              // Read existing parameters
-              let existingParams = {};
-              if (fs.existsSync(paramFilePath)) {
-                const content = fs.readFileSync(paramFilePath, 'utf8');
-                content.split('\n').forEach(line => {
-                  if (line.trim()) {
-                    const [key, value] = line.split('=');
-                    if (key && value) {
-                      existingParams[key.trim()] = value.trim();
-                    }
-                  }
-                });
-              }
-              
-              // Update the specific parameter
-              if (effect === 'voice_volume') {
-                existingParams['voice_volume'] = value;
-              } else if (effect === 'instrument_volume') {
-                existingParams['instrument_volume'] = value;
-              } else if (effect === 'autotune') {
-                existingParams['autotune_strength'] = value;
-              } else if (effect === 'pitch_shift') {
-                existingParams['pitch_shift'] = value;
-              }
-              
-              // Write all parameters back to file
-              const paramContent = Object.entries(existingParams)
-                .map(([key, val]) => `${key}=${val}`)
-                .join('\n') + '\n';
-              
-              fs.writeFileSync(paramFilePath, paramContent);
-              console.log(`📝 ${effect} parameter updated in file: ${value}`);
-            } catch (error) {
-              console.error(`❌ Failed to update ${effect} parameter in file:`, error);
-            }
+            // Push the change to the running engine
+            console.log(`✅ ${effect} updated - sending real-time update`);
+            sendVoiceParams({ [realTimeParamKeys[effect]]: value });
           } else {
             console.log('✅ Effect updated - no session restart needed');
           }
@@ -617,62 +772,16 @@ wss.on('connection', (ws) => {
               runKaraoke(currentSession.songName, ws);
             }, 1000); // Small delay to ensure clean shutdown
           } else {
-            // Check for real-time updatable effects and write to parameter file
-            const realTimeEffects = ['voice_volume', 'instrument_volume', 'autotune', 'pitch_shift'];
-            let hasRealTimeUpdates = false;
-            
-            // Read existing parameters first
-            let existingParams = {};
-            const paramFilePath = path.join(__dirname, 'autotune-app', 'voice_params.txt');
-            if (fs.existsSync(paramFilePath)) {
-              try {
-                const content = fs.readFileSync(paramFilePath, 'utf8');
-                content.split('\n').forEach(line => {
-                  if (line.trim()) {
-                    const [key, value] = line.split('=');
-                    if (key && value) {
-                      existingParams[key.trim()] = value.trim();
-                    }
-                  }
-                });
-              } catch (error) {
-                console.error('❌ Failed to read existing parameters:', error);
-              }
-            }
-            
-            for (const effect of realTimeEffects) {
+            // Collect real-time updatable effects and push them in one message batch
+            const realTimeUpdates = {};
+            for (const [effect, key] of Object.entries(realTimeParamKeys)) {
               if (effects.hasOwnProperty(effect)) {
-                hasRealTimeUpdates = true;
-                console.log(`✅ ${effect} updated - updating parameter file for real-time update`);
-                try {
-                  // Update the specific parameter
-                  if (effect === 'voice_volume') {
-                    existingParams['voice_volume'] = effects[effect];
-                  } else if (effect === 'instrument_volume') {
-                    existingParams['instrument_volume'] = effects[effect];
-                  } else if (effect === 'autotune') {
-                    existingParams['autotune_strength'] = effects[effect];
-                  } else if (effect === 'pitch_shift') {
-                    existingParams['pitch_shift'] = effects[effect];
-                  }
-                } catch (error) {
-                  console.error(`❌ Failed to update ${effect} parameter:`, error);
-                }
+                realTimeUpdates[key] = effects[effect];
               }
             }
-            
-            // Write all updated parameters back to file
+            const hasRealTimeUpdates = Object.keys(realTimeUpdates).length > 0;
             if (hasRealTimeUpdates) {
-              try {
-                const paramContent = Object.entries(existingParams)
-                  .map(([key, val]) => `${key}=${val}`)
-                  .join('\n') + '\n';
-                
-                fs.writeFileSync(paramFilePath, paramContent);
-                console.log(`📝 All real-time parameters updated in file`);
-              } catch (error) {
-                console.error('❌ Failed to write updated parameters to file:', error);
-              }
+              sendVoiceParams(realTimeUpdates);
             }
             
             if (hasRealTimeUpdates) {
@@ -2,23 +2,68 @@
 """
 Integration Bridge for Autotune Karaoke System
 This script provides a clean API interface between the Node.js backend and C++ autotune system.
+
+Songs can be queued (enqueue/reorder/remove/skip). While one plays, the next
+entries are preloaded in the background, up to KARAOKE_PRELOAD_MB of decoded
+audio. With an engine daemon running (autotune-karaoke --daemon, socket
+KARAOKE_DAEMON_SOCKET) preloading decodes the song into the daemon's cache and
+the switch is a gapless swap; without one, sessions are separate engine
+processes and preloading ingests the instrumental into the resample cache.
 """
 
 import os
 import sys
 import json
+import shlex
+import socket
 import subprocess
 import signal
+import threading
 import time
+import wave
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import soundfile
+except ImportError:
+    soundfile = None  # Only needed for song lengths of non-PCM instrumentals
+
+APP_DIR = Path("autotune-app")
+ENGINE_SAMPLE_RATE = 48000          # Daemon cache holds mono float32 at this rate
+DEFAULT_PRELOAD_MB = 256            # Keep well under the daemon's song cache (512MB)
+DAEMON_TIMEOUT = 5.0                # Commands reply at once; the daemon decodes in the background
+DAEMON_LOAD_TIMEOUT = 120.0         # Longest wait for a background decode
+DAEMON_POLL_INTERVAL = 0.1
+ENGINE_STARTUP_SECONDS = 1.0        # Engine process start-up before the song is heard (no daemon)
+MB = 1 << 20
+
 class AutotuneIntegrationBridge:
-    def __init__(self, songs_dir: str = "autotune-app/songs"):
+    def __init__(self, songs_dir: str = "autotune-app/songs", daemon_socket: Optional[str] = None,
+                 preload_budget_mb: Optional[float] = None):
         self.songs_dir = Path(songs_dir)
         self.current_session = None
         self.process = None
         
+        # Engine daemon socket; relative paths are relative to autotune-app like the engine's own
+        if daemon_socket is None:
+            daemon_socket = APP_DIR / os.environ.get("KARAOKE_DAEMON_SOCKET", "karaoke_daemon.sock")
+        self.daemon_socket = Path(daemon_socket)
+        if preload_budget_mb is None:
+            preload_budget_mb = float(os.environ.get("KARAOKE_PRELOAD_MB", DEFAULT_PRELOAD_MB))
+        self.preload_budget_bytes = int(preload_budget_mb * MB)
+        
+        # Upcoming songs, next first. The worker thread preloads from the head
+        # and starts the next entry when the current song ends.
+        self.queue = []
+        self.auto_advance = True
+        self._next_entry_id = 1
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._switching = False     # A skip or advance is talking to the engine
+        self._worker = None
+        self._closing = False
+        
     def discover_songs(self) -> List[Dict]:
         """Discover all available songs in the songs directory."""
         songs = []
@@ -102,13 +147,23 @@ class AutotuneIntegrationBridge:
                 "error": f"Song files not found: {message}"
             }
         
+        return self._start_session(song_name, str(melody_file), str(instrumental_file))
+    
+    def _start_session(self, song_name: str, melody_file: str, instrumental_file: str) -> Dict:
+        """Start playing the given files, replacing any current session."""
+        if self._daemon_available():
+            return self._start_daemon_session(song_name, melody_file, instrumental_file)
+        
+        if self.current_session:
+            self.stop_karaoke_session()
+        
         try:
             # Start the C++ karaoke program
             cmd = ["./autotune-karaoke", song_name, melody_file, instrumental_file]
             
             print(f"🚀 Starting karaoke: {' '.join(cmd)}")
             
-            self.process = subprocess.Popen(
+            process = subprocess.Popen(
                 cmd,
                 cwd=Path("autotune-app"),  # Run from autotune-app directory
                 stdout=subprocess.PIPE,
@@ -118,18 +173,27 @@ class AutotuneIntegrationBridge:
                 universal_newlines=True
             )
             
-            self.current_session = {
+            session = {
                 "song_name": song_name,
                 "start_time": time.time(),
                 "melody_file": melody_file,
                 "instrumental_file": instrumental_file,
-                "process": self.process
+                "process": process
             }
+            # The engine loops the instrumental and never exits on its own, so the
+            # queue advances on the song's length
+            seconds = self._song_seconds(instrumental_file)
+            if seconds is not None:
+                session["ends_at"] = time.time() + ENGINE_STARTUP_SECONDS + seconds
             
+            with self._lock:
+                self.process = process
+                self.current_session = session
+                self._changed.notify_all()
             return {
                 "success": True,
                 "message": f"Karaoke session started for {song_name}",
-                "session": self.current_session
+                "session": session
             }
             
         except Exception as e:
@@ -138,33 +202,82 @@ class AutotuneIntegrationBridge:
                 "error": f"Failed to start karaoke: {str(e)}"
             }
     
+    def _start_daemon_session(self, song_name: str, melody_file: str, instrumental_file: str) -> Dict:
+        """Start (or swap to) a song on the engine daemon."""
+        started = time.time()
+        reply = self._daemon_command("start", song_name, melody_file, instrumental_file)
+        if reply["success"] and reply.get("loading"):
+            # Not cached: the daemon plays it once decoded, so wait for that
+            reply = self._wait_for_daemon_song(song_name)
+            if reply["success"]:
+                reply["first_audio_ms"] = round((time.time() - started) * 1000, 1)
+        if not reply["success"]:
+            return {
+                "success": False,
+                "error": f"Failed to start karaoke: {reply['error']}"
+            }
+        
+        session = {
+            "song_name": song_name,
+            "start_time": time.time(),
+            "melody_file": melody_file,
+            "instrumental_file": instrumental_file,
+            "ends_at": time.time() + reply.get("duration", 0.0) - reply.get("position", 0.0),
+            "first_audio_ms": reply.get("first_audio_ms"),
+            "output_file": reply.get("output")
+        }
+        
+        with self._lock:
+            self.current_session = session
+            self._changed.notify_all()
+        return {
+            "success": True,
+            "message": f"Karaoke session started for {song_name}",
+            "session": session
+        }
+    
     def stop_karaoke_session(self) -> Dict:
         """Stop the current karaoke session."""
-        if not self.current_session:
+        with self._lock:
+            session_info = self.current_session
+            process = self.process
+        if not session_info:
             return {
                 "success": False,
                 "error": "No active session"
             }
         
+        if self._daemon_available():
+            reply = self._daemon_command("stop")
+            self._end_session(session_info)
+            if not reply["success"]:
+                return {
+                    "success": False,
+                    "error": f"Failed to stop session: {reply['error']}"
+                }
+            session_info["recorded"] = reply.get("recorded")
+            return {
+                "success": True,
+                "message": "Karaoke session stopped",
+                "session": session_info
+            }
+        
         try:
-            if self.process:
+            if process:
                 print("🛑 Stopping karaoke session...")
                 
                 # Send SIGTERM first
-                self.process.terminate()
+                process.terminate()
                 
                 # Wait for graceful shutdown
                 try:
-                    self.process.wait(timeout=5)
+                    process.wait(timeout=5)
                 except subprocess.TimeoutExpired:
                     print("⚠️  Force killing process...")
-                    self.process.kill()
-                    self.process.wait()
-                
-                self.process = None
+                    process.kill()
+                    process.wait()
             
-            session_info = self.current_session
-            self.current_session = None
+            self._end_session(session_info)
             
             return {
                 "success": True,
@@ -180,27 +293,64 @@ class AutotuneIntegrationBridge:
     
     def get_session_status(self) -> Dict:
         """Get the current session status."""
-        if not self.current_session:
+        with self._lock:
+            session = self.current_session
+            process = self.process
+            queued = len(self.queue)
+        if not session:
             return {
                 "active": False,
                 "message": "No active session"
             }
         
-        if self.process:
+        if self._daemon_available():
+            reply = self._daemon_command("status")
+            state = reply.get("state")
+            with self._lock:
+                switching = self._switching
+            # Mid song change the daemon may be idle or loading the next song; the session
+            # stays current until the switch commits the new one
+            if switching or (reply["success"] and state in ("playing", "loading")):
+                return {
+                    "active": True,
+                    "song_name": session["song_name"],
+                    "start_time": session["start_time"],
+                    "duration": time.time() - session["start_time"],
+                    "position": reply.get("position"),
+                    "song_duration": reply.get("duration"),
+                    "queued": queued,
+                    "message": "Changing song" if switching or state == "loading" else "Session active"
+                }
+            if not reply["success"]:
+                return {
+                    "active": False,
+                    "message": reply["error"]
+                }
+            if state in ("idle", "stopped") and reply.get("song", session["song_name"]) == session["song_name"]:
+                self._end_session(session)
+                return {
+                    "active": False,
+                    "message": "Session ended"
+                }
+            return {
+                "active": False,
+                "message": f"Engine daemon is {state}"
+            }
+        
+        if process:
             # Check if process is still running
-            if self.process.poll() is None:
+            if process.poll() is None:
                 return {
                     "active": True,
-                    "song_name": self.current_session["song_name"],
-                    "start_time": self.current_session["start_time"],
-                    "duration": time.time() - self.current_session["start_time"],
+                    "song_name": session["song_name"],
+                    "start_time": session["start_time"],
+                    "duration": time.time() - session["start_time"],
                     "message": "Session active"
                 }
             else:
                 # Process has ended
-                return_code = self.process.returncode
-                self.current_session = None
-                self.process = None
+                return_code = process.returncode
+                self._end_session(session)
                 
                 return {
                     "active": False,
@@ -213,6 +363,13 @@ class AutotuneIntegrationBridge:
             "message": "Session inactive"
         }
     
+    def _end_session(self, session: Dict):
+        """Forget a session that ended on its own, unless another has replaced it meanwhile."""
+        with self._lock:
+            if self.current_session is session:
+                self.current_session = None
+                self.process = None
+    
     def _find_song_files(self, song_input: str) -> Tuple[Optional[str], Optional[str], str]:
         """Find song files using the existing song_finder logic."""
         try:
@@ -226,8 +383,313 @@ class AutotuneIntegrationBridge:
             # Fallback if song_finder is not available
             return None, None, "song_finder module not available"
     
+    # ---- Song queue ----
+    
+    def enqueue(self, song_name: str, position: Optional[int] = None) -> Dict:
+        """Add a song to the queue (at the end, or before position)."""
+        melody_file, instrumental_file, message = self._find_song_files(song_name)
+        if not melody_file or not instrumental_file:
+            return {
+                "success": False,
+                "error": f"Song files not found: {message}"
+            }
+        
+        with self._lock:
+            entry = {
+                "id": self._next_entry_id,
+                "song_name": song_name,
+                "melody_file": str(melody_file),
+                "instrumental_file": str(instrumental_file),
+                "size_bytes": self._estimate_decoded_bytes(str(instrumental_file)),
+                "preloaded": False,
+                "preload_error": None
+            }
+            self._next_entry_id += 1
+            if position is None:
+                self.queue.append(entry)
+            else:
+                self.queue.insert(max(0, min(position, len(self.queue))), entry)
+            self._changed.notify_all()
+        
+        self._ensure_worker()
+        return {
+            "success": True,
+            "entry": dict(entry),
+            "queue": self.get_queue()
+        }
+    
+    def reorder(self, entry_id: int, position: int) -> Dict:
+        """Move a queued entry to position (0 plays next)."""
+        with self._lock:
+            entry = self._find_entry(entry_id)
+            if not entry:
+                return {
+                    "success": False,
+                    "error": f"No queued entry {entry_id}"
+                }
+            self.queue.remove(entry)
+            self.queue.insert(max(0, min(position, len(self.queue))), entry)
+            self._changed.notify_all()
+            return {
+                "success": True,
+                "queue": self.get_queue()
+            }
+    
+    def remove(self, entry_id: int) -> Dict:
+        """Drop an entry from the queue."""
+        with self._lock:
+            entry = self._find_entry(entry_id)
+            if not entry:
+                return {
+                    "success": False,
+                    "error": f"No queued entry {entry_id}"
+                }
+            self.queue.remove(entry)
+            self._changed.notify_all()
+            return {
+                "success": True,
+                "queue": self.get_queue()
+            }
+    
+    def skip(self) -> Dict:
+        """End the current song and play the next queued one."""
+        return self._play_next()
+    
+    def _play_next(self, expected: Optional[Dict] = None) -> Dict:
+        """Start the next queued entry, or stop when the queue is empty. The entry is
+        taken under the lock, so a skip and an automatic advance cannot both pop one,
+        but the engine is driven outside it. With expected, only move on if that
+        session is still the current one."""
+        with self._lock:
+            if self._switching or (expected is not None and self.current_session is not expected):
+                return {
+                    "success": False,
+                    "error": "Song change already in progress"
+                }
+            entry = self.queue.pop(0) if self.queue else None
+            if not entry and not self.current_session:
+                return {
+                    "success": False,
+                    "error": "Queue is empty"
+                }
+            self._switching = True
+        
+        try:
+            if not entry:
+                result = self.stop_karaoke_session()
+                result["message"] = "Queue is empty, session stopped"
+                return result
+            
+            print(f"⏭️  Next up: {entry['song_name']} ({'preloaded' if entry['preloaded'] else 'not preloaded'})")
+            result = self._start_session(entry["song_name"], entry["melody_file"], entry["instrumental_file"])
+            result["preloaded"] = entry["preloaded"]
+            return result
+        finally:
+            with self._lock:
+                self._switching = False
+                self._changed.notify_all()
+    
+    def has_pending_songs(self) -> bool:
+        """True while a song plays, is queued, or a song change is under way."""
+        with self._lock:
+            return bool(self.current_session or self.queue or self._switching)
+    
+    def get_queue(self) -> List[Dict]:
+        """Queued entries, next first."""
+        with self._lock:
+            return [dict(entry) for entry in self.queue]
+    
+    def _find_entry(self, entry_id: int) -> Optional[Dict]:
+        for entry in self.queue:
+            if entry["id"] == entry_id:
+                return entry
+        return None
+    
+    def _song_seconds(self, instrumental_file: str) -> Optional[float]:
+        """Length of an instrumental, None if it cannot be read."""
+        path = APP_DIR / instrumental_file
+        try:
+            with wave.open(str(path), "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError, OSError):
+            pass
+        if soundfile is not None:
+            try:
+                return soundfile.info(str(path)).duration
+            except RuntimeError:
+                pass
+        # Other formats without soundfile: assume 16-bit stereo at 44.1kHz
+        try:
+            return path.stat().st_size / (44100 * 2 * 2)
+        except OSError:
+            return None
+    
+    def _estimate_decoded_bytes(self, instrumental_file: str) -> int:
+        """Size of an instrumental once decoded to mono float32 at the engine rate."""
+        seconds = self._song_seconds(instrumental_file)
+        return int(seconds * ENGINE_SAMPLE_RATE * 4) if seconds is not None else 0
+    
+    def _next_to_preload(self) -> Optional[Dict]:
+        """First queued entry within the preload budget that is not loaded yet.
+        The next song is always eligible, even if it alone is over budget."""
+        planned = 0
+        for index, entry in enumerate(self.queue):
+            planned += entry["size_bytes"]
+            if index > 0 and planned > self.preload_budget_bytes:
+                return None
+            if not entry["preloaded"] and not entry["preload_error"]:
+                return entry
+        return None
+    
+    def _preload(self, entry: Dict):
+        """Decode an entry ahead of time (runs on the worker thread, outside the lock)."""
+        started = time.time()
+        if self._daemon_available():
+            # load replies straight away; ask again until the decode has landed in the cache
+            deadline = started + DAEMON_LOAD_TIMEOUT
+            while True:
+                reply = self._daemon_command("load", entry["song_name"], entry["melody_file"],
+                                             entry["instrumental_file"])
+                if not reply["success"] or reply.get("cached") or time.time() > deadline or self._closing:
+                    break
+                time.sleep(DAEMON_POLL_INTERVAL)
+            ok, error = reply["success"] and bool(reply.get("cached")), reply.get("error")
+            if ok and reply.get("duration"):
+                entry["size_bytes"] = int(reply["duration"] * ENGINE_SAMPLE_RATE * 4)
+        else:
+            try:
+                result = subprocess.run(["./autotune-karaoke", "--ingest", entry["instrumental_file"]],
+                                        cwd=APP_DIR, capture_output=True, text=True)
+                ok, error = result.returncode == 0, result.stderr.strip()
+            except OSError as e:
+                ok, error = False, str(e)
+        
+        with self._lock:
+            entry["preloaded"] = ok
+            entry["preload_error"] = None if ok else (error or "preload failed")
+            entry["preload_ms"] = round((time.time() - started) * 1000, 1)
+        if ok:
+            print(f"📦 Preloaded {entry['song_name']} in {entry['preload_ms']}ms")
+        else:
+            print(f"⚠️  Could not preload {entry['song_name']}: {entry['preload_error']}")
+    
+    def _seconds_until_song_end(self) -> Optional[float]:
+        """Time left in the current song, None when it cannot be known."""
+        session = self.current_session
+        if not session:
+            return None
+        if self.process and self.process.poll() is not None:
+            return 0.0
+        if "ends_at" in session:
+            return session["ends_at"] - time.time()
+        return None
+    
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._closing = False
+            self._worker = threading.Thread(target=self._worker_loop, name="queue-worker", daemon=True)
+            self._worker.start()
+    
+    def _notify_worker(self):
+        with self._lock:
+            self._changed.notify_all()
+    
+    def _worker_loop(self):
+        """Preload upcoming entries and start the next song when one ends."""
+        while True:
+            with self._lock:
+                if self._closing:
+                    return
+                entry = self._next_to_preload()
+                remaining = self._seconds_until_song_end() if self.auto_advance and not self._switching else None
+                due = remaining is not None and remaining <= 0
+                if entry is None and not due:
+                    # Nothing to load: sleep until the song ends or the queue changes
+                    self._changed.wait(timeout=1.0 if remaining is None else min(remaining, 1.0))
+                    continue
+            
+            if due:
+                self._advance()
+            else:
+                self._preload(entry)
+    
+    def _advance(self):
+        """The song is due to end; confirm with the engine, then play the next entry
+        (or stop when the queue is empty)."""
+        with self._lock:
+            session = self.current_session
+        if not session:
+            return
+        if self._daemon_available():
+            status = self._daemon_command("status")
+            left = status.get("duration", 0.0) - status.get("position", 0.0)
+            if status.get("state") == "playing" and left > 0.005:
+                # Audio clock runs a little behind wall time; wait for the real end
+                with self._lock:
+                    session["ends_at"] = time.time() + left
+                return
+        # A skip that got in first has already moved on; leave its song playing
+        self._play_next(expected=session)
+    
+    # ---- Engine daemon ----
+    
+    def _daemon_available(self) -> bool:
+        return hasattr(socket, "AF_UNIX") and self.daemon_socket.exists()
+    
+    def _daemon_command(self, command: str, *args: str) -> Dict:
+        """Send one command to the engine daemon and parse its reply line."""
+        line = " ".join([command] + [f'"{arg}"' for arg in args]) + "\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(DAEMON_TIMEOUT)
+                conn.connect(str(self.daemon_socket))
+                conn.sendall(line.encode())
+                reply = b""
+                while not reply.endswith(b"\n"):
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    reply += chunk
+        except OSError as e:
+            return {"success": False, "error": f"Engine daemon unreachable: {e}"}
+        return self._parse_daemon_reply(reply.decode(errors="replace").strip())
+    
+    def _wait_for_daemon_song(self, song_name: str) -> Dict:
+        """Poll the daemon until a loading start is playing; returns its status reply."""
+        deadline = time.time() + DAEMON_LOAD_TIMEOUT
+        while time.time() < deadline:
+            status = self._daemon_command("status")
+            if not status["success"]:
+                return status
+            if status.get("state") == "playing" and status.get("song") == song_name:
+                return status
+            if status.get("pending") != song_name:
+                # Dropped from the daemon's pending start: the decode failed or another start replaced it
+                return {"success": False, "error": f"could not load {song_name}"}
+            time.sleep(DAEMON_POLL_INTERVAL)
+        return {"success": False, "error": f"timed out loading {song_name}"}
+    
+    @staticmethod
+    def _parse_daemon_reply(reply: str) -> Dict:
+        """'ok key=value ...' -> {"success": True, key: value}; 'error reason' -> error"""
+        status, _, rest = reply.partition(" ")
+        if status != "ok":
+            return {"success": False, "error": rest or "no reply from engine daemon"}
+        
+        result = {"success": True}
+        for field in shlex.split(rest):
+            key, _, value = field.partition("=")
+            try:
+                result[key] = float(value)
+            except ValueError:
+                result[key] = value
+        return result
+    
     def cleanup(self):
         """Cleanup resources."""
+        with self._lock:
+            self._closing = True
+            self._changed.notify_all()
         if self.current_session:
             self.stop_karaoke_session()
 
@@ -240,6 +702,7 @@ def main():
         print("  python3 integration_bridge.py start <song_name>")
         print("  python3 integration_bridge.py stop")
         print("  python3 integration_bridge.py status")
+        print("  python3 integration_bridge.py queue <song_name> [song_name ...]   # play back to back")
         return
     
     bridge = AutotuneIntegrationBridge()
@@ -267,6 +730,22 @@ def main():
             result = bridge.get_session_status()
             print(json.dumps(result, indent=2))
             
+        elif command == "queue":
+            if len(sys.argv) < 3:
+                print("❌ Song name required")
+                return
+            for song_name in sys.argv[2:]:
+                result = bridge.enqueue(song_name)
+                if not result["success"]:
+                    print(f"❌ {result['error']}")
+            result = bridge.skip()
+            print(json.dumps(result, indent=2, default=str))
+            
+            # Songs advance on their own; stay alive until the queue has played out
+            while bridge.has_pending_songs():
+                time.sleep(1.0)
+                bridge.get_session_status()
+            
         else:
             print(f"❌ Unknown command: {command}")
             
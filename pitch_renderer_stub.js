@@ -1,24 +1,89 @@
-// Replace this with your real WASM/Node-API renderer.
-// Expected to export an async function:
-export async function initPitchRenderer({ canvas, onReady, onDispose }) {
+// Pitch lane: the target melody (red) and the singer's live pitch (green)
+// over the last few seconds of the song, drawn from the engine's binary pitch
+// feed (autotune-app/pitch_stream.h, forwarded by autotune_backend_server.js).
+
+export const PITCH_RECORD_BYTES = 20;
+const MAX_RATE_HZ = 60;              // What the engine publishes
+const HISTORY = MAX_RATE_HZ * 30;    // Frames kept (30s at full rate)
+const MIN_HZ = 80, MAX_HZ = 1000;    // Vertical range, log scale
+const MIN_CONFIDENCE = 0.5;          // Below this the voice line breaks
+
+// One record per 20 bytes: uint32 sequence, float32 position, pitch, confidence, target (little-endian)
+export function decodePitchRecords(buffer) {
+  const view = new DataView(buffer);
+  const frames = [];
+  for (let o = 0; o + PITCH_RECORD_BYTES <= view.byteLength; o += PITCH_RECORD_BYTES) {
+    frames.push({
+      sequence: view.getUint32(o, true),
+      position: view.getFloat32(o + 4, true),
+      pitch: view.getFloat32(o + 8, true),
+      confidence: view.getFloat32(o + 12, true),
+      target: view.getFloat32(o + 16, true)
+    });
+  }
+  return frames;
+}
+
+// subscribe(onBuffer, rateHz) should deliver binary pitch messages and return an unsubscribe function
+export async function initPitchRenderer({ canvas, subscribe, windowSec = 8, onReady, onDispose }) {
   const ctx = canvas.getContext('2d');
-  let running = true, t = 0;
+  const position = new Float32Array(HISTORY);
+  const pitch = new Float32Array(HISTORY);
+  const confidence = new Float32Array(HISTORY);
+  const target = new Float32Array(HISTORY);
+  let head = 0, count = 0, dirty = true, running = true;
+
+  const push = (frame) => {
+    // The song restarted or another one began: start a fresh lane
+    if (count && frame.position < position[(head - 1 + HISTORY) % HISTORY] - 0.5) count = 0;
+    position[head] = frame.position;
+    pitch[head] = frame.pitch;
+    confidence[head] = frame.confidence;
+    target[head] = frame.target;
+    head = (head + 1) % HISTORY;
+    count = Math.min(count + 1, HISTORY);
+    dirty = true;
+  };
+
+  // Ask for no more frames than the lane has pixel columns to show them on
+  const rateHz = Math.max(1, Math.min(MAX_RATE_HZ, Math.ceil((canvas.clientWidth || 600) / windowSec)));
+  const unsubscribe = subscribe ? subscribe((buffer) => decodePitchRecords(buffer).forEach(push), rateHz) : null;
+
+  const yFor = (hz, h) => h - Math.log2(Math.min(MAX_HZ, Math.max(MIN_HZ, hz)) / MIN_HZ) / Math.log2(MAX_HZ / MIN_HZ) * h;
+
+  const drawLine = (values, color, gated, w, h, now) => {
+    ctx.strokeStyle = color; ctx.lineWidth = 2; ctx.beginPath();
+    let pen = false, lastX = -1;
+    for (let i = 0; i < count; i++) {
+      const k = (head - count + i + HISTORY) % HISTORY;
+      const x = Math.round(w - (now - position[k]) / windowSec * w);
+      if (x < 0) continue;
+      if (values[k] <= 0 || (gated && confidence[k] < MIN_CONFIDENCE)) { pen = false; continue; }
+      if (x === lastX) continue;   // One point per pixel column
+      lastX = x;
+      const y = yFor(values[k], h);
+      pen ? ctx.lineTo(x, y) : ctx.moveTo(x, y);
+      pen = true;
+    }
+    ctx.stroke();
+  };
+
   const draw = () => {
     if (!running) return;
-    const w = canvas.width = canvas.clientWidth;
-    const h = canvas.height = canvas.clientHeight;
-    ctx.clearRect(0,0,w,h);
-    ctx.globalAlpha = 1;
-    ctx.fillStyle = '#0b0b0b'; ctx.fillRect(0,0,w,h);
-    // Red line (song pitch, mock)
-    ctx.strokeStyle = '#ef4444'; ctx.lineWidth = 2; ctx.beginPath();
-    for (let x=0;x<w;x++){ const y = h/2 + Math.sin((x+t)/50)*18; x?ctx.lineTo(x,y):ctx.moveTo(x,y); } ctx.stroke();
-    // Green line (live voice, mock)
-    ctx.strokeStyle = '#22c55e'; ctx.beginPath();
-    for (let x=0;x<w;x++){ const y = h/2 + Math.sin((x+t*1.2)/33)*30; x?ctx.lineTo(x,y):ctx.moveTo(x,y); } ctx.stroke();
-    t += 2; requestAnimationFrame(draw);
+    const w = canvas.clientWidth, h = canvas.clientHeight;
+    if (canvas.width !== w || canvas.height !== h) { canvas.width = w; canvas.height = h; dirty = true; }
+    if (dirty) {
+      dirty = false;
+      ctx.fillStyle = '#0b0b0b'; ctx.fillRect(0, 0, w, h);
+      if (count) {
+        const now = position[(head - 1 + HISTORY) % HISTORY];
+        drawLine(target, '#ef4444', false, w, h, now);
+        drawLine(pitch, '#22c55e', true, w, h, now);
+      }
+    }
+    requestAnimationFrame(draw);
   };
   draw();
   onReady?.();
-  return () => { running = false; onDispose?.(); };
+  return () => { running = false; unsubscribe?.(); onDispose?.(); };
 }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Queue auto-advance test for the integration bridge without an engine daemon.
+Each song runs as its own engine process, which loops the instrumental and
+never exits on its own, so the bridge has to move on when the song's length
+has played. A stand-in engine records which songs were started and then
+runs until it is terminated, like the real one.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import integration_bridge
+from integration_bridge import AutotuneIntegrationBridge
+
+SONG_SECONDS = 0.5
+SONGS = ["First", "Second"]
+QUEUE_TIMEOUT = 15.0
+
+FAKE_ENGINE = """#!/usr/bin/env python3
+import sys, time
+if sys.argv[1] == "--ingest":
+    sys.exit(0)
+with open("started.txt", "a") as f:
+    f.write(sys.argv[1] + "\\n")
+while True:
+    time.sleep(1)
+"""
+
+
+class LocalBridge(AutotuneIntegrationBridge):
+    """Bridge whose songs are the test's own files instead of songs/."""
+
+    def _find_song_files(self, song_input):
+        return f"{song_input}_melody.txt", f"{song_input}.wav", "found"
+
+
+def write_song(app_dir, name):
+    (app_dir / f"{name}_melody.txt").write_text("0.0,220\n")
+    with wave.open(str(app_dir / f"{name}.wav"), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes(b"\0\0" * int(48000 * SONG_SECONDS))
+
+
+def test_fallback_queue_advances():
+    """Both queued songs play in order and the queue empties on its own."""
+    with tempfile.TemporaryDirectory() as work:
+        app_dir = Path(work) / "autotune-app"
+        app_dir.mkdir()
+        engine = app_dir / "autotune-karaoke"
+        engine.write_text(FAKE_ENGINE)
+        engine.chmod(0o755)
+        for name in SONGS:
+            write_song(app_dir, name)
+
+        cwd = os.getcwd()
+        os.chdir(work)
+        bridge = LocalBridge(daemon_socket=Path(work) / "no_daemon.sock")
+        try:
+            for name in SONGS:
+                bridge.enqueue(name)
+            bridge.skip()
+
+            deadline = time.time() + QUEUE_TIMEOUT
+            while bridge.has_pending_songs() and time.time() < deadline:
+                time.sleep(0.1)
+            finished = not bridge.has_pending_songs()
+            started = (app_dir / "started.txt").read_text().split()
+        finally:
+            bridge.cleanup()
+            os.chdir(cwd)
+
+    if not finished:
+        print(f"❌ Queue did not play out within {QUEUE_TIMEOUT}s")
+        return False
+    if started != SONGS:
+        print(f"❌ Expected {SONGS} to start in order, got {started}")
+        return False
+    print(f"✅ Queue advanced through {len(SONGS)} songs without a daemon")
+    return True
+
+
+def main():
+    print(f"🎤 Bridge queue test (songs of {SONG_SECONDS}s, engine start-up allowance "
+          f"{integration_bridge.ENGINE_STARTUP_SECONDS}s)")
+    return test_fallback_queue_advances()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)